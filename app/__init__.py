@@ -11,6 +11,10 @@ import os
 def create_app():
     """Factory para crear la aplicación Flask"""
     
+    # Configurar logging (nivel desde LOG_LEVEL, handler con cola)
+    from app.core.logging_config import configurar_logging
+    configurar_logging()
+    
     # Crear app con template folder en shared
     app = Flask(__name__, template_folder='shared/templates')
     app.config.from_object(Config)
@@ -62,6 +66,7 @@ def create_app():
     from app.features.movimientos.routes.movimientos_routes import movimientos_bp
     from app.features.bitacora.routes.bitacora_routes import bitacora_bp
     from app.features.configuracion.routes.configuracion_routes import configuracion_bp
+    from app.features.metricas.routes.metricas_routes import metricas_bp, ip_autorizada_metricas
     
     app.register_blueprint(checadores_bp)
     app.register_blueprint(asistencias_bp)
@@ -72,6 +77,20 @@ def create_app():
     app.register_blueprint(movimientos_bp)
     app.register_blueprint(bitacora_bp)
     app.register_blueprint(configuracion_bp)
+    app.register_blueprint(metricas_bp)
+    
+    # Instrumentación de queries por request (X-DB-Queries, X-DB-Time, Server-Timing)
+    from app.core.database.query_metrics import metricas_queries
+    app.before_request(metricas_queries.iniciar_request)
+    app.after_request(metricas_queries.finalizar_request)
+    
+    # Despachador de la bandeja de salida de correos (un hilo por worker, se crea al primer request)
+    from app.features.bitacora.services.bandeja_correo_use_case import despachador_bandeja
+    app.before_request(despachador_bandeja.asegurar_iniciado)
+    
+    # Actualización en segundo plano del índice de usuarios de checadores
+    from app.features.checadores.services.indice_usuarios_checador_use_case import actualizador_indice_usuarios
+    app.before_request(actualizador_indice_usuarios.asegurar_iniciado)
     
     # Proteger TODAS las rutas excepto auth
     @app.before_request
@@ -80,6 +99,10 @@ def create_app():
         # Rutas que no requieren autenticación
         allowed_routes = ['auth.login', 'auth.logout', 'static']
         
+        # /metrics: el scraper de Prometheus entra por IP (METRICS_ALLOWED_IPS)
+        if request.endpoint == 'metricas.metrics' and ip_autorizada_metricas(request.remote_addr):
+            return None
+        
         if request.endpoint and not any(request.endpoint.startswith(r) for r in allowed_routes):
             if not session.get('logged_in'):
                 return redirect(url_for('auth.login', next=request.url))
@@ -18,3 +18,13 @@ class Config:
     # Servidor
     HOST = os.getenv('FLASK_HOST', '0.0.0.0')
     PORT = int(os.getenv('FLASK_PORT', '5000'))
+    
+    # Logging (ver app/core/logging_config.py)
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FILE = os.getenv('LOG_FILE', '')
+    
+    # Métricas Prometheus (ver app/core/metricas.py)
+    METRICS_DIR = os.getenv('METRICS_DIR', '/tmp/tecnotime_metricas')  # Compartido por los workers
+    METRICS_FLUSH_SEGUNDOS = float(os.getenv('METRICS_FLUSH_SEGUNDOS', '1'))
+    # IPs que pueden leer /metrics sin sesión (ej. el servidor Prometheus), separadas por coma
+    METRICS_ALLOWED_IPS = [ip.strip() for ip in os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1').split(',') if ip.strip()]
@@ -0,0 +1,37 @@
+"""
+Configuración de la tabla asistencias (particiones y archivo frío)
+"""
+import os
+
+# ============================================
+# PARTICIONES (ver particiones_asistencias_use_case)
+# ============================================
+# Tamaño de cada partición por rango de fecha: 'mensual' o 'anual'
+PARTICIONES_GRANULARIDAD = os.getenv('ASISTENCIAS_PARTICIONES', 'mensual').lower()
+
+# Particiones que deben existir por adelantado después del periodo actual
+# (la corrida nocturna las crea; así p_futuro queda siempre vacía)
+PARTICIONES_ADELANTE = int(os.getenv('ASISTENCIAS_PARTICIONES_ADELANTE', '3'))
+
+# Prefijo de las tablas de paso de las particiones que se pasan al archivo frío
+PREFIJO_TABLA_ARCHIVO = 'asistencias_archivo_'
+
+# ============================================
+# ARCHIVO FRÍO (ver archivo_asistencias y archivar_asistencias_use_case)
+# ============================================
+# Las checadas de meses anteriores a (mes actual - ARCHIVO_MESES) salen de la
+# tabla a archivos comprimidos por mes; 0 = no archivar
+ARCHIVO_MESES = int(os.getenv('ASISTENCIAS_ARCHIVO_MESES', '24'))
+
+# Directorio de los archivos (un asistencias-AAAA-MM.json.gz por mes)
+_RAIZ_PROYECTO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ARCHIVO_DIR = os.getenv('ASISTENCIAS_ARCHIVO_DIR', os.path.join(_RAIZ_PROYECTO, 'archivo_asistencias'))
+
+# Archivar en cada corrida nocturna (si no, solo con scripts/archivar_asistencias.py)
+ARCHIVO_AUTOMATICO = os.getenv('ASISTENCIAS_ARCHIVO_AUTOMATICO', 'false').lower() == 'true'
+
+# Meses descomprimidos que se conservan en memoria por proceso
+ARCHIVO_CACHE_MESES = int(os.getenv('ASISTENCIAS_ARCHIVO_CACHE_MESES', '6'))
+
+# Filas borradas de asistencias por sentencia al archivar
+ARCHIVO_LOTE_BORRADO = 1000
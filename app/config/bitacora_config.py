@@ -1,6 +1,7 @@
 """
 Configuración de reglas para cálculo de incidencias en bitácora
 """
+import os
 
 # ============================================
 # CÓDIGOS DE INCIDENCIA (COLUMNA CÓDIGO)
@@ -161,6 +162,62 @@ def validar_salida(minutos_diferencia: int, es_docente_plaza: bool) -> tuple:
         else:
             return ('ST', None, f'Salida temprana: {minutos_temprano} minutos antes')
 
+# ============================================
+# PROCESAMIENTO NOCTURNO (scripts/procesar_bitacora_nocturna.py)
+# ============================================
+# Días hacia atrás que se procesan cuando no hay corridas previas
+# Ejemplo: 1 = solo el día de ayer
+DIAS_PROCESAMIENTO_NOCTURNO = 1
+
+# Máximo de días que una corrida puede recuperar si el servidor estuvo apagado
+# Ejemplo: si la última corrida exitosa fue hace 20 días, solo se procesan los últimos 7
+MAX_DIAS_RECUPERACION_NOCTURNA = 7
+
+# Usuario que queda registrado en bitacora.procesado_por
+PROCESADO_POR_NOCTURNO = 'NOCTURNO'
+
+# Archivo de bloqueo (flock): una sola corrida a la vez; si hay otra en curso
+# la nueva termina sin hacer nada
+NOCTURNA_LOCK = os.getenv('BITACORA_NOCTURNA_LOCK', '/tmp/tecnotime_bitacora_nocturna.lock')
+
+# ============================================
+# PDF MASIVO (generar_pdf_masivo_bitacora_use_case.py)
+# ============================================
+# Procesos que renderizan trabajadores en paralelo (requiere pypdf para unir las páginas)
+# 0 = automático (núcleos disponibles, máximo 4); 1 = siempre secuencial
+PDF_MASIVO_PROCESOS = int(os.getenv('PDF_MASIVO_PROCESOS', '0'))
+PDF_MASIVO_MAX_PROCESOS_AUTO = 4
+
+# Con menos trabajadores el costo de arrancar procesos no se recupera
+PDF_MASIVO_MIN_TRABAJADORES_PARALELO = 8
+
+# Trabajadores por query al leer la bitácora de muchos a la vez
+# (listar_bitacora_use_case.ejecutar_por_trabajadores: num_trabajador IN (...))
+LOTE_TRABAJADORES_CONSULTA = 500
+
+# ============================================
+# RENDERIZADO DE PDF (individual y masivo)
+# ============================================
+# 'platypus' = SimpleDocTemplate + Table (implementación original, default)
+# 'canvas' = dibujo directo con coordenadas precalculadas (renderizador_canvas_bitacora.py);
+#            más rápido, se activa por despliegue con PDF_RENDERIZADOR=canvas
+PDF_RENDERIZADOR = os.getenv('PDF_RENDERIZADOR', 'platypus').lower()
+
+# ============================================
+# CACHÉ DE PDFs RENDERIZADOS (cache_pdf_bitacora.py)
+# ============================================
+# Directorio compartido por todos los workers; PDF_CACHE_MAX_MB=0 deshabilita la caché
+PDF_CACHE_DIR = os.getenv('PDF_CACHE_DIR', '/tmp/tecnotime_pdf_cache')
+PDF_CACHE_MAX_MB = int(os.getenv('PDF_CACHE_MAX_MB', '200'))
+# Incrementar al cambiar el formato de los PDFs: invalida todo lo guardado
+PDF_VERSION_PLANTILLA = 1
+
+# ============================================
+# ENVÍO MASIVO DE CORREOS (enviar_correo_masivo_bitacora_use_case.py)
+# ============================================
+CORREO_MASIVO_HILOS = int(os.getenv('CORREO_MASIVO_HILOS', '4'))   # correos armándose/enviándose a la vez
+CORREO_MASIVO_LOTE = int(os.getenv('CORREO_MASIVO_LOTE', '50'))    # trabajadores por consulta de bitácora
+
 # ============================================
 # DESCRIPCIÓN DE REGLAS (para mostrar al usuario)
 # ============================================
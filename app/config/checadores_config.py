@@ -1,7 +1,11 @@
 """
 Configuración de checadores ZKTeco
 Lista de dispositivos disponibles
+
+Con CHECADORES_SIMULADOS=host:puerto,host:puerto... la app usa checadores
+simulados (benchmarks/zk_simulado.py) en lugar de los reales.
 """
+import os
 
 
 class CheckadoresConfig:
@@ -53,6 +57,49 @@ class CheckadoresConfig:
     # Reintentos de conexión
     MAX_RETRIES = 3
     
+    # Checadores consultados a la vez (hilos del cliente asíncrono)
+    MAX_CONCURRENTES = 8
+    
+    # Sesiones persistentes (sesiones_checador.py)
+    # Una conexión sin uso más de SESION_MAX_INACTIVA segundos se cierra (el
+    # checador atiende pocas conexiones a la vez); cada SESION_KEEPALIVE segundos
+    # se comprueban las sesiones abiertas
+    SESION_MAX_INACTIVA = 120
+    SESION_KEEPALIVE = 30
+    
+    # Índice de usuarios por checador (tabla checador_usuarios)
+    # Un checador cuyo índice tenga más de INDICE_USUARIOS_INTERVALO segundos se
+    # vuelve a leer en segundo plano (0 = solo en descargas y a pedido)
+    INDICE_USUARIOS_INTERVALO = 3600
+    
+    # Poda de la memoria de asistencias (podar_asistencias_checador_use_case.py)
+    # Tras una descarga con todas las checadas verificadas en BD se vacía el
+    # checador (clear_attendance), si tiene al menos PODA_MIN_REGISTROS y su
+    # última checada tiene más de PODA_MARGEN_MINUTOS
+    PODA_ASISTENCIAS = os.getenv('CHECADORES_PODA_ASISTENCIAS', 'False').lower() == 'true'
+    PODA_MIN_REGISTROS = 20000
+    PODA_MARGEN_MINUTOS = 30
+    
+    @classmethod
+    def usar_simulados(cls, direcciones):
+        """
+        Reemplaza la lista de checadores por checadores simulados
+        
+        Args:
+            direcciones (list): [(host, puerto), ...] de benchmarks/zk_simulado.py
+        """
+        cls.CHECADORES = [
+            {
+                'id': f'simulado_{i}',
+                'nombre': f'SIMULADO {i}',
+                'ip': host,
+                'puerto': int(puerto),
+                'ubicacion': 'Simulador (benchmarks/zk_simulado.py)',
+                'activo': True
+            }
+            for i, (host, puerto) in enumerate(direcciones, start=1)
+        ]
+    
     @classmethod
     def get_checadores_activos(cls):
         """Retorna solo los checadores activos"""
@@ -67,3 +114,10 @@ class CheckadoresConfig:
     def get_checador_by_ip(cls, ip):
         """Obtiene un checador por su IP"""
         return next((c for c in cls.CHECADORES if c['ip'] == ip), None)
+
+
+if os.getenv('CHECADORES_SIMULADOS'):
+    CheckadoresConfig.usar_simulados([
+        direccion.strip().rsplit(':', 1) for direccion in os.getenv('CHECADORES_SIMULADOS').split(',')
+        if direccion.strip()
+    ])
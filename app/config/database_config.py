@@ -32,6 +32,10 @@ class DatabaseConfig:
         'charset': 'utf8mb4'
     }
     
+    # Instrumentación de queries (ver app/core/database/query_metrics.py)
+    SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', '500'))              # Umbral de query lenta
+    QUERIES_POR_REQUEST_ALERTA = int(os.getenv('DB_QUERIES_ALERTA', '200'))  # Posible N+1
+    
     @classmethod
     def get_connection_params(cls, db_type='sistema'):
         """
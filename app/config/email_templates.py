@@ -18,9 +18,13 @@ VARIABLES DISPONIBLES PARA BINDING:
 - {remitente_departamento} - Departamento del remitente
 """
 
+import logging
+import threading
 from pathlib import Path
 import json
 
+logger = logging.getLogger(__name__)
+
 # Ruta base para recursos de correo (imágenes, etc.)
 EMAIL_RESOURCES_PATH = Path(__file__).parent.parent.parent / 'email_resources'
 
@@ -31,8 +35,33 @@ EMAIL_SETTINGS_PATH = Path(__file__).parent / 'email_settings.json'
 # FUNCIONES PARA CONFIGURACIÓN PERSISTENTE
 # =============================================================================
 
+# Configuración ya leída: se reutiliza mientras el archivo no cambie (mtime y tamaño),
+# así que los cambios hechos por otro worker también se ven
+_cache_configuracion = {'firma': None, 'config': None}
+_lock_configuracion = threading.Lock()
+
+
+def _firma_archivo(ruta: Path):
+    """(mtime_ns, tamaño) del archivo, None si no existe"""
+    try:
+        stat = ruta.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 def cargar_configuracion() -> dict:
-    """Carga la configuración de plantillas desde archivo JSON"""
+    """
+    Carga la configuración de plantillas desde archivo JSON
+    
+    El archivo solo se vuelve a leer si cambió desde la última lectura; cada
+    llamada recibe una copia que puede modificar.
+    """
+    firma = _firma_archivo(EMAIL_SETTINGS_PATH)
+    with _lock_configuracion:
+        if _cache_configuracion['config'] is not None and _cache_configuracion['firma'] == firma:
+            return dict(_cache_configuracion['config'])
+    
     config_default = {
         'usar_plantilla_html': True,
         'imagen_encabezado': '',
@@ -42,16 +71,29 @@ def cargar_configuracion() -> dict:
     }
     
     try:
-        if EMAIL_SETTINGS_PATH.exists():
+        if firma is not None:
             with open(EMAIL_SETTINGS_PATH, 'r', encoding='utf-8') as f:
                 config = json.load(f)
                 config_default.update(config)
     except Exception as e:
-        print(f"Error cargando configuración de email: {e}")
+        logger.error("Error cargando configuración de email: %s", e)
+        # No se guarda en caché: la siguiente llamada vuelve a intentar
+        return config_default
+    
+    with _lock_configuracion:
+        _cache_configuracion['firma'] = firma
+        _cache_configuracion['config'] = dict(config_default)
     
     return config_default
 
 
+def invalidar_configuracion():
+    """Olvida la configuración leída (la siguiente llamada relee el archivo)"""
+    with _lock_configuracion:
+        _cache_configuracion['firma'] = None
+        _cache_configuracion['config'] = None
+
+
 def guardar_configuracion(config: dict) -> tuple:
     """Guarda la configuración de email en archivo JSON"""
     try:
@@ -60,6 +102,9 @@ def guardar_configuracion(config: dict) -> tuple:
         return True, None
     except Exception as e:
         return False, str(e)
+    finally:
+        # Dos escrituras en el mismo tick de mtime no cambiarían la firma
+        invalidar_configuracion()
 
 
 # =============================================================================
@@ -16,6 +16,23 @@ SMTP_CONFIG = {
     'from_name': os.getenv('SMTP_FROM_NAME', 'Sistema de Recursos Humanos')
 }
 
+# Sesiones reutilizadas (app/core/smtp_pool.py)
+SMTP_SESIONES = int(os.getenv('SMTP_SESIONES', 2))                        # sesiones abiertas a la vez por worker
+SMTP_TIMEOUT = float(os.getenv('SMTP_TIMEOUT', 30))                       # segundos
+SMTP_SESION_MAX_INACTIVA = float(os.getenv('SMTP_SESION_MAX_INACTIVA', 60))  # segundos sin uso antes de descartarla
+SMTP_CORREOS_POR_MINUTO = int(os.getenv('SMTP_CORREOS_POR_MINUTO', 60))   # por worker; 0 = sin límite
+
+# Bandeja de salida (bandeja_correo_use_case.py): correos con fallo temporal que se reintentan
+_RAIZ_PROYECTO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CORREO_BANDEJA_DIR = os.getenv('CORREO_BANDEJA_DIR', os.path.join(_RAIZ_PROYECTO, 'bandeja_correo'))  # mensajes .eml pendientes
+CORREO_BANDEJA_INTERVALO = float(os.getenv('CORREO_BANDEJA_INTERVALO', 30))            # segundos entre revisiones; 0 = sin despachador
+CORREO_BANDEJA_LOTE = int(os.getenv('CORREO_BANDEJA_LOTE', 50))                        # correos por revisión
+CORREO_BANDEJA_MAX_INTENTOS = int(os.getenv('CORREO_BANDEJA_MAX_INTENTOS', 8))         # después queda como 'fallido'
+CORREO_BANDEJA_BACKOFF_BASE = float(os.getenv('CORREO_BANDEJA_BACKOFF_BASE', 60))      # 1 min, 2, 4, 8... segundos
+CORREO_BANDEJA_BACKOFF_MAX = float(os.getenv('CORREO_BANDEJA_BACKOFF_MAX', 3600))      # tope del backoff
+CORREO_BANDEJA_ESPERA_DOMINIO = float(os.getenv('CORREO_BANDEJA_ESPERA_DOMINIO', 2))   # segundos mínimos entre correos a un dominio
+CORREO_BANDEJA_BLOQUEO = float(os.getenv('CORREO_BANDEJA_BLOQUEO', 300))               # un envío tomado y no cerrado se libera tras esto
+
 def validar_config():
     """Valida que la configuración SMTP esté completa"""
     if not SMTP_CONFIG['host']:
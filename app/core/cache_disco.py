@@ -0,0 +1,235 @@
+"""
+Caché de archivos en disco direccionada por contenido
+Responsabilidad única: guardar/leer blobs por clave con tamaño total acotado (LRU)
+
+La clave la calcula quien usa la caché como hash de todo lo que determina el
+contenido (ver calcular_clave()): si cambia un dato, cambia la clave, así que no hay
+invalidación explícita; las entradas viejas salen por LRU.
+
+- Archivos en <directorio>/<ab>/<clave>: compartidos por todos los workers
+- Escritura a un temporal + os.replace: un lector nunca ve un archivo a medias
+- Cada acierto actualiza el mtime; al pasar de max_bytes se borran los de
+  mtime más antiguo hasta bajar a 90% (bajo flock, un proceso a la vez)
+- El total se estima en el proceso y se recalcula recorriendo el directorio
+  cuando la estimación pasa del límite o cada INTERVALO_RECUENTO segundos
+"""
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import BinaryIO, Iterable, Optional, Union
+
+from app.core.metricas import CACHE_DISCO
+
+logger = logging.getLogger(__name__)
+
+ARCHIVO_LOCK = '.lock'
+INTERVALO_RECUENTO = 300
+FRACCION_TRAS_RECORTE = 0.9
+
+
+def calcular_clave(*partes: Union[str, int, Iterable]) -> str:
+    """
+    SHA-256 de las partes (las iterables se recorren elemento por elemento)
+
+    Ejemplo:
+        calcular_clave('bitacora', 1, num, fecha_inicio, fecha_fin, filas)
+    """
+    h = hashlib.sha256()
+
+    def agregar(parte):
+        if isinstance(parte, (str, bytes, int, float)) or parte is None:
+            h.update(repr(parte).encode('utf-8'))
+            h.update(b'\x1f')
+        else:
+            h.update(b'[')
+            for elemento in parte:
+                agregar(elemento)
+            h.update(b']')
+
+    for parte in partes:
+        agregar(parte)
+    return h.hexdigest()
+
+
+class CacheDisco:
+    """Caché LRU de archivos acotada por tamaño total"""
+
+    def __init__(self, nombre: str, directorio: str, max_bytes: int):
+        """
+        Args:
+            nombre: Etiqueta para métricas y logs
+            directorio: Carpeta de la caché (se crea al guardar)
+            max_bytes: Tamaño total máximo; 0 deshabilita la caché
+        """
+        self.nombre = nombre
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._bytes_estimados: Optional[int] = None
+        self._ultimo_recuento = 0.0
+
+    @property
+    def habilitada(self) -> bool:
+        return self.max_bytes > 0
+
+    def ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, clave[:2], clave)
+
+    # ------------------------------------------
+    # Lectura
+    # ------------------------------------------
+
+    def abrir(self, clave: str) -> Optional[BinaryIO]:
+        """
+        Abre la entrada para lectura (None si no existe)
+
+        El archivo abierto sigue siendo legible aunque otro proceso lo expulse.
+        """
+        if not self.habilitada:
+            return None
+
+        ruta = self.ruta(clave)
+        try:
+            archivo = open(ruta, 'rb')
+        except FileNotFoundError:
+            CACHE_DISCO.inc(cache=self.nombre, resultado='fallo')
+            return None
+
+        try:
+            os.utime(ruta)  # Uso reciente (LRU)
+        except OSError:
+            pass
+        CACHE_DISCO.inc(cache=self.nombre, resultado='acierto')
+        return archivo
+
+    def obtener(self, clave: str) -> Optional[bytes]:
+        """Contenido de la entrada (None si no existe)"""
+        archivo = self.abrir(clave)
+        if archivo is None:
+            return None
+        with archivo:
+            return archivo.read()
+
+    # ------------------------------------------
+    # Escritura
+    # ------------------------------------------
+
+    def guardar(self, clave: str, origen: Union[bytes, BinaryIO]):
+        """
+        Guarda una entrada; los errores de disco solo se registran en el log
+
+        Args:
+            clave: Clave de la entrada (ver calcular_clave())
+            origen: bytes o archivo binario (se copia desde su posición actual
+                    y se deja al final; el llamador decide si vuelve al inicio)
+        """
+        if not self.habilitada:
+            return
+
+        ruta = self.ruta(clave)
+        temporal = None
+        try:
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), prefix='.tmp-')
+            with os.fdopen(descriptor, 'wb') as destino:
+                if isinstance(origen, (bytes, bytearray, memoryview)):
+                    destino.write(origen)
+                else:
+                    shutil.copyfileobj(origen, destino)
+                tamano = destino.tell()
+            os.replace(temporal, ruta)
+            temporal = None
+        except OSError as e:
+            logger.warning("Caché %s: no se pudo guardar %s: %s", self.nombre, ruta, e)
+            return
+        finally:
+            if temporal:
+                try:
+                    os.unlink(temporal)
+                except OSError:
+                    pass
+
+        CACHE_DISCO.inc(cache=self.nombre, resultado='guardado')
+        self._contar(tamano)
+
+    def vaciar(self):
+        """Elimina todas las entradas"""
+        shutil.rmtree(self.directorio, ignore_errors=True)
+        with self._lock:
+            self._bytes_estimados = 0
+
+    # ------------------------------------------
+    # Tamaño y expulsión LRU
+    # ------------------------------------------
+
+    def _contar(self, tamano: int):
+        with self._lock:
+            vencido = time.monotonic() - self._ultimo_recuento > INTERVALO_RECUENTO
+            if self._bytes_estimados is None or vencido:
+                recortar = True
+            else:
+                self._bytes_estimados += tamano
+                recortar = self._bytes_estimados > self.max_bytes
+
+        if recortar:
+            self._recortar()
+
+    def _entradas(self):
+        """(mtime, tamaño, ruta) de cada entrada"""
+        entradas = []
+        try:
+            subdirectorios = list(os.scandir(self.directorio))
+        except FileNotFoundError:
+            return entradas
+
+        for subdirectorio in subdirectorios:
+            if not subdirectorio.is_dir():
+                continue
+            for entrada in os.scandir(subdirectorio.path):
+                if entrada.name.startswith('.'):
+                    continue
+                try:
+                    stat = entrada.stat()
+                except FileNotFoundError:
+                    continue
+                entradas.append((stat.st_mtime, stat.st_size, entrada.path))
+        return entradas
+
+    def _recortar(self):
+        """Recalcula el total y expulsa las entradas menos usadas si pasa de max_bytes"""
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            with open(os.path.join(self.directorio, ARCHIVO_LOCK), 'a') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    entradas = self._entradas()
+                    total = sum(tamano for _, tamano, _ in entradas)
+
+                    if total > self.max_bytes:
+                        objetivo = self.max_bytes * FRACCION_TRAS_RECORTE
+                        expulsadas = 0
+                        for _, tamano, ruta in sorted(entradas):
+                            if total <= objetivo:
+                                break
+                            try:
+                                os.unlink(ruta)
+                            except FileNotFoundError:
+                                pass
+                            total -= tamano
+                            expulsadas += 1
+                        CACHE_DISCO.inc(expulsadas, cache=self.nombre, resultado='expulsado')
+                        logger.info("Caché %s: %s entradas expulsadas (%s bytes en uso)", self.nombre, expulsadas, total)
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+        except OSError as e:
+            logger.warning("Caché %s: no se pudo recortar %s: %s", self.nombre, self.directorio, e)
+            return
+
+        with self._lock:
+            self._bytes_estimados = total
+            self._ultimo_recuento = time.monotonic()
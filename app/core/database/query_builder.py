@@ -2,12 +2,59 @@
 Constructor de queries SQL
 Responsabilidad única: construir queries con filtros dinámicos
 Elimina duplicación de lógica de construcción de WHERE clauses
+
+Todos los filtros comparan la columna directamente (sin DATE(), YEAR(), etc.
+sobre ella) para que MySQL pueda usar sus índices y podar particiones.
 """
+from datetime import date, timedelta
+
+# Marca en la query del IN que build_chunks() reparte en bloques
+_MARCA_IN = '\x00IN\x00'
+
+
+def condicion_keyset(columns, values, descending=False):
+    """
+    Condición "filas después de values" en el orden de columns (paginación por keyset)
+    
+    (c1, c2, c3) > (v1, v2, v3) se escribe como
+    c1 >= v1 AND (c1 > v1 OR c2 > v2 OR (c2 = v2 AND c3 > v3)), con la primera
+    columna sola al inicio para que el índice se use como rango.
+    
+    Args:
+        columns (list): Columnas del orden (la última debe ser única, ej. id)
+        values (list): Valores de la fila de referencia, en el mismo orden
+        descending (bool): True si el orden es DESC (filas "antes" de values)
+        
+    Returns:
+        tuple: (condición SQL, params)
+    """
+    operador = '<' if descending else '>'
+    if len(columns) == 1:
+        return f"{columns[0]} {operador} %s", [values[0]]
+    
+    # Desde la última columna hacia la primera: ck > vk OR (ck = vk AND (<resto>))
+    condicion = f"{columns[-1]} {operador} %s"
+    params = [values[-1]]
+    for column, value in zip(reversed(columns[1:-1]), reversed(values[1:-1])):
+        resto = condicion if len(params) == 1 else f"({condicion})"
+        condicion = f"{column} {operador} %s OR ({column} = %s AND {resto})"
+        params = [value, value] + params
+    
+    return (
+        f"{columns[0]} {operador}= %s AND ({columns[0]} {operador} %s OR {condicion})",
+        [values[0], values[0]] + params
+    )
 
 
 class QueryBuilder:
     """Construye queries SQL dinámicamente con filtros"""
     
+    # Valores por sentencia sugeridos para add_in_filter(..., chunk_size=...)
+    TAMANO_BLOQUE_IN = 1000
+    
+    # Tipos de columna de add_date_filter
+    TIPOS_FECHA = ('date', 'datetime', 'timestamp')
+    
     def __init__(self, base_query):
         """
         Inicializa el builder con la query base
@@ -18,6 +65,7 @@ class QueryBuilder:
         self.query = base_query
         self.params = []
         self.has_where = 'WHERE' in base_query.upper()
+        self._en_bloques = None  # (posición en params, columna, valores, tamaño) de add_in_filter
     
     def add_filter(self, column, value, operator='='):
         """
@@ -44,26 +92,124 @@ class QueryBuilder:
         
         return self
     
-    def add_date_filter(self, column, fecha_desde=None, fecha_hasta=None):
+    def add_in_filter(self, column, values, chunk_size=None):
         """
-        Agrega filtros de rango de fechas
+        Agrega un filtro column IN (...)
+        
+        Con chunk_size y más valores que ese tamaño, build_chunks() da una
+        sentencia por bloque de valores (listas de miles de valores hacen lento
+        el parseo y el plan de MySQL); build() sigue dando una sola con todos.
+        Solo un IN por builder puede ir en bloques.
+        
+        Args:
+            column (str): Nombre de la columna
+            values (list): Valores permitidos; vacía = ningún registro coincide
+            chunk_size (int): Valores por sentencia en build_chunks(), ej.
+                              TAMANO_BLOQUE_IN (None = sin bloques)
+            
+        Returns:
+            self: Para encadenamiento
+        """
+        if values is not None:
+            if self.has_where:
+                self.query += " AND"
+            else:
+                self.query += " WHERE"
+                self.has_where = True
+            
+            values = list(values)
+            if not values:
+                self.query += " 1 = 0"
+            elif chunk_size and len(values) > chunk_size:
+                if self._en_bloques:
+                    raise ValueError("Solo un filtro IN por query puede ir en bloques")
+                self.query += f" {_MARCA_IN}"
+                self._en_bloques = (len(self.params), column, values, chunk_size)
+            else:
+                self.query += f" {column} IN ({', '.join(['%s'] * len(values))})"
+                self.params.extend(values)
+        
+        return self
+    
+    def add_date_filter(self, column, fecha_desde=None, fecha_hasta=None, tipo='datetime'):
+        """
+        Agrega filtros de rango de fechas (días completos, ambos inclusive)
+        
+        Compara la columna directamente en lugar de DATE(column), así usa los
+        índices de la columna y permite la poda de particiones:
+        - 'date': column >= desde AND column <= hasta
+        - 'datetime' / 'timestamp': column >= desde AND column < hasta + 1 día
+          (incluye todo el último día; también es correcto sobre DATE)
         
         Args:
             column (str): Nombre de la columna de fecha
-            fecha_desde (str): Fecha inicio
-            fecha_hasta (str): Fecha fin
+            fecha_desde (str|date): Fecha inicio (YYYY-MM-DD)
+            fecha_hasta (str|date): Fecha fin (YYYY-MM-DD)
+            tipo (str): Tipo de la columna: 'date', 'datetime' o 'timestamp'
             
         Returns:
             self: Para encadenamiento
         """
+        if tipo not in self.TIPOS_FECHA:
+            raise ValueError(f"Tipo de columna de fecha no soportado: {tipo}")
+        
         if fecha_desde:
-            self.add_filter(f"DATE({column})", fecha_desde, '>=')
+            self.add_filter(column, date.fromisoformat(str(fecha_desde)[:10]), '>=')
         
         if fecha_hasta:
-            self.add_filter(f"DATE({column})", fecha_hasta, '<=')
+            hasta = date.fromisoformat(str(fecha_hasta)[:10])
+            if tipo == 'date':
+                self.add_filter(column, hasta, '<=')
+            else:
+                self.add_filter(column, hasta + timedelta(days=1), '<')
         
         return self
     
+    def add_keyset(self, columns, values=None, descending=False):
+        """
+        Agrega paginación por keyset (seek): filas después de values y ORDER BY columns
+        
+        Con un índice sobre columns (o sobre sus primeras), la página 10,000
+        cuesta lo mismo que la primera (no lee y descarta filas como OFFSET).
+        Va al final, como add_order_by; después solo add_limit().
+        
+        Args:
+            columns (list): Columnas del orden; la última debe ser única (ej. id)
+            values (list): Valores de la última fila de la página anterior
+                           (None = primera página)
+            descending (bool): Orden DESC
+            
+        Returns:
+            self: Para encadenamiento
+        """
+        if values is not None:
+            condicion, params = condicion_keyset(columns, values, descending)
+            if self.has_where:
+                self.query += " AND"
+            else:
+                self.query += " WHERE"
+                self.has_where = True
+            self.query += f" ({condicion})"
+            self.params.extend(params)
+        
+        direction = 'DESC' if descending else 'ASC'
+        self.query += " ORDER BY " + ", ".join(f"{column} {direction}" for column in columns)
+        return self
+    
+    @staticmethod
+    def keyset_values(row, columns):
+        """
+        Valores de la llave keyset de una fila (para la página siguiente)
+        
+        Args:
+            row (dict): Última fila de la página
+            columns (list): Columnas pasadas a add_keyset
+            
+        Returns:
+            list: Valores en el orden de columns
+        """
+        return [row[column.split('.')[-1]] for column in columns]
+    
     def add_order_by(self, column, direction='ASC'):
         """
         Agrega ORDER BY
@@ -134,4 +280,31 @@ class QueryBuilder:
         Returns:
             tuple: (query, params)
         """
-        return self.query, tuple(self.params)
+        if not self._en_bloques:
+            return self.query, tuple(self.params)
+        
+        posicion, column, values, _ = self._en_bloques
+        return self._con_in(posicion, column, values)
+    
+    def build_chunks(self):
+        """
+        Construye una query por bloque de valores del IN con chunk_size
+        
+        Para sentencias que se pueden repartir (DELETE/UPDATE por id, SELECT sin
+        ORDER BY/LIMIT global): el orden y el LIMIT aplican a cada bloque.
+        
+        Returns:
+            list: [(query, params), ...]; una sola si no hay IN en bloques
+        """
+        if not self._en_bloques:
+            return [self.build()]
+        
+        posicion, column, values, chunk_size = self._en_bloques
+        return [
+            self._con_in(posicion, column, values[inicio:inicio + chunk_size])
+            for inicio in range(0, len(values), chunk_size)
+        ]
+    
+    def _con_in(self, posicion, column, values):
+        query = self.query.replace(_MARCA_IN, f"{column} IN ({', '.join(['%s'] * len(values))})")
+        return query, tuple(self.params[:posicion] + list(values) + self.params[posicion:])
@@ -2,10 +2,13 @@
 Ejecutor de queries SQL
 Responsabilidad única: ejecutar consultas SQL personalizadas
 Soporta múltiples conexiones de base de datos
+Cada ejecución se registra en query_metrics (conteo, tiempo, queries lentas)
 """
+import time
 import pymysql
-from pymysql.cursors import DictCursor
+from pymysql.cursors import DictCursor, SSDictCursor
 from app.core.database.connection import db_connection, db_sync_connection
+from app.core.database.query_metrics import metricas_queries
 
 
 class QueryExecutor:
@@ -19,6 +22,7 @@ class QueryExecutor:
             connection: DatabaseConnection instance (default: db_connection)
         """
         self.connection = connection or db_connection
+        self._base = getattr(self.connection, 'db_type', 'sistema')
     
     def ejecutar(self, query, params=None):
         """
@@ -31,6 +35,7 @@ class QueryExecutor:
         Returns:
             tuple: (resultados, error)
         """
+        inicio = time.perf_counter()
         try:
             with self.connection.get_connection() as conn:
                 with conn.cursor(DictCursor) as cursor:
@@ -46,6 +51,114 @@ class QueryExecutor:
                         
         except Exception as e:
             return None, str(e)
+        finally:
+            metricas_queries.registrar_query(query, time.perf_counter() - inicio, base=self._base)
+    
+    def insertar(self, query, params=None):
+        """
+        Ejecuta un INSERT y retorna el id AUTO_INCREMENT que generó
+        
+        El id se toma del cursor del mismo INSERT (LAST_INSERT_ID de esa
+        conexión): un SELECT MAX(id) posterior puede ir por otra conexión del
+        pool y ver la fila de otro proceso.
+        
+        Args:
+            query (str): Query INSERT
+            params (tuple/dict): Parámetros para la query
+            
+        Returns:
+            tuple: (id insertado, error)
+        """
+        inicio = time.perf_counter()
+        try:
+            with self.connection.get_connection() as conn:
+                with conn.cursor(DictCursor) as cursor:
+                    cursor.execute(query, params or ())
+                    return cursor.lastrowid, None
+        except Exception as e:
+            return None, str(e)
+        finally:
+            metricas_queries.registrar_query(query, time.perf_counter() - inicio, base=self._base)
+    
+    def explicar(self, query, params=None):
+        """
+        Plan de ejecución de un SELECT (EXPLAIN)
+        
+        Args:
+            query (str): Query SELECT
+            params (tuple/dict): Parámetros para la query
+            
+        Returns:
+            tuple: (filas de EXPLAIN: una por tabla con table, type, key, rows, Extra; error)
+        """
+        try:
+            with self.connection.get_connection() as conn:
+                with conn.cursor(DictCursor) as cursor:
+                    cursor.execute(f"EXPLAIN {query.strip()}", params or ())
+                    return cursor.fetchall(), None
+        except Exception as e:
+            return None, str(e)
+    
+    def usa_indice(self, query, params, indices, tabla=None):
+        """
+        Comprueba que el plan de una query use el índice esperado (pruebas y benchmarks)
+        
+        Uso: usa, error = query_executor.usa_indice(query, params, 'idx_trabajador_fecha')
+             assert usa, error
+        
+        Args:
+            query (str): Query SELECT
+            params (tuple/dict): Parámetros para la query
+            indices (str|list): Nombre del índice o nombres aceptados
+            tabla (str): Solo el paso del plan sobre esta tabla (None = cualquiera)
+            
+        Returns:
+            tuple: (True si lo usa, error o descripción del plan si no)
+        """
+        plan, error = self.explicar(query, params)
+        if error:
+            return False, f"Error en EXPLAIN: {error}"
+        
+        aceptados = {indices} if isinstance(indices, str) else set(indices)
+        pasos = [paso for paso in plan if tabla is None or paso.get('table') == tabla]
+        if any(paso.get('key') in aceptados for paso in pasos):
+            return True, None
+        
+        usados = ', '.join(f"{paso.get('table')}: {paso.get('key') or 'sin índice'}" for paso in pasos)
+        return False, f"Se esperaba {' o '.join(sorted(aceptados))}; el plan usa {usados or 'nada'}"
+    
+    def ejecutar_stream(self, query, params=None, tamano_lote=1000):
+        """
+        Ejecuta un SELECT y entrega las filas conforme llegan del servidor
+        
+        Usa un cursor del lado del servidor (SSDictCursor): el resultado no se
+        carga completo en memoria. La conexión queda abierta mientras se consume
+        el generador, así que el consumidor no debe hacer trabajo lento por fila.
+        
+        Args:
+            query (str): Query SELECT
+            params (tuple/dict): Parámetros para la query
+            tamano_lote (int): Filas leídas por viaje al servidor
+            
+        Yields:
+            dict: Una fila
+            
+        Raises:
+            Exception: Errores de conexión o de la query (un generador no
+                       puede devolver la tupla (resultados, error))
+        """
+        inicio = time.perf_counter()
+        try:
+            with self.connection.get_connection() as conn:
+                with conn.cursor(SSDictCursor) as cursor:
+                    cursor.execute(query, params or ())
+                    while True:
+                        filas = cursor.fetchmany(tamano_lote)
+                        if not filas:
+                            break
+                        yield from filas
+        finally:
+            metricas_queries.registrar_query(query, time.perf_counter() - inicio, base=self._base)
     
     def ejecutar_batch(self, query, params_list, ignore_duplicates=True):
         """
@@ -63,6 +176,7 @@ class QueryExecutor:
         if not params_list:
             return 0, "No hay datos para procesar"
         
+        inicio = time.perf_counter()
         try:
             with self.connection.get_connection() as conn:
                 with conn.cursor() as cursor:
@@ -84,6 +198,8 @@ class QueryExecutor:
                     
         except Exception as e:
             return 0, str(e)
+        finally:
+            metricas_queries.registrar_query(query, time.perf_counter() - inicio, len(params_list), self._base)
 
 
 # Instancias singleton para cada tipo de BD
@@ -0,0 +1,213 @@
+"""
+Instrumentación de queries SQL
+Responsabilidad única: contar y medir las queries que ejecuta QueryExecutor
+
+- Por request (flask.g): número de queries, tiempo acumulado en BD y huellas repetidas
+- Queries lentas: se registran en el log con su huella normalizada
+  (literales y placeholders -> ?, listas IN colapsadas)
+- Agregado por endpoint y por huella dentro del proceso, para /metrics/db
+- Contadores e histogramas Prometheus (app/core/metricas.py), para /metrics
+
+Las respuestas en streaming (SSE, PDFs grandes) consultan la BD después de
+after_request: esas queries cuentan en el agregado por huella pero no en los
+encabezados de la respuesta.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Dict
+
+from flask import g, has_request_context, request
+
+from app.config.database_config import DatabaseConfig
+from app.core.metricas import DB_CONEXIONES, DB_DURACION, DB_QUERIES, HTTP_DURACION, HTTP_PETICIONES
+
+logger = logging.getLogger(__name__)
+
+# Huellas distintas que se conservan; el resto se acumula en OTRAS_HUELLAS
+MAX_HUELLAS = 300
+OTRAS_HUELLAS = '(otras)'
+
+_CADENA = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_PLACEHOLDER = re.compile(r'%\(\w+\)s|%s')
+_NUMERO = re.compile(r'\b\d+(?:\.\d+)?\b')
+_LISTA_IN = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_VALUES = re.compile(r'\bVALUES\s*(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*', re.IGNORECASE)
+_ESPACIOS = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=1024)
+def huella_sql(query: str) -> str:
+    """
+    Normaliza una query para agrupar las que solo difieren en valores
+
+    Ejemplo:
+        "SELECT * FROM bitacora WHERE num_trabajador IN (%s, %s, %s) AND fecha >= '2025-01-01'"
+        -> "SELECT * FROM bitacora WHERE num_trabajador IN (...) AND fecha >= ?"
+    """
+    huella = _CADENA.sub('?', query)
+    huella = _PLACEHOLDER.sub('?', huella)
+    huella = _NUMERO.sub('?', huella)
+    huella = _LISTA_IN.sub('IN (...)', huella)
+    huella = _VALUES.sub(r'VALUES \1', huella)
+    return _ESPACIOS.sub(' ', huella).strip()
+
+
+def _nuevo_endpoint() -> Dict:
+    return {
+        'requests': 0,
+        'queries': 0,
+        'queries_max': 0,
+        'db_ms': 0.0,
+        'db_ms_max': 0.0,
+        'request_ms': 0.0,
+        'request_ms_max': 0.0,
+    }
+
+
+class MetricasQueries:
+    """Acumula métricas de queries por request, por endpoint y por huella"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints: Dict[str, Dict] = {}
+        self.huellas: Dict[str, Dict] = {}
+        self.desde = time.time()
+
+    # ------------------------------------------
+    # Queries
+    # ------------------------------------------
+
+    def registrar_query(self, query: str, duracion_s: float, cantidad: int = 1, base: str = 'sistema'):
+        """
+        Registra una ejecución de QueryExecutor
+
+        Args:
+            query: SQL tal como se envió al cursor
+            duracion_s: Tiempo total (conexión + ejecución + fetch)
+            cantidad: Sentencias ejecutadas (ejecutar_batch ejecuta una por registro)
+            base: Tipo de BD de la conexión ('sistema' o 'sync')
+        """
+        huella = huella_sql(query)
+        duracion_ms = duracion_s * 1000
+
+        with self._lock:
+            if huella not in self.huellas and len(self.huellas) >= MAX_HUELLAS:
+                huella_agregada = OTRAS_HUELLAS
+            else:
+                huella_agregada = huella
+            stats = self.huellas.setdefault(huella_agregada, {'ejecuciones': 0, 'queries': 0, 'ms': 0.0, 'ms_max': 0.0})
+            stats['ejecuciones'] += 1
+            stats['queries'] += cantidad
+            stats['ms'] += duracion_ms
+            stats['ms_max'] = max(stats['ms_max'], duracion_ms)
+
+        endpoint = None
+        if has_request_context() and 'db_queries' in g:
+            g.db_queries += cantidad
+            g.db_tiempo_s += duracion_s
+            g.db_huellas[huella] += cantidad
+            endpoint = request.endpoint
+
+        DB_QUERIES.inc(cantidad, base=base, endpoint=endpoint or '(fuera de request)')
+        DB_CONEXIONES.inc(base=base)
+        DB_DURACION.observar(duracion_s, base=base)
+
+        if duracion_ms >= DatabaseConfig.SLOW_QUERY_MS:
+            logger.warning("Query lenta: %.1f ms (%s sentencias) [%s] %s", duracion_ms, cantidad, endpoint or '-', huella)
+
+    # ------------------------------------------
+    # Requests (hooks de Flask)
+    # ------------------------------------------
+
+    def iniciar_request(self):
+        """before_request: reinicia los contadores del request actual"""
+        g.db_queries = 0
+        g.db_tiempo_s = 0.0
+        g.db_huellas = Counter()
+        g.request_inicio = time.perf_counter()
+
+    def finalizar_request(self, response):
+        """after_request: agrega el request al endpoint y emite encabezados X-DB-* / Server-Timing"""
+        if 'db_queries' not in g:
+            return response
+
+        queries = g.db_queries
+        db_ms = g.db_tiempo_s * 1000
+        request_ms = (time.perf_counter() - g.request_inicio) * 1000
+        endpoint = request.endpoint or '(sin endpoint)'
+
+        HTTP_PETICIONES.inc(endpoint=endpoint, metodo=request.method, codigo=response.status_code)
+        HTTP_DURACION.observar(request_ms / 1000, endpoint=endpoint)
+
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, _nuevo_endpoint())
+            stats['requests'] += 1
+            stats['queries'] += queries
+            stats['queries_max'] = max(stats['queries_max'], queries)
+            stats['db_ms'] += db_ms
+            stats['db_ms_max'] = max(stats['db_ms_max'], db_ms)
+            stats['request_ms'] += request_ms
+            stats['request_ms_max'] = max(stats['request_ms_max'], request_ms)
+
+        # Con QUERIES_POR_REQUEST_ALERTA=0 también llegan requests sin queries
+        if queries >= DatabaseConfig.QUERIES_POR_REQUEST_ALERTA and g.db_huellas:
+            huella, repeticiones = g.db_huellas.most_common(1)[0]
+            logger.warning(
+                "Request %s %s ejecutó %s queries (%.1f ms en BD); la más repetida (%s veces): %s",
+                request.method, endpoint, queries, db_ms, repeticiones, huella
+            )
+
+        response.headers['X-DB-Queries'] = str(queries)
+        response.headers['X-DB-Time'] = f"{db_ms:.1f}"
+        response.headers.add(
+            'Server-Timing', f'db;dur={db_ms:.1f};desc="{queries} queries", app;dur={request_ms:.1f}'
+        )
+        return response
+
+    # ------------------------------------------
+    # Consulta
+    # ------------------------------------------
+
+    def resumen(self, max_huellas: int = 20) -> Dict:
+        """
+        Estadísticas agregadas del proceso
+
+        Returns:
+            dict: {'desde', 'endpoints': {endpoint: stats}, 'huellas': [top por tiempo total]}
+        """
+        with self._lock:
+            endpoints = {nombre: dict(stats) for nombre, stats in self.endpoints.items()}
+            huellas = [{'huella': huella, **stats} for huella, stats in self.huellas.items()]
+
+        for stats in endpoints.values():
+            n = stats['requests'] or 1
+            stats['queries_promedio'] = round(stats['queries'] / n, 2)
+            stats['db_ms_promedio'] = round(stats['db_ms'] / n, 2)
+            stats['request_ms_promedio'] = round(stats['request_ms'] / n, 2)
+            for clave in ('db_ms', 'db_ms_max', 'request_ms', 'request_ms_max'):
+                stats[clave] = round(stats[clave], 2)
+
+        huellas.sort(key=lambda h: h['ms'], reverse=True)
+        for stats in huellas:
+            stats['ms'] = round(stats['ms'], 2)
+            stats['ms_max'] = round(stats['ms_max'], 2)
+
+        return {
+            'desde': self.desde,
+            'endpoints': dict(sorted(endpoints.items(), key=lambda e: e[1]['db_ms'], reverse=True)),
+            'huellas': huellas[:max_huellas],
+        }
+
+    def reiniciar(self):
+        with self._lock:
+            self.endpoints.clear()
+            self.huellas.clear()
+            self.desde = time.time()
+
+
+# Instancia singleton (una por proceso/worker)
+metricas_queries = MetricasQueries()
@@ -0,0 +1,103 @@
+"""
+Configuración central de logging
+
+- Un logger por módulo: logger = logging.getLogger(__name__)
+- Formato perezoso: logger.debug("Fecha %s: %s", fecha, checadas)
+  (el mensaje solo se formatea si el nivel está habilitado)
+- Nivel configurable con la variable de entorno LOG_LEVEL (DEBUG, INFO, WARNING, ERROR)
+- Los handlers reales (stderr / archivo) corren en un hilo aparte detrás de una cola,
+  así las peticiones solo pagan el costo de encolar el registro
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from typing import Optional
+
+from app.config.app_config import Config
+
+FORMATO_LOG = '%(asctime)s [%(process)d] %(levelname)s %(name)s: %(message)s'
+
+# Estado del módulo (una configuración por proceso)
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _crear_handlers_destino() -> list:
+    """Crea los handlers que realmente escriben (se ejecutan en el hilo del listener)"""
+    formatter = logging.Formatter(FORMATO_LOG)
+
+    handlers = [logging.StreamHandler(sys.stderr)]
+    if Config.LOG_FILE:
+        handlers.append(logging.handlers.WatchedFileHandler(Config.LOG_FILE, encoding='utf-8'))
+
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def _reiniciar_listener_en_hijo():
+    """
+    Reinicia el listener después de un fork
+
+    Gunicorn con --preload crea la app en el proceso maestro; el hilo del listener
+    no sobrevive al fork, así que cada worker necesita su propia cola e hilo.
+    """
+    global _listener
+
+    if _queue_handler is None or _listener is None:
+        return
+
+    nueva_cola = queue.SimpleQueue()
+    _queue_handler.queue = nueva_cola
+    _listener = logging.handlers.QueueListener(
+        nueva_cola, *_listener.handlers, respect_handler_level=True
+    )
+    _listener.start()
+
+
+def _detener_listener():
+    """Vacía la cola pendiente al terminar el proceso"""
+    if _listener is not None:
+        try:
+            _listener.stop()
+        except Exception:
+            pass
+
+
+def configurar_logging(nivel: Optional[str] = None, destinos: Optional[list] = None) -> None:
+    """
+    Configura el logger raíz con un QueueHandler
+
+    Es idempotente: llamadas posteriores solo ajustan el nivel.
+
+    Args:
+        nivel: Nivel de log (default: Config.LOG_LEVEL / variable LOG_LEVEL)
+        destinos: Handlers que escriben los registros (default: stderr y LOG_FILE)
+    """
+    global _queue_handler, _listener
+
+    nivel = (nivel or Config.LOG_LEVEL).upper()
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, nivel, logging.INFO))
+
+    if _queue_handler is not None:
+        return
+
+    cola = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(cola)
+    _listener = logging.handlers.QueueListener(
+        cola, *(destinos or _crear_handlers_destino()), respect_handler_level=True
+    )
+
+    # Reemplazar handlers previos (basicConfig, etc.) para no escribir dos veces
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+
+    _listener.start()
+    atexit.register(_detener_listener)
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_reiniciar_listener_en_hijo)
@@ -0,0 +1,361 @@
+"""
+Métricas estilo Prometheus compartidas entre procesos
+Responsabilidad única: acumular contadores/histogramas y exponerlos en formato texto
+
+Gunicorn corre varios workers; cada proceso acumula en memoria y vuelca sus
+valores a METRICS_DIR/<pid>-<inicio>.json (hilo en segundo plano, a lo más una
+vez por METRICS_FLUSH_SEGUNDOS). Al exponer, se suman los archivos de todos los
+procesos. Los archivos de procesos que ya terminaron se consolidan en
+acumulado.json para que los contadores no retrocedan al reiniciar un worker.
+
+Uso:
+    DESCARGAS = Contador('tecnotime_x_total', 'Ayuda', ('checador',))
+    DESCARGAS.inc(checador='CLN123')
+    DURACION = Histograma('tecnotime_x_seconds', 'Ayuda', ('checador',), BUCKETS_LENTOS)
+    DURACION.observar(3.2, checador='CLN123')
+"""
+import atexit
+import fcntl
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from app.config.app_config import Config
+
+logger = logging.getLogger(__name__)
+
+# Buckets (segundos) para distintos órdenes de magnitud
+BUCKETS_HTTP = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BUCKETS_DB = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+BUCKETS_LENTOS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+ARCHIVO_ACUMULADO = 'acumulado.json'
+ARCHIVO_LOCK = '.lock'
+
+
+class _Metrica:
+    """Base de Contador e Histograma"""
+    tipo = ''
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = (), registro=None):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self.registro = registro or registro_metricas
+        self.registro.registrar(self)
+
+    def _clave(self, etiquetas: Dict) -> Tuple[str, ...]:
+        return tuple(str(etiquetas.get(e, '')) for e in self.etiquetas)
+
+
+class Contador(_Metrica):
+    """Valor que solo crece (peticiones, registros, segundos acumulados)"""
+    tipo = 'counter'
+
+    def inc(self, valor: float = 1, **etiquetas):
+        self.registro.sumar(self.nombre, self._clave(etiquetas), valor)
+
+
+class Histograma(_Metrica):
+    """Distribución de observaciones en buckets acumulativos (con suma y conteo)"""
+    tipo = 'histogram'
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = BUCKETS_HTTP, registro=None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(nombre, ayuda, etiquetas, registro)
+
+    def observar(self, valor: float, **etiquetas):
+        self.registro.observar(self, self._clave(etiquetas), valor)
+
+    @contextmanager
+    def medir(self, **etiquetas):
+        """Observa la duración del bloque"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(time.perf_counter() - inicio, **etiquetas)
+
+
+class RegistroMetricas:
+    """Valores del proceso actual + volcado/lectura de los archivos compartidos"""
+
+    def __init__(self, directorio: str, intervalo_volcado: float = 1.0):
+        self.directorio = directorio
+        self.intervalo_volcado = intervalo_volcado
+        self.metricas: Dict[str, _Metrica] = {}
+        self._reiniciar_proceso()
+
+    def _reiniciar_proceso(self):
+        """Estado propio del proceso (se llama también en cada worker tras el fork)"""
+        self._lock = threading.Lock()
+        self._lock_archivo = threading.Lock()
+        # Contadores: {nombre: {clave: valor}}; histogramas: {nombre: {clave: [buckets..., suma, conteo]}}
+        self._valores: Dict[str, Dict[Tuple[str, ...], object]] = {}
+        self._sucio = False
+        self._hilo: Optional[threading.Thread] = None
+        self._pid = os.getpid()
+        self._archivo = os.path.join(self.directorio, f'{self._pid}-{int(time.time() * 1000)}.json')
+
+    def registrar(self, metrica: _Metrica):
+        self.metricas[metrica.nombre] = metrica
+
+    # ------------------------------------------
+    # Escritura (proceso actual)
+    # ------------------------------------------
+
+    def sumar(self, nombre: str, clave: Tuple[str, ...], valor: float):
+        with self._lock:
+            serie = self._valores.setdefault(nombre, {})
+            serie[clave] = serie.get(clave, 0) + valor
+            self._marcar_sucio()
+
+    def observar(self, histograma: Histograma, clave: Tuple[str, ...], valor: float):
+        with self._lock:
+            serie = self._valores.setdefault(histograma.nombre, {})
+            datos = serie.get(clave)
+            if datos is None:
+                datos = serie[clave] = [0] * (len(histograma.buckets) + 2)
+            for i, limite in enumerate(histograma.buckets):
+                if valor <= limite:
+                    datos[i] += 1
+            datos[-2] += valor
+            datos[-1] += 1
+            self._marcar_sucio()
+
+    def _marcar_sucio(self):
+        """Llamar con _lock tomado: arranca el hilo de volcado si este proceso no lo tiene"""
+        self._sucio = True
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._bucle_volcado, name='metricas-volcado', daemon=True)
+            self._hilo.start()
+
+    def _bucle_volcado(self):
+        while True:
+            time.sleep(self.intervalo_volcado)
+            self.volcar()
+
+    def volcar(self):
+        """Escribe los valores del proceso a su archivo (reemplazo atómico)"""
+        with self._lock_archivo:
+            with self._lock:
+                if not self._sucio:
+                    return
+                contenido = self._a_filas(self._valores)
+                self._sucio = False
+
+            try:
+                os.makedirs(self.directorio, exist_ok=True)
+                temporal = f'{self._archivo}.tmp'
+                with open(temporal, 'w', encoding='utf-8') as f:
+                    json.dump(contenido, f)
+                os.replace(temporal, self._archivo)
+            except OSError as e:
+                logger.warning("No se pudieron volcar métricas a %s: %s", self._archivo, e)
+
+    # ------------------------------------------
+    # Lectura (todos los procesos)
+    # ------------------------------------------
+
+    @staticmethod
+    def _proceso_vivo(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    @staticmethod
+    def _leer(ruta: str) -> Dict:
+        try:
+            with open(ruta, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _fusionar(destino: Dict, origen: Dict):
+        """Suma los valores de origen en destino ({nombre: {clave: valor}})"""
+        for nombre, filas in origen.items():
+            serie = destino.setdefault(nombre, {})
+            for clave, valor in filas:
+                clave = tuple(clave)
+                previo = serie.get(clave)
+                if previo is None:
+                    serie[clave] = list(valor) if isinstance(valor, list) else valor
+                elif isinstance(valor, list):
+                    if len(previo) == len(valor):
+                        serie[clave] = [a + b for a, b in zip(previo, valor)]
+                else:
+                    serie[clave] = previo + valor
+
+    @staticmethod
+    def _a_filas(valores: Dict) -> Dict:
+        """{nombre: {clave: valor}} -> {nombre: [[clave, valor], ...]} (serializable a JSON)"""
+        return {
+            nombre: [[list(clave), list(valor) if isinstance(valor, list) else valor] for clave, valor in serie.items()]
+            for nombre, serie in valores.items()
+        }
+
+    def recolectar(self) -> Dict[str, Dict[Tuple[str, ...], object]]:
+        """Suma los valores de todos los procesos (vivos y terminados)"""
+        self.volcar()
+        os.makedirs(self.directorio, exist_ok=True)
+        ruta_acumulado = os.path.join(self.directorio, ARCHIVO_ACUMULADO)
+        total: Dict[str, Dict] = {}
+
+        with open(os.path.join(self.directorio, ARCHIVO_LOCK), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                acumulado = {}
+                self._fusionar(acumulado, self._leer(ruta_acumulado))
+                consolidados = []
+
+                for archivo in os.listdir(self.directorio):
+                    if not archivo.endswith('.json') or archivo == ARCHIVO_ACUMULADO:
+                        continue
+                    ruta = os.path.join(self.directorio, archivo)
+                    try:
+                        pid = int(archivo.split('-', 1)[0])
+                    except ValueError:
+                        continue
+                    datos = self._leer(ruta)
+                    if pid != self._pid and not self._proceso_vivo(pid):
+                        self._fusionar(acumulado, datos)
+                        consolidados.append(ruta)
+                    else:
+                        self._fusionar(total, datos)
+
+                if consolidados:
+                    temporal = f'{ruta_acumulado}.tmp'
+                    with open(temporal, 'w', encoding='utf-8') as f:
+                        json.dump(self._a_filas(acumulado), f)
+                    os.replace(temporal, ruta_acumulado)
+                    for ruta in consolidados:
+                        os.unlink(ruta)
+                    logger.debug("Métricas de %s procesos terminados consolidadas", len(consolidados))
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+        self._fusionar(total, self._a_filas(acumulado))
+        return total
+
+    def exponer(self) -> str:
+        """Formato de exposición de texto de Prometheus (version=0.0.4)"""
+        valores = self.recolectar()
+        lineas: List[str] = []
+
+        for nombre, metrica in sorted(self.metricas.items()):
+            lineas.append(f'# HELP {nombre} {metrica.ayuda}')
+            lineas.append(f'# TYPE {nombre} {metrica.tipo}')
+            for clave, valor in sorted(valores.get(nombre, {}).items()):
+                etiquetas = list(zip(metrica.etiquetas, clave))
+                if metrica.tipo == 'counter':
+                    lineas.append(f'{nombre}{_formatear_etiquetas(etiquetas)} {_formatear_valor(valor)}')
+                    continue
+                for limite, conteo in zip(metrica.buckets, valor):
+                    le = [('le', _formatear_valor(limite))]
+                    lineas.append(f'{nombre}_bucket{_formatear_etiquetas(etiquetas + le)} {conteo}')
+                lineas.append(f'{nombre}_bucket{_formatear_etiquetas(etiquetas + [("le", "+Inf")])} {valor[-1]}')
+                lineas.append(f'{nombre}_sum{_formatear_etiquetas(etiquetas)} {_formatear_valor(valor[-2])}')
+                lineas.append(f'{nombre}_count{_formatear_etiquetas(etiquetas)} {valor[-1]}')
+
+        return '\n'.join(lineas) + '\n'
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _formatear_etiquetas(etiquetas) -> str:
+    if not etiquetas:
+        return ''
+    return '{' + ','.join(f'{nombre}="{_escapar(valor)}"' for nombre, valor in etiquetas) + '}'
+
+
+def _formatear_valor(valor: float) -> str:
+    if isinstance(valor, float) and math.isinf(valor):
+        return '+Inf'
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return repr(valor)
+
+
+# Instancia singleton (un archivo por proceso dentro del directorio compartido)
+registro_metricas = RegistroMetricas(Config.METRICS_DIR, Config.METRICS_FLUSH_SEGUNDOS)
+os.register_at_fork(after_in_child=registro_metricas._reiniciar_proceso)
+atexit.register(registro_metricas.volcar)
+
+
+# ============================================
+# MÉTRICAS DE LA APLICACIÓN
+# ============================================
+
+HTTP_PETICIONES = Contador(
+    'tecnotime_http_requests_total', 'Peticiones HTTP atendidas', ('endpoint', 'metodo', 'codigo')
+)
+HTTP_DURACION = Histograma(
+    'tecnotime_http_request_duration_seconds', 'Latencia de peticiones HTTP por endpoint',
+    ('endpoint',), BUCKETS_HTTP
+)
+
+DB_QUERIES = Contador(
+    'tecnotime_db_queries_total', 'Sentencias SQL ejecutadas por endpoint', ('base', 'endpoint')
+)
+DB_CONEXIONES = Contador(
+    'tecnotime_db_connections_total', 'Conexiones abiertas (QueryExecutor abre una por ejecución)', ('base',)
+)
+DB_DURACION = Histograma(
+    'tecnotime_db_query_duration_seconds', 'Duración de ejecuciones de QueryExecutor (conexión + query + fetch)',
+    ('base',), BUCKETS_DB
+)
+
+CHECADOR_DESCARGA_DURACION = Histograma(
+    'tecnotime_checador_descarga_duration_seconds', 'Duración de la descarga de asistencias de un checador',
+    ('checador',), BUCKETS_LENTOS
+)
+CHECADOR_REGISTROS = Contador(
+    'tecnotime_checador_registros_total', 'Registros de asistencia descargados por checador', ('checador',)
+)
+CHECADOR_ERRORES = Contador(
+    'tecnotime_checador_errores_total', 'Operaciones fallidas con checadores', ('checador', 'operacion')
+)
+CHECADOR_CONEXIONES = Contador(
+    'tecnotime_checador_conexiones_total', 'Conexiones abiertas a checadores (nueva, reconexion)',
+    ('checador', 'motivo')
+)
+
+IMPORTACION_REGISTROS = Contador(
+    'tecnotime_importacion_registros_total', 'Registros procesados por importaciones/migraciones',
+    ('tipo', 'resultado')
+)
+IMPORTACION_SEGUNDOS = Contador(
+    'tecnotime_importacion_seconds_total', 'Tiempo acumulado de importaciones/migraciones (throughput = registros / segundos)',
+    ('tipo',)
+)
+
+SMTP_DURACION = Histograma(
+    'tecnotime_smtp_envio_duration_seconds', 'Latencia de envío SMTP (envío, más conexión + login si no hay sesión abierta)',
+    ('resultado',), BUCKETS_LENTOS
+)
+SMTP_CONEXIONES = Contador(
+    'tecnotime_smtp_conexiones_total', 'Sesiones SMTP abiertas por el pool (nueva, reconexion)', ('motivo',)
+)
+
+CORREO_BANDEJA = Contador(
+    'tecnotime_correo_bandeja_total', 'Correos de la bandeja de salida (encolado, enviado, reintento, fallido)',
+    ('resultado',)
+)
+
+CACHE_DISCO = Contador(
+    'tecnotime_cache_disco_total', 'Operaciones de cachés en disco (acierto, fallo, guardado, expulsado)',
+    ('cache', 'resultado')
+)
@@ -0,0 +1,210 @@
+"""
+Pool de sesiones SMTP autenticadas
+Responsabilidad única: reutilizar conexiones SMTP (STARTTLS + login) entre envíos
+
+- Hasta `tamano` sesiones abiertas; una sesión la usa un envío a la vez
+- Las sesiones inactivas más de `max_inactiva` segundos se cierran antes de
+  usarlas (los servidores cortan las conexiones ociosas)
+- Si el servidor desconecta, responde 421 o la conexión vence, se abre una
+  sesión nueva y el mensaje se reintenta una vez
+- Los envíos se espacian para no pasar de `por_minuto` correos por minuto
+  (límite por proceso: cada worker de gunicorn tiene su propio pool)
+"""
+import logging
+import queue
+import smtplib
+import threading
+import time
+from email.message import Message
+from typing import Callable, List
+
+from app.config.smtp_config import (
+    SMTP_CONFIG,
+    SMTP_CORREOS_POR_MINUTO,
+    SMTP_SESION_MAX_INACTIVA,
+    SMTP_SESIONES,
+    SMTP_TIMEOUT
+)
+from app.core.metricas import SMTP_CONEXIONES, SMTP_DURACION
+
+logger = logging.getLogger(__name__)
+
+# Errores tras los cuales la sesión ya no sirve pero el mensaje puede reintentarse
+ERRORES_CONEXION = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+CODIGO_SERVICIO_NO_DISPONIBLE = 421
+# Respuestas de error del servidor a un mensaje concreto (la sesión sigue abierta salvo 421)
+ERRORES_DEL_MENSAJE = (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException)
+
+
+class LimitadorTasa:
+    """Espacia llamadas para no pasar de `por_minuto` (0 = sin límite)"""
+
+    def __init__(self, por_minuto: int):
+        self.intervalo = 60.0 / por_minuto if por_minuto else 0.0
+        self._siguiente = 0.0
+        self._lock = threading.Lock()
+
+    def esperar(self):
+        """Bloquea hasta el siguiente turno libre"""
+        if not self.intervalo:
+            return
+
+        with self._lock:
+            ahora = time.monotonic()
+            turno = max(ahora, self._siguiente)
+            self._siguiente = turno + self.intervalo
+
+        if turno > ahora:
+            time.sleep(turno - ahora)
+
+
+class PoolSMTP:
+    """Sesiones SMTP autenticadas reutilizables"""
+
+    def __init__(
+        self,
+        config: dict,
+        tamano: int,
+        timeout: float,
+        max_inactiva: float,
+        por_minuto: int
+    ):
+        """
+        Args:
+            config: Datos del servidor (host, port, use_tls, username, password)
+            tamano: Máximo de sesiones abiertas a la vez
+            timeout: Timeout de socket de cada sesión (segundos)
+            max_inactiva: Segundos sin uso tras los que una sesión se descarta
+            por_minuto: Máximo de correos por minuto (0 = sin límite)
+        """
+        self.config = config
+        self.timeout = timeout
+        self.max_inactiva = max_inactiva
+        self.limitador = LimitadorTasa(por_minuto)
+        self._libres = queue.LifoQueue()  # (sesión, último uso); LIFO = la más reciente primero
+        self._cupos = threading.BoundedSemaphore(max(1, tamano))
+
+    def enviar(self, mensaje: Message):
+        """
+        Envía un mensaje por una sesión del pool
+
+        Raises:
+            smtplib.SMTPException / OSError: Si el envío falla (tras reintentar
+            una vez los errores de conexión)
+        """
+        self._ejecutar(lambda sesion: sesion.send_message(mensaje))
+
+    def enviar_crudo(self, remitente: str, destinatarios: List[str], datos: bytes):
+        """Envía un mensaje ya serializado (p. ej. leído de la bandeja de salida); mismos errores que enviar()"""
+        self._ejecutar(lambda sesion: sesion.sendmail(remitente, destinatarios, datos))
+
+    def _ejecutar(self, operacion: Callable[[smtplib.SMTP], object]):
+        self.limitador.esperar()
+
+        with self._cupos:
+            inicio = time.perf_counter()
+            try:
+                self._enviar(operacion)
+            except Exception:
+                SMTP_DURACION.observar(time.perf_counter() - inicio, resultado='error')
+                raise
+            SMTP_DURACION.observar(time.perf_counter() - inicio, resultado='ok')
+
+    def cerrar(self):
+        """Cierra las sesiones libres (las que están en uso se cierran al devolverlas si vencen)"""
+        while True:
+            try:
+                sesion, _ = self._libres.get_nowait()
+            except queue.Empty:
+                return
+            self._descartar(sesion)
+
+    # ------------------------------------------
+    # Sesiones
+    # ------------------------------------------
+
+    def _enviar(self, operacion: Callable[[smtplib.SMTP], object]):
+        for intento in range(2):
+            sesion = self._tomar() if intento == 0 else self._conectar('reconexion')
+            try:
+                operacion(sesion)
+            except Exception as e:
+                if isinstance(e, ERRORES_DEL_MENSAJE) and not self._es_reintentable(e):
+                    # Rechazo del remitente, destinatario o datos: smtplib ya hizo RSET
+                    self._devolver(sesion)
+                    raise
+                self._descartar(sesion)
+                if intento or not self._es_reintentable(e):
+                    raise
+                logger.warning("SMTP: sesión perdida (%s); reintentando con una nueva", e)
+            else:
+                self._devolver(sesion)
+                return
+
+    def _tomar(self) -> smtplib.SMTP:
+        """Sesión libre y vigente, o una nueva"""
+        while True:
+            try:
+                sesion, ultimo_uso = self._libres.get_nowait()
+            except queue.Empty:
+                return self._conectar('nueva')
+            if time.monotonic() - ultimo_uso <= self.max_inactiva:
+                return sesion
+            self._descartar(sesion)
+
+    def _conectar(self, motivo: str) -> smtplib.SMTP:
+        sesion = smtplib.SMTP(self.config['host'], self.config['port'], timeout=self.timeout)
+        try:
+            if self.config['use_tls']:
+                sesion.starttls()
+            if self.config.get('username'):
+                sesion.login(self.config['username'], self.config['password'])
+        except Exception:
+            self._descartar(sesion)
+            raise
+        SMTP_CONEXIONES.inc(motivo=motivo)
+        return sesion
+
+    def _devolver(self, sesion: smtplib.SMTP):
+        self._libres.put((sesion, time.monotonic()))
+
+    @staticmethod
+    def _descartar(sesion: smtplib.SMTP):
+        try:
+            sesion.quit()
+        except Exception:
+            sesion.close()
+
+    @staticmethod
+    def _es_reintentable(error: Exception) -> bool:
+        if isinstance(error, ERRORES_CONEXION):
+            return True
+        return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code == CODIGO_SERVICIO_NO_DISPONIBLE
+
+
+def es_error_temporal(error: Exception) -> bool:
+    """
+    True si vale la pena reintentar el envío más tarde
+
+    Temporales: conexión/timeout y respuestas 4xx. Permanentes: 5xx (destinatario
+    inexistente, mensaje rechazado, autenticación) y errores que no son de red.
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codigos = [codigo for codigo, _ in error.recipients.values()]
+        return bool(codigos) and all(400 <= codigo < 500 for codigo in codigos)
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPException):
+        return isinstance(error, smtplib.SMTPServerDisconnected)
+    # Red: conexión rechazada, timeout, DNS
+    return isinstance(error, OSError)
+
+
+# Instancia singleton (las sesiones se abren en el primer envío, no al importar)
+smtp_pool = PoolSMTP(
+    SMTP_CONFIG,
+    tamano=SMTP_SESIONES,
+    timeout=SMTP_TIMEOUT,
+    max_inactiva=SMTP_SESION_MAX_INACTIVA,
+    por_minuto=SMTP_CORREOS_POR_MINUTO
+)
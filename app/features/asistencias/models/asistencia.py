@@ -15,7 +15,7 @@ class Asistencia:
     fecha: str  # YYYY-MM-DD
     hora: str   # HH:MM:SS
     checador: str
-    nombre: Optional[str] = None  # Nombre del trabajador del checador
+    nombre: Optional[str] = None  # Nombre del trabajador (se resuelve al leer, no se guarda)
     id: Optional[int] = None
     
     def to_dict(self):
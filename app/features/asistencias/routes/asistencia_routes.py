@@ -2,6 +2,7 @@
 Rutas para el feature de asistencias
 Responsabilidad: mostrar asistencias de la base de datos
 """
+import logging
 from flask import Blueprint, render_template, flash, request, Response, jsonify, stream_with_context, session
 from app.features.asistencias.services.obtener_asistencias_use_case import obtener_asistencias_use_case
 from app.features.asistencias.services.importar_checadas_use_case import importar_checadas_use_case
@@ -12,6 +13,8 @@ import os
 import tempfile
 import pickle
 
+logger = logging.getLogger(__name__)
+
 # Crear blueprint
 asistencias_bp = Blueprint('asistencias', __name__, url_prefix='/asistencias')
 
@@ -33,7 +36,7 @@ def _save_to_cache(session_id: str, data: list) -> bool:
             pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
         return True
     except Exception as e:
-        print(f"Error guardando cache: {e}")
+        logger.error("Error guardando cache: %s", e)
         return False
 
 
@@ -45,7 +48,7 @@ def _load_from_cache(session_id: str) -> list:
             with open(cache_path, 'rb') as f:
                 return pickle.load(f)
     except Exception as e:
-        print(f"Error cargando cache: {e}")
+        logger.error("Error cargando cache: %s", e)
     return None
 
 
@@ -56,7 +59,7 @@ def _delete_cache(session_id: str):
         if os.path.exists(cache_path):
             os.remove(cache_path)
     except Exception as e:
-        print(f"Error eliminando cache: {e}")
+        logger.error("Error eliminando cache: %s", e)
 
 
 @asistencias_bp.route('/')
@@ -72,6 +75,12 @@ def index():
     page = request.args.get('page', 1, type=int)
     per_page = 50  # Registros por página
     
+    # Paginación por cursor (orden por id o fecha): llave de la fila de referencia
+    cursor = request.args.get('cursor', type=str)
+    direccion = request.args.get('direccion', 'siguiente')
+    if direccion not in ['siguiente', 'anterior']:
+        direccion = 'siguiente'
+    
     # Ordenación
     order_by = request.args.get('order_by', 'id')  # Campo por el cual ordenar
     order_dir = request.args.get('order_dir', 'desc')  # Dirección: asc o desc
@@ -94,27 +103,38 @@ def index():
         page=page,
         per_page=per_page,
         order_by=order_by,
-        order_dir=order_dir
+        order_dir=order_dir,
+        cursor=cursor,
+        direccion=direccion
     )
     
     if error:
         flash(f'Error al consultar: {error}', 'error')
-        resultado = {'asistencias': [], 'total': 0, 'page': 1, 'per_page': per_page}
+        resultado = {
+            'asistencias': [], 'total': 0, 'tipo_total': 'exacto', 'page': 1, 'per_page': per_page,
+            'paginacion': 'offset', 'has_prev': False, 'has_next': False,
+            'cursor_anterior': None, 'cursor_siguiente': None, 'archivo_hasta': None
+        }
     
-    # Calcular información de paginación
+    # Calcular información de paginación (con total estimado el número de páginas es aproximado)
     total_pages = math.ceil(resultado['total'] / resultado['per_page']) if resultado['total'] > 0 else 1
-    has_prev = resultado['page'] > 1
-    has_next = resultado['page'] < total_pages
+    if resultado['paginacion'] == 'cursor' and not cursor:
+        page = total_pages if direccion == 'anterior' else 1  # Última o primera página
     
     return render_template(
         'asistencias/index.html',
         asistencias=resultado['asistencias'],
         total=resultado['total'],
-        page=resultado['page'],
+        tipo_total=resultado['tipo_total'],
+        page=page,
         per_page=resultado['per_page'],
         total_pages=total_pages,
-        has_prev=has_prev,
-        has_next=has_next,
+        has_prev=resultado['has_prev'],
+        has_next=resultado['has_next'],
+        paginacion=resultado['paginacion'],
+        cursor_anterior=resultado['cursor_anterior'],
+        cursor_siguiente=resultado['cursor_siguiente'],
+        archivo_hasta=resultado['archivo_hasta'],
         num_trabajador_filter=num_trabajador,
         nombre_trabajador_filter=nombre_trabajador or '',
         checador_filter=checador or '',
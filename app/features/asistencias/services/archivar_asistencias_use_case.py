@@ -0,0 +1,115 @@
+"""
+Caso de uso: Archivar asistencias antiguas
+Responsabilidad: Mover las checadas de meses anteriores al horizonte
+(ARCHIVO_MESES) de la tabla asistencias a los archivos comprimidos por mes
+
+Por cada mes: lee las filas del mes, las agrega al archivo del mes
+(archivo_asistencias.escribir_mes, que lo vuelve a leer para comprobarlo) y
+solo entonces las borra de la tabla por id, en lotes. Si el proceso se
+interrumpe entre escribir y borrar, la siguiente corrida vuelve a tomar esas
+filas y el archivo no las duplica.
+
+Las consultas que llegan a meses archivados (listado de asistencias y bitácora)
+mezclan el archivo con la tabla; ver archivo_asistencias.
+"""
+import logging
+from datetime import date
+
+from app.config import asistencias_config
+from app.core.database.query_builder import QueryBuilder
+from app.core.database.query_executor import query_executor
+from app.features.asistencias.services.archivo_asistencias import archivo_asistencias
+from app.features.asistencias.services.particiones_asistencias_use_case import inicio_periodo, siguiente_periodo
+
+logger = logging.getLogger(__name__)
+
+
+def horizonte(hoy=None, meses=None):
+    """Primer día del mes más antiguo que se queda en la tabla"""
+    hoy = hoy or date.today()
+    meses = asistencias_config.ARCHIVO_MESES if meses is None else meses
+    indice = hoy.year * 12 + hoy.month - 1 - meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+class ArchivarAsistenciasUseCase:
+    """Mueve las checadas antiguas de asistencias al archivo frío"""
+
+    def ejecutar(self, antes_de=None):
+        """
+        Archiva los meses completos anteriores a antes_de
+
+        Args:
+            antes_de (date): Se archivan los meses que terminan antes de esta
+                             fecha (default: horizonte de ARCHIVO_MESES; nunca
+                             el mes actual)
+
+        Returns:
+            tuple: (lista de {'mes', 'filas', 'archivo'}, error)
+        """
+        if antes_de is None:
+            if asistencias_config.ARCHIVO_MESES <= 0:
+                return [], None
+            antes_de = horizonte()
+        limite = min(inicio_periodo(antes_de, 'mensual'), inicio_periodo(date.today(), 'mensual'))
+
+        resultado, error = query_executor.ejecutar(
+            "SELECT MIN(fecha) AS primera FROM asistencias WHERE fecha < %s", (limite,)
+        )
+        if error:
+            return None, f"Error al consultar asistencias: {error}"
+        primera = resultado[0]['primera'] if resultado else None
+        if not primera:
+            return [], None
+        if isinstance(primera, str):
+            primera = date.fromisoformat(primera)
+
+        archivados = []
+        mes = inicio_periodo(primera, 'mensual')
+        while mes < limite:
+            archivado, error = self._archivar_mes(mes)
+            if error:
+                return archivados, error
+            if archivado:
+                archivados.append(archivado)
+            mes = siguiente_periodo(mes, 'mensual')
+        return archivados, None
+
+    def _archivar_mes(self, mes):
+        """
+        Returns:
+            tuple: ({'mes', 'filas', 'archivo'} o None si el mes no tenía filas, error)
+        """
+        siguiente = siguiente_periodo(mes, 'mensual')
+        try:
+            filas = list(query_executor.ejecutar_stream(
+                "SELECT id, num_trabajador, fecha, hora, checador, created_at FROM asistencias "
+                "WHERE fecha >= %s AND fecha < %s",
+                (mes, siguiente)
+            ))
+        except Exception as e:
+            return None, f"Error al leer asistencias de {mes:%Y-%m}: {e}"
+        if not filas:
+            return None, None
+
+        total, error = archivo_asistencias.escribir_mes(mes, filas)
+        if error:
+            return None, error
+
+        builder = QueryBuilder("DELETE FROM asistencias")
+        builder.add_in_filter('id', [fila['id'] for fila in filas], chunk_size=asistencias_config.ARCHIVO_LOTE_BORRADO)
+        for query, params in builder.build_chunks():
+            _, error = query_executor.ejecutar(query, params)
+            if error:
+                return None, f"Error al borrar asistencias archivadas de {mes:%Y-%m}: {error}"
+
+        ruta = archivo_asistencias.ruta(mes)
+        logger.warning(
+            "Asistencias de %s archivadas: %s filas movidas a %s (%s en el archivo)",
+            f"{mes:%Y-%m}", len(filas), ruta, total
+        )
+        return {'mes': f"{mes:%Y-%m}", 'filas': len(filas), 'archivo': ruta}, None
+
+
+# Instancia singleton
+archivar_asistencias_use_case = ArchivarAsistenciasUseCase()
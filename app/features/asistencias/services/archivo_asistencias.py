@@ -0,0 +1,476 @@
+"""
+Archivo frío de asistencias
+Responsabilidad: Guardar y leer las checadas de meses archivados (fuera de la
+tabla asistencias) en archivos comprimidos por mes
+
+- Un archivo por mes: ARCHIVO_DIR/asistencias-AAAA-MM.json.gz
+- Formato columnar (formato 1): JSON comprimido con gzip con una lista por
+  columna en lugar de un objeto por fila; las filas van ordenadas por
+  (num_trabajador, fecha, hora, id), así num_trabajador se guarda como
+  diferencias (casi todas 0) y cada trabajador es un tramo contiguo
+      {"formato": 1, "mes": "2023-01", "filas": N, "checadores": ["CHK001", ...],
+       "columnas": {"id": [...], "num_trabajador": [diferencias], "dia": [...],
+                    "segundos": [hora en segundos], "checador": [índice en checadores],
+                    "created_at": [segundos desde 1970 o null]}}
+- Las filas leídas tienen la forma de las de MySQL (fecha date, hora
+  timedelta), así que se mezclan con las de la tabla sin convertir
+- Lo archivado no vuelve a la tabla: la descarga de checadores y la
+  importación de .res quitan con sin_archivadas las checadas que ya están aquí
+  (el UNIQUE de la tabla ya no las ve); al leer, excluir quita las que de todos
+  modos quedaron en los dos lados
+- Los últimos ARCHIVO_CACHE_MESES meses leídos se conservan descomprimidos por
+  proceso (la bitácora lee el mismo mes para cada trabajador)
+
+El que mueve las filas de la tabla a los archivos es archivar_asistencias_use_case.
+"""
+import gzip
+import heapq
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from operator import itemgetter
+from datetime import date, datetime, time, timedelta
+
+from app.config import asistencias_config
+
+logger = logging.getLogger(__name__)
+
+FORMATO = 1
+PATRON_ARCHIVO = re.compile(r'^asistencias-(\d{4})-(\d{2})\.json\.gz$')
+_EPOCA = datetime(1970, 1, 1)
+
+
+def _a_fecha(valor):
+    return date.fromisoformat(valor) if isinstance(valor, str) else valor
+
+
+def _a_segundos(hora):
+    """TIME de MySQL (timedelta), time o 'HH:MM:SS' -> segundos"""
+    if isinstance(hora, timedelta):
+        return int(hora.total_seconds())
+    if isinstance(hora, str):
+        hora = time.fromisoformat(hora)
+    return hora.hour * 3600 + hora.minute * 60 + hora.second
+
+
+def _a_epoca(valor):
+    if valor is None:
+        return None
+    if isinstance(valor, str):
+        valor = datetime.fromisoformat(valor)
+    return int((valor.replace(tzinfo=None) - _EPOCA).total_seconds())
+
+
+def llave_unica(fila):
+    """(num_trabajador, fecha, segundos, checador): la llave única de asistencias"""
+    return (fila['num_trabajador'], _a_fecha(fila['fecha']), _a_segundos(fila['hora']), fila['checador'])
+
+
+class _MesArchivado:
+    """Columnas de un mes descomprimido y el tramo de filas de cada trabajador"""
+
+    def __init__(self, mes, contenido):
+        columnas = contenido['columnas']
+        self.mes = mes
+        self.ids = columnas['id']
+        self.dias = columnas['dia']
+        self.segundos = columnas['segundos']
+        self.checadores = [contenido['checadores'][i] for i in columnas['checador']]
+        self.creados = columnas['created_at']
+
+        self._llaves = None
+        self.numeros = []
+        self.tramos = {}  # {num_trabajador: (inicio, fin)}
+        num = 0
+        for i, diferencia in enumerate(columnas['num_trabajador']):
+            num += diferencia
+            self.numeros.append(num)
+            inicio, _ = self.tramos.get(num, (i, i))
+            self.tramos[num] = (inicio, i + 1)
+
+        if not (len(self.ids) == len(self.dias) == len(self.segundos) == len(self.checadores)
+                == len(self.creados) == len(self.numeros) == contenido['filas']):
+            raise ValueError("columnas de distinto tamaño")
+
+    def __len__(self):
+        return len(self.ids)
+
+    def llaves(self):
+        """Llaves únicas de todas las filas (se arma la primera vez que se pide)"""
+        if self._llaves is None:
+            self._llaves = {self.llave(i) for i in range(len(self))}
+        return self._llaves
+
+    def llave(self, i):
+        """Llave única de la fila i como la de llave_unica"""
+        return (self.numeros[i], self.mes.replace(day=self.dias[i]), self.segundos[i], self.checadores[i])
+
+    def fila(self, i):
+        creado = self.creados[i]
+        return {
+            'id': self.ids[i],
+            'num_trabajador': self.numeros[i],
+            'fecha': self.mes.replace(day=self.dias[i]),
+            'hora': timedelta(seconds=self.segundos[i]),
+            'checador': self.checadores[i],
+            'created_at': None if creado is None else _EPOCA + timedelta(seconds=creado)
+        }
+
+    def indices(self, num_trabajadores=None):
+        if num_trabajadores is None:
+            return range(len(self))
+        tramos = (self.tramos.get(num) for num in sorted(num_trabajadores))
+        return (i for tramo in tramos if tramo for i in range(*tramo))
+
+
+class _Filtro:
+    """Filtros de leer/contar/pagina sobre las filas de un mes archivado"""
+
+    def __init__(self, desde=None, hasta=None, num_trabajadores=None, checador=None, excluir=None):
+        self.desde, self.hasta = _a_fecha(desde), _a_fecha(hasta)
+        self.numeros = None if num_trabajadores is None else set(num_trabajadores)
+        self.checador = checador.lower() if checador else None
+        self.excluidas = {llave_unica(fila) for fila in excluir or ()}
+
+    def indices(self, archivado):
+        mes = archivado.mes
+        dia_desde = self.desde.day if self.desde and self.desde > mes else 1
+        dia_hasta = self.hasta.day if self.hasta and self.hasta.replace(day=1) == mes else 31
+        dias, checadores = archivado.dias, archivado.checadores
+        return (
+            i for i in archivado.indices(self.numeros)
+            if dia_desde <= dias[i] <= dia_hasta
+            and not (self.checador and self.checador not in checadores[i].lower())
+            and not (self.excluidas and archivado.llave(i) in self.excluidas)
+        )
+
+
+class ArchivoAsistencias:
+    """Lectura y escritura de los archivos mensuales de checadas"""
+
+    def __init__(self, directorio=None, cache_meses=None):
+        self.directorio = directorio or asistencias_config.ARCHIVO_DIR
+        self.cache_meses = asistencias_config.ARCHIVO_CACHE_MESES if cache_meses is None else cache_meses
+        self._cache = OrderedDict()  # {ruta: ((mtime, tamaño), _MesArchivado)}
+        self._meses = (None, [])  # (mtime del directorio, meses)
+        self._lock = threading.Lock()
+
+    def ruta(self, mes):
+        return os.path.join(self.directorio, f"asistencias-{mes:%Y-%m}.json.gz")
+
+    def meses(self):
+        """Primer día de cada mes archivado, ordenados"""
+        try:
+            firma = os.stat(self.directorio).st_mtime_ns
+        except FileNotFoundError:
+            return []
+
+        en_cache = self._meses
+        if en_cache[0] == firma:
+            return en_cache[1]
+
+        meses = sorted(
+            date(int(coincidencia.group(1)), int(coincidencia.group(2)), 1)
+            for coincidencia in map(PATRON_ARCHIVO.match, os.listdir(self.directorio)) if coincidencia
+        )
+        self._meses = (firma, meses)
+        return meses
+
+    def meses_en(self, desde=None, hasta=None):
+        """
+        Meses archivados que tocan el rango de fechas
+
+        Args:
+            desde (date|str): Primer día (None = sin límite)
+            hasta (date|str): Último día, inclusive (None = sin límite)
+        """
+        desde, hasta = _a_fecha(desde), _a_fecha(hasta)
+        return [
+            mes for mes in self.meses()
+            if (hasta is None or mes <= hasta)
+            and (desde is None or mes >= desde.replace(day=1))
+        ]
+
+    def leer(self, desde=None, hasta=None, num_trabajadores=None, checador=None, excluir=None):
+        """
+        Checadas archivadas en un rango de fechas
+
+        Args:
+            desde (date|str): Primer día (None = sin límite)
+            hasta (date|str): Último día, inclusive (None = sin límite)
+            num_trabajadores (iterable): Solo estos trabajadores (None = todos)
+            checador (str): Solo checadores que contienen este texto (como LIKE %texto%)
+            excluir (iterable): Filas de la tabla (num_trabajador, fecha, hora,
+                                checador); las archivadas con la misma llave no
+                                se regresan, así una checada que quedó en los dos
+                                lados sale una sola vez
+
+        Returns:
+            tuple: (filas como las de SELECT * FROM asistencias, ordenadas por
+                    (mes, num_trabajador, fecha, hora, id), error)
+        """
+        filtro = _Filtro(desde, hasta, num_trabajadores, checador, excluir)
+        filas = []
+        for mes in self.meses_en(filtro.desde, filtro.hasta):
+            archivado, error = self._cargar(mes)
+            if error:
+                return None, error
+            filas.extend(archivado.fila(i) for i in filtro.indices(archivado))
+        return filas, None
+
+    def contar(self, desde=None, hasta=None, num_trabajadores=None, checador=None, excluir=None):
+        """
+        Checadas archivadas que pasan los filtros (mismos argumentos que leer),
+        sumadas mes por mes sin armar las filas
+
+        Returns:
+            tuple: (total, error)
+        """
+        filtro = _Filtro(desde, hasta, num_trabajadores, checador, excluir)
+        total = 0
+        for mes in self.meses_en(filtro.desde, filtro.hasta):
+            archivado, error = self._cargar(mes)
+            if error:
+                return None, error
+            total += sum(1 for _ in filtro.indices(archivado))
+        return total, None
+
+    def pagina(self, columnas, descendente, limite, despues_de=None, **filtros):
+        """
+        Las primeras checadas archivadas en el orden de una página por cursor
+
+        Ordenado por fecha los meses se recorren en el orden de la página (los
+        anteriores al cursor se saltan) y se deja de leer en cuanto hay limite
+        filas; por id cada mes aporta sus limite mejores. Solo se arman las
+        filas que se regresan.
+
+        Args:
+            columnas (tuple): ('fecha', 'hora', 'id') o ('id',)
+            descendente (bool): Orden de la página
+            limite (int): Filas como máximo
+            despues_de (tuple): Llave del cursor, ('AAAA-MM-DD', segundos, id) o
+                                (id,); solo filas después de ella
+            **filtros: desde, hasta, num_trabajadores, checador, excluir (como leer)
+
+        Returns:
+            tuple: (filas en el orden de la página, error)
+        """
+        filtro = _Filtro(**filtros)
+        por_fecha = columnas[0] == 'fecha'
+        meses = self.meses_en(filtro.desde, filtro.hasta)
+        if por_fecha and despues_de:
+            mes_cursor = date.fromisoformat(despues_de[0]).replace(day=1)
+            meses = [mes for mes in meses if (mes <= mes_cursor if descendente else mes >= mes_cursor)]
+        if descendente:
+            meses = meses[::-1]
+        elegir = heapq.nlargest if descendente else heapq.nsmallest
+
+        candidatos = []
+        for mes in meses:
+            archivado, error = self._cargar(mes)
+            if error:
+                return None, error
+            if por_fecha:
+                prefijo = f"{mes:%Y-%m}-"
+                llave = lambda i, a=archivado, p=prefijo: (f"{p}{a.dias[i]:02d}", a.segundos[i], a.ids[i])
+            else:
+                llave = lambda i, a=archivado: (a.ids[i],)
+            indices = filtro.indices(archivado)
+            if despues_de:
+                indices = (i for i in indices if (llave(i) < despues_de if descendente else llave(i) > despues_de))
+            candidatos.extend((llave(i), archivado, i) for i in elegir(limite, indices, key=llave))
+            if por_fecha and len(candidatos) >= limite:
+                break  # Los meses siguientes van después en la página
+
+        elegidos = elegir(limite, candidatos, key=itemgetter(0))
+        return [archivado.fila(i) for _, archivado, i in elegidos], None
+
+    def ordenadas(self, clave, descendente=False, **filtros):
+        """
+        Checadas archivadas ordenadas por una llave calculada, sin armar las filas
+
+        Para paginar por LIMIT/OFFSET con la tabla: se ordenan solo las llaves y
+        con filas() se arman las de la página.
+
+        Args:
+            clave (callable): (num_trabajador, fecha, segundos, checador) -> llave
+            descendente (bool): Orden
+            **filtros: desde, hasta, num_trabajadores, checador, excluir (como leer)
+
+        Returns:
+            tuple: (lista ordenada de (llave, mes, índice), error)
+        """
+        filtro = _Filtro(**filtros)
+        referencias = []
+        for mes in self.meses_en(filtro.desde, filtro.hasta):
+            archivado, error = self._cargar(mes)
+            if error:
+                return None, error
+            referencias.extend(
+                (clave(archivado.numeros[i], mes.replace(day=archivado.dias[i]),
+                       archivado.segundos[i], archivado.checadores[i]), archivado, i)
+                for i in filtro.indices(archivado)
+            )
+        referencias.sort(key=itemgetter(0), reverse=descendente)
+        return referencias, None
+
+    @staticmethod
+    def filas(referencias):
+        """Filas de referencias de ordenadas()"""
+        return [archivado.fila(i) for _, archivado, i in referencias]
+
+    def sin_archivadas(self, checadas, llave=None):
+        """
+        Quita las checadas que ya están en el archivo
+
+        Los dispositivos conservan su historial, así que una descarga o una
+        importación puede traer checadas de meses ya archivados; la llave única
+        de la tabla ya no las ve y se volverían a insertar.
+
+        Args:
+            checadas (iterable): Checadas por insertar
+            llave (callable): checada -> (num_trabajador, fecha, hora, checador)
+                              (default: la checada ya es esa tupla)
+
+        Returns:
+            tuple: (lista de checadas que no están archivadas, error)
+        """
+        checadas = list(checadas)
+        meses = set(self.meses())
+        if not meses or not checadas:
+            return checadas, None
+
+        nuevas = []
+        try:
+            for checada in checadas:
+                num, fecha, hora, checador = llave(checada) if llave else checada
+                fecha = _a_fecha(fecha)
+                mes = fecha.replace(day=1)
+                if mes in meses:
+                    archivado, error = self._cargar(mes)
+                    if error:
+                        return None, error
+                    if (num, fecha, _a_segundos(hora), checador) in archivado.llaves():
+                        continue
+                nuevas.append(checada)
+        except (TypeError, ValueError) as e:
+            return None, f"Checada inválida: {e}"
+        return nuevas, None
+
+    def escribir_mes(self, mes, filas):
+        """
+        Agrega filas al archivo del mes (lo crea si no existe)
+
+        Las filas que ya están en el archivo (mismo num_trabajador, fecha, hora y
+        checador, la llave única de asistencias) no se duplican. El archivo se
+        escribe aparte y se reemplaza al final, y se vuelve a leer para
+        comprobarlo antes de regresar.
+
+        Args:
+            mes (date): Primer día del mes
+            filas (iterable): Filas de asistencias del mes (dicts con id,
+                              num_trabajador, fecha, hora, checador, created_at)
+
+        Returns:
+            tuple: (filas en el archivo, error)
+        """
+        ruta = self.ruta(mes)
+        registros = {}
+        if os.path.exists(ruta):
+            archivado, error = self._cargar(mes)
+            if error:
+                return 0, error
+            for i in range(len(archivado)):
+                registro = (archivado.numeros[i], archivado.dias[i], archivado.segundos[i],
+                            archivado.checadores[i], archivado.ids[i], archivado.creados[i])
+                registros[registro[:4]] = registro
+
+        try:
+            for fila in filas:
+                fecha = _a_fecha(fila['fecha'])
+                if fecha.replace(day=1) != mes:
+                    return 0, f"La checada {fila['id']} ({fecha}) no es de {mes:%Y-%m}"
+                registro = (fila['num_trabajador'], fecha.day, _a_segundos(fila['hora']),
+                            fila['checador'], fila['id'], _a_epoca(fila.get('created_at')))
+                registros.setdefault(registro[:4], registro)
+        except (KeyError, TypeError, ValueError) as e:
+            return 0, f"Fila de asistencias inválida: {e}"
+
+        ordenados = sorted(registros.values(), key=lambda r: (r[0], r[1], r[2], r[4]))
+        checadores = sorted({r[3] for r in ordenados})
+        posicion = {checador: i for i, checador in enumerate(checadores)}
+        numeros = [r[0] for r in ordenados]
+        contenido = {
+            'formato': FORMATO,
+            'mes': f"{mes:%Y-%m}",
+            'filas': len(ordenados),
+            'checadores': checadores,
+            'columnas': {
+                'id': [r[4] for r in ordenados],
+                'num_trabajador': [b - a for a, b in zip([0] + numeros, numeros)],
+                'dia': [r[1] for r in ordenados],
+                'segundos': [r[2] for r in ordenados],
+                'checador': [posicion[r[3]] for r in ordenados],
+                'created_at': [r[5] for r in ordenados]
+            }
+        }
+
+        temporal = f"{ruta}.tmp"
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            with open(temporal, 'wb') as archivo:
+                with gzip.GzipFile(fileobj=archivo, mode='wb', mtime=0) as comprimido:
+                    comprimido.write(json.dumps(contenido, separators=(',', ':')).encode('utf-8'))
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            os.replace(temporal, ruta)
+        except OSError as e:
+            return 0, f"Error al escribir {ruta}: {e}"
+
+        # Comprobación: se lee del disco, no de la caché
+        with self._lock:
+            self._cache.pop(ruta, None)
+        archivado, error = self._cargar(mes)
+        if error:
+            return 0, error
+        if len(archivado) != len(ordenados):
+            return 0, f"{ruta} tiene {len(archivado)} filas, se escribieron {len(ordenados)}"
+        return len(archivado), None
+
+    def _cargar(self, mes):
+        """Mes descomprimido (caché por ruta, mtime y tamaño del archivo)"""
+        ruta = self.ruta(mes)
+        try:
+            estado = os.stat(ruta)
+        except OSError as e:
+            return None, f"Error al leer {ruta}: {e}"
+        firma = (estado.st_mtime_ns, estado.st_size)
+
+        with self._lock:
+            en_cache = self._cache.get(ruta)
+            if en_cache and en_cache[0] == firma:
+                self._cache.move_to_end(ruta)
+                return en_cache[1], None
+
+        try:
+            with gzip.open(ruta, 'rb') as archivo:
+                contenido = json.loads(archivo.read())
+            if contenido.get('formato') != FORMATO:
+                raise ValueError(f"formato {contenido.get('formato')} no soportado")
+            archivado = _MesArchivado(mes, contenido)
+        except (OSError, EOFError, ValueError, KeyError, IndexError, TypeError) as e:
+            return None, f"Error al leer {ruta}: {e}"
+
+        with self._lock:
+            self._cache[ruta] = (firma, archivado)
+            self._cache.move_to_end(ruta)
+            while len(self._cache) > max(self.cache_meses, 1):
+                self._cache.popitem(last=False)
+        return archivado, None
+
+
+# Instancia singleton
+archivo_asistencias = ArchivoAsistencias()
@@ -3,7 +3,10 @@ Caso de uso: Importar checadas desde archivo .res
 Responsabilidad: Parsear archivo .res, detectar duplicados e insertar en BD con progreso
 """
 from app.core.database.query_executor import query_executor
+from app.features.asistencias.services.archivo_asistencias import archivo_asistencias
+from app.core.metricas import IMPORTACION_REGISTROS, IMPORTACION_SEGUNDOS
 import csv
+import time
 from typing import Generator, Dict, List, Tuple
 from io import StringIO
 from datetime import datetime
@@ -334,6 +337,7 @@ class ImportarChecadasUseCase:
             dict: Progreso de inserción
         """
         total_nuevas = len(checadas_nuevas)
+        inicio = time.perf_counter()
         
         if total_nuevas == 0:
             yield {
@@ -348,21 +352,6 @@ class ImportarChecadasUseCase:
             'fase': 'insercion'
         }
         
-        # Obtener nombres de trabajadores
-        yield {
-            'estado': 'Obteniendo nombres de trabajadores...',
-            'progreso': 10,
-            'fase': 'nombres'
-        }
-        
-        nombres_trabajadores = self._obtener_nombres_trabajadores(checadas_nuevas)
-        
-        yield {
-            'estado': f'Nombres obtenidos: {len(nombres_trabajadores):,} trabajadores',
-            'progreso': 15,
-            'fase': 'nombres'
-        }
-        
         # Insertar en lotes grandes usando INSERT múltiple para mejor rendimiento
         # Con millones de registros, usar batches de 2000 para balancear memoria y velocidad
         BATCH_SIZE = 2000
@@ -377,15 +366,14 @@ class ImportarChecadasUseCase:
             
             try:
                 # Construir INSERT múltiple con VALUES (más rápido que batch individual)
+                # Sin nombre: se toma de trabajadores al consultar asistencias
                 placeholders = []
                 params = []
                 
                 for c in batch:
-                    nombre = nombres_trabajadores.get(c['num_trabajador'])
-                    placeholders.append("(%s, %s, %s, %s, %s, NOW())")
+                    placeholders.append("(%s, %s, %s, %s, NOW())")
                     params.extend([
                         c['num_trabajador'],
-                        nombre,
                         c['fecha'],
                         c['hora'],
                         c['checador']
@@ -393,7 +381,7 @@ class ImportarChecadasUseCase:
                 
                 query = f"""
                     INSERT IGNORE INTO asistencias 
-                    (num_trabajador, nombre, fecha, hora, checador, created_at)
+                    (num_trabajador, fecha, hora, checador, created_at)
                     VALUES {', '.join(placeholders)}
                 """
                 
@@ -418,8 +406,8 @@ class ImportarChecadasUseCase:
                     'error': str(e)
                 })
             
-            # Calcular progreso (15% a 95%)
-            progreso = 15 + int((batch_num / total_batches) * 80)
+            # Calcular progreso (5% a 95%)
+            progreso = 5 + int((batch_num / total_batches) * 90)
             
             # Reportar progreso cada 10 lotes o cada lote si hay pocos
             if batch_num % 10 == 0 or batch_num == total_batches or total_batches <= 20:
@@ -433,6 +421,11 @@ class ImportarChecadasUseCase:
                     'fase': 'insercion'
                 }
         
+        IMPORTACION_SEGUNDOS.inc(time.perf_counter() - inicio, tipo='archivo_res')
+        IMPORTACION_REGISTROS.inc(insertadas_total, tipo='archivo_res', resultado='insertado')
+        IMPORTACION_REGISTROS.inc(duplicadas_total, tipo='archivo_res', resultado='duplicado')
+        IMPORTACION_REGISTROS.inc(total_nuevas - insertadas_total - duplicadas_total, tipo='archivo_res', resultado='error')
+        
         # Resultado final
         estado_final = f'Completado: {insertadas_total:,} insertadas, {duplicadas_total:,} ya existían en BD'
         if errores_insercion:
@@ -519,44 +512,20 @@ class ImportarChecadasUseCase:
                         str(row['hora'])
                     ))
         
+        # Las checadas de meses archivados ya no están en la tabla: también son duplicados
+        no_archivadas, error = archivo_asistencias.sin_archivadas(
+            checadas,
+            llave=lambda c: (c['num_trabajador'], c['fecha'], c['hora'], c['checador'])
+        )
+        if not error and len(no_archivadas) < len(checadas):
+            no_archivadas = {id(c) for c in no_archivadas}
+            duplicados.update(
+                (c['num_trabajador'], c['fecha'], c['hora'])
+                for c in checadas if id(c) not in no_archivadas
+            )
+        
         # Yield final con resultados
         yield {'duplicados': duplicados}
-    
-    def _obtener_nombres_trabajadores(self, checadas: List[Dict]) -> Dict[int, str]:
-        """
-        Obtiene nombres de trabajadores desde la tabla trabajadores
-        
-        Args:
-            checadas: Lista de diccionarios con num_trabajador
-            
-        Returns:
-            dict: {num_trabajador: nombre_trabajador}
-        """
-        if not checadas:
-            return {}
-        
-        # Obtener números únicos de trabajadores
-        nums_trabajadores = list(set(c['num_trabajador'] for c in checadas))
-        
-        if not nums_trabajadores:
-            return {}
-        
-        # Query para obtener nombres
-        placeholders = ','.join(['%s'] * len(nums_trabajadores))
-        query = f"""
-            SELECT num_trabajador, nombre
-            FROM trabajadores
-            WHERE num_trabajador IN ({placeholders})
-        """
-        
-        resultados, error = query_executor.ejecutar(query, tuple(nums_trabajadores))
-        
-        nombres = {}
-        if not error and resultados:
-            for row in resultados:
-                nombres[row['num_trabajador']] = row['nombre']
-        
-        return nombres
 
 
 # Instancia singleton
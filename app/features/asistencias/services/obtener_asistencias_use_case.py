@@ -1,49 +1,169 @@
 """
 Caso de uso: Obtener asistencias
 Responsabilidad: Ejecutar SELECT y convertir resultados a modelos
+
+asistencias solo guarda num_trabajador: el nombre se toma de trabajadores (caché
+en memoria de indice_nombres_trabajadores); si el trabajador no está dado de
+alta, del nombre guardado en la fila (registros anteriores a quitar la columna)
+o del índice de usuarios de los checadores (checador_usuarios)
+
+Paginación:
+- Ordenado por id o por fecha (los órdenes por defecto) se pagina por cursor
+  (keyset): la página siguiente es "WHERE (fecha, hora, id) < último de esta
+  página", que usa el índice y cuesta lo mismo en la página 1 que en la 10,000
+- Ordenado por otras columnas se sigue usando LIMIT/OFFSET
+
+Total de registros:
+- Sin filtros: estimado de information_schema (la tabla tiene millones de filas)
+- Con filtros: COUNT(*) exacto hasta CONTEO_MAXIMO; si hay más se muestra "más de"
+- Se cachea CACHE_TOTAL_SEGUNDOS por combinación de filtros (las páginas de una
+  misma búsqueda no vuelven a contar)
+
+Meses archivados (archivo_asistencias): si el filtro de fecha llega a un mes
+archivado, sus checadas se suman al total (conteo por mes, cacheado como el de
+la tabla) y se mezclan con las de la tabla en el orden de la página (una
+checada en los dos lados se muestra una vez). Del archivo solo se arman las
+filas que pueden entrar a la página:
+- Por cursor: archivo_asistencias.pagina lee los meses en el orden de la página
+  y se detiene con per_page + 1 filas después del cursor
+- Por LIMIT/OFFSET: se ordenan las llaves de las archivadas y una búsqueda
+  binaria (filas sueltas de la tabla con LIMIT 1 OFFSET n) encuentra cuántas
+  archivadas van antes de la página; de cada lado se leen per_page + 1 filas
+Sin filtro de fecha solo se lista la tabla (el resultado indica hasta qué mes
+hay archivo).
 """
+import heapq
+import threading
+import time
+from datetime import date, datetime, timedelta
+from itertools import islice
+
+from app.core.database.query_builder import condicion_keyset
 from app.core.database.query_executor import query_executor
 from app.features.asistencias.models import Asistencia
+from app.features.asistencias.services.archivo_asistencias import archivo_asistencias
+from app.features.asistencias.services.particiones_asistencias_use_case import siguiente_periodo
+from app.features.trabajadores.services.indice_nombres_trabajadores import indice_nombres_trabajadores, normalizar
 
 
 class ObtenerAsistenciasUseCase:
     """Obtiene asistencias de la base de datos y las convierte a modelos"""
-    
-    def ejecutar(self, num_trabajador=None, nombre_trabajador=None, checador=None, fecha_inicio=None, fecha_fin=None, 
-                 page=1, per_page=50, order_by='id', order_dir='desc'):
+
+    # Filas contadas como máximo con filtros (más allá el total es "más de")
+    CONTEO_MAXIMO = 10000
+    CACHE_TOTAL_SEGUNDOS = 60
+
+    # Orden por cursor: columnas de la llave (la última es única)
+    LLAVES_CURSOR = {
+        'id': ('id',),
+        'fecha': ('fecha', 'hora', 'id'),
+    }
+
+    def __init__(self):
+        self._totales = {}  # {filtros: (expira, total, tipo)}
+        self._lock = threading.Lock()
+
+    def ejecutar(self, num_trabajador=None, nombre_trabajador=None, checador=None, fecha_inicio=None, fecha_fin=None,
+                 page=1, per_page=50, order_by='id', order_dir='desc', cursor=None, direccion='siguiente'):
         """
         Ejecuta SELECT con filtros, ordenación y paginación, convierte a modelos Asistencia
-        
+
         Args:
             num_trabajador: Filtro opcional por número de trabajador
             nombre_trabajador: Filtro opcional por nombre del trabajador
             checador: Filtro opcional por checador (serial)
             fecha_inicio: Filtro opcional por fecha inicial (YYYY-MM-DD)
             fecha_fin: Filtro opcional por fecha final (YYYY-MM-DD)
-            page: Número de página (default: 1)
+            page: Número de página (default: 1); con cursor solo se muestra
             per_page: Registros por página (default: 50)
             order_by: Campo por el cual ordenar (default: 'id')
             order_dir: Dirección de ordenación 'asc' o 'desc' (default: 'desc')
-        
+            cursor: Llave de la última (o primera) fila de la página anterior
+            direccion: 'siguiente' (filas después del cursor) o 'anterior'; 'anterior'
+                       sin cursor es la última página
+
         Returns:
-            tuple: (dict con asistencias, total, page, per_page, error)
+            tuple: (dict con asistencias, total, tipo de total, page, per_page,
+                    cursores/has_prev/has_next y archivo_hasta (último mes
+                    archivado, 'AAAA-MM', si no se incluyó en la consulta), error)
         """
-        # Construir WHERE clauses
+        # Las fechas se comparan con meses del archivo: una mal formada no llega más lejos
+        for fecha in (fecha_inicio, fecha_fin):
+            if fecha:
+                try:
+                    date.fromisoformat(str(fecha))
+                except ValueError:
+                    return None, 'Fecha inválida'
+
+        where_clauses, params, error = self._filtros(
+            num_trabajador, nombre_trabajador, checador, fecha_inicio, fecha_fin
+        )
+        if error:
+            return None, error
+
+        archivo, error = self._filtros_archivo(num_trabajador, nombre_trabajador, checador, fecha_inicio, fecha_fin)
+        if error:
+            return None, error
+
+        total, tipo_total, error = self._total(where_clauses, params)
+        if error:
+            return None, error
+
+        total_archivadas = 0
+        if archivo:
+            total_archivadas, error = self._total_archivadas(
+                (num_trabajador, nombre_trabajador, checador, fecha_inicio, fecha_fin), archivo
+            )
+            if error:
+                return None, error
+
+        if order_by in self.LLAVES_CURSOR:
+            pagina, error = self._pagina_cursor(
+                where_clauses, params, per_page, order_by, order_dir, cursor, direccion, archivo
+            )
+        else:
+            pagina, error = self._pagina_offset(
+                where_clauses, params, page, per_page, order_by, order_dir, archivo
+            )
+
+        if error:
+            return None, error
+
+        meses_archivados = archivo_asistencias.meses()
+        return {
+            **pagina,
+            'total': total + total_archivadas,
+            'tipo_total': tipo_total,
+            'page': page,
+            'per_page': per_page,
+            'archivo_hasta': f"{meses_archivados[-1]:%Y-%m}" if meses_archivados and not fecha_inicio else None
+        }, None
+
+    # ------------------------------------------
+    # Filtros y total
+    # ------------------------------------------
+
+    @staticmethod
+    def _filtros(num_trabajador, nombre_trabajador, checador, fecha_inicio, fecha_fin):
         where_clauses = []
         params = []
-        
+
         if num_trabajador:
             where_clauses.append("num_trabajador = %s")
             params.append(num_trabajador)
-        
+
         if nombre_trabajador:
-            where_clauses.append("nombre LIKE %s")
-            params.append(f"%{nombre_trabajador}%")
-        
+            # Nombre -> num_trabajador con el índice de trabajadores (usa idx_trabajador_fecha)
+            condicion, numeros, error = indice_nombres_trabajadores.condicion_sql('num_trabajador', nombre_trabajador)
+            if error:
+                return None, None, error
+            where_clauses.append(condicion)
+            params.extend(numeros)
+
         if checador:
             where_clauses.append("checador LIKE %s")
             params.append(f"%{checador}%")
-        
+
         # Filtros de fecha
         if fecha_inicio and fecha_fin:
             # Rango de fechas
@@ -54,63 +174,370 @@ class ObtenerAsistenciasUseCase:
             # Solo fecha inicial (búsqueda por fecha específica)
             where_clauses.append("fecha = %s")
             params.append(fecha_inicio)
-        
+
+        return where_clauses, params, None
+
+    @staticmethod
+    def _filtros_archivo(num_trabajador, nombre_trabajador, checador, fecha_inicio, fecha_fin):
+        """
+        Filtros para archivo_asistencias equivalentes a _filtros
+
+        Solo con filtro de fecha (fecha_inicio sola = ese día): sin él la
+        consulta no "llega" a un periodo y no se recorre todo el archivo.
+
+        Returns:
+            tuple: (dict de filtros o None si no hay meses archivados que consultar, error)
+        """
+        if not fecha_inicio or not archivo_asistencias.meses_en(fecha_inicio, fecha_fin or fecha_inicio):
+            return None, None
+
+        numeros = None
+        if num_trabajador:
+            numeros = {num_trabajador}
+        if nombre_trabajador:
+            encontrados, error = indice_nombres_trabajadores.buscar(nombre_trabajador)
+            if error:
+                return None, error
+            numeros = set(encontrados) if numeros is None else numeros & set(encontrados)
+            if not numeros:
+                return None, None
+
+        # Checadas de la tabla en los meses archivados: normalmente ninguna; las que
+        # haya también pueden estar en el archivo y se muestran una sola vez
+        meses = archivo_asistencias.meses_en(fecha_inicio, fecha_fin or fecha_inicio)
+        en_tabla, error = query_executor.ejecutar(
+            "SELECT num_trabajador, fecha, hora, checador FROM asistencias WHERE fecha >= %s AND fecha < %s",
+            (meses[0], siguiente_periodo(meses[-1], 'mensual'))
+        )
+        if error:
+            return None, error
+
+        return {
+            'desde': fecha_inicio,
+            'hasta': fecha_fin or fecha_inicio,
+            'num_trabajadores': numeros,
+            'checador': checador,
+            'excluir': en_tabla
+        }, None
+
+    def _total(self, where_clauses, params):
+        """
+        Total de registros con los filtros
+
+        Returns:
+            tuple: (total, tipo, error) — tipo: 'exacto', 'estimado' o 'minimo'
+                   ('minimo' = hay más de CONTEO_MAXIMO)
+        """
+        clave = (tuple(where_clauses), tuple(params))
+        ahora = time.monotonic()
+        en_cache = self._totales.get(clave)
+        if en_cache and en_cache[0] > ahora:
+            return en_cache[1], en_cache[2], None
+
+        if where_clauses:
+            # COUNT acotado: deja de leer índice al pasar CONTEO_MAXIMO
+            resultado, error = query_executor.ejecutar(
+                f"SELECT COUNT(*) AS total FROM (SELECT 1 FROM asistencias WHERE {' AND '.join(where_clauses)} "
+                f"LIMIT {self.CONTEO_MAXIMO + 1}) AS acotado",
+                tuple(params)
+            )
+            if error:
+                return None, None, error
+            total = resultado[0]['total'] if resultado else 0
+            tipo = 'minimo' if total > self.CONTEO_MAXIMO else 'exacto'
+            total = min(total, self.CONTEO_MAXIMO)
+        else:
+            total, tipo, error = self._total_sin_filtros()
+            if error:
+                return None, None, error
+
+        with self._lock:
+            if len(self._totales) > 500:
+                self._totales = {k: v for k, v in self._totales.items() if v[0] > ahora}
+            self._totales[clave] = (ahora + self.CACHE_TOTAL_SEGUNDOS, total, tipo)
+        return total, tipo, None
+
+    def _total_archivadas(self, filtros, archivo):
+        """Checadas archivadas con los filtros (cacheado como _total)"""
+        clave = ('archivo',) + tuple(filtros)
+        ahora = time.monotonic()
+        en_cache = self._totales.get(clave)
+        if en_cache and en_cache[0] > ahora:
+            return en_cache[1], None
+
+        total, error = archivo_asistencias.contar(**archivo)
+        if error:
+            return None, error
+        with self._lock:
+            self._totales[clave] = (ahora + self.CACHE_TOTAL_SEGUNDOS, total, 'exacto')
+        return total, None
+
+    @staticmethod
+    def _total_sin_filtros():
+        """Estimado de InnoDB (information_schema); COUNT(*) si no está disponible"""
+        resultado, error = query_executor.ejecutar(
+            "SELECT TABLE_ROWS AS total FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'asistencias'"
+        )
+        if not error and resultado and resultado[0]['total'] is not None:
+            return int(resultado[0]['total']), 'estimado', None
+
+        resultado, error = query_executor.ejecutar("SELECT COUNT(*) AS total FROM asistencias")
+        if error:
+            return None, None, error
+        return (resultado[0]['total'] if resultado else 0), 'exacto', None
+
+    # ------------------------------------------
+    # Páginas
+    # ------------------------------------------
+
+    def _pagina_cursor(self, where_clauses, params, per_page, order_by, order_dir, cursor, direccion, archivo=None):
+        """Página por keyset; se lee una fila de más para saber si hay otra página"""
+        columnas = self.LLAVES_CURSOR[order_by]
+        valores = self._decodificar_cursor(cursor, len(columnas))
+        hacia_atras = direccion == 'anterior'
+
+        # Hacia atrás se recorre en el orden inverso y luego se voltea la página
+        descendente = (order_dir != 'asc') != hacia_atras
+        where_clauses = list(where_clauses)
+        params = list(params)
+        if valores:
+            condicion, params_cursor = condicion_keyset(columnas, valores, descendente)
+            where_clauses.append(condicion)
+            params.extend(params_cursor)
+
         where_sql = " WHERE " + " AND ".join(where_clauses) if where_clauses else ""
-        
+        direccion_sql = 'DESC' if descendente else 'ASC'
+        order_sql = "ORDER BY " + ", ".join(f"{columna} {direccion_sql}" for columna in columnas)
+
+        registros, error = query_executor.ejecutar(
+            f"SELECT * FROM asistencias{where_sql} {order_sql} LIMIT %s",
+            tuple(params + [per_page + 1])
+        )
+        if error:
+            return None, error
+
+        if archivo:
+            # Las archivadas después del cursor compiten con las de la tabla por la página
+            referencia = self._llave(dict(zip(columnas, valores)), columnas) if valores else None
+            archivadas, error = archivo_asistencias.pagina(
+                columnas, descendente, per_page + 1, despues_de=referencia, **archivo
+            )
+            if error:
+                return None, error
+            elegir = heapq.nlargest if descendente else heapq.nsmallest
+            registros = elegir(per_page + 1, [*registros, *archivadas], key=lambda fila: self._llave(fila, columnas))
+
+        hay_mas = len(registros) > per_page
+        registros = registros[:per_page]
+        if hacia_atras:
+            registros.reverse()
+            has_prev, has_next = hay_mas, True
+            if not valores:
+                has_next = False  # Última página
+        else:
+            has_prev, has_next = valores is not None, hay_mas
+
+        return {
+            'asistencias': self._asistencias(registros),
+            'paginacion': 'cursor',
+            'has_prev': has_prev and bool(registros),
+            'has_next': has_next and bool(registros),
+            'cursor_anterior': self._codificar_cursor(registros[0], columnas) if registros else None,
+            'cursor_siguiente': self._codificar_cursor(registros[-1], columnas) if registros else None
+        }, None
+
+    def _pagina_offset(self, where_clauses, params, page, per_page, order_by, order_dir, archivo=None):
+        where_sql = " WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+
         # Validar y construir ORDER BY
         columnas_permitidas = {
-            'id': 'id',
             'num_trabajador': 'num_trabajador',
-            'nombre': 'nombre',
-            'fecha': 'fecha',
+            'nombre': '(SELECT t.nombre FROM trabajadores t WHERE t.num_trabajador = asistencias.num_trabajador)',
             'hora': 'hora',
             'checador': 'checador'
         }
-        
-        order_column = columnas_permitidas.get(order_by, 'id')
+
+        order_column = columnas_permitidas.get(order_by, 'num_trabajador')
         order_direction = 'ASC' if order_dir == 'asc' else 'DESC'
         order_sql = f"ORDER BY {order_column} {order_direction}"
-        
+
         # Si se ordena por algo diferente a fecha/hora, agregar fecha DESC, hora DESC como secundario
-        if order_by not in ['fecha', 'hora']:
+        if order_by != 'hora':
             order_sql += ", fecha DESC, hora DESC"
-        
-        # Obtener total de registros
-        count_query = f"SELECT COUNT(*) as total FROM asistencias{where_sql}"
-        count_result, error = query_executor.ejecutar(count_query, tuple(params) if params else None)
-        
-        if error:
-            return None, error
-        
-        total = count_result[0]['total'] if count_result else 0
-        
-        # Calcular offset
+
+        # Obtener registros paginados con ordenación (uno de más: ¿hay página siguiente?)
         offset = (page - 1) * per_page
-        
-        # Obtener registros paginados con ordenación
         query = f"""
             SELECT * FROM asistencias
             {where_sql}
             {order_sql}
             LIMIT %s OFFSET %s
         """
-        params.extend([per_page, offset])
-        
-        registros, error = query_executor.ejecutar(query, tuple(params))
-        
+        if archivo:
+            registros, error = self._pagina_offset_con_archivo(
+                query, params, offset, per_page, order_by, order_direction, archivo
+            )
+        else:
+            registros, error = query_executor.ejecutar(query, tuple(params + [per_page + 1, offset]))
+
         if error:
             return None, error
-        
-        # Convertir diccionarios a objetos Asistencia
-        asistencias = [Asistencia.from_dict(reg) for reg in registros]
-        
+
         return {
-            'asistencias': asistencias,
-            'total': total,
-            'page': page,
-            'per_page': per_page
+            'asistencias': self._asistencias(registros[:per_page]),
+            'paginacion': 'offset',
+            'has_prev': page > 1,
+            'has_next': len(registros) > per_page,
+            'cursor_anterior': None,
+            'cursor_siguiente': None
         }, None
 
+    def _pagina_offset_con_archivo(self, query, params, offset, per_page, order_by, order_direction, archivo):
+        """
+        Filas offset..offset+per_page de la tabla y el archivo mezclados
+
+        Returns:
+            tuple: (hasta per_page + 1 filas, error)
+        """
+        clave = self._clave_orden(order_by, order_direction)
+        descendente = order_direction == 'DESC'
+        antes = (lambda x, y: x > y) if descendente else (lambda x, y: x < y)
+        clave_fila = lambda reg: clave(
+            reg['num_trabajador'], date.fromisoformat(str(reg['fecha'])),
+            self._llave(reg, ('hora',))[0], reg['checador']
+        )
+
+        archivadas, error = archivo_asistencias.ordenadas(clave, descendente, **archivo)
+        if error:
+            return None, error
+
+        # Cuántas archivadas van antes de la página: la menor a tal que la
+        # archivada a no va antes de la fila offset - a - 1 de la tabla (en
+        # empate va primero la de la tabla, como en heapq.merge)
+        bajo, alto = 0, min(offset, len(archivadas))
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            fila, error = query_executor.ejecutar(query, tuple(params + [1, offset - medio - 1]))
+            if error:
+                return None, error
+            if fila and not antes(archivadas[medio][0], clave_fila(fila[0])):
+                alto = medio
+            else:
+                bajo = medio + 1
+
+        registros, error = query_executor.ejecutar(query, tuple(params + [per_page + 1, offset - bajo]))
+        if error:
+            return None, error
+        mezcla = heapq.merge(
+            registros, archivo_asistencias.filas(archivadas[bajo:bajo + per_page + 1]),
+            key=clave_fila, reverse=descendente
+        )
+        return list(islice(mezcla, per_page + 1)), None
+
+    @staticmethod
+    def _clave_orden(order_by, order_direction):
+        """
+        Llave (num_trabajador, fecha, segundos, checador) -> valor comparable con
+        el mismo orden que el ORDER BY de _pagina_offset (ordenando con
+        reverse=True si es DESC); nombres y checadores sin acentos ni
+        mayúsculas, como los compara la intercalación de MySQL
+        """
+        if order_by == 'hora':
+            return lambda num, fecha, segundos, checador: (segundos,)
+
+        if order_by == 'nombre':
+            nombres = {}
+
+            def primaria(num, checador):
+                if num not in nombres:
+                    encontrados, _ = indice_nombres_trabajadores.nombres_de([num])
+                    nombres[num] = normalizar(encontrados.get(num) or '')
+                return nombres[num]
+        elif order_by == 'checador':
+            primaria = lambda num, checador: normalizar(checador)
+        else:
+            primaria = lambda num, checador: num
+
+        # Secundario fecha DESC, hora DESC: con la primaria ASC se niega
+        signo = 1 if order_direction == 'DESC' else -1
+        return lambda num, fecha, segundos, checador: (
+            primaria(num, checador), signo * fecha.toordinal(), signo * segundos
+        )
+
+    @staticmethod
+    def _asistencias(registros):
+        """Convierte las filas a Asistencia con el nombre del trabajador"""
+        numeros = {reg['num_trabajador'] for reg in registros}
+        nombres, _ = indice_nombres_trabajadores.nombres_de(numeros)
+
+        faltantes = {
+            reg['num_trabajador'] for reg in registros
+            if reg['num_trabajador'] not in nombres and not reg.get('nombre')
+        }
+        if faltantes:
+            filas, error = query_executor.ejecutar(
+                "SELECT num_trabajador, nombre FROM checador_usuarios "
+                f"WHERE num_trabajador IN ({', '.join(['%s'] * len(faltantes))})",
+                tuple(faltantes)
+            )
+            for fila in filas if not error else []:
+                nombres.setdefault(fila['num_trabajador'], fila['nombre'])
+
+        return [
+            Asistencia.from_dict({**reg, 'nombre': nombres.get(reg['num_trabajador']) or reg.get('nombre')})
+            for reg in registros
+        ]
+
+    # ------------------------------------------
+    # Cursor
+    # ------------------------------------------
+
+    @staticmethod
+    def _llave(registro, columnas):
+        """Valores comparables de la llave (fecha date o str, hora timedelta o str)"""
+        llave = []
+        for columna in columnas:
+            valor = registro[columna]
+            if columna == 'fecha':
+                valor = str(valor)
+            elif columna == 'hora':
+                if isinstance(valor, timedelta):
+                    valor = int(valor.total_seconds())
+                else:
+                    horas, minutos, segundos = (int(parte) for parte in str(valor).split(':'))
+                    valor = horas * 3600 + minutos * 60 + segundos
+            llave.append(valor)
+        return tuple(llave)
+
+    @staticmethod
+    def _codificar_cursor(registro, columnas):
+        valores = []
+        for columna in columnas:
+            valor = registro[columna]
+            if isinstance(valor, timedelta):  # TIME llega como timedelta
+                segundos = int(valor.total_seconds())
+                valor = f"{segundos // 3600:02d}:{segundos // 60 % 60:02d}:{segundos % 60:02d}"
+            valores.append(str(valor))
+        return '|'.join(valores)
+
+    @staticmethod
+    def _decodificar_cursor(cursor, columnas):
+        """Valores del cursor o None si no hay (o no es válido: se empieza desde el inicio)"""
+        if not cursor:
+            return None
+        valores = cursor.split('|')
+        if len(valores) != columnas:
+            return None
+        try:
+            valores[-1] = int(valores[-1])  # id
+            if columnas == 3:
+                date.fromisoformat(valores[0])
+                datetime.strptime(valores[1], '%H:%M:%S')
+        except ValueError:
+            return None
+        return valores
+
 
 # Instancia singleton
 obtener_asistencias_use_case = ObtenerAsistenciasUseCase()
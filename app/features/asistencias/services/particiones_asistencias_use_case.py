@@ -0,0 +1,327 @@
+"""
+Caso de uso: Particiones de la tabla asistencias
+Responsabilidad: Particionar asistencias por rango de fecha, crear las
+particiones por adelantado y archivar las antiguas
+
+- Esquema: PARTITION BY RANGE COLUMNS(fecha), una partición por mes
+  (p202501 = fechas < 2025-02-01) o por año (p2025) según
+  PARTICIONES_GRANULARIDAD, más p_futuro (MAXVALUE) que debe quedar vacía
+- particionar(): migración de la tabla existente; la llave primaria pasa a
+  (id, fecha) porque MySQL exige que toda llave única incluya la columna de
+  particionado (uk_asistencia_unica ya la incluye)
+- rolar(): divide p_futuro para que existan PARTICIONES_ADELANTE periodos
+  después del actual (la corrida nocturna lo llama; sin particiones no hace nada)
+- archivar(): pasa las particiones anteriores a una fecha al archivo frío
+  (archivo_asistencias): EXCHANGE PARTITION a una tabla de paso
+  (asistencias_archivo_p202301), DROP PARTITION, escribir_mes por cada mes de
+  la tabla y DROP TABLE
+
+Las consultas sobre asistencias filtran con rangos sobre fecha (fecha =,
+BETWEEN, >= / <) y no con DATE()/YEAR() sobre la columna: así MySQL lee solo
+las particiones del rango.
+"""
+import logging
+import re
+from datetime import date
+
+from app.config import asistencias_config
+from app.core.database.query_executor import query_executor
+from app.features.asistencias.services.archivo_asistencias import archivo_asistencias
+
+logger = logging.getLogger(__name__)
+
+PARTICION_FUTURO = 'p_futuro'
+NOMBRE_VALIDO = re.compile(r'^p\w+$')
+
+
+def inicio_periodo(fecha, granularidad):
+    """Primer día del mes (o del año) de la fecha"""
+    if granularidad == 'anual':
+        return date(fecha.year, 1, 1)
+    return date(fecha.year, fecha.month, 1)
+
+
+def siguiente_periodo(inicio, granularidad):
+    """Primer día del periodo siguiente"""
+    if granularidad == 'anual':
+        return date(inicio.year + 1, 1, 1)
+    return date(inicio.year + inicio.month // 12, inicio.month % 12 + 1, 1)
+
+
+def _nombre_particion(inicio, granularidad):
+    return f"p{inicio:%Y}" if granularidad == 'anual' else f"p{inicio:%Y%m}"
+
+
+class ParticionesAsistenciasUseCase:
+    """Administra las particiones por fecha de asistencias"""
+
+    def __init__(self, granularidad=None, adelante=None):
+        self.granularidad = granularidad or asistencias_config.PARTICIONES_GRANULARIDAD
+        self.adelante = asistencias_config.PARTICIONES_ADELANTE if adelante is None else adelante
+
+    def estado(self):
+        """
+        Particiones actuales de asistencias
+
+        Returns:
+            tuple: ({'particionada', 'por_fecha', 'particiones': [{'nombre', 'hasta', 'filas'}]}, error)
+                   hasta = límite exclusivo (date) o None para MAXVALUE; filas es estimado
+        """
+        filas, error = query_executor.ejecutar(
+            "SELECT PARTITION_NAME AS nombre, PARTITION_METHOD AS metodo, "
+            "PARTITION_EXPRESSION AS expresion, PARTITION_DESCRIPTION AS descripcion, TABLE_ROWS AS filas "
+            "FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'asistencias' "
+            "ORDER BY PARTITION_ORDINAL_POSITION"
+        )
+        if error:
+            return None, f"Error al consultar particiones: {error}"
+
+        filas = [fila for fila in filas if fila['nombre']]
+        por_fecha = all(
+            fila['metodo'] == 'RANGE COLUMNS' and fila['expresion'].strip('`') == 'fecha' for fila in filas
+        )
+        particiones = []
+        if por_fecha:
+            for fila in filas:
+                descripcion = fila['descripcion'] or ''
+                hasta = None if descripcion.upper() == 'MAXVALUE' else date.fromisoformat(descripcion.strip("'"))
+                particiones.append({'nombre': fila['nombre'], 'hasta': hasta, 'filas': fila['filas']})
+
+        return {'particionada': bool(filas), 'por_fecha': por_fecha, 'particiones': particiones}, None
+
+    def sentencia_particionar(self, hoy=None):
+        """
+        ALTER TABLE que particiona la tabla existente (desde el mes de la checada
+        más antigua hasta PARTICIONES_ADELANTE periodos después del actual)
+
+        Returns:
+            tuple: (sql, error)
+        """
+        resultado, error = query_executor.ejecutar("SELECT MIN(fecha) AS primera FROM asistencias")
+        if error:
+            return None, f"Error al consultar asistencias: {error}"
+        hoy = hoy or date.today()
+        primera = resultado[0]['primera'] if resultado and resultado[0]['primera'] else hoy
+        if isinstance(primera, str):
+            primera = date.fromisoformat(primera)
+
+        definiciones = self._definiciones(inicio_periodo(primera, self.granularidad), self._objetivo(hoy))
+        return (
+            "ALTER TABLE asistencias\n"
+            "    DROP PRIMARY KEY,\n"
+            "    ADD PRIMARY KEY (id, fecha)\n"
+            "PARTITION BY RANGE COLUMNS(fecha) (\n    " + ",\n    ".join(definiciones) + "\n)"
+        ), None
+
+    def particionar(self, hoy=None):
+        """
+        Particiona la tabla existente (reconstruye la tabla: ejecutar fuera del
+        horario de checadas)
+
+        Returns:
+            tuple: (particiones creadas, error)
+        """
+        estado, error = self.estado()
+        if error:
+            return 0, error
+        if estado['particionada']:
+            return 0, "La tabla asistencias ya está particionada"
+
+        sql, error = self.sentencia_particionar(hoy)
+        if error:
+            return 0, error
+        _, error = query_executor.ejecutar(sql)
+        if error:
+            return 0, f"Error al particionar asistencias: {error}"
+
+        creadas = sql.count('PARTITION p')
+        logger.warning("Tabla asistencias particionada por fecha: %s particiones", creadas)
+        return creadas, None
+
+    def rolar(self, hoy=None):
+        """
+        Crea las particiones que faltan hasta PARTICIONES_ADELANTE periodos
+        después del actual (divide la partición MAXVALUE)
+
+        Returns:
+            tuple: (nombres de las particiones creadas, error)
+        """
+        estado, error = self.estado()
+        if error:
+            return None, error
+        if not estado['particionada']:
+            return [], None
+        if not estado['por_fecha']:
+            return None, "asistencias está particionada con otro esquema (se esperaba RANGE COLUMNS(fecha))"
+
+        particiones = estado['particiones']
+        futuro = next((p['nombre'] for p in particiones if p['hasta'] is None), None)
+        if futuro is None:
+            return None, "asistencias no tiene partición MAXVALUE para dividir"
+
+        hoy = hoy or date.today()
+        # Sin particiones con fecha (todas archivadas) se empieza en el periodo actual
+        ultima = max(
+            (p['hasta'] for p in particiones if p['hasta'] is not None),
+            default=inicio_periodo(hoy, self.granularidad)
+        )
+        definiciones = self._definiciones(ultima, self._objetivo(hoy), futuro)
+        if len(definiciones) == 1:
+            return [], None
+
+        _, error = query_executor.ejecutar(
+            f"ALTER TABLE asistencias REORGANIZE PARTITION {futuro} INTO ({', '.join(definiciones)})"
+        )
+        if error:
+            return None, f"Error al crear particiones: {error}"
+
+        creadas = [definicion.split()[1] for definicion in definiciones[:-1]]
+        logger.info("Particiones de asistencias creadas: %s", ', '.join(creadas))
+        return creadas, None
+
+    def archivar(self, antes_de):
+        """
+        Pasa al archivo frío las particiones con fechas anteriores a antes_de
+
+        Cada partición se intercambia con una tabla vacía idéntica
+        (asistencias_archivo_<partición>) y se borra de asistencias ya vacía;
+        luego las filas de esa tabla se escriben mes por mes con
+        archivo_asistencias.escribir_mes, donde las leen el listado y la
+        bitácora, y la tabla se borra. Las tablas que dejó una corrida
+        interrumpida se pasan al archivo antes de tocar más particiones.
+
+        Args:
+            antes_de (date): Se archivan particiones cuyo límite es <= antes_de
+                             (nunca la del periodo actual ni las futuras)
+
+        Returns:
+            tuple: (lista de {'particion', 'filas', 'meses'}, error)
+        """
+        estado, error = self.estado()
+        if error:
+            return None, error
+        if not estado['particionada'] or not estado['por_fecha']:
+            return None, "asistencias no está particionada por fecha"
+
+        archivadas = []
+        pendientes, error = self._tablas_de_paso()
+        if error:
+            return archivadas, error
+        for tabla in pendientes:
+            archivada, error = self._pasar_al_archivo(tabla)
+            if error:
+                return archivadas, error
+            archivadas.append(archivada)
+
+        limite = min(antes_de, inicio_periodo(date.today(), self.granularidad))
+        for particion in estado['particiones']:
+            if particion['hasta'] is None or particion['hasta'] > limite:
+                continue
+            nombre = particion['nombre']
+            if not NOMBRE_VALIDO.match(nombre):
+                return archivadas, f"Nombre de partición inesperado: {nombre}"
+            tabla = f"{asistencias_config.PREFIJO_TABLA_ARCHIVO}{nombre}"
+
+            for sql in (
+                f"CREATE TABLE {tabla} LIKE asistencias",
+                f"ALTER TABLE {tabla} REMOVE PARTITIONING",
+                f"ALTER TABLE asistencias EXCHANGE PARTITION {nombre} WITH TABLE {tabla}",
+                f"ALTER TABLE asistencias DROP PARTITION {nombre}",
+            ):
+                _, error = query_executor.ejecutar(sql)
+                if error:
+                    return archivadas, f"Error al archivar {nombre} ({sql}): {error}"
+
+            archivada, error = self._pasar_al_archivo(tabla)
+            if error:
+                return archivadas, error
+            archivadas.append(archivada)
+        return archivadas, None
+
+    def _tablas_de_paso(self):
+        """Tablas asistencias_archivo_p* que quedaron de una corrida interrumpida"""
+        prefijo = asistencias_config.PREFIJO_TABLA_ARCHIVO
+        filas, error = query_executor.ejecutar(
+            "SELECT TABLE_NAME AS tabla FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME LIKE %s ORDER BY TABLE_NAME",
+            (prefijo.replace('_', r'\_') + 'p%',)
+        )
+        if error:
+            return None, f"Error al consultar tablas de archivo: {error}"
+        return [
+            fila['tabla'] for fila in filas
+            if NOMBRE_VALIDO.match(fila['tabla'][len(prefijo):])
+        ], None
+
+    def _pasar_al_archivo(self, tabla):
+        """
+        Escribe en el archivo frío las filas de una tabla de paso, mes por mes,
+        y la borra (si se interrumpe, escribir_mes no duplica lo ya escrito)
+
+        Returns:
+            tuple: ({'particion', 'filas', 'meses'}, error)
+        """
+        resultado, error = query_executor.ejecutar(
+            f"SELECT MIN(fecha) AS primera, MAX(fecha) AS ultima, COUNT(*) AS filas FROM {tabla}"
+        )
+        if error:
+            return None, f"Error al consultar {tabla}: {error}"
+        primera, ultima, total = resultado[0]['primera'], resultado[0]['ultima'], resultado[0]['filas']
+
+        meses = []
+        if total:
+            if isinstance(primera, str):
+                primera, ultima = date.fromisoformat(primera), date.fromisoformat(ultima)
+            mes = inicio_periodo(primera, 'mensual')
+            while mes <= ultima:
+                siguiente = siguiente_periodo(mes, 'mensual')
+                try:
+                    filas = list(query_executor.ejecutar_stream(
+                        "SELECT id, num_trabajador, fecha, hora, checador, created_at "
+                        f"FROM {tabla} WHERE fecha >= %s AND fecha < %s",
+                        (mes, siguiente)
+                    ))
+                except Exception as e:
+                    return None, f"Error al leer {tabla} ({mes:%Y-%m}): {e}"
+                if filas:
+                    _, error = archivo_asistencias.escribir_mes(mes, filas)
+                    if error:
+                        return None, error
+                    meses.append(f"{mes:%Y-%m}")
+                mes = siguiente
+
+        _, error = query_executor.ejecutar(f"DROP TABLE {tabla}")
+        if error:
+            return None, f"Error al borrar {tabla}: {error}"
+
+        particion = tabla[len(asistencias_config.PREFIJO_TABLA_ARCHIVO):]
+        logger.warning(
+            "Partición %s de asistencias archivada: %s filas en el archivo frío (%s)",
+            particion, total, ', '.join(meses) or 'sin filas'
+        )
+        return {'particion': particion, 'filas': total, 'meses': meses}, None
+
+    def _objetivo(self, hoy):
+        """Límite que debe alcanzar la última partición con fecha"""
+        objetivo = siguiente_periodo(inicio_periodo(hoy, self.granularidad), self.granularidad)
+        for _ in range(self.adelante):
+            objetivo = siguiente_periodo(objetivo, self.granularidad)
+        return objetivo
+
+    def _definiciones(self, desde, hasta, futuro=PARTICION_FUTURO):
+        """Definiciones de particiones de desde a hasta más la MAXVALUE"""
+        definiciones = []
+        inicio = desde
+        while inicio < hasta:
+            siguiente = siguiente_periodo(inicio, self.granularidad)
+            definiciones.append(
+                f"PARTITION {_nombre_particion(inicio, self.granularidad)} VALUES LESS THAN ('{siguiente.isoformat()}')"
+            )
+            inicio = siguiente
+        definiciones.append(f"PARTITION {futuro} VALUES LESS THAN (MAXVALUE)")
+        return definiciones
+
+
+# Instancia singleton
+particiones_asistencias_use_case = ParticionesAsistenciasUseCase()
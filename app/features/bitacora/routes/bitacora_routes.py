@@ -1,35 +1,39 @@
-from flask import Blueprint, render_template, request, jsonify, send_file
+from flask import Blueprint, render_template, request, jsonify, send_file, Response, stream_with_context
+import json
 import logging
+import os
 from app.features.bitacora.services.procesar_bitacora_use_case import ProcesarBitacoraUseCase
 from app.features.bitacora.services.procesar_bitacora_masivo_use_case import procesar_bitacora_masivo_use_case
+from app.features.bitacora.services.procesar_bitacora_nocturna_use_case import procesar_bitacora_nocturna_use_case
 from app.features.bitacora.services.listar_bitacora_use_case import ListarBitacoraUseCase
 from app.features.bitacora.services.obtener_horario_asignado_use_case import ObtenerHorarioAsignadoUseCase
 from app.features.bitacora.services.generar_pdf_bitacora_use_case import generar_pdf_bitacora_use_case
 from app.features.bitacora.services.generar_pdf_masivo_bitacora_use_case import generar_pdf_masivo_bitacora_use_case
 from app.features.bitacora.services.enviar_correo_bitacora_use_case import enviar_correo_bitacora_use_case
+from app.features.bitacora.services.enviar_correo_masivo_bitacora_use_case import enviar_correo_masivo_bitacora_use_case
+from app.features.bitacora.services.bandeja_correo_use_case import bandeja_correo_use_case
 from app.features.bitacora.services.editar_registro_bitacora_use_case import editar_registro_bitacora_use_case
 
 # Configurar logger
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
 bitacora_bp = Blueprint('bitacora', __name__, url_prefix='/bitacora', template_folder='../templates')
 
-logger.info(f"[BITACORA] Blueprint created")
+logger.info("[BITACORA] Blueprint created")
 
 @bitacora_bp.route('/')
 def index():
     """Página principal de bitácora"""
     try:
         logger.info("[BITACORA] Accediendo a ruta /bitacora/")
-        logger.debug(f"[BITACORA] Template folder: {bitacora_bp.template_folder}")
-        logger.debug(f"[BITACORA] Renderizando: bitacora/index.html")
+        logger.debug("[BITACORA] Template folder: %s", bitacora_bp.template_folder)
+        logger.debug("[BITACORA] Renderizando: bitacora/index.html")
         return render_template('bitacora/index.html')
     except Exception as e:
-        logger.error(f"[BITACORA] Error en index(): {str(e)}")
-        logger.error(f"[BITACORA] Exception type: {type(e).__name__}")
+        logger.error("[BITACORA] Error en index(): %s", str(e))
+        logger.error("[BITACORA] Exception type: %s", type(e).__name__)
         import traceback
-        logger.error(f"[BITACORA] Traceback: {traceback.format_exc()}")
+        logger.error("[BITACORA] Traceback: %s", traceback.format_exc())
         return jsonify({
             'success': False,
             'message': f'Error al cargar bitácora: {str(e)}'
@@ -45,7 +49,7 @@ def obtener_horario():
         fecha_inicio = data.get('fecha_inicio')
         fecha_fin = data.get('fecha_fin')
         
-        logger.debug(f"[BITACORA] Parámetros: trabajador={num_trabajador}, inicio={fecha_inicio}, fin={fecha_fin}")
+        logger.debug("[BITACORA] Parámetros: trabajador=%s, inicio=%s, fin=%s", num_trabajador, fecha_inicio, fecha_fin)
         
         if not all([num_trabajador, fecha_inicio, fecha_fin]):
             logger.warning("[BITACORA] Datos incompletos")
@@ -59,7 +63,7 @@ def obtener_horario():
         horarios, error = use_case.ejecutar(num_trabajador, fecha_inicio, fecha_fin)
         
         if error:
-            logger.error(f"[BITACORA] Error en caso de uso: {error}")
+            logger.error("[BITACORA] Error en caso de uso: %s", error)
             return jsonify({
                 'success': False,
                 'message': error
@@ -72,15 +76,15 @@ def obtener_horario():
                 'message': 'No se encontró horario asignado para este trabajador en el rango de fechas'
             }), 404
         
-        logger.info(f"[BITACORA] Horario obtenido exitosamente")
+        logger.info("[BITACORA] Horario obtenido exitosamente")
         return jsonify({
             'success': True,
             'horario': horarios[0] if horarios else None
         })
         
     except Exception as e:
-        logger.error(f"[BITACORA] Error en obtener_horario(): {str(e)}")
-        logger.error(f"[BITACORA] Traceback: {__import__('traceback').format_exc()}")
+        logger.error("[BITACORA] Error en obtener_horario(): %s", str(e))
+        logger.error("[BITACORA] Traceback: %s", __import__('traceback').format_exc())
         return jsonify({
             'success': False,
             'message': f'Error al obtener horario: {str(e)}'
@@ -96,7 +100,7 @@ def procesar_bitacora():
         fecha_inicio_str = data.get('fecha_inicio')
         fecha_fin_str = data.get('fecha_fin')
         
-        logger.debug(f"[BITACORA] Parámetros: trabajador={num_trabajador}, inicio={fecha_inicio_str}, fin={fecha_fin_str}")
+        logger.debug("[BITACORA] Parámetros: trabajador=%s, inicio=%s, fin=%s", num_trabajador, fecha_inicio_str, fecha_fin_str)
         
         if not all([num_trabajador, fecha_inicio_str, fecha_fin_str]):
             logger.warning("[BITACORA] Datos incompletos en procesar")
@@ -111,7 +115,7 @@ def procesar_bitacora():
             fecha_inicio = datetime.strptime(fecha_inicio_str, '%Y-%m-%d').date()
             fecha_fin = datetime.strptime(fecha_fin_str, '%Y-%m-%d').date()
         except ValueError as e:
-            logger.error(f"[BITACORA] Error al parsear fechas: {e}")
+            logger.error("[BITACORA] Error al parsear fechas: %s", e)
             return jsonify({
                 'success': False,
                 'message': 'Formato de fecha inválido. Use YYYY-MM-DD'
@@ -122,7 +126,7 @@ def procesar_bitacora():
         resultado, error = use_case.ejecutar(num_trabajador, fecha_inicio, fecha_fin)
         
         if error:
-            logger.error(f"[BITACORA] Error en procesar: {error}")
+            logger.error("[BITACORA] Error en procesar: %s", error)
             return jsonify({
                 'success': False,
                 'message': error
@@ -153,7 +157,7 @@ def procesar_bitacora():
         
         mensaje = "Bitácora procesada exitosamente. " + ", ".join(mensaje_partes) + "."
         
-        logger.info(f"[BITACORA] {mensaje}")
+        logger.info("[BITACORA] %s", mensaje)
         return jsonify({
             'success': True,
             'message': mensaje,
@@ -162,14 +166,14 @@ def procesar_bitacora():
         })
         
     except ValueError as e:
-        logger.error(f"[BITACORA] ValueError en procesar: {str(e)}")
+        logger.error("[BITACORA] ValueError en procesar: %s", str(e))
         return jsonify({
             'success': False,
             'message': str(e)
         }), 400
     except Exception as e:
-        logger.error(f"[BITACORA] Error en procesar_bitacora(): {str(e)}")
-        logger.error(f"[BITACORA] Traceback: {__import__('traceback').format_exc()}")
+        logger.error("[BITACORA] Error en procesar_bitacora(): %s", str(e))
+        logger.error("[BITACORA] Traceback: %s", __import__('traceback').format_exc())
         return jsonify({
             'success': False,
             'message': f'Error al procesar bitácora: {str(e)}'
@@ -179,7 +183,7 @@ def procesar_bitacora():
 def listar_bitacora():
     """Lista registros de bitácora con filtros opcionales"""
     try:
-        logger.info(f"[BITACORA] {request.method} /bitacora/listar")
+        logger.info("[BITACORA] %s /bitacora/listar", request.method)
         
         # Obtener parámetros dependiendo del método
         if request.method == 'POST':
@@ -206,7 +210,7 @@ def listar_bitacora():
         if fecha_fin_str:
             fecha_fin = datetime.strptime(fecha_fin_str, '%Y-%m-%d').date()
         
-        logger.debug(f"[BITACORA] Filtros: trabajador={num_trabajador}, inicio={fecha_inicio}, fin={fecha_fin}, codigo={codigo_incidencia}")
+        logger.debug("[BITACORA] Filtros: trabajador=%s, inicio=%s, fin=%s, codigo=%s", num_trabajador, fecha_inicio, fecha_fin, codigo_incidencia)
         
         use_case = ListarBitacoraUseCase()
         logger.debug("[BITACORA] Ejecutando ListarBitacoraUseCase")
@@ -217,7 +221,7 @@ def listar_bitacora():
             codigo_incidencia=codigo_incidencia
         )
         
-        logger.info(f"[BITACORA] Listado obtenido: {len(registros or [])} registros")
+        logger.info("[BITACORA] Listado obtenido: %s registros", len(registros or []))
         
         # Convertir registros a diccionarios para JSON
         registros_dict = [reg.to_dict() for reg in registros] if registros else []
@@ -228,8 +232,8 @@ def listar_bitacora():
         })
         
     except Exception as e:
-        logger.error(f"[BITACORA] Error en listar_bitacora(): {str(e)}")
-        logger.error(f"[BITACORA] Traceback: {__import__('traceback').format_exc()}")
+        logger.error("[BITACORA] Error en listar_bitacora(): %s", str(e))
+        logger.error("[BITACORA] Traceback: %s", __import__('traceback').format_exc())
         return jsonify({
             'success': False,
             'message': f'Error al listar bitácora: {str(e)}'
@@ -247,7 +251,7 @@ def generar_pdf():
         fecha_inicio = data.get('fecha_inicio', '')
         fecha_fin = data.get('fecha_fin', '')
         
-        logger.debug(f"[BITACORA] Generando PDF para {len(registros_dict)} registros")
+        logger.debug("[BITACORA] Generando PDF para %s registros", len(registros_dict))
         
         if not registros_dict:
             return jsonify({
@@ -298,7 +302,7 @@ def generar_pdf():
         )
         
         if error:
-            logger.error(f"[BITACORA] Error generando PDF: {error}")
+            logger.error("[BITACORA] Error generando PDF: %s", error)
             return jsonify({
                 'success': False,
                 'message': error
@@ -314,8 +318,8 @@ def generar_pdf():
         )
         
     except Exception as e:
-        logger.error(f"[BITACORA] Error en generar_pdf(): {str(e)}")
-        logger.error(f"[BITACORA] Traceback: {__import__('traceback').format_exc()}")
+        logger.error("[BITACORA] Error en generar_pdf(): %s", str(e))
+        logger.error("[BITACORA] Traceback: %s", __import__('traceback').format_exc())
         return jsonify({
             'success': False,
             'message': f'Error al generar PDF: {str(e)}'
@@ -331,7 +335,7 @@ def generar_pdf_masivo():
         fecha_inicio = data.get('fecha_inicio', '')
         fecha_fin = data.get('fecha_fin', '')
         
-        logger.debug(f"[BITACORA] Generando PDF masivo para {len(num_trabajadores)} trabajadores")
+        logger.debug("[BITACORA] Generando PDF masivo para %s trabajadores", len(num_trabajadores))
         
         if not num_trabajadores:
             return jsonify({
@@ -345,32 +349,35 @@ def generar_pdf_masivo():
                 'message': 'Debe especificar fechas de inicio y fin'
             }), 400
         
-        # Generar PDF masivo
-        buffer, error = generar_pdf_masivo_bitacora_use_case.ejecutar(
+        # Generar PDF masivo (archivo temporal, se elimina al terminar de enviarlo)
+        archivo, error = generar_pdf_masivo_bitacora_use_case.ejecutar(
             num_trabajadores=num_trabajadores,
             fecha_inicio=fecha_inicio,
             fecha_fin=fecha_fin
         )
         
         if error:
-            logger.error(f"[BITACORA] Error generando PDF masivo: {error}")
+            logger.error("[BITACORA] Error generando PDF masivo: %s", error)
             return jsonify({
                 'success': False,
                 'message': error
             }), 500
         
-        # Enviar PDF
-        logger.info(f"[BITACORA] PDF masivo generado exitosamente ({len(num_trabajadores)} trabajadores)")
-        return send_file(
-            buffer,
+        # Enviar PDF en bloques desde el archivo temporal
+        logger.info("[BITACORA] PDF masivo generado exitosamente (%s trabajadores)", len(num_trabajadores))
+        tamano = os.fstat(archivo.fileno()).st_size
+        response = send_file(
+            archivo,
             mimetype='application/pdf',
             as_attachment=True,
             download_name=f'registro_checadas_{len(num_trabajadores)}trabajadores_{fecha_inicio}_{fecha_fin}.pdf'
         )
+        response.content_length = tamano
+        return response
         
     except Exception as e:
-        logger.error(f"[BITACORA] Error en generar_pdf_masivo(): {str(e)}")
-        logger.error(f"[BITACORA] Traceback: {__import__('traceback').format_exc()}")
+        logger.error("[BITACORA] Error en generar_pdf_masivo(): %s", str(e))
+        logger.error("[BITACORA] Traceback: %s", __import__('traceback').format_exc())
         return jsonify({
             'success': False,
             'message': f'Error al generar PDF masivo: {str(e)}'
@@ -384,7 +391,7 @@ def procesar_masivo():
         logger.info("[BITACORA] POST /procesar-masivo - Iniciando procesamiento masivo")
         
         data = request.get_json()
-        logger.info(f"[BITACORA] Data recibida: {data}")
+        logger.info("[BITACORA] Data recibida: %s", data)
         
         # Validar datos
         num_trabajadores = data.get('num_trabajadores', [])
@@ -408,8 +415,8 @@ def procesar_masivo():
         fecha_inicio = datetime.strptime(fecha_inicio_str, '%Y-%m-%d').date()
         fecha_fin = datetime.strptime(fecha_fin_str, '%Y-%m-%d').date()
         
-        logger.info(f"[BITACORA] Procesando {len(num_trabajadores)} trabajadores")
-        logger.info(f"[BITACORA] Período: {fecha_inicio} a {fecha_fin}")
+        logger.info("[BITACORA] Procesando %s trabajadores", len(num_trabajadores))
+        logger.info("[BITACORA] Período: %s a %s", fecha_inicio, fecha_fin)
         
         # Procesar
         resultados, error = procesar_bitacora_masivo_use_case.ejecutar(
@@ -419,7 +426,7 @@ def procesar_masivo():
         )
         
         if error:
-            logger.error(f"[BITACORA] Error en procesamiento masivo: {error}")
+            logger.error("[BITACORA] Error en procesamiento masivo: %s", error)
             return jsonify({
                 'success': False,
                 'message': error
@@ -436,8 +443,8 @@ def procesar_masivo():
         if total_fallidos > 0:
             mensaje += f", {total_fallidos} con errores"
         
-        logger.info(f"[BITACORA] {mensaje}")
-        logger.info(f"[BITACORA] Total: {total_insertados} nuevos, {total_actualizados} actualizados, {total_registros} registros")
+        logger.info("[BITACORA] %s", mensaje)
+        logger.info("[BITACORA] Total: %s nuevos, %s actualizados, %s registros", total_insertados, total_actualizados, total_registros)
         
         return jsonify({
             'success': True,
@@ -453,14 +460,34 @@ def procesar_masivo():
         })
         
     except Exception as e:
-        logger.error(f"[BITACORA] Error en procesar_masivo(): {str(e)}")
-        logger.error(f"[BITACORA] Traceback: {__import__('traceback').format_exc()}")
+        logger.error("[BITACORA] Error en procesar_masivo(): %s", str(e))
+        logger.error("[BITACORA] Traceback: %s", __import__('traceback').format_exc())
         return jsonify({
             'success': False,
             'message': f'Error al procesar bitácora masiva: {str(e)}'
         }), 500
 
 
+@bitacora_bp.route('/ejecuciones', methods=['GET'])
+def listar_ejecuciones():
+    """Historial de corridas del procesamiento nocturno"""
+    limite = request.args.get('limite', 20, type=int)
+
+    ejecuciones, error = procesar_bitacora_nocturna_use_case.listar_ejecuciones(limite=limite)
+
+    if error:
+        logger.error("[BITACORA] Error listando ejecuciones: %s", error)
+        return jsonify({
+            'success': False,
+            'message': error
+        }), 500
+
+    return jsonify({
+        'success': True,
+        'ejecuciones': ejecuciones
+    })
+
+
 @bitacora_bp.route('/enviar-correo', methods=['POST'])
 def enviar_correo():
     """Envía correo con PDF de bitácora adjunto"""
@@ -473,7 +500,7 @@ def enviar_correo():
         fecha_inicio = data.get('fecha_inicio')
         fecha_fin = data.get('fecha_fin')
         
-        logger.debug(f"[BITACORA] Enviando correo para trabajador {num_trabajador}")
+        logger.debug("[BITACORA] Enviando correo para trabajador %s", num_trabajador)
         
         if not all([num_trabajador, nombre_trabajador, fecha_inicio, fecha_fin]):
             return jsonify({
@@ -486,7 +513,7 @@ def enviar_correo():
         usar_html = request.json.get('usar_plantilla_html', None)
         
         # Ejecutar caso de uso
-        exito, error = enviar_correo_bitacora_use_case.ejecutar(
+        estado, error = enviar_correo_bitacora_use_case.ejecutar(
             num_trabajador=num_trabajador,
             nombre_trabajador=nombre_trabajador,
             fecha_inicio=fecha_inicio,
@@ -494,14 +521,23 @@ def enviar_correo():
             usar_plantilla_html=usar_html
         )
         
-        if not exito:
-            logger.error(f"[BITACORA] Error enviando correo: {error}")
+        if estado == 'fallido':
+            logger.error("[BITACORA] Error enviando correo: %s", error)
             return jsonify({
                 'success': False,
                 'message': error
             }), 500
         
-        logger.info(f"[BITACORA] Correo enviado exitosamente para trabajador {num_trabajador}")
+        if estado == 'encolado':
+            # Aceptado: el reintento en segundo plano lo entregará
+            logger.warning("[BITACORA] Correo de %s en bandeja de salida: %s", num_trabajador, error)
+            return jsonify({
+                'success': True,
+                'encolado': True,
+                'message': 'El servidor de correo no respondió; el correo quedó en bandeja de salida y se reintentará automáticamente'
+            }), 202
+        
+        logger.info("[BITACORA] Correo enviado exitosamente para trabajador %s", num_trabajador)
         
         return jsonify({
             'success': True,
@@ -509,24 +545,87 @@ def enviar_correo():
         })
         
     except Exception as e:
-        logger.error(f"[BITACORA] Error en enviar_correo(): {str(e)}")
-        logger.error(f"[BITACORA] Traceback: {__import__('traceback').format_exc()}")
+        logger.error("[BITACORA] Error en enviar_correo(): %s", str(e))
+        logger.error("[BITACORA] Traceback: %s", __import__('traceback').format_exc())
         return jsonify({
             'success': False,
             'message': f'Error al enviar correo: {str(e)}'
         }), 500
 
 
+@bitacora_bp.route('/enviar-correo-masivo', methods=['POST'])
+def enviar_correo_masivo():
+    """Envía correos con PDF de bitácora a varios trabajadores (progreso por SSE)"""
+    logger.info("[BITACORA] POST /bitacora/enviar-correo-masivo")
+    data = request.get_json() or {}
+    
+    num_trabajadores = data.get('num_trabajadores', [])
+    fecha_inicio = data.get('fecha_inicio')
+    fecha_fin = data.get('fecha_fin')
+    
+    if not num_trabajadores:
+        return jsonify({
+            'success': False,
+            'message': 'Debe seleccionar al menos un trabajador'
+        }), 400
+    
+    if not fecha_inicio or not fecha_fin:
+        return jsonify({
+            'success': False,
+            'message': 'Debe especificar fechas de inicio y fin'
+        }), 400
+    
+    # None = usar configuración guardada en email_settings.json
+    usar_html = data.get('usar_plantilla_html', None)
+    
+    def generar_eventos():
+        """Genera un evento SSE por destinatario"""
+        try:
+            for evento in enviar_correo_masivo_bitacora_use_case.ejecutar(
+                num_trabajadores, fecha_inicio, fecha_fin, usar_html
+            ):
+                yield f"data: {json.dumps(evento)}\n\n"
+        except Exception as e:
+            logger.error("[BITACORA] Error en enviar_correo_masivo(): %s", str(e))
+            yield f"data: {json.dumps({'error': f'{type(e).__name__}: {str(e)}', 'finalizado': True})}\n\n"
+    
+    return Response(
+        stream_with_context(generar_eventos()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+
+@bitacora_bp.route('/bandeja-correo', methods=['GET'])
+def bandeja_correo():
+    """Correos de la bandeja de salida por estado (pendiente, enviado, fallido)"""
+    resumen, error = bandeja_correo_use_case.resumen()
+    
+    if error:
+        return jsonify({
+            'success': False,
+            'message': error
+        }), 500
+    
+    return jsonify({
+        'success': True,
+        'data': resumen
+    })
+
+
 @bitacora_bp.route('/registro/<int:registro_id>', methods=['GET'])
 def obtener_registro(registro_id):
     """Obtiene un registro de bitácora por ID para edición"""
     try:
-        logger.info(f"[BITACORA] GET /bitacora/registro/{registro_id}")
+        logger.info("[BITACORA] GET /bitacora/registro/%s", registro_id)
         
         registro, error = editar_registro_bitacora_use_case.obtener_registro(registro_id)
         
         if error:
-            logger.error(f"[BITACORA] Error obteniendo registro: {error}")
+            logger.error("[BITACORA] Error obteniendo registro: %s", error)
             return jsonify({
                 'success': False,
                 'message': error
@@ -538,8 +637,8 @@ def obtener_registro(registro_id):
         })
         
     except Exception as e:
-        logger.error(f"[BITACORA] Error en obtener_registro(): {str(e)}")
-        logger.error(f"[BITACORA] Traceback: {__import__('traceback').format_exc()}")
+        logger.error("[BITACORA] Error en obtener_registro(): %s", str(e))
+        logger.error("[BITACORA] Traceback: %s", __import__('traceback').format_exc())
         return jsonify({
             'success': False,
             'message': f'Error al obtener registro: {str(e)}'
@@ -550,7 +649,7 @@ def obtener_registro(registro_id):
 def editar_registro(registro_id):
     """Edita un registro de bitácora manualmente y recalcula incidencias"""
     try:
-        logger.info(f"[BITACORA] POST /bitacora/registro/{registro_id}/editar")
+        logger.info("[BITACORA] POST /bitacora/registro/%s/editar", registro_id)
         data = request.get_json()
         
         checada1 = data.get('checada1')
@@ -559,9 +658,9 @@ def editar_registro(registro_id):
         checada4 = data.get('checada4')
         updatable = data.get('updatable', True)
         
-        logger.debug(f"[BITACORA] Editando registro {registro_id}")
-        logger.debug(f"[BITACORA] Checadas: {checada1}, {checada2}, {checada3}, {checada4}")
-        logger.debug(f"[BITACORA] Updatable: {updatable}")
+        logger.debug("[BITACORA] Editando registro %s", registro_id)
+        logger.debug("[BITACORA] Checadas: %s, %s, %s, %s", checada1, checada2, checada3, checada4)
+        logger.debug("[BITACORA] Updatable: %s", updatable)
         
         registro_actualizado, error = editar_registro_bitacora_use_case.ejecutar(
             registro_id=registro_id,
@@ -574,13 +673,13 @@ def editar_registro(registro_id):
         )
         
         if error:
-            logger.error(f"[BITACORA] Error editando registro: {error}")
+            logger.error("[BITACORA] Error editando registro: %s", error)
             return jsonify({
                 'success': False,
                 'message': error
             }), 400
         
-        logger.info(f"[BITACORA] Registro {registro_id} editado exitosamente")
+        logger.info("[BITACORA] Registro %s editado exitosamente", registro_id)
         
         return jsonify({
             'success': True,
@@ -589,8 +688,8 @@ def editar_registro(registro_id):
         })
         
     except Exception as e:
-        logger.error(f"[BITACORA] Error en editar_registro(): {str(e)}")
-        logger.error(f"[BITACORA] Traceback: {__import__('traceback').format_exc()}")
+        logger.error("[BITACORA] Error en editar_registro(): %s", str(e))
+        logger.error("[BITACORA] Traceback: %s", __import__('traceback').format_exc())
         return jsonify({
             'success': False,
             'message': f'Error al editar registro: {str(e)}'
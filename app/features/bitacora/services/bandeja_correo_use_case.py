@@ -0,0 +1,382 @@
+"""
+Caso de uso: Bandeja de salida de correos
+Guarda los correos que no se pudieron enviar por un fallo temporal y los
+reintenta en segundo plano
+
+- El mensaje MIME ya armado se guarda en CORREO_BANDEJA_DIR/<uuid>.eml y la
+  fila de correos_salida apunta a él (destinatario, intentos, siguiente_intento)
+- Backoff exponencial: CORREO_BANDEJA_BACKOFF_BASE × 2^(intentos - 1) ±20%,
+  hasta CORREO_BANDEJA_BACKOFF_MAX; tras CORREO_BANDEJA_MAX_INTENTOS intentos
+  o un error permanente (5xx) el correo queda como 'fallido'
+- Entre dos correos al mismo dominio pasan al menos CORREO_BANDEJA_ESPERA_DOMINIO
+  segundos (los pendientes se intercalan por dominio para no esperar de más)
+- Varios workers pueden revisar la bandeja a la vez: cada correo se toma con un
+  UPDATE condicional que adelanta siguiente_intento CORREO_BANDEJA_BLOQUEO
+  segundos (si el proceso muere, el correo vuelve a estar disponible)
+- El .eml se borra cuando el correo llega a un estado final (enviado o
+  fallido); el despachador barre cada hora los .eml sin correo pendiente (el
+  proceso murió antes de borrarlo o de encolarlo)
+"""
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from email.message import Message
+from email.utils import parseaddr
+from itertools import chain, zip_longest
+from typing import Dict, List, Optional
+
+from app.config.smtp_config import (
+    CORREO_BANDEJA_BACKOFF_BASE,
+    CORREO_BANDEJA_BACKOFF_MAX,
+    CORREO_BANDEJA_BLOQUEO,
+    CORREO_BANDEJA_DIR,
+    CORREO_BANDEJA_ESPERA_DOMINIO,
+    CORREO_BANDEJA_INTERVALO,
+    CORREO_BANDEJA_LOTE,
+    CORREO_BANDEJA_MAX_INTENTOS,
+    SMTP_CONFIG
+)
+from app.core.database.connection import db_connection
+from app.core.database.query_executor import QueryExecutor
+from app.core.metricas import CORREO_BANDEJA
+from app.core.smtp_pool import es_error_temporal, smtp_pool
+
+logger = logging.getLogger(__name__)
+
+# Largo máximo de ultimo_error que se guarda
+MAX_ERROR_GUARDADO = 1000
+
+
+class BandejaCorreoUseCase:
+    """Encola correos fallidos y los reintenta con backoff"""
+
+    def __init__(self):
+        self.query_executor = QueryExecutor(db_connection)
+        self.directorio = CORREO_BANDEJA_DIR
+        self.max_intentos = CORREO_BANDEJA_MAX_INTENTOS
+        self.backoff_base = CORREO_BANDEJA_BACKOFF_BASE
+        self.backoff_max = CORREO_BANDEJA_BACKOFF_MAX
+        self.espera_dominio = CORREO_BANDEJA_ESPERA_DOMINIO
+        self.bloqueo = CORREO_BANDEJA_BLOQUEO
+        self._ultimo_envio_dominio: Dict[str, float] = {}
+        self._lock = threading.Lock()  # Una revisión a la vez por proceso
+
+    # ------------------------------------------
+    # Encolar
+    # ------------------------------------------
+
+    def encolar(
+        self,
+        mensaje: Message,
+        num_trabajador: Optional[int] = None,
+        error: Optional[str] = None
+    ) -> tuple[bool, Optional[str]]:
+        """
+        Guarda un mensaje para reintentarlo (cuenta como primer intento fallido)
+
+        Args:
+            mensaje: Mensaje ya armado (To, From y Subject incluidos)
+            num_trabajador: Trabajador al que corresponde (consulta/auditoría)
+            error: Error del intento directo
+
+        Returns:
+            tuple: (éxito, error)
+        """
+        destinatario = parseaddr(mensaje['To'] or '')[1]
+        remitente = SMTP_CONFIG['from_email'] or parseaddr(mensaje['From'] or '')[1]
+        if '@' not in destinatario:
+            return False, f"Destinatario inválido: {mensaje['To']}"
+
+        ruta = os.path.join(self.directorio, f'{uuid.uuid4().hex}.eml')
+        try:
+            self._escribir(ruta, mensaje.as_bytes())
+        except OSError as e:
+            return False, f"No se pudo guardar el mensaje en la bandeja: {e}"
+
+        query = """
+            INSERT INTO correos_salida
+            (remitente, destinatario, dominio, asunto, num_trabajador, mensaje_ruta,
+             estado, intentos, siguiente_intento, ultimo_error)
+            VALUES (%s, %s, %s, %s, %s, %s, 'pendiente', 1, %s, %s)
+        """
+        params = (
+            remitente, destinatario, self._dominio(destinatario), (mensaje['Subject'] or '')[:255],
+            num_trabajador, ruta, self._ahora() + timedelta(seconds=self._backoff(1)),
+            (error or '')[:MAX_ERROR_GUARDADO]
+        )
+        _, error_bd = self.query_executor.ejecutar(query, params)
+        if error_bd:
+            self._borrar(ruta)
+            return False, f"No se pudo encolar el correo: {error_bd}"
+
+        CORREO_BANDEJA.inc(resultado='encolado')
+        logger.info("[BANDEJA] Correo a %s encolado para reintento (%s)", destinatario, error)
+        return True, None
+
+    # ------------------------------------------
+    # Reintentar
+    # ------------------------------------------
+
+    def procesar_pendientes(self, limite: Optional[int] = None) -> Dict[str, int]:
+        """
+        Intenta enviar los correos cuyo siguiente_intento ya pasó
+
+        Args:
+            limite: Máximo de correos a revisar (default: CORREO_BANDEJA_LOTE)
+
+        Returns:
+            dict: {'enviados', 'reintentos', 'fallidos'} de esta revisión
+        """
+        resumen = {'enviados': 0, 'reintentos': 0, 'fallidos': 0}
+
+        with self._lock:
+            query = """
+                SELECT id, remitente, destinatario, dominio, mensaje_ruta, intentos, siguiente_intento
+                FROM correos_salida
+                WHERE estado = 'pendiente' AND siguiente_intento <= %s
+                ORDER BY siguiente_intento
+                LIMIT %s
+            """
+            filas, error = self.query_executor.ejecutar(query, (self._ahora(), limite or CORREO_BANDEJA_LOTE))
+            if error:
+                logger.error("[BANDEJA] Error consultando pendientes: %s", error)
+                return resumen
+
+            for fila in self._intercalar_por_dominio(filas):
+                self._esperar_dominio(fila['dominio'])
+                if self._tomar(fila):
+                    resultado = self._intentar(fila)
+                    resumen[resultado] += 1
+
+        return resumen
+
+    def limpiar_huerfanos(self, antiguedad: float = 3600) -> tuple[int, Optional[str]]:
+        """
+        Borra los archivos de la bandeja que ya no tienen un correo pendiente
+
+        Quedan cuando el proceso muere entre marcar el estado final y borrar el
+        .eml, o entre guardarlo y encolarlo (también temporales de _escribir).
+
+        Args:
+            antiguedad: Solo archivos sin modificar en estos segundos (un .eml
+                        recién escrito todavía no tiene su fila)
+
+        Returns:
+            tuple: (archivos borrados, error)
+        """
+        try:
+            nombres = os.listdir(self.directorio)
+        except FileNotFoundError:
+            return 0, None
+
+        limite = time.time() - antiguedad
+        viejos = []
+        for nombre in nombres:
+            if not (nombre.endswith('.eml') or nombre.startswith('.tmp-')):
+                continue
+            ruta = os.path.join(self.directorio, nombre)
+            try:
+                if os.path.getmtime(ruta) < limite:
+                    viejos.append(ruta)
+            except OSError:
+                continue
+        if not viejos:
+            return 0, None
+
+        filas, error = self.query_executor.ejecutar(
+            "SELECT mensaje_ruta FROM correos_salida WHERE estado = 'pendiente'"
+        )
+        if error:
+            return 0, error
+        pendientes = {os.path.basename(fila['mensaje_ruta']) for fila in filas}
+
+        borrados = 0
+        for ruta in viejos:
+            if os.path.basename(ruta) not in pendientes:
+                self._borrar(ruta)
+                borrados += 1
+        return borrados, None
+
+    def resumen(self) -> tuple[Optional[Dict[str, int]], Optional[str]]:
+        """Correos por estado"""
+        resultados, error = self.query_executor.ejecutar(
+            "SELECT estado, COUNT(*) AS total FROM correos_salida GROUP BY estado"
+        )
+        if error:
+            return None, error
+        return {row['estado']: row['total'] for row in resultados}, None
+
+    def _tomar(self, fila: dict) -> bool:
+        """Reserva el correo para este proceso (False si otro worker lo tomó primero)"""
+        resultado, error = self.query_executor.ejecutar(
+            "UPDATE correos_salida SET siguiente_intento = %s "
+            "WHERE id = %s AND estado = 'pendiente' AND siguiente_intento = %s",
+            (self._ahora() + timedelta(seconds=self.bloqueo), fila['id'], fila['siguiente_intento'])
+        )
+        if error:
+            logger.error("[BANDEJA] Error reservando correo %s: %s", fila['id'], error)
+            return False
+        return resultado['affected_rows'] == 1
+
+    def _intentar(self, fila: dict) -> str:
+        """Un intento de envío; retorna 'enviados', 'reintentos' o 'fallidos'"""
+        intentos = fila['intentos'] + 1
+        try:
+            with open(fila['mensaje_ruta'], 'rb') as f:
+                datos = f.read()
+        except OSError as e:
+            return self._marcar_fallido(fila, intentos, f"Mensaje no disponible: {e}")
+
+        try:
+            smtp_pool.enviar_crudo(fila['remitente'], [fila['destinatario']], datos)
+        except Exception as e:
+            if es_error_temporal(e) and intentos < self.max_intentos:
+                espera = self._backoff(intentos)
+                self.query_executor.ejecutar(
+                    "UPDATE correos_salida SET intentos = %s, siguiente_intento = %s, ultimo_error = %s WHERE id = %s",
+                    (intentos, self._ahora() + timedelta(seconds=espera), str(e)[:MAX_ERROR_GUARDADO], fila['id'])
+                )
+                CORREO_BANDEJA.inc(resultado='reintento')
+                logger.warning(
+                    "[BANDEJA] Correo %s a %s falló (intento %s): %s; siguiente en %.0fs",
+                    fila['id'], fila['destinatario'], intentos, e, espera
+                )
+                return 'reintentos'
+            return self._marcar_fallido(fila, intentos, str(e))
+
+        _, error_bd = self.query_executor.ejecutar(
+            "UPDATE correos_salida SET estado = 'enviado', intentos = %s, enviado_en = %s, ultimo_error = NULL "
+            "WHERE id = %s",
+            (intentos, self._ahora(), fila['id'])
+        )
+        if not error_bd:
+            self._borrar(fila['mensaje_ruta'])
+        CORREO_BANDEJA.inc(resultado='enviado')
+        return 'enviados'
+
+    def _marcar_fallido(self, fila: dict, intentos: int, error: str) -> str:
+        _, error_bd = self.query_executor.ejecutar(
+            "UPDATE correos_salida SET estado = 'fallido', intentos = %s, ultimo_error = %s WHERE id = %s",
+            (intentos, error[:MAX_ERROR_GUARDADO], fila['id'])
+        )
+        if not error_bd:
+            self._borrar(fila['mensaje_ruta'])  # Ya no se reintenta
+        CORREO_BANDEJA.inc(resultado='fallido')
+        logger.error("[BANDEJA] Correo %s a %s descartado tras %s intentos: %s", fila['id'], fila['destinatario'], intentos, error)
+        return 'fallidos'
+
+    # ------------------------------------------
+    # Límite por dominio
+    # ------------------------------------------
+
+    @staticmethod
+    def _intercalar_por_dominio(filas: List[dict]) -> List[dict]:
+        """a1, a2, b1 → a1, b1, a2: los dominios se turnan y casi no hay que esperar"""
+        por_dominio = defaultdict(list)
+        for fila in filas:
+            por_dominio[fila['dominio']].append(fila)
+        rondas = zip_longest(*por_dominio.values())
+        return [fila for fila in chain.from_iterable(rondas) if fila is not None]
+
+    def _esperar_dominio(self, dominio: str):
+        ultimo = self._ultimo_envio_dominio.get(dominio)
+        if ultimo is not None:
+            espera = self.espera_dominio - (time.monotonic() - ultimo)
+            if espera > 0:
+                time.sleep(espera)
+        self._ultimo_envio_dominio[dominio] = time.monotonic()
+
+    # ------------------------------------------
+    # Utilidades
+    # ------------------------------------------
+
+    def _backoff(self, intentos: int) -> float:
+        """Segundos hasta el siguiente intento tras `intentos` fallidos"""
+        espera = min(self.backoff_max, self.backoff_base * 2 ** (intentos - 1))
+        return espera * random.uniform(0.8, 1.2)
+
+    @staticmethod
+    def _ahora() -> datetime:
+        # Sin microsegundos: DATETIME de MySQL los redondea y _tomar() compara por igualdad
+        return datetime.now().replace(microsecond=0)
+
+    @staticmethod
+    def _dominio(destinatario: str) -> str:
+        return destinatario.rsplit('@', 1)[-1].lower()
+
+    def _escribir(self, ruta: str, datos: bytes):
+        """Escritura atómica (temporal + os.replace)"""
+        os.makedirs(self.directorio, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, prefix='.tmp-')
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                f.write(datos)
+            os.replace(temporal, ruta)
+        except OSError:
+            self._borrar(temporal)
+            raise
+
+    @staticmethod
+    def _borrar(ruta: str):
+        try:
+            os.unlink(ruta)
+        except OSError:
+            pass
+
+
+class DespachadorBandeja:
+    """Hilo que revisa la bandeja cada CORREO_BANDEJA_INTERVALO segundos (uno por proceso)"""
+
+    # Segundos entre barridos de archivos huérfanos (limpiar_huerfanos)
+    LIMPIEZA = 3600
+
+    def __init__(self, bandeja: BandejaCorreoUseCase, intervalo: float):
+        self.bandeja = bandeja
+        self.intervalo = intervalo
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def asegurar_iniciado(self):
+        """
+        Arranca el hilo si este proceso no lo tiene
+
+        Se llama en cada request (before_request): con gunicorn --preload el
+        hilo no puede crearse en el proceso maestro, no sobreviviría al fork.
+        """
+        if not self.intervalo or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._bucle, name='bandeja-correo', daemon=True).start()
+
+    def _bucle(self):
+        ultima_limpieza = time.monotonic()
+        while True:
+            time.sleep(self.intervalo)
+            try:
+                resumen = self.bandeja.procesar_pendientes()
+                if any(resumen.values()):
+                    logger.info("[BANDEJA] Revisión: %s", resumen)
+            except Exception as e:
+                logger.error("[BANDEJA] Error procesando pendientes: %s", e)
+
+            if time.monotonic() - ultima_limpieza >= self.LIMPIEZA:
+                ultima_limpieza = time.monotonic()
+                borrados, error = self.bandeja.limpiar_huerfanos()
+                if error:
+                    logger.error("[BANDEJA] Error limpiando archivos: %s", error)
+                elif borrados:
+                    logger.info("[BANDEJA] %s archivos sin correo pendiente borrados", borrados)
+
+
+# Instancias singleton
+bandeja_correo_use_case = BandejaCorreoUseCase()
+despachador_bandeja = DespachadorBandeja(bandeja_correo_use_case, CORREO_BANDEJA_INTERVALO)
@@ -0,0 +1,14 @@
+"""
+Caché en disco de PDFs de bitácora ya renderizados
+
+Las claves incluyen todo lo que cambia el PDF, así que nunca se invalida a mano:
+- Individual: títulos y renglones dibujados (generar_pdf_bitacora_use_case)
+- Masivo: número de registros y MAX(updated_at) por trabajador
+  (listar_bitacora_use_case.versiones_por_trabajadores)
+Ambas incluyen PDF_VERSION_PLANTILLA, el renderizador y la fecha de impresión.
+"""
+from app.config.bitacora_config import PDF_CACHE_DIR, PDF_CACHE_MAX_MB
+from app.core.cache_disco import CacheDisco
+
+# Instancia singleton
+cache_pdf_bitacora = CacheDisco('pdf_bitacora', PDF_CACHE_DIR, PDF_CACHE_MAX_MB * 1024 * 1024)
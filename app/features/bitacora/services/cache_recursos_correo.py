@@ -0,0 +1,101 @@
+"""
+Caché de recursos estáticos de correo (imágenes embebidas y adjuntos fijos)
+
+Los archivos (banner, logo, plantilla.pdf) son los mismos en cada correo: se
+leen y se codifican en base64 una vez y cada mensaje recibe una parte MIME
+nueva con el payload ya codificado (las partes no se comparten entre mensajes).
+
+Una entrada se descarta si cambia el mtime o el tamaño del archivo (p. ej. al
+subir otra imagen) o al guardar la configuración de correo (vaciar()).
+"""
+import base64
+import logging
+import mimetypes
+import threading
+from email.mime.base import MIMEBase
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _ParteCodificada(NamedTuple):
+    firma: Tuple[int, int]
+    payload: str  # base64 en líneas de 76 caracteres, igual que email.encoders
+
+
+class CacheRecursosCorreo:
+    """Partes MIME de archivos estáticos, codificadas una sola vez"""
+
+    def __init__(self):
+        self._partes: Dict[Path, _ParteCodificada] = {}
+        self._lock = threading.Lock()
+
+    def imagen_embebida(self, ruta: Path, content_id: str, nombre_archivo: str) -> Optional[MIMEBase]:
+        """
+        Imagen para referenciar desde el HTML como cid:<content_id>
+
+        Returns:
+            Parte MIME nueva, o None si el archivo no existe
+        """
+        # Detectar tipo MIME
+        tipo_mime, _ = mimetypes.guess_type(str(ruta))
+        if not tipo_mime or not tipo_mime.startswith('image/'):
+            tipo_mime = 'image/png'
+
+        parte = self._parte(ruta, tipo_mime)
+        if parte is None:
+            return None
+        parte.add_header('Content-ID', f'<{content_id}>')
+        parte.add_header('Content-Disposition', 'inline', filename=nombre_archivo)
+        return parte
+
+    def adjunto(self, ruta: Path, nombre_archivo: str) -> Optional[MIMEBase]:
+        """
+        Archivo adjunto (application/pdf, como la plantilla de instrucciones)
+
+        Returns:
+            Parte MIME nueva, o None si el archivo no existe
+        """
+        parte = self._parte(ruta, 'application/pdf')
+        if parte is None:
+            return None
+        parte.add_header('Content-Disposition', 'attachment', filename=nombre_archivo)
+        return parte
+
+    def vaciar(self):
+        """Descarta todas las partes codificadas"""
+        with self._lock:
+            self._partes.clear()
+
+    def _parte(self, ruta: Path, tipo_mime: str) -> Optional[MIMEBase]:
+        try:
+            stat = ruta.stat()
+        except FileNotFoundError:
+            return None
+        firma = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            codificada = self._partes.get(ruta)
+
+        if codificada is None or codificada.firma != firma:
+            codificada = self._codificar(ruta, firma)
+            with self._lock:
+                self._partes[ruta] = codificada
+
+        parte = MIMEBase(*tipo_mime.split('/', 1))
+        parte.set_payload(codificada.payload)
+        parte['Content-Transfer-Encoding'] = 'base64'
+        return parte
+
+    @staticmethod
+    def _codificar(ruta: Path, firma: Tuple[int, int]) -> _ParteCodificada:
+        with open(ruta, 'rb') as f:
+            payload = base64.encodebytes(f.read()).decode('ascii')
+
+        logger.debug("Recurso de correo codificado: %s (%s bytes)", ruta, firma[1])
+        return _ParteCodificada(firma, payload)
+
+
+# Instancia singleton
+cache_recursos_correo = CacheRecursosCorreo()
@@ -2,11 +2,14 @@
 Caso de uso: Calcular Incidencias
 Analiza checadas vs horario y determina el código de incidencia
 """
+import logging
 from app.config import bitacora_config
 from datetime import time, datetime, timedelta
 from typing import Dict, Optional
 from decimal import Decimal
 
+logger = logging.getLogger(__name__)
+
 
 class CalcularIncidenciasUseCase:
     """Calcula incidencias comparando checadas con horario esperado"""
@@ -82,10 +85,12 @@ class CalcularIncidenciasUseCase:
         if not checadas.get('tiene_checadas') or not checadas.get('checada1'):
             # Debug: verificar si se perdieron las checadas
             if checadas.get('tiene_checadas') and not checadas.get('checada1'):
-                print(f"[WARNING] tiene_checadas=True pero checada1=None")
-                print(f"  - Checadas originales: {checadas.get('num_checadas_originales', 0)}")
-                print(f"  - Checadas filtradas: {checadas.get('num_checadas', 0)}")
-                print(f"  - Se filtraron: {checadas.get('se_filtraron_duplicadas', False)}")
+                logger.warning(
+                    "tiene_checadas=True pero checada1=None (originales=%s, filtradas=%s, se_filtraron=%s)",
+                    checadas.get('num_checadas_originales', 0),
+                    checadas.get('num_checadas', 0),
+                    checadas.get('se_filtraron_duplicadas', False)
+                )
             
             # TEMPORAL: Si es descanso sin checadas, marcar como Omisión en lugar de Falta
             # para que se pueda identificar en el reporte
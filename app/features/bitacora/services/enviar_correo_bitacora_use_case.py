@@ -2,15 +2,20 @@
 Caso de uso: Enviar Correo con Bitácora
 Envía correo electrónico con PDF de bitácora adjunto + plantilla de instrucciones
 Soporta HTML enriquecido con imágenes embebidas
+
+construir_mensaje() y enviar() están separados para el envío masivo
+(enviar_correo_masivo_bitacora_use_case), que arma mensajes en paralelo y los
+envía por el mismo pool de sesiones SMTP. La configuración (cargar_configuracion)
+y las imágenes/adjuntos fijos (cache_recursos_correo) se leen y codifican una vez,
+no en cada correo.
 """
+import logging
 import smtplib
-import mimetypes
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
-from email.mime.image import MIMEImage
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
 
 from app.config.email_templates import (
@@ -22,10 +27,16 @@ from app.config.email_templates import (
     cargar_configuracion
 )
 from app.config.smtp_config import SMTP_CONFIG
+from app.core.smtp_pool import es_error_temporal, smtp_pool
+from app.features.bitacora.services.bandeja_correo_use_case import bandeja_correo_use_case
+from app.features.bitacora.services.cache_recursos_correo import cache_recursos_correo
 from app.features.bitacora.services.generar_pdf_bitacora_use_case import generar_pdf_bitacora_use_case
-from app.features.bitacora.services.listar_bitacora_use_case import ListarBitacoraUseCase
+from app.features.bitacora.models.bitacora_models import BitacoraRecord
+from app.features.bitacora.services.listar_bitacora_use_case import listar_bitacora_use_case
 from app.features.trabajadores.services.obtener_trabajador_use_case import obtener_trabajador_use_case
 
+logger = logging.getLogger(__name__)
+
 
 class EnviarCorreoBitacoraUseCase:
     """Envía correo electrónico con PDF de bitácora y plantilla adjuntos"""
@@ -47,31 +58,20 @@ class EnviarCorreoBitacoraUseCase:
             config = cargar_configuracion()
             nombre_archivo = config.get(clave_imagen)
             if not nombre_archivo:
-                print(f"No hay imagen configurada para: {clave_imagen}")
+                logger.warning("No hay imagen configurada para: %s", clave_imagen)
                 return False
                 
             ruta_imagen = obtener_ruta_imagen(nombre_archivo)
-            if not ruta_imagen.exists():
-                print(f"Imagen no encontrada: {ruta_imagen}")
+            # Parte MIME ya codificada (se lee del disco solo si la imagen cambió)
+            imagen = cache_recursos_correo.imagen_embebida(ruta_imagen, clave_imagen, nombre_archivo)
+            if imagen is None:
+                logger.warning("Imagen no encontrada: %s", ruta_imagen)
                 return False
             
-            # Detectar tipo MIME
-            mime_type, _ = mimetypes.guess_type(str(ruta_imagen))
-            if not mime_type or not mime_type.startswith('image/'):
-                mime_type = 'image/png'
-            
-            subtype = mime_type.split('/')[1]
-            
-            with open(ruta_imagen, 'rb') as f:
-                imagen = MIMEImage(f.read(), _subtype=subtype)
-                imagen.add_header('Content-ID', f'<{clave_imagen}>')
-                imagen.add_header('Content-Disposition', 'inline', 
-                                 filename=nombre_archivo)
-                mensaje_relacionado.attach(imagen)
-            
+            mensaje_relacionado.attach(imagen)
             return True
         except Exception as e:
-            print(f"Error adjuntando imagen {clave_imagen}: {e}")
+            logger.error("Error adjuntando imagen %s: %s", clave_imagen, e)
             return False
     
     def _crear_mensaje_html(self, plantilla_formateada: dict, 
@@ -141,16 +141,17 @@ class EnviarCorreoBitacoraUseCase:
         mensaje.attach(MIMEText(cuerpo, 'plain', 'utf-8'))
         return mensaje
     
-    def ejecutar(
+    def construir_mensaje(
         self,
         num_trabajador: int,
         nombre_trabajador: str,
         fecha_inicio: str,
         fecha_fin: str,
-        usar_plantilla_html: bool = None  # None = usar configuración guardada
-    ) -> tuple[bool, Optional[str]]:
+        usar_plantilla_html: bool = None,  # None = usar configuración guardada
+        registros: Optional[List[BitacoraRecord]] = None
+    ) -> tuple[Optional[MIMEMultipart], Optional[str]]:
         """
-        Envía correo con PDF de bitácora adjunto
+        Arma el correo (destinatario, plantilla, PDF de bitácora y adjuntos) sin enviarlo
         
         Args:
             num_trabajador: Número del trabajador
@@ -158,46 +159,45 @@ class EnviarCorreoBitacoraUseCase:
             fecha_inicio: Fecha inicio (YYYY-MM-DD)
             fecha_fin: Fecha fin (YYYY-MM-DD)
             usar_plantilla_html: Si True usa HTML, si False texto plano, si None usa config guardada
+            registros: Bitácora del trabajador ya consultada (envíos de varios trabajadores
+                       con listar_bitacora_use_case.ejecutar_por_trabajadores); None = consultarla
             
         Returns:
-            tuple: (éxito, error)
+            tuple: (mensaje listo para enviar, error)
         """
         try:
             # Cargar configuración
             config = cargar_configuracion()
-            print(f"[CORREO] Config cargada: usar_plantilla_html={config.get('usar_plantilla_html')}")
-            print(f"[CORREO] Config imágenes: encabezado={config.get('imagen_encabezado')}, secundaria={config.get('imagen_secundaria')}")
+            logger.debug("[CORREO] Config cargada: usar_plantilla_html=%s", config.get('usar_plantilla_html'))
+            logger.debug("[CORREO] Config imágenes: encabezado=%s, secundaria=%s", config.get('imagen_encabezado'), config.get('imagen_secundaria'))
             
             # Determinar si usar HTML (prioridad: parámetro > configuración)
             if usar_plantilla_html is None:
                 usar_plantilla_html = config.get('usar_plantilla_html', True)
             
-            print(f"[CORREO] usar_plantilla_html final: {usar_plantilla_html}")
+            logger.debug("[CORREO] usar_plantilla_html final: %s", usar_plantilla_html)
             
             # 1. Obtener datos del trabajador (incluye email)
             trabajador, error = obtener_trabajador_use_case.ejecutar(num_trabajador)
             
             if error:
-                return False, error
+                return None, error
             
             email_trabajador = trabajador.get('email')
             if not email_trabajador:
-                return False, f"El trabajador {nombre_trabajador} no tiene correo electrónico registrado"
-            
-            # 2. Obtener registros de bitácora
-            fecha_inicio_date = datetime.strptime(fecha_inicio, '%Y-%m-%d').date()
-            fecha_fin_date = datetime.strptime(fecha_fin, '%Y-%m-%d').date()
+                return None, f"El trabajador {nombre_trabajador} no tiene correo electrónico registrado"
             
-            listar_use_case = ListarBitacoraUseCase()
-            registros = listar_use_case.ejecutar(
-                num_trabajador=num_trabajador,
-                fecha_inicio=fecha_inicio_date,
-                fecha_fin=fecha_fin_date,
-                codigo_incidencia=None
-            )
+            # 2. Obtener registros de bitácora (en orden de fecha, igual que el PDF masivo)
+            if registros is None:
+                fecha_inicio_date = datetime.strptime(fecha_inicio, '%Y-%m-%d').date()
+                fecha_fin_date = datetime.strptime(fecha_fin, '%Y-%m-%d').date()
+                
+                [(_, registros)] = listar_bitacora_use_case.ejecutar_por_trabajadores(
+                    [num_trabajador], fecha_inicio_date, fecha_fin_date
+                )
             
             if not registros:
-                return False, "No hay registros de bitácora para el periodo especificado"
+                return None, "No hay registros de bitácora para el periodo especificado"
             
             # 3. Generar PDF de bitácora
             buffer, error = generar_pdf_bitacora_use_case.ejecutar(
@@ -209,7 +209,7 @@ class EnviarCorreoBitacoraUseCase:
             )
             
             if error:
-                return False, f"Error al generar PDF: {error}"
+                return None, f"Error al generar PDF: {error}"
             
             # 4. Preparar variables para la plantilla
             fecha_inicio_formatted = datetime.strptime(fecha_inicio, '%Y-%m-%d').strftime('%d/%m/%Y')
@@ -242,9 +242,9 @@ class EnviarCorreoBitacoraUseCase:
             }
             
             # 5. Seleccionar plantilla y crear mensaje
-            print(f"[CORREO] Creando mensaje. usar_plantilla_html={usar_plantilla_html}")
+            logger.debug("[CORREO] Creando mensaje. usar_plantilla_html=%s", usar_plantilla_html)
             if usar_plantilla_html:
-                print("[CORREO] Usando plantilla HTML enriquecida (REPORTE_ASISTENCIA_EMAIL)")
+                logger.debug("[CORREO] Usando plantilla HTML enriquecida (REPORTE_ASISTENCIA_EMAIL)")
                 plantilla = REPORTE_ASISTENCIA_EMAIL
                 plantilla_formateada = formatear_plantilla(plantilla, variables)
                 mensaje = self._crear_mensaje_html(
@@ -253,7 +253,7 @@ class EnviarCorreoBitacoraUseCase:
                     plantilla_formateada['asunto']
                 )
             else:
-                print("[CORREO] Usando plantilla texto plano (BITACORA_EMAIL)")
+                logger.debug("[CORREO] Usando plantilla texto plano (BITACORA_EMAIL)")
                 plantilla_formateada = formatear_plantilla(BITACORA_EMAIL, variables)
                 mensaje = self._crear_mensaje_simple(
                     plantilla_formateada['cuerpo_texto'],
@@ -271,30 +271,75 @@ class EnviarCorreoBitacoraUseCase:
             # 7. Adjuntar archivos configurados en la plantilla
             for nombre_adjunto in plantilla_formateada.get('adjuntos', []):
                 ruta_adjunto = obtener_ruta_adjunto(nombre_adjunto)
-                if ruta_adjunto.exists():
-                    with open(ruta_adjunto, 'rb') as f:
-                        adjunto = MIMEApplication(f.read(), _subtype='pdf')
-                        # Usar nombre amigable para el usuario
-                        nombre_display = 'Instrucciones_Bitacora.pdf' if 'plantilla' in nombre_adjunto.lower() else nombre_adjunto
-                        adjunto.add_header('Content-Disposition', 'attachment', filename=nombre_display)
-                        mensaje.attach(adjunto)
+                # Usar nombre amigable para el usuario
+                nombre_display = 'Instrucciones_Bitacora.pdf' if 'plantilla' in nombre_adjunto.lower() else nombre_adjunto
+                adjunto = cache_recursos_correo.adjunto(ruta_adjunto, nombre_display)
+                if adjunto is not None:
+                    mensaje.attach(adjunto)
             
-            # 8. Enviar correo
-            with smtplib.SMTP(SMTP_CONFIG['host'], SMTP_CONFIG['port']) as servidor:
-                if SMTP_CONFIG['use_tls']:
-                    servidor.starttls()
-                
-                servidor.login(SMTP_CONFIG['username'], SMTP_CONFIG['password'])
-                servidor.send_message(mensaje)
+            return mensaje, None
             
-            return True, None
-            
-        except smtplib.SMTPAuthenticationError:
-            return False, "Error de autenticación SMTP. Verifica usuario y contraseña en smtp_config.py"
-        except smtplib.SMTPException as e:
-            return False, f"Error al enviar correo: {str(e)}"
         except Exception as e:
-            return False, f"Error inesperado: {str(e)}"
+            return None, f"Error inesperado: {str(e)}"
+    
+    def ejecutar(
+        self,
+        num_trabajador: int,
+        nombre_trabajador: str,
+        fecha_inicio: str,
+        fecha_fin: str,
+        usar_plantilla_html: bool = None,  # None = usar configuración guardada
+        registros: Optional[List[BitacoraRecord]] = None
+    ) -> tuple[str, Optional[str]]:
+        """
+        Envía correo con PDF de bitácora adjunto
+        
+        Los argumentos son los de construir_mensaje(). El envío usa una sesión
+        del pool SMTP (app/core/smtp_pool.py) en lugar de conectar y autenticar
+        en cada correo.
+        
+        Returns:
+            tuple: ('enviado' | 'encolado' | 'fallido', error); un correo
+                   'encolado' quedó en la bandeja de salida y se entregará
+                   en un reintento, no es un fallo
+        """
+        mensaje, error = self.construir_mensaje(
+            num_trabajador, nombre_trabajador, fecha_inicio, fecha_fin, usar_plantilla_html, registros
+        )
+        if error:
+            return 'fallido', error
+        
+        return self.enviar_o_encolar(mensaje, num_trabajador)
+    
+    def enviar_o_encolar(self, mensaje: MIMEMultipart, num_trabajador: Optional[int] = None) -> tuple[str, Optional[str]]:
+        """
+        Envía un mensaje; si el fallo es temporal (conexión, 4xx) lo deja en
+        la bandeja de salida para que se reintente en segundo plano
+        
+        Returns:
+            tuple: ('enviado' | 'encolado' | 'fallido', error)
+        """
+        try:
+            smtp_pool.enviar(mensaje)
+            return 'enviado', None
+        except Exception as e:
+            error = self._describir_error(e)
+            if not es_error_temporal(e):
+                return 'fallido', error
+        
+        encolado, error_bandeja = bandeja_correo_use_case.encolar(mensaje, num_trabajador, error)
+        if not encolado:
+            logger.error("No se pudo encolar el correo de %s: %s", num_trabajador, error_bandeja)
+            return 'fallido', error
+        return 'encolado', f"{error}. El correo quedó en la bandeja de salida y se reintentará automáticamente"
+    
+    @staticmethod
+    def _describir_error(error: Exception) -> str:
+        if isinstance(error, smtplib.SMTPAuthenticationError):
+            return "Error de autenticación SMTP. Verifica usuario y contraseña en smtp_config.py"
+        if isinstance(error, smtplib.SMTPException):
+            return f"Error al enviar correo: {str(error)}"
+        return f"Error inesperado: {str(error)}"
 
 
 # Instancia singleton
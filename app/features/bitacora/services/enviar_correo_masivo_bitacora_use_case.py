@@ -0,0 +1,184 @@
+"""
+Caso de uso: Enviar Correos de Bitácora a varios trabajadores
+Envía a cada trabajador su correo con PDF de bitácora, reportando el
+resultado de cada destinatario a medida que termina (para SSE)
+
+- La bitácora se consulta por lotes de CORREO_MASIVO_LOTE trabajadores con
+  listar_bitacora_use_case.ejecutar_por_trabajadores() y cada lote se
+  materializa antes de enviar: el cursor no queda abierto durante el SMTP
+- CORREO_MASIVO_HILOS mensajes se arman (PDF + plantilla) y envían a la vez
+- Los envíos pasan por smtp_pool: sesiones autenticadas reutilizadas,
+  reconexión ante 421/timeouts y límite de correos por minuto
+- Los fallos temporales quedan en la bandeja de salida (bandeja_correo_use_case)
+  y se reportan como 'encolado'
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+
+from app.config.bitacora_config import CORREO_MASIVO_HILOS, CORREO_MASIVO_LOTE
+from app.features.bitacora.models.bitacora_models import BitacoraRecord
+from app.features.bitacora.services.enviar_correo_bitacora_use_case import enviar_correo_bitacora_use_case
+from app.features.bitacora.services.listar_bitacora_use_case import listar_bitacora_use_case
+
+logger = logging.getLogger(__name__)
+
+
+class EnviarCorreoMasivoBitacoraUseCase:
+    """Envía correos de bitácora a una lista de trabajadores"""
+
+    def ejecutar(
+        self,
+        num_trabajadores: Iterable[int],
+        fecha_inicio: str,
+        fecha_fin: str,
+        usar_plantilla_html: bool = None
+    ) -> Iterator[dict]:
+        """
+        Envía los correos y reporta el progreso
+
+        Args:
+            num_trabajadores: Trabajadores destinatarios (los repetidos se ignoran)
+            fecha_inicio: Fecha inicio (YYYY-MM-DD)
+            fecha_fin: Fecha fin (YYYY-MM-DD)
+            usar_plantilla_html: Igual que en EnviarCorreoBitacoraUseCase
+
+        Yields:
+            dict: Un evento por destinatario con 'resultado'
+                  ({num_trabajador, nombre_trabajador, enviado, encolado, mensaje})
+                  y uno final con 'finalizado', 'enviados', 'encolados' y 'fallidos'
+        """
+        try:
+            nums = list(dict.fromkeys(int(num) for num in num_trabajadores))
+            fecha_inicio_date = datetime.strptime(fecha_inicio, '%Y-%m-%d').date()
+            fecha_fin_date = datetime.strptime(fecha_fin, '%Y-%m-%d').date()
+        except (TypeError, ValueError) as e:
+            yield {'error': f'Datos inválidos: {e}', 'finalizado': True}
+            return
+
+        total = len(nums)
+        enviados = encolados = fallidos = 0
+        inicio = time.perf_counter()
+
+        yield {
+            'estado': f'Enviando {total} correos...',
+            'progreso': 0,
+            'total': total
+        }
+
+        pool = ThreadPoolExecutor(max_workers=CORREO_MASIVO_HILOS, thread_name_prefix='correo-masivo')
+        try:
+            for i in range(0, total, CORREO_MASIVO_LOTE):
+                lote = nums[i:i + CORREO_MASIVO_LOTE]
+
+                try:
+                    # list(): el lote se lee completo y el cursor se cierra antes de enviar
+                    grupos = list(listar_bitacora_use_case.ejecutar_por_trabajadores(
+                        lote, fecha_inicio_date, fecha_fin_date
+                    ))
+                    futuros = {
+                        pool.submit(self._enviar_trabajador, num, registros, fecha_inicio, fecha_fin, usar_plantilla_html): num
+                        for num, registros in grupos
+                    }
+                    resultados = self._recoger(futuros)
+                except Exception as e:
+                    logger.error("[CORREO MASIVO] Error consultando bitácora de %s trabajadores: %s", len(lote), e)
+                    resultados = (self._resultado(num, '', False, f'Error consultando bitácora: {e}') for num in lote)
+
+                for resultado in resultados:
+                    if resultado['enviado']:
+                        enviados += 1
+                    elif resultado['encolado']:
+                        encolados += 1
+                    else:
+                        fallidos += 1
+                    actual = enviados + encolados + fallidos
+                    yield {
+                        'estado': f"{actual}/{total} - {resultado['num_trabajador']}: {resultado['mensaje']}",
+                        'progreso': int(actual / total * 100),
+                        'actual': actual,
+                        'total': total,
+                        'resultado': resultado
+                    }
+        finally:
+            # Si el cliente se desconecta no se envían los correos que faltan
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        duracion = time.perf_counter() - inicio
+        logger.info(
+            "[CORREO MASIVO] %s enviados, %s encolados, %s fallidos de %s en %.1fs",
+            enviados, encolados, fallidos, total, duracion
+        )
+
+        yield {
+            'estado': f'Correos enviados: {enviados} de {total}',
+            'progreso': 100,
+            'total': total,
+            'enviados': enviados,
+            'encolados': encolados,
+            'fallidos': fallidos,
+            'duracion_s': round(duracion, 1),
+            'finalizado': True
+        }
+
+    def _recoger(self, futuros: dict) -> Iterator[dict]:
+        """
+        Resultados de los envíos a medida que terminan; una excepción en un
+        hilo se reporta como fallo de ese trabajador sin cortar el resto
+        """
+        for futuro in as_completed(futuros):
+            num_trabajador = futuros[futuro]
+            try:
+                yield futuro.result()
+            except Exception as e:
+                logger.error("[CORREO MASIVO] Trabajador %s: %s", num_trabajador, e, exc_info=True)
+                yield self._resultado(num_trabajador, '', False, str(e))
+
+    def _enviar_trabajador(
+        self,
+        num_trabajador: int,
+        registros: List[BitacoraRecord],
+        fecha_inicio: str,
+        fecha_fin: str,
+        usar_plantilla_html: Optional[bool]
+    ) -> dict:
+        """Arma y envía el correo de un trabajador (corre en el pool de hilos)"""
+        if not registros:
+            return self._resultado(num_trabajador, '', False, 'No hay registros de bitácora para el periodo especificado')
+
+        nombre_trabajador = registros[0].nombre_trabajador or ''
+        mensaje, error = enviar_correo_bitacora_use_case.construir_mensaje(
+            num_trabajador, nombre_trabajador, fecha_inicio, fecha_fin, usar_plantilla_html, registros
+        )
+        if error:
+            logger.warning("[CORREO MASIVO] Trabajador %s: %s", num_trabajador, error)
+            return self._resultado(num_trabajador, nombre_trabajador, False, error)
+
+        estado, error = enviar_correo_bitacora_use_case.enviar_o_encolar(mensaje, num_trabajador)
+        if estado == 'enviado':
+            return self._resultado(num_trabajador, nombre_trabajador, True, 'Correo enviado')
+
+        logger.warning("[CORREO MASIVO] Trabajador %s: %s", num_trabajador, error)
+        return self._resultado(num_trabajador, nombre_trabajador, False, error, encolado=estado == 'encolado')
+
+    @staticmethod
+    def _resultado(
+        num_trabajador: int,
+        nombre_trabajador: str,
+        enviado: bool,
+        mensaje: str,
+        encolado: bool = False
+    ) -> dict:
+        return {
+            'num_trabajador': num_trabajador,
+            'nombre_trabajador': nombre_trabajador,
+            'enviado': enviado,
+            'encolado': encolado,
+            'mensaje': mensaje
+        }
+
+
+# Instancia singleton
+enviar_correo_masivo_bitacora_use_case = EnviarCorreoMasivoBitacoraUseCase()
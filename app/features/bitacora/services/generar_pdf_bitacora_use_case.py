@@ -1,6 +1,13 @@
 """
 Caso de uso: Generar PDF de Bitácora
 Genera un PDF con el formato estándar de checadas
+
+El PDF se dibuja directamente en canvas (RenderizadorCanvasBitacora) o con
+platypus según PDF_RENDERIZADOR; ambos producen el mismo layout.
+
+Los PDFs se guardan en cache_pdf_bitacora con una clave calculada sobre el
+contenido dibujado (títulos, renglones, versión de plantilla y renderizador):
+una descarga o un correo repetido con los mismos datos solo lee el archivo.
 """
 from reportlab.lib.pagesizes import landscape, letter
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
@@ -10,7 +17,11 @@ from reportlab.lib import colors
 from io import BytesIO
 from datetime import datetime
 from typing import List, Optional
+from app.config.bitacora_config import PDF_RENDERIZADOR, PDF_VERSION_PLANTILLA
+from app.core.cache_disco import calcular_clave
 from app.features.bitacora.models.bitacora_models import BitacoraRecord
+from app.features.bitacora.services.cache_pdf_bitacora import cache_pdf_bitacora
+from app.features.bitacora.services.renderizador_canvas_bitacora import RenderizadorCanvasBitacora
 
 
 class GenerarPdfBitacoraUseCase:
@@ -19,6 +30,7 @@ class GenerarPdfBitacoraUseCase:
     def __init__(self):
         self.dias_semana = ['Lun', 'Mar', 'Mié', 'Jue', 'Vie', 'Sáb', 'Dom']
         self.registros_por_pagina = 15
+        self.renderizador = PDF_RENDERIZADOR
     
     def ejecutar(
         self,
@@ -42,73 +54,29 @@ class GenerarPdfBitacoraUseCase:
             tuple: (buffer con PDF, error)
         """
         try:
-            # Crear buffer en memoria
-            buffer = BytesIO()
-            
-            # Crear documento con orientación horizontal
-            doc = SimpleDocTemplate(
-                buffer,
-                pagesize=landscape(letter),
-                leftMargin=0.5*inch,
-                rightMargin=0.5*inch,
-                topMargin=0.5*inch,
-                bottomMargin=0.5*inch
-            )
-            
-            elements = []
-            
-            # Crear estilos
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Normal'],
-                fontSize=12,
-                alignment=1,  # Centrado
-                spaceAfter=10,
-                spaceBefore=10
+            # Contenido exacto de cada hoja: la clave de caché se calcula sobre lo que se dibuja
+            titulos = self._titulos(nombre_trabajador, num_trabajador, fecha_inicio, fecha_fin)
+            hojas = [
+                self._filas_tabla(registros[i:i + self.registros_por_pagina])
+                for i in range(0, len(registros), self.registros_por_pagina)
+            ]
+            clave = calcular_clave(
+                'bitacora_individual', PDF_VERSION_PLANTILLA, self.renderizador, titulos, hojas
             )
             
-            page_info_style = ParagraphStyle(
-                'PageInfo',
-                parent=styles['Normal'],
-                fontSize=8,
-                alignment=2  # Derecha
-            )
+            pdf = cache_pdf_bitacora.obtener(clave)
+            if pdf is not None:
+                return BytesIO(pdf), None
             
-            # Procesar registros por páginas
-            pagina_actual = 1
-            total_registros = len(registros)
+            # Crear buffer en memoria
+            buffer = BytesIO()
             
-            for i in range(0, total_registros, self.registros_por_pagina):
-                # Agregar encabezado de página
-                elements.extend(self._crear_encabezado(
-                    nombre_trabajador,
-                    num_trabajador,
-                    fecha_inicio,
-                    fecha_fin,
-                    title_style
-                ))
-                
-                # Obtener lote de registros
-                lote_registros = registros[i:i + self.registros_por_pagina]
-                
-                # Crear tabla para este lote
-                tabla = self._crear_tabla(lote_registros)
-                elements.append(tabla)
-                
-                # Agregar información de página
-                elements.append(Spacer(1, 10))
-                elements.append(
-                    Paragraph(f"HOJA #{pagina_actual}", page_info_style)
-                )
-                
-                # Agregar salto de página si no es la última
-                if i + self.registros_por_pagina < total_registros:
-                    elements.append(PageBreak())
-                    pagina_actual += 1
+            if self.renderizador == 'canvas':
+                self._dibujar_canvas(buffer, titulos, hojas)
+            else:
+                self._construir_platypus(buffer, titulos, hojas)
             
-            # Construir PDF
-            doc.build(elements)
+            cache_pdf_bitacora.guardar(clave, buffer.getvalue())
             
             # Volver al inicio del buffer
             buffer.seek(0)
@@ -118,49 +86,93 @@ class GenerarPdfBitacoraUseCase:
         except Exception as e:
             return None, f"Error al generar PDF: {str(e)}"
     
-    def _crear_encabezado(
-        self,
-        nombre_trabajador: str,
-        num_trabajador: int,
-        fecha_inicio: str,
-        fecha_fin: str,
-        title_style
-    ) -> list:
-        """Crea encabezado de página"""
-        encabezado = []
+    def _dibujar_canvas(self, buffer: BytesIO, titulos: List[str], hojas: List[List[List[str]]]):
+        """Dibuja las hojas (15 registros cada una) directamente en canvas"""
+        renderizador = RenderizadorCanvasBitacora(buffer)
         
-        encabezado.append(
-            Paragraph(
-                "TECNOLÓGICO NACIONAL DE MEXICO CAMPUS MINATITLÁN",
-                title_style
-            )
-        )
-        encabezado.append(
-            Paragraph("REGISTRO DE CHECADAS", title_style)
+        for pagina, filas in enumerate(hojas, start=1):
+            renderizador.agregar_hoja(titulos, filas, f"HOJA #{pagina}")
+        
+        renderizador.guardar()
+    
+    def _construir_platypus(self, buffer: BytesIO, titulos: List[str], hojas: List[List[List[str]]]):
+        """Construye las hojas con SimpleDocTemplate + Table"""
+        # Crear documento con orientación horizontal
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=landscape(letter),
+            leftMargin=0.5*inch,
+            rightMargin=0.5*inch,
+            topMargin=0.5*inch,
+            bottomMargin=0.5*inch
         )
-        encabezado.append(
-            Paragraph(
-                f"PERIODO DEL {fecha_inicio} AL {fecha_fin}",
-                title_style
-            )
+        
+        elements = []
+        
+        # Crear estilos
+        styles = getSampleStyleSheet()
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Normal'],
+            fontSize=12,
+            alignment=1,  # Centrado
+            spaceAfter=10,
+            spaceBefore=10
         )
-        encabezado.append(
-            Paragraph(
-                f"Empleado: {num_trabajador} - {nombre_trabajador}",
-                title_style
-            )
+        
+        page_info_style = ParagraphStyle(
+            'PageInfo',
+            parent=styles['Normal'],
+            fontSize=8,
+            alignment=2  # Derecha
         )
-        encabezado.append(
-            Paragraph(
-                f"Fecha de Impresión: {datetime.now().strftime('%d-%m-%Y')}",
-                title_style
+        
+        # Procesar registros por páginas
+        for pagina_actual, filas in enumerate(hojas, start=1):
+            # Agregar encabezado de página
+            elements.extend(self._crear_encabezado(titulos, title_style))
+            
+            # Crear tabla para este lote
+            tabla = self._crear_tabla(filas)
+            elements.append(tabla)
+            
+            # Agregar información de página
+            elements.append(Spacer(1, 10))
+            elements.append(
+                Paragraph(f"HOJA #{pagina_actual}", page_info_style)
             )
-        )
+            
+            # Agregar salto de página si no es la última
+            if pagina_actual < len(hojas):
+                elements.append(PageBreak())
+        
+        # Construir PDF
+        doc.build(elements)
+    
+    def _titulos(
+        self,
+        nombre_trabajador: str,
+        num_trabajador: int,
+        fecha_inicio: str,
+        fecha_fin: str
+    ) -> List[str]:
+        """Líneas del encabezado de página"""
+        return [
+            "TECNOLÓGICO NACIONAL DE MEXICO CAMPUS MINATITLÁN",
+            "REGISTRO DE CHECADAS",
+            f"PERIODO DEL {fecha_inicio} AL {fecha_fin}",
+            f"Empleado: {num_trabajador} - {nombre_trabajador}",
+            f"Fecha de Impresión: {datetime.now().strftime('%d-%m-%Y')}",
+        ]
+    
+    def _crear_encabezado(self, titulos: List[str], title_style) -> list:
+        """Crea encabezado de página"""
+        encabezado = [Paragraph(titulo, title_style) for titulo in titulos]
         encabezado.append(Spacer(1, 10))
         
         return encabezado
     
-    def _crear_tabla(self, registros: List[BitacoraRecord]) -> Table:
+    def _crear_tabla(self, filas: List[List[str]]) -> Table:
         """Crea tabla con registros de bitácora"""
         
         # Encabezados de columnas
@@ -179,29 +191,7 @@ class GenerarPdfBitacoraUseCase:
             'Checada4'
         ]
         
-        data = [headers]
-        
-        # Agregar datos de cada registro (filtrar DESCANSO)
-        for reg in registros:
-            # Saltar días sin horario o con horario de descanso
-            if not reg.horario_texto or reg.horario_texto.upper() == 'DESCANSO':
-                continue
-            
-            row = [
-                str(reg.num_trabajador),
-                str(reg.departamento or ''),  # Ahora es el ID del departamento
-                reg.nombre_trabajador or '',
-                self._formatear_fecha(reg.fecha),
-                str(reg.turno_id or ''),
-                self._formatear_horario(reg.horario_texto),
-                reg.codigo_incidencia or '',
-                reg.tipo_movimiento or '',
-                self._formatear_hora(reg.checada1),
-                self._formatear_hora(reg.checada2),
-                self._formatear_hora(reg.checada3),
-                self._formatear_hora(reg.checada4)
-            ]
-            data.append(row)
+        data = [headers] + filas
         
         # Crear tabla con anchos específicos
         table = Table(
@@ -245,6 +235,34 @@ class GenerarPdfBitacoraUseCase:
         
         return table
     
+    def _filas_tabla(self, registros: List[BitacoraRecord]) -> List[List[str]]:
+        """Renglones de la tabla (sin encabezados)"""
+        filas = []
+        
+        # Agregar datos de cada registro (filtrar DESCANSO)
+        for reg in registros:
+            # Saltar días sin horario o con horario de descanso
+            if not reg.horario_texto or reg.horario_texto.upper() == 'DESCANSO':
+                continue
+            
+            row = [
+                str(reg.num_trabajador),
+                str(reg.departamento or ''),  # Ahora es el ID del departamento
+                reg.nombre_trabajador or '',
+                self._formatear_fecha(reg.fecha),
+                str(reg.turno_id or ''),
+                self._formatear_horario(reg.horario_texto),
+                reg.codigo_incidencia or '',
+                reg.tipo_movimiento or '',
+                self._formatear_hora(reg.checada1),
+                self._formatear_hora(reg.checada2),
+                self._formatear_hora(reg.checada3),
+                self._formatear_hora(reg.checada4)
+            ]
+            filas.append(row)
+        
+        return filas
+    
     def _formatear_fecha(self, fecha) -> str:
         """Formatea fecha como 'Vie 01-08-2024'"""
         if not fecha:
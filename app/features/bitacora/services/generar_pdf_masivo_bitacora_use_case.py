@@ -2,17 +2,94 @@
 Caso de uso: Generar PDF Masivo de Bitácora
 Genera un PDF con reportes individuales de múltiples trabajadores
 Cada trabajador tiene su propia sección con encabezado personalizado
+
+Dos modos:
+- Paralelo: cada trabajador se renderiza como un PDF independiente en un pool
+  de procesos y las páginas se unen en orden con pypdf
+- Secuencial: un solo documento alimentado sección por sección (sin pypdf,
+  con pocos trabajadores o si el pool falla)
+
+En ambos modos las hojas se dibujan directamente en canvas
+(RenderizadorCanvasBitacora) o con platypus según PDF_RENDERIZADOR.
+
+El resultado se guarda en cache_pdf_bitacora; la clave sale de una consulta
+agregada (registros y MAX(updated_at) por trabajador), así que una descarga
+repetida sin cambios en la bitácora no vuelve a leer renglones ni a renderizar.
 """
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
 from reportlab.lib.pagesizes import landscape, letter
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-from io import BytesIO
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
 from collections import defaultdict
+from app.config.bitacora_config import (
+    PDF_MASIVO_PROCESOS,
+    PDF_MASIVO_MAX_PROCESOS_AUTO,
+    PDF_MASIVO_MIN_TRABAJADORES_PARALELO,
+    PDF_RENDERIZADOR,
+    PDF_VERSION_PLANTILLA
+)
+from app.core.cache_disco import calcular_clave
+from app.features.bitacora.services.cache_pdf_bitacora import cache_pdf_bitacora
 from app.features.bitacora.services.listar_bitacora_use_case import listar_bitacora_use_case
+from app.features.bitacora.services.renderizador_canvas_bitacora import RenderizadorCanvasBitacora
+
+try:
+    from pypdf import PdfReader, PdfWriter  # Opcional: unión de páginas del modo paralelo
+except ImportError:
+    PdfReader = PdfWriter = None
+
+logger = logging.getLogger(__name__)
+
+
+class _FlowablesPerezosos(list):
+    """
+    Lista de flowables que se rellena sección por sección
+    
+    doc.build() consume la lista desde el frente (len() / [0] / del [0]) y
+    pregunta len() antes de cada flowable: cuando la lista se vacía se pide
+    la siguiente sección al generador.
+    """
+    
+    def __init__(self, secciones: Iterable[list]):
+        super().__init__()
+        self._secciones = iter(secciones)
+    
+    def __len__(self):
+        if not super().__len__():
+            for seccion in self._secciones:
+                if seccion:
+                    self.extend(seccion)
+                    break
+        return super().__len__()
+
+
+def _renderizar_trabajador(trabajo: tuple) -> bytes:
+    """
+    Renderiza la sección de un trabajador como PDF independiente (corre en el pool)
+    
+    Args:
+        trabajo: Argumentos de GenerarPdfMasivoBitacoraUseCase._elementos_trabajador
+    """
+    buffer = BytesIO()
+    use_case = generar_pdf_masivo_bitacora_use_case
+    if use_case.renderizador == 'canvas':
+        renderizador = RenderizadorCanvasBitacora(buffer)
+        use_case._dibujar_trabajador(renderizador, *trabajo)
+        renderizador.guardar()
+    else:
+        use_case._crear_documento(buffer).build(use_case._elementos_trabajador(*trabajo))
+    return buffer.getvalue()
 
 
 class GenerarPdfMasivoBitacoraUseCase:
@@ -21,13 +98,15 @@ class GenerarPdfMasivoBitacoraUseCase:
     def __init__(self):
         self.dias_semana = ['Lun', 'Mar', 'Mié', 'Jue', 'Vie', 'Sáb', 'Dom']
         self.registros_por_pagina = 15
+        self.renderizador = PDF_RENDERIZADOR
+        self._estilos = None
     
     def ejecutar(
         self,
         num_trabajadores: List[int],
         fecha_inicio: str,
         fecha_fin: str
-    ) -> tuple[Optional[BytesIO], Optional[str]]:
+    ) -> tuple[Optional[BinaryIO], Optional[str]]:
         """
         Genera PDF masivo con reportes individuales
         
@@ -37,127 +116,357 @@ class GenerarPdfMasivoBitacoraUseCase:
             fecha_fin: Fecha fin del periodo (YYYY-MM-DD)
             
         Returns:
-            tuple: (buffer con PDF, error)
+            tuple: (archivo con el PDF posicionado al inicio, error)
+                   Archivo temporal que se elimina al cerrarlo, o la entrada de
+                   cache_pdf_bitacora si los datos no cambiaron desde la última vez
+        """
+        clave = self._clave_cache(num_trabajadores, fecha_inicio, fecha_fin)
+        if clave:
+            archivo = cache_pdf_bitacora.abrir(clave)
+            if archivo:
+                logger.info("PDF masivo desde caché: %s trabajadores", len(num_trabajadores))
+                return archivo, None
+        
+        archivo, error = self._generar(num_trabajadores, fecha_inicio, fecha_fin)
+        
+        if archivo and clave:
+            cache_pdf_bitacora.guardar(clave, archivo)
+            archivo.seek(0)
+        
+        return archivo, error
+    
+    def _clave_cache(self, num_trabajadores: List[int], fecha_inicio: str, fecha_fin: str) -> Optional[str]:
+        """
+        Clave de caché del PDF masivo (None si la caché está deshabilitada o falla la consulta)
+        
+        Se calcula con (registros, MAX(updated_at)) de cada trabajador en lugar de
+        leer los renglones: cualquier cambio en la bitácora del periodo cambia la clave.
         """
+        if not cache_pdf_bitacora.habilitada:
+            return None
+        
+        num_trabajadores = list(dict.fromkeys(int(num) for num in num_trabajadores))
+        versiones, error = listar_bitacora_use_case.versiones_por_trabajadores(
+            num_trabajadores, fecha_inicio, fecha_fin
+        )
+        if error:
+            return None
+        
+        return calcular_clave(
+            'bitacora_masivo', PDF_VERSION_PLANTILLA, self.renderizador, self.registros_por_pagina,
+            fecha_inicio, fecha_fin, datetime.now().strftime('%d-%m-%Y'),
+            [(num, versiones.get(num)) for num in num_trabajadores]
+        )
+    
+    def _generar(
+        self,
+        num_trabajadores: List[int],
+        fecha_inicio: str,
+        fecha_fin: str
+    ) -> tuple[Optional[BinaryIO], Optional[str]]:
+        """Renderiza el PDF en paralelo si conviene, si no en secuencial"""
+        procesos = self._procesos_paralelo(len(num_trabajadores))
+        if procesos > 1:
+            try:
+                return self._ejecutar_paralelo(num_trabajadores, fecha_inicio, fecha_fin, procesos)
+            except Exception as e:
+                logger.warning("PDF masivo en paralelo falló (%s); se genera en secuencial", e)
+        
+        return self._ejecutar_secuencial(num_trabajadores, fecha_inicio, fecha_fin)
+    
+    def _procesos_paralelo(self, total_trabajadores: int) -> int:
+        """Procesos a usar (1 = secuencial)"""
+        if PdfWriter is None or total_trabajadores < PDF_MASIVO_MIN_TRABAJADORES_PARALELO:
+            return 1
+        
+        procesos = PDF_MASIVO_PROCESOS or min(os.cpu_count() or 1, PDF_MASIVO_MAX_PROCESOS_AUTO)
+        return max(1, min(procesos, total_trabajadores))
+    
+    def _ejecutar_paralelo(
+        self,
+        num_trabajadores: List[int],
+        fecha_inicio: str,
+        fecha_fin: str,
+        procesos: int
+    ) -> tuple[Optional[BinaryIO], Optional[str]]:
+        """
+        Renderiza cada trabajador en un pool de procesos y une las páginas en orden
+        
+        Las consultas se hacen en este proceso; a lo más 2 × procesos trabajadores
+        están en vuelo a la vez. El pool usa forkserver: los hijos no heredan el
+        estado del worker de gunicorn (gevent, conexiones, hilos).
+        """
+        inicio = time.perf_counter()
+        contexto = multiprocessing.get_context('forkserver')
+        contexto.set_forkserver_preload([__name__])
+        writer = PdfWriter()
+        
+        def anexar(pdf: bytes):
+            for pagina in PdfReader(BytesIO(pdf)).pages:
+                writer.add_page(pagina)
+        
+        with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto) as pool:
+            pendientes = deque()
+            for trabajo in self._trabajos(num_trabajadores, fecha_inicio, fecha_fin):
+                pendientes.append(pool.submit(_renderizar_trabajador, trabajo))
+                if len(pendientes) >= procesos * 2:
+                    anexar(pendientes.popleft().result())
+            while pendientes:
+                anexar(pendientes.popleft().result())
+        
+        if not writer.pages:
+            return None, "No hay registros para generar PDF"
+        
+        archivo = tempfile.TemporaryFile(prefix='bitacora_masivo_', suffix='.pdf')
         try:
-            # Crear buffer en memoria
-            buffer = BytesIO()
-            
-            # Crear documento con orientación horizontal
-            doc = SimpleDocTemplate(
-                buffer,
-                pagesize=landscape(letter),
-                leftMargin=0.5*inch,
-                rightMargin=0.5*inch,
-                topMargin=0.5*inch,
-                bottomMargin=0.5*inch
-            )
-            
-            elements = []
-            
-            # Crear estilos
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Normal'],
-                fontSize=12,
-                alignment=1,  # Centrado
-                spaceAfter=10,
-                spaceBefore=10
-            )
-            
-            page_info_style = ParagraphStyle(
-                'PageInfo',
-                parent=styles['Normal'],
-                fontSize=8,
-                alignment=2  # Derecha
-            )
-            
-            # Procesar cada trabajador
+            writer.write(archivo)
+        except Exception:
+            archivo.close()
+            raise
+        
+        logger.info(
+            "PDF masivo (%s procesos): %s trabajadores, %s páginas, %s bytes en %.1fs",
+            procesos, len(num_trabajadores), len(writer.pages), archivo.tell(), time.perf_counter() - inicio
+        )
+        
+        archivo.seek(0)
+        return archivo, None
+    
+    def _ejecutar_secuencial(
+        self,
+        num_trabajadores: List[int],
+        fecha_inicio: str,
+        fecha_fin: str
+    ) -> tuple[Optional[BinaryIO], Optional[str]]:
+        """
+        Genera el PDF en un solo documento
+        
+        Las secciones se construyen una por trabajador a medida que ReportLab las
+        consume (ver _FlowablesPerezosos): en memoria solo viven las tablas del
+        trabajador en turno. El PDF se escribe a un archivo temporal anónimo.
+        """
+        archivo = None
+        try:
+            inicio = time.perf_counter()
             total_trabajadores = len(num_trabajadores)
             
-            for idx, num_trabajador in enumerate(num_trabajadores):
-                # Obtener registros del trabajador
-                # listar_bitacora_use_case.ejecutar() retorna List[BitacoraRecord], no tupla
-                registros = listar_bitacora_use_case.ejecutar(
-                    num_trabajador=num_trabajador,
-                    fecha_inicio=fecha_inicio,
-                    fecha_fin=fecha_fin
-                )
-                
-                if not registros:
-                    print(f"[INFO] No hay registros para trabajador {num_trabajador}")
-                    continue
-                
-                # Convertir a diccionarios
-                registros_dict = [reg.to_dict() for reg in registros]
+            if self.renderizador == 'canvas':
+                archivo = tempfile.TemporaryFile(prefix='bitacora_masivo_', suffix='.pdf')
+                renderizador = RenderizadorCanvasBitacora(archivo)
+                for trabajo in self._trabajos(num_trabajadores, fecha_inicio, fecha_fin):
+                    self._dibujar_trabajador(renderizador, *trabajo)
                 
-                # Filtrar días sin horario o con DESCANSO
-                registros_filtrados = [
-                    r for r in registros_dict 
-                    if r.get('horario_texto') and r.get('horario_texto').upper() != 'DESCANSO'
-                ]
+                if not renderizador.hojas:
+                    archivo.close()
+                    return None, "No hay registros para generar PDF"
                 
-                if not registros_filtrados:
-                    continue
-                
-                # Obtener info del trabajador (del primer registro)
-                primer_registro = registros_filtrados[0]
-                nombre_trabajador = primer_registro.get('nombre_trabajador', '')
-                
-                # Procesar registros por páginas
-                pagina_actual = 1
-                total_registros = len(registros_filtrados)
-                
-                for i in range(0, total_registros, self.registros_por_pagina):
-                    # Agregar encabezado personalizado para este trabajador
-                    elements.extend(self._crear_encabezado_individual(
-                        nombre_trabajador,
-                        num_trabajador,
-                        fecha_inicio,
-                        fecha_fin,
-                        title_style
-                    ))
-                    
-                    # Obtener lote de registros
-                    lote_registros = registros_filtrados[i:i + self.registros_por_pagina]
-                    
-                    # Crear tabla para este lote
-                    tabla = self._crear_tabla(lote_registros)
-                    elements.append(tabla)
-                    
-                    # Agregar información de página
-                    elements.append(Spacer(1, 10))
-                    elements.append(
-                        Paragraph(
-                            f"Trabajador {idx + 1}/{total_trabajadores} - HOJA #{pagina_actual}",
-                            page_info_style
-                        )
-                    )
-                    
-                    # Agregar salto de página si no es la última página del trabajador
-                    if i + self.registros_por_pagina < total_registros:
+                paginas = renderizador.guardar()
+                logger.info(
+                    "PDF masivo: %s trabajadores, %s páginas, %s bytes en %.1fs",
+                    total_trabajadores, paginas, archivo.tell(), time.perf_counter() - inicio
+                )
+                archivo.seek(0)
+                return archivo, None
+            
+            def secciones():
+                for trabajo in self._trabajos(num_trabajadores, fecha_inicio, fecha_fin):
+                    elements = self._elementos_trabajador(*trabajo)
+                    # Salto de página entre trabajadores (si no es el último)
+                    if trabajo[0] < total_trabajadores - 1:
                         elements.append(PageBreak())
-                        pagina_actual += 1
-                
-                # Salto de página entre trabajadores (si no es el último)
-                if idx < total_trabajadores - 1:
-                    elements.append(PageBreak())
+                    yield elements
             
-            # Construir PDF
-            if not elements:
+            flowables = _FlowablesPerezosos(secciones())
+            
+            # len() carga la primera sección: si no hay ninguna, no hay PDF
+            if not len(flowables):
                 return None, "No hay registros para generar PDF"
             
-            doc.build(elements)
+            archivo = tempfile.TemporaryFile(prefix='bitacora_masivo_', suffix='.pdf')
+            doc = self._crear_documento(archivo)
+            doc.build(flowables)
+            
+            logger.info(
+                "PDF masivo: %s trabajadores, %s páginas, %s bytes en %.1fs",
+                total_trabajadores, doc.page, archivo.tell(), time.perf_counter() - inicio
+            )
             
-            # Volver al inicio del buffer
-            buffer.seek(0)
+            # Volver al inicio del archivo
+            archivo.seek(0)
             
-            return buffer, None
+            return archivo, None
             
         except Exception as e:
+            if archivo:
+                archivo.close()
             return None, f"Error al generar PDF masivo: {str(e)}"
     
+    def _crear_documento(self, destino) -> SimpleDocTemplate:
+        """Documento con orientación horizontal"""
+        return SimpleDocTemplate(
+            destino,
+            pagesize=landscape(letter),
+            leftMargin=0.5*inch,
+            rightMargin=0.5*inch,
+            topMargin=0.5*inch,
+            bottomMargin=0.5*inch
+        )
+    
+    def _crear_estilos(self) -> tuple:
+        """Estilos de título y de pie de página (se crean una vez por proceso)"""
+        if self._estilos:
+            return self._estilos
+        
+        styles = getSampleStyleSheet()
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Normal'],
+            fontSize=12,
+            alignment=1,  # Centrado
+            spaceAfter=10,
+            spaceBefore=10
+        )
+        
+        page_info_style = ParagraphStyle(
+            'PageInfo',
+            parent=styles['Normal'],
+            fontSize=8,
+            alignment=2  # Derecha
+        )
+        
+        self._estilos = (title_style, page_info_style)
+        return self._estilos
+    
+    def _trabajos(
+        self,
+        num_trabajadores: List[int],
+        fecha_inicio: str,
+        fecha_fin: str
+    ) -> Iterator[Tuple]:
+        """
+        Consulta la bitácora de los trabajadores y genera los argumentos de cada sección
+        
+        La bitácora se lee con listar_bitacora_use_case.ejecutar_por_trabajadores():
+        una query por lote de trabajadores, agrupada por trabajador y en orden de fecha.
+        
+        Yields:
+            tuple: (idx, total, num_trabajador, nombre, registros_filtrados, fecha_inicio, fecha_fin)
+        """
+        num_trabajadores = list(dict.fromkeys(num_trabajadores))
+        total_trabajadores = len(num_trabajadores)
+        grupos = listar_bitacora_use_case.ejecutar_por_trabajadores(num_trabajadores, fecha_inicio, fecha_fin)
+        
+        for idx, (num_trabajador, registros) in enumerate(grupos):
+            if not registros:
+                logger.info("No hay registros para trabajador %s", num_trabajador)
+                continue
+            
+            # Convertir a diccionarios
+            registros_dict = [reg.to_dict() for reg in registros]
+            
+            # Filtrar días sin horario o con DESCANSO
+            registros_filtrados = [
+                r for r in registros_dict 
+                if r.get('horario_texto') and r.get('horario_texto').upper() != 'DESCANSO'
+            ]
+            
+            if not registros_filtrados:
+                continue
+            
+            # Obtener info del trabajador (del primer registro)
+            nombre_trabajador = registros_filtrados[0].get('nombre_trabajador', '')
+            
+            yield (idx, total_trabajadores, num_trabajador, nombre_trabajador,
+                   registros_filtrados, fecha_inicio, fecha_fin)
+    
+    def _dibujar_trabajador(
+        self,
+        renderizador: RenderizadorCanvasBitacora,
+        idx: int,
+        total_trabajadores: int,
+        num_trabajador: int,
+        nombre_trabajador: str,
+        registros_filtrados: List[Dict],
+        fecha_inicio: str,
+        fecha_fin: str
+    ):
+        """Equivalente en canvas de _elementos_trabajador: una hoja por cada 15 registros"""
+        titulos = self._titulos_trabajador(nombre_trabajador, num_trabajador, fecha_inicio, fecha_fin)
+        
+        for pagina, i in enumerate(range(0, len(registros_filtrados), self.registros_por_pagina), start=1):
+            renderizador.agregar_hoja(
+                titulos,
+                self._filas_tabla(registros_filtrados[i:i + self.registros_por_pagina]),
+                f"Trabajador {idx + 1}/{total_trabajadores} - HOJA #{pagina}"
+            )
+    
+    def _elementos_trabajador(
+        self,
+        idx: int,
+        total_trabajadores: int,
+        num_trabajador: int,
+        nombre_trabajador: str,
+        registros_filtrados: List[Dict],
+        fecha_inicio: str,
+        fecha_fin: str
+    ) -> list:
+        """Flowables de un trabajador: una hoja por cada 15 registros con su pie 'Trabajador i/N - HOJA #k'"""
+        title_style, page_info_style = self._crear_estilos()
+        elements = []
+        
+        # Procesar registros por páginas
+        pagina_actual = 1
+        total_registros = len(registros_filtrados)
+        
+        for i in range(0, total_registros, self.registros_por_pagina):
+            # Agregar encabezado personalizado para este trabajador
+            elements.extend(self._crear_encabezado_individual(
+                nombre_trabajador,
+                num_trabajador,
+                fecha_inicio,
+                fecha_fin,
+                title_style
+            ))
+            
+            # Obtener lote de registros
+            lote_registros = registros_filtrados[i:i + self.registros_por_pagina]
+            
+            # Crear tabla para este lote
+            tabla = self._crear_tabla(lote_registros)
+            elements.append(tabla)
+            
+            # Agregar información de página
+            elements.append(Spacer(1, 10))
+            elements.append(
+                Paragraph(
+                    f"Trabajador {idx + 1}/{total_trabajadores} - HOJA #{pagina_actual}",
+                    page_info_style
+                )
+            )
+            
+            # Agregar salto de página si no es la última página del trabajador
+            if i + self.registros_por_pagina < total_registros:
+                elements.append(PageBreak())
+                pagina_actual += 1
+        
+        return elements
+    
+    def _titulos_trabajador(
+        self,
+        nombre_trabajador: str,
+        num_trabajador: int,
+        fecha_inicio: str,
+        fecha_fin: str
+    ) -> List[str]:
+        """Líneas del encabezado de un trabajador"""
+        return [
+            "TECNOLÓGICO NACIONAL DE MEXICO CAMPUS MINATITLÁN",
+            "REGISTRO DE CHECADAS",
+            f"PERIODO DEL {fecha_inicio} AL {fecha_fin}",
+            f"TRABAJADOR: {num_trabajador} - {nombre_trabajador}",
+            f"Fecha de Impresión: {datetime.now().strftime('%d-%m-%Y')}",
+        ]
+    
     def _crear_encabezado_individual(
         self,
         nombre_trabajador: str,
@@ -167,35 +476,10 @@ class GenerarPdfMasivoBitacoraUseCase:
         title_style
     ) -> list:
         """Crea encabezado personalizado para un trabajador"""
-        encabezado = []
-        
-        encabezado.append(
-            Paragraph(
-                "TECNOLÓGICO NACIONAL DE MEXICO CAMPUS MINATITLÁN",
-                title_style
-            )
-        )
-        encabezado.append(
-            Paragraph("REGISTRO DE CHECADAS", title_style)
-        )
-        encabezado.append(
-            Paragraph(
-                f"PERIODO DEL {fecha_inicio} AL {fecha_fin}",
-                title_style
-            )
-        )
-        encabezado.append(
-            Paragraph(
-                f"TRABAJADOR: {num_trabajador} - {nombre_trabajador}",
-                title_style
-            )
-        )
-        encabezado.append(
-            Paragraph(
-                f"Fecha de Impresión: {datetime.now().strftime('%d-%m-%Y')}",
-                title_style
-            )
-        )
+        encabezado = [
+            Paragraph(titulo, title_style)
+            for titulo in self._titulos_trabajador(nombre_trabajador, num_trabajador, fecha_inicio, fecha_fin)
+        ]
         encabezado.append(Spacer(1, 10))
         
         return encabezado
@@ -219,25 +503,7 @@ class GenerarPdfMasivoBitacoraUseCase:
             'Checada4'
         ]
         
-        data = [headers]
-        
-        # Agregar datos de cada registro
-        for reg in registros_dict:
-            row = [
-                str(reg.get('num_trabajador', '')),
-                str(reg.get('departamento', '')),
-                reg.get('nombre_trabajador', ''),
-                self._formatear_fecha(reg.get('fecha')),
-                str(reg.get('turno_id', '')),
-                self._formatear_horario(reg.get('horario_texto')),
-                reg.get('codigo_incidencia', ''),
-                reg.get('tipo_movimiento', ''),
-                self._formatear_hora(reg.get('checada1')),
-                self._formatear_hora(reg.get('checada2')),
-                self._formatear_hora(reg.get('checada3')),
-                self._formatear_hora(reg.get('checada4'))
-            ]
-            data.append(row)
+        data = [headers] + self._filas_tabla(registros_dict)
         
         # Crear tabla con anchos específicos
         table = Table(
@@ -281,6 +547,30 @@ class GenerarPdfMasivoBitacoraUseCase:
         
         return table
     
+    def _filas_tabla(self, registros_dict: List[Dict]) -> List[List[str]]:
+        """Renglones de la tabla (sin encabezados)"""
+        filas = []
+        
+        # Agregar datos de cada registro
+        for reg in registros_dict:
+            row = [
+                str(reg.get('num_trabajador', '')),
+                str(reg.get('departamento', '')),
+                reg.get('nombre_trabajador', ''),
+                self._formatear_fecha(reg.get('fecha')),
+                str(reg.get('turno_id', '')),
+                self._formatear_horario(reg.get('horario_texto')),
+                reg.get('codigo_incidencia', ''),
+                reg.get('tipo_movimiento', ''),
+                self._formatear_hora(reg.get('checada1')),
+                self._formatear_hora(reg.get('checada2')),
+                self._formatear_hora(reg.get('checada3')),
+                self._formatear_hora(reg.get('checada4'))
+            ]
+            filas.append(row)
+        
+        return filas
+    
     def _formatear_fecha(self, fecha) -> str:
         """Formatea fecha como 'Vie 01-08-2024'"""
         if not fecha:
@@ -1,13 +1,35 @@
 """
 Caso de uso: Listar Bitácora
 Consulta registros de bitácora con filtros
+
+ejecutar_por_trabajadores() consulta varios trabajadores a la vez
+(num_trabajador IN (...) + rango de fechas) para el PDF masivo y los correos,
+en lugar de una query por trabajador. versiones_por_trabajadores() da la
+huella (registros, última actualización) que usa la caché del PDF masivo.
 """
+import logging
+from app.config.bitacora_config import LOTE_TRABAJADORES_CONSULTA
 from app.core.database.query_executor import QueryExecutor
 from app.core.database.query_builder import QueryBuilder
 from app.core.database.connection import db_connection
 from app.features.bitacora.models.bitacora_models import BitacoraRecord
+from collections import deque
 from datetime import date
-from typing import List, Optional
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+COLUMNAS = """
+    id, num_trabajador, departamento, nombre_trabajador,
+    fecha, turno_id, horario_texto,
+    codigo_incidencia, tipo_movimiento, movimiento_id,
+    checada1, checada2, checada3, checada4,
+    minutos_retardo, horas_trabajadas, descripcion_incidencia,
+    fecha_procesamiento, procesado_por,
+    created_at, updated_at
+"""
 
 
 class ListarBitacoraUseCase:
@@ -36,17 +58,7 @@ class ListarBitacoraUseCase:
             Lista de registros de bitácora
         """
         try:
-            base_query = """
-                SELECT 
-                    id, num_trabajador, departamento, nombre_trabajador,
-                    fecha, turno_id, horario_texto,
-                    codigo_incidencia, tipo_movimiento, movimiento_id,
-                    checada1, checada2, checada3, checada4,
-                    minutos_retardo, horas_trabajadas, descripcion_incidencia,
-                    fecha_procesamiento, procesado_por,
-                    created_at, updated_at
-                FROM bitacora
-            """
+            base_query = f"SELECT {COLUMNAS} FROM bitacora"
             
             builder = QueryBuilder(base_query)
             
@@ -68,42 +80,144 @@ class ListarBitacoraUseCase:
             resultados, error = self.query_executor.ejecutar(query, params)
             
             if error:
-                print(f"[ERROR LISTAR BITACORA] {error}")
+                logger.error("[LISTAR BITACORA] %s", error)
                 return []
             
             # Convertir a objetos BitacoraRecord
-            registros = []
-            for row in resultados:
-                registro = BitacoraRecord(
-                    id=row['id'],
-                    num_trabajador=row['num_trabajador'],
-                    departamento=row['departamento'],
-                    nombre_trabajador=row['nombre_trabajador'],
-                    fecha=row['fecha'],
-                    turno_id=row['turno_id'],
-                    horario_texto=row['horario_texto'],
-                    codigo_incidencia=row['codigo_incidencia'],
-                    tipo_movimiento=row['tipo_movimiento'],
-                    movimiento_id=row['movimiento_id'],
-                    checada1=row['checada1'],
-                    checada2=row['checada2'],
-                    checada3=row['checada3'],
-                    checada4=row['checada4'],
-                    minutos_retardo=row['minutos_retardo'],
-                    horas_trabajadas=row['horas_trabajadas'],
-                    descripcion_incidencia=row['descripcion_incidencia'],
-                    fecha_procesamiento=row['fecha_procesamiento'],
-                    procesado_por=row['procesado_por'],
-                    created_at=row['created_at'],
-                    updated_at=row['updated_at']
-                )
-                registros.append(registro)
-            
-            return registros
+            return [self._a_registro(row) for row in resultados]
             
         except Exception as e:
-            print(f"[ERROR LISTAR BITACORA] {str(e)}")
+            logger.error("[LISTAR BITACORA] %s", str(e))
             return []
+    
+    def ejecutar_por_trabajadores(
+        self,
+        num_trabajadores: Iterable[int],
+        fecha_inicio: date,
+        fecha_fin: date
+    ) -> Iterator[Tuple[int, List[BitacoraRecord]]]:
+        """
+        Bitácora de varios trabajadores, agrupada por trabajador y en orden de fecha
+        
+        Una query por cada LOTE_TRABAJADORES_CONSULTA trabajadores
+        (num_trabajador IN (...) AND fecha BETWEEN, ORDER BY num_trabajador, fecha,
+        resuelta con el índice uk_trabajador_fecha). Las filas se leen en streaming
+        y se agrupan en una sola pasada.
+        
+        Los grupos se entregan en el orden de num_trabajadores. Si la lista viene
+        ordenada (lo normal), cada grupo sale en cuanto termina; si no, los que
+        llegan antes de su turno esperan en memoria hasta el fin del lote.
+        
+        Args:
+            num_trabajadores: Trabajadores a consultar (los repetidos se ignoran)
+            fecha_inicio: Fecha inicial (inclusive)
+            fecha_fin: Fecha final (inclusive)
+            
+        Yields:
+            tuple: (num_trabajador, registros); lista vacía si no tiene registros
+            
+        Raises:
+            Exception: Si falla la consulta (no se entrega un reporte incompleto)
+        """
+        nums = list(dict.fromkeys(int(num) for num in num_trabajadores))
+        
+        for i in range(0, len(nums), LOTE_TRABAJADORES_CONSULTA):
+            lote = nums[i:i + LOTE_TRABAJADORES_CONSULTA]
+            pendientes = deque(lote)
+            listos = {}
+            
+            try:
+                filas = self._consultar_lote(lote, fecha_inicio, fecha_fin)
+                for num, grupo in groupby(filas, key=itemgetter('num_trabajador')):
+                    listos[num] = [self._a_registro(row) for row in grupo]
+                    # Los pendientes menores que num ya no van a aparecer en el resultado
+                    while pendientes and (pendientes[0] in listos or pendientes[0] < num):
+                        siguiente = pendientes.popleft()
+                        yield siguiente, listos.pop(siguiente, [])
+            except Exception as e:
+                logger.error("[LISTAR BITACORA] Consulta de %s trabajadores: %s", len(lote), e)
+                raise
+            
+            while pendientes:
+                siguiente = pendientes.popleft()
+                yield siguiente, listos.pop(siguiente, [])
+    
+    def versiones_por_trabajadores(
+        self,
+        num_trabajadores: Iterable[int],
+        fecha_inicio: date,
+        fecha_fin: date
+    ) -> Tuple[Optional[Dict[int, Tuple[int, str]]], Optional[str]]:
+        """
+        Huella barata de la bitácora de varios trabajadores (para claves de caché)
+        
+        COUNT(*) y MAX(updated_at) por trabajador con el mismo índice que
+        ejecutar_por_trabajadores, sin leer los renglones. updated_at tiene
+        resolución de segundos: un cambio en el mismo segundo que el anterior
+        no altera la huella.
+        
+        Returns:
+            tuple: ({num_trabajador: (registros, ultima_actualizacion)}, error);
+                   los trabajadores sin registros no aparecen
+        """
+        nums = list(dict.fromkeys(int(num) for num in num_trabajadores))
+        versiones = {}
+        
+        for i in range(0, len(nums), LOTE_TRABAJADORES_CONSULTA):
+            lote = nums[i:i + LOTE_TRABAJADORES_CONSULTA]
+            placeholders = ', '.join(['%s'] * len(lote))
+            query = (
+                f"SELECT num_trabajador, COUNT(*) AS registros, MAX(updated_at) AS actualizado "
+                f"FROM bitacora "
+                f"WHERE num_trabajador IN ({placeholders}) AND fecha >= %s AND fecha <= %s "
+                f"GROUP BY num_trabajador"
+            )
+            resultados, error = self.query_executor.ejecutar(query, (*lote, fecha_inicio, fecha_fin))
+            if error:
+                logger.error("[LISTAR BITACORA] Versiones de %s trabajadores: %s", len(lote), error)
+                return None, error
+            
+            for row in resultados:
+                versiones[row['num_trabajador']] = (row['registros'], str(row['actualizado']))
+        
+        return versiones, None
+    
+    def _consultar_lote(self, nums: List[int], fecha_inicio: date, fecha_fin: date) -> Iterator[dict]:
+        """Filas de un lote de trabajadores ordenadas por trabajador y fecha"""
+        placeholders = ', '.join(['%s'] * len(nums))
+        query = (
+            f"SELECT {COLUMNAS} FROM bitacora "
+            f"WHERE num_trabajador IN ({placeholders}) AND fecha >= %s AND fecha <= %s "
+            f"ORDER BY num_trabajador, fecha"
+        )
+        return self.query_executor.ejecutar_stream(query, (*nums, fecha_inicio, fecha_fin))
+    
+    @staticmethod
+    def _a_registro(row: dict) -> BitacoraRecord:
+        """Convierte una fila de la tabla bitacora en BitacoraRecord"""
+        return BitacoraRecord(
+            id=row['id'],
+            num_trabajador=row['num_trabajador'],
+            departamento=row['departamento'],
+            nombre_trabajador=row['nombre_trabajador'],
+            fecha=row['fecha'],
+            turno_id=row['turno_id'],
+            horario_texto=row['horario_texto'],
+            codigo_incidencia=row['codigo_incidencia'],
+            tipo_movimiento=row['tipo_movimiento'],
+            movimiento_id=row['movimiento_id'],
+            checada1=row['checada1'],
+            checada2=row['checada2'],
+            checada3=row['checada3'],
+            checada4=row['checada4'],
+            minutos_retardo=row['minutos_retardo'],
+            horas_trabajadas=row['horas_trabajadas'],
+            descripcion_incidencia=row['descripcion_incidencia'],
+            fecha_procesamiento=row['fecha_procesamiento'],
+            procesado_por=row['procesado_por'],
+            created_at=row['created_at'],
+            updated_at=row['updated_at']
+        )
 
 
 # Instancia singleton
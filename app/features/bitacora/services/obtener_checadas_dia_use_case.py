@@ -2,12 +2,16 @@
 Caso de uso: Obtener Checadas del Día
 Obtiene todas las checadas de un trabajador en un día específico
 """
+import logging
 from app.core.database.query_executor import QueryExecutor
 from app.core.database.connection import db_connection
 from app.config import bitacora_config
+from app.features.asistencias.services.archivo_asistencias import archivo_asistencias
 from datetime import date, time, datetime, timedelta
 from typing import Optional, List, Dict, Tuple
 
+logger = logging.getLogger(__name__)
+
 
 class ObtenerChecadasDiaUseCase:
     """Obtiene checadas de un trabajador en un día"""
@@ -198,7 +202,7 @@ class ObtenerChecadasDiaUseCase:
                 
                 return checada1, checada2, checada3, checada4
         except Exception as e:
-            print(f"[ERROR] Error en asignación inteligente: {e}")
+            logger.error("Error en asignación inteligente: %s", e)
             import traceback
             traceback.print_exc()
             # Fallback a asignación simple
@@ -273,11 +277,84 @@ class ObtenerChecadasDiaUseCase:
         mejor = min(disponibles, key=diferencia_minutos)
         return mejor[1]  # Retornar el original (puede ser timedelta)
     
+    def _con_archivadas(
+        self,
+        resultados: List[Dict],
+        num_trabajador: int,
+        fecha_inicio: date,
+        fecha_fin: date
+    ) -> tuple[Optional[List[Dict]], Optional[str]]:
+        """
+        Agrega las checadas del archivo frío si el rango llega a meses archivados
+        
+        Una checada que está en la tabla y en el archivo (descargada otra vez
+        antes de que la descarga revisara el archivo) se cuenta una sola vez.
+        
+        Returns:
+            tuple: (filas ordenadas por fecha y hora, error)
+        """
+        archivadas, error = archivo_asistencias.leer(
+            fecha_inicio, fecha_fin, [num_trabajador], excluir=resultados
+        )
+        if error:
+            return None, f"Error al leer el archivo de asistencias: {error}"
+        if not archivadas:
+            return resultados, None
+        return sorted([*resultados, *archivadas], key=lambda fila: (fila['fecha'], fila['hora'])), None
+    
+    def checadas_rango(
+        self,
+        num_trabajador: int,
+        fecha_inicio: date,
+        fecha_fin: date
+    ) -> tuple[Optional[Dict[date, List[Dict]]], Optional[str]]:
+        """
+        Obtiene las checadas de un trabajador en un rango de fechas con una sola query
+        
+        El filtro es un rango sobre fecha (sin funciones sobre la columna): usa
+        idx_trabajador_fecha y, con la tabla particionada, solo lee las
+        particiones del rango. Los meses archivados se leen del archivo frío.
+        
+        Args:
+            num_trabajador: Número del trabajador
+            fecha_inicio: Primer día
+            fecha_fin: Último día (inclusive)
+            
+        Returns:
+            tuple: ({fecha: filas del día ordenadas por hora}, error)
+        """
+        query = """
+            SELECT 
+                id,
+                num_trabajador,
+                fecha,
+                hora,
+                checador
+            FROM asistencias
+            WHERE num_trabajador = %s
+            AND fecha >= %s AND fecha <= %s
+            ORDER BY fecha ASC, hora ASC
+        """
+        
+        resultados, error = self.query_executor.ejecutar(query, (num_trabajador, fecha_inicio, fecha_fin))
+        if error:
+            return None, f"Error al obtener checadas: {error}"
+        
+        resultados, error = self._con_archivadas(resultados, num_trabajador, fecha_inicio, fecha_fin)
+        if error:
+            return None, error
+        
+        por_dia = {}
+        for fila in resultados:
+            por_dia.setdefault(fila['fecha'], []).append(fila)
+        return por_dia, None
+    
     def ejecutar(
         self,
         num_trabajador: int,
         fecha: date,
-        horario_esperado: Optional[str] = None
+        horario_esperado: Optional[str] = None,
+        checadas_dia: Optional[List[Dict]] = None
     ) -> tuple[Optional[Dict], Optional[str]]:
         """
         Obtiene las checadas del día y las organiza por entrada/salida
@@ -287,31 +364,41 @@ class ObtenerChecadasDiaUseCase:
             num_trabajador: Número del trabajador
             fecha: Fecha a consultar
             horario_esperado: Horario esperado del trabajador (opcional)
+            checadas_dia: Filas del día ya consultadas con checadas_rango()
+                          (None = consultarlas)
             
         Returns:
             tuple: (diccionario con checadas organizadas, error)
         """
         try:
-            # Obtener TODAS las checadas del día ordenadas por hora
-            query = """
-                SELECT 
-                    id,
-                    num_trabajador,
-                    fecha,
-                    hora
-                FROM asistencias
-                WHERE num_trabajador = %s
-                AND fecha = %s
-                ORDER BY hora ASC
-            """
-            
-            resultados, error = self.query_executor.ejecutar(
-                query, 
-                (num_trabajador, fecha)
-            )
-            
-            if error:
-                return None, f"Error al obtener checadas: {error}"
+            if checadas_dia is not None:
+                resultados = checadas_dia
+            else:
+                # Obtener TODAS las checadas del día ordenadas por hora
+                query = """
+                    SELECT 
+                        id,
+                        num_trabajador,
+                        fecha,
+                        hora,
+                        checador
+                    FROM asistencias
+                    WHERE num_trabajador = %s
+                    AND fecha = %s
+                    ORDER BY hora ASC
+                """
+                
+                resultados, error = self.query_executor.ejecutar(
+                    query, 
+                    (num_trabajador, fecha)
+                )
+                
+                if error:
+                    return None, f"Error al obtener checadas: {error}"
+                
+                resultados, error = self._con_archivadas(resultados, num_trabajador, fecha, fecha)
+                if error:
+                    return None, error
             
             # Si no hay checadas
             if not resultados:
@@ -329,12 +416,12 @@ class ObtenerChecadasDiaUseCase:
             # Extraer solo las horas
             checadas_originales = [r['hora'] for r in resultados]
             
-            print(f"[DEBUG] Fecha {fecha}: {len(checadas_originales)} checadas originales: {checadas_originales}")
+            logger.debug("Fecha %s: %s checadas originales: %s", fecha, len(checadas_originales), checadas_originales)
             
             # PASO 1: Filtrar checadas duplicadas (diferencia < 1 minuto)
             checadas_filtradas = self._filtrar_checadas_duplicadas(checadas_originales)
             
-            print(f"[DEBUG] Fecha {fecha}: {len(checadas_filtradas)} checadas después de filtrar: {checadas_filtradas}")
+            logger.debug("Fecha %s: %s checadas después de filtrar: %s", fecha, len(checadas_filtradas), checadas_filtradas)
             
             # PASO 2: Asignar inteligentemente a entrada/salida
             checada1, checada2, checada3, checada4 = self._asignar_checadas_inteligentemente(
@@ -342,7 +429,7 @@ class ObtenerChecadasDiaUseCase:
                 horario_esperado
             )
             
-            print(f"[DEBUG] Fecha {fecha}: Asignación final -> c1={checada1}, c2={checada2}, c3={checada3}, c4={checada4}")
+            logger.debug("Fecha %s: Asignación final -> c1=%s, c2=%s, c3=%s, c4=%s", fecha, checada1, checada2, checada3, checada4)
             
             # Organizar resultado
             checadas_organizadas = {
@@ -20,7 +20,8 @@ class ProcesarBitacoraMasivoUseCase:
         self,
         num_trabajadores: List[int],
         fecha_inicio: date,
-        fecha_fin: date
+        fecha_fin: date,
+        procesado_por: Optional[str] = None
     ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
         """
         Procesa la bitácora de múltiples trabajadores
@@ -29,6 +30,7 @@ class ProcesarBitacoraMasivoUseCase:
             num_trabajadores: Lista de números de trabajador
             fecha_inicio: Fecha de inicio del período
             fecha_fin: Fecha de fin del período
+            procesado_por: Usuario que procesa (se guarda en bitacora.procesado_por)
             
         Returns:
             Tupla (resultados, error) donde resultados es una lista de:
@@ -42,24 +44,25 @@ class ProcesarBitacoraMasivoUseCase:
             }
         """
         try:
-            logger.info(f"Procesando bitácora masiva para {len(num_trabajadores)} trabajadores")
-            logger.info(f"Período: {fecha_inicio} a {fecha_fin}")
+            logger.info("Procesando bitácora masiva para %s trabajadores", len(num_trabajadores))
+            logger.info("Período: %s a %s", fecha_inicio, fecha_fin)
             
             resultados = []
             
             for num_trabajador in num_trabajadores:
-                logger.info(f"Procesando trabajador {num_trabajador}...")
+                logger.debug("Procesando trabajador %s...", num_trabajador)
                 
                 try:
                     # Procesar individualmente
                     resultado_individual, error = self.procesar_individual_use_case.ejecutar(
                         num_trabajador=num_trabajador,
                         fecha_inicio=fecha_inicio,
-                        fecha_fin=fecha_fin
+                        fecha_fin=fecha_fin,
+                        procesado_por=procesado_por
                     )
                     
                     if error:
-                        logger.error(f"Error procesando trabajador {num_trabajador}: {error}")
+                        logger.error("Error procesando trabajador %s: %s", num_trabajador, error)
                         resultados.append({
                             'num_trabajador': num_trabajador,
                             'nombre': 'Desconocido',
@@ -70,8 +73,8 @@ class ProcesarBitacoraMasivoUseCase:
                         })
                     else:
                         registros, stats = resultado_individual
-                        logger.info(f"Trabajador {num_trabajador}: {len(registros)} registros procesados")
-                        logger.info(f"Stats: {stats}")
+                        logger.debug("Trabajador %s: %s registros procesados", num_trabajador, len(registros))
+                        logger.debug("Stats: %s", stats)
                         
                         # Obtener nombre del trabajador (del primer registro si existe)
                         nombre = 'Sin nombre'
@@ -87,7 +90,7 @@ class ProcesarBitacoraMasivoUseCase:
                         })
                 
                 except Exception as e:
-                    logger.error(f"Excepción procesando trabajador {num_trabajador}: {str(e)}")
+                    logger.error("Excepción procesando trabajador %s: %s", num_trabajador, str(e))
                     resultados.append({
                         'num_trabajador': num_trabajador,
                         'nombre': 'Desconocido',
@@ -97,13 +100,13 @@ class ProcesarBitacoraMasivoUseCase:
                         'total_registros': 0
                     })
             
-            logger.info(f"Procesamiento masivo completado: {len(resultados)} trabajadores procesados")
+            logger.info("Procesamiento masivo completado: %s trabajadores procesados", len(resultados))
             
             # Calcular totales
             total_exitosos = sum(1 for r in resultados if r['success'])
             total_fallidos = len(resultados) - total_exitosos
             
-            logger.info(f"Exitosos: {total_exitosos}, Fallidos: {total_fallidos}")
+            logger.info("Exitosos: %s, Fallidos: %s", total_exitosos, total_fallidos)
             
             return resultados, None
             
@@ -0,0 +1,275 @@
+"""
+Caso de uso: Procesamiento Nocturno de Bitácora
+Procesa de forma incremental los días pendientes de todos los trabajadores activos
+usando el procesamiento masivo, y guarda los metadatos de cada corrida
+"""
+import json
+import logging
+import time
+from datetime import date, timedelta
+from typing import List, Optional, Dict, Any
+
+from app.config import bitacora_config
+from app.core.database.query_executor import QueryExecutor
+from app.core.database.connection import db_connection
+from app.features.bitacora.services.procesar_bitacora_masivo_use_case import procesar_bitacora_masivo_use_case
+
+logger = logging.getLogger(__name__)
+
+# Máximo de errores individuales que se guardan en bitacora_ejecuciones.errores
+MAX_ERRORES_GUARDADOS = 100
+
+
+class ProcesarBitacoraNocturnaUseCase:
+    """Procesa la bitácora de los días pendientes para todos los trabajadores activos"""
+
+    def __init__(self):
+        self.query_executor = QueryExecutor(db_connection)
+
+    def ejecutar(
+        self,
+        fecha_fin: Optional[date] = None,
+        dias: Optional[int] = None,
+        num_trabajadores: Optional[List[int]] = None,
+        tipo: str = 'nocturna'
+    ) -> tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Ejecuta una corrida incremental
+
+        Si no se indica `dias`, el rango inicia el día siguiente a la última corrida
+        'completada' del mismo tipo (máximo MAX_DIAS_RECUPERACION_NOCTURNA días
+        atrás). Una corrida 'con_errores' no avanza ese punto: la siguiente vuelve
+        a procesar sus días y reintenta los trabajadores que fallaron.
+
+        Una corrida con `dias` o con trabajadores explícitos no cubre a todos en
+        el rango pendiente: si se pidió como 'nocturna' se guarda como 'manual'
+        para no adelantar el punto de partida de las nocturnas.
+
+        Args:
+            fecha_fin: Último día a procesar (default: ayer)
+            dias: Número de días a procesar hacia atrás desde fecha_fin (ignora el historial)
+            num_trabajadores: Lista explícita de trabajadores (default: todos los activos con horario)
+            tipo: Tipo de corrida que se guarda en bitacora_ejecuciones
+
+        Returns:
+            tuple: (resumen de la corrida, error)
+        """
+        fecha_fin = fecha_fin or (date.today() - timedelta(days=1))
+        if tipo == 'nocturna' and (dias or num_trabajadores is not None):
+            tipo = 'manual'
+
+        # 1. Determinar rango de fechas
+        fecha_inicio, error = self._calcular_fecha_inicio(fecha_fin, dias, tipo)
+        if error:
+            return None, error
+
+        if fecha_inicio > fecha_fin:
+            logger.info("Bitácora al día hasta %s, no hay días pendientes", fecha_fin)
+            return {
+                'ejecucion_id': None,
+                'fecha_inicio': fecha_inicio.isoformat(),
+                'fecha_fin': fecha_fin.isoformat(),
+                'estado': 'sin_pendientes',
+                'trabajadores_total': 0
+            }, None
+
+        # 2. Obtener trabajadores a procesar
+        if num_trabajadores is None:
+            num_trabajadores, error = self._obtener_trabajadores_activos(fecha_inicio, fecha_fin)
+            if error:
+                return None, error
+
+        # 3. Registrar inicio de la corrida
+        ejecucion_id, error = self._registrar_inicio(tipo, fecha_inicio, fecha_fin, len(num_trabajadores))
+        if error:
+            return None, error
+
+        logger.info(
+            "Corrida %s #%s: %d trabajadores, %s a %s",
+            tipo, ejecucion_id, len(num_trabajadores), fecha_inicio, fecha_fin
+        )
+
+        # 4. Procesar con el motor masivo
+        inicio = time.monotonic()
+        resultados, error = procesar_bitacora_masivo_use_case.ejecutar(
+            num_trabajadores=num_trabajadores,
+            fecha_inicio=fecha_inicio,
+            fecha_fin=fecha_fin,
+            procesado_por=bitacora_config.PROCESADO_POR_NOCTURNO
+        )
+        duracion = time.monotonic() - inicio
+
+        if error:
+            self._registrar_fin(ejecucion_id, 'fallida', duracion, {}, [{'error': error}])
+            return None, error
+
+        # 5. Calcular totales y guardar metadatos
+        totales = {
+            'trabajadores_exitosos': sum(1 for r in resultados if r['success']),
+            'trabajadores_fallidos': sum(1 for r in resultados if not r['success']),
+            'registros_insertados': sum(r['stats'].get('insertados', 0) for r in resultados),
+            'registros_actualizados': sum(r['stats'].get('actualizados', 0) for r in resultados),
+            'registros_errores': sum(r['stats'].get('errores', 0) for r in resultados)
+        }
+        errores = [
+            {'num_trabajador': r['num_trabajador'], 'error': r.get('error')}
+            for r in resultados if not r['success']
+        ]
+
+        hay_errores = totales['trabajadores_fallidos'] > 0 or totales['registros_errores'] > 0
+        estado = 'con_errores' if hay_errores else 'completada'
+
+        _, error = self._registrar_fin(ejecucion_id, estado, duracion, totales, errores)
+        if error:
+            logger.error("No se pudo guardar el resultado de la corrida #%s: %s", ejecucion_id, error)
+
+        logger.info(
+            "Corrida #%s %s en %.1fs: %d insertados, %d actualizados, %d trabajadores con error",
+            ejecucion_id, estado, duracion, totales['registros_insertados'],
+            totales['registros_actualizados'], totales['trabajadores_fallidos']
+        )
+
+        return {
+            'ejecucion_id': ejecucion_id,
+            'fecha_inicio': fecha_inicio.isoformat(),
+            'fecha_fin': fecha_fin.isoformat(),
+            'estado': estado,
+            'duracion_segundos': round(duracion, 2),
+            'trabajadores_total': len(num_trabajadores),
+            **totales,
+            'errores': errores[:MAX_ERRORES_GUARDADOS]
+        }, None
+
+    def listar_ejecuciones(self, limite: int = 20) -> tuple[Optional[List[Dict]], Optional[str]]:
+        """
+        Lista las corridas más recientes
+
+        Args:
+            limite: Número máximo de corridas
+
+        Returns:
+            tuple: (lista de corridas, error)
+        """
+        query = """
+            SELECT
+                id, tipo, fecha_inicio, fecha_fin, estado,
+                trabajadores_total, trabajadores_exitosos, trabajadores_fallidos,
+                registros_insertados, registros_actualizados, registros_errores,
+                duracion_segundos, errores, ejecutado_por, iniciado_en, finalizado_en
+            FROM bitacora_ejecuciones
+            ORDER BY iniciado_en DESC
+            LIMIT %s
+        """
+        resultados, error = self.query_executor.ejecutar(query, (limite,))
+
+        if error:
+            return None, f"Error al listar ejecuciones: {error}"
+
+        ejecuciones = []
+        for row in resultados:
+            ejecucion = dict(row)
+            for campo in ('fecha_inicio', 'fecha_fin', 'iniciado_en', 'finalizado_en'):
+                if ejecucion.get(campo):
+                    ejecucion[campo] = ejecucion[campo].isoformat()
+            if ejecucion.get('duracion_segundos') is not None:
+                ejecucion['duracion_segundos'] = float(ejecucion['duracion_segundos'])
+            ejecucion['errores'] = json.loads(ejecucion['errores']) if ejecucion.get('errores') else []
+            ejecuciones.append(ejecucion)
+
+        return ejecuciones, None
+
+    def _calcular_fecha_inicio(self, fecha_fin: date, dias: Optional[int], tipo: str) -> tuple:
+        """Calcula el primer día pendiente a partir del historial de corridas"""
+        if dias:
+            return fecha_fin - timedelta(days=dias - 1), None
+
+        query = """
+            SELECT MAX(fecha_fin) as ultima_fecha
+            FROM bitacora_ejecuciones
+            WHERE tipo = %s AND estado = 'completada'
+        """
+        resultados, error = self.query_executor.ejecutar(query, (tipo,))
+
+        if error:
+            return None, f"Error al consultar ejecuciones previas: {error}"
+
+        ultima_fecha = resultados[0]['ultima_fecha'] if resultados else None
+        limite_recuperacion = fecha_fin - timedelta(days=bitacora_config.MAX_DIAS_RECUPERACION_NOCTURNA - 1)
+
+        if not ultima_fecha:
+            return fecha_fin - timedelta(days=bitacora_config.DIAS_PROCESAMIENTO_NOCTURNO - 1), None
+
+        return max(ultima_fecha + timedelta(days=1), limite_recuperacion), None
+
+    def _obtener_trabajadores_activos(self, fecha_inicio: date, fecha_fin: date) -> tuple:
+        """Obtiene trabajadores activos con horario asignado vigente en el rango"""
+        query = """
+            SELECT DISTINCT t.num_trabajador
+            FROM trabajadores t
+            INNER JOIN horarios_trabajadores ht ON ht.num_trabajador = t.num_trabajador
+            WHERE t.activo = 1
+            AND ht.activo_asignacion = 1
+            AND ht.fecha_inicio_asignacion <= %s
+            AND (ht.fecha_fin_asignacion IS NULL OR ht.fecha_fin_asignacion >= %s)
+            ORDER BY t.num_trabajador
+        """
+        resultados, error = self.query_executor.ejecutar(query, (fecha_fin, fecha_inicio))
+
+        if error:
+            return None, f"Error al obtener trabajadores activos: {error}"
+
+        return [row['num_trabajador'] for row in resultados], None
+
+    def _registrar_inicio(self, tipo: str, fecha_inicio: date, fecha_fin: date, total: int) -> tuple:
+        """Inserta la corrida con estado 'en_curso' y retorna su ID"""
+        query = """
+            INSERT INTO bitacora_ejecuciones (
+                tipo, fecha_inicio, fecha_fin, estado, trabajadores_total, ejecutado_por
+            ) VALUES (%s, %s, %s, 'en_curso', %s, %s)
+        """
+        ejecucion_id, error = self.query_executor.insertar(
+            query, (tipo, fecha_inicio, fecha_fin, total, bitacora_config.PROCESADO_POR_NOCTURNO)
+        )
+        if error:
+            return None, f"Error al registrar ejecución: {error}"
+
+        return ejecucion_id, None
+
+    def _registrar_fin(
+        self,
+        ejecucion_id: int,
+        estado: str,
+        duracion: float,
+        totales: Dict[str, int],
+        errores: List[Dict]
+    ) -> tuple:
+        """Actualiza la corrida con sus resultados"""
+        query = """
+            UPDATE bitacora_ejecuciones SET
+                estado = %s,
+                trabajadores_exitosos = %s,
+                trabajadores_fallidos = %s,
+                registros_insertados = %s,
+                registros_actualizados = %s,
+                registros_errores = %s,
+                duracion_segundos = %s,
+                errores = %s,
+                finalizado_en = NOW()
+            WHERE id = %s
+        """
+        params = (
+            estado,
+            totales.get('trabajadores_exitosos', 0),
+            totales.get('trabajadores_fallidos', 0),
+            totales.get('registros_insertados', 0),
+            totales.get('registros_actualizados', 0),
+            totales.get('registros_errores', 0),
+            round(duracion, 2),
+            json.dumps(errores[:MAX_ERRORES_GUARDADOS], ensure_ascii=False) if errores else None,
+            ejecucion_id
+        )
+        return self.query_executor.ejecutar(query, params)
+
+
+# Instancia singleton
+procesar_bitacora_nocturna_use_case = ProcesarBitacoraNocturnaUseCase()
@@ -2,6 +2,7 @@
 Caso de uso: Procesar Bitácora
 Procesa asistencias de un trabajador en un rango de fechas
 """
+import logging
 from app.core.database.query_executor import QueryExecutor
 from app.core.database.connection import db_connection
 from app.features.bitacora.services.obtener_horario_asignado_use_case import obtener_horario_asignado_use_case
@@ -12,6 +13,8 @@ from app.features.bitacora.models.bitacora_models import BitacoraRecord
 from datetime import date, timedelta
 from typing import List, Optional
 
+logger = logging.getLogger(__name__)
+
 
 class ProcesarBitacoraUseCase:
     """Procesa bitácora de asistencias completa"""
@@ -53,13 +56,19 @@ class ProcesarBitacoraUseCase:
             
             horario_asignado = horarios[0]
             
-            # 3. Procesar día por día
+            # 3. Checadas de todo el rango en una sola query (por rango de fecha)
+            checadas_por_dia, error = obtener_checadas_dia_use_case.checadas_rango(
+                num_trabajador, fecha_inicio, fecha_fin
+            )
+            if error:
+                return None, error
+            
+            # 4. Procesar día por día
             registros = []
             stats = {'insertados': 0, 'actualizados': 0, 'bloqueados': 0, 'errores': 0, 'saltados_descanso': 0}
             fecha_actual = fecha_inicio
             
-            print(f"[INFO] Iniciando procesamiento de bitácora del trabajador {num_trabajador}")
-            print(f"[INFO] Rango de fechas: {fecha_inicio} a {fecha_fin}")
+            logger.debug("Procesando bitácora del trabajador %s: %s a %s", num_trabajador, fecha_inicio, fecha_fin)
             
             while fecha_actual <= fecha_fin:
                 # Obtener horario del día de la semana
@@ -72,7 +81,7 @@ class ProcesarBitacoraUseCase:
                     num_trabajador, fecha_actual
                 )
                 if error:
-                    print(f"[WARNING] Error obteniendo movimiento {fecha_actual}: {error}")
+                    logger.warning("Error obteniendo movimiento %s: %s", fecha_actual, error)
                     movimiento = None
                 
                 # REGLA: No procesar sábados (5) y domingos (6) EXCEPTO si:
@@ -83,7 +92,7 @@ class ProcesarBitacoraUseCase:
                 tiene_movimiento = movimiento and movimiento.get('tiene_movimiento')
                 
                 if es_fin_de_semana and not tiene_horario_real and not tiene_movimiento:
-                    print(f"[DEBUG] Día {fecha_actual} ({dia_nombre}) saltado: Fin de semana sin horario ni movimiento")
+                    logger.debug("Día %s (%s) saltado: Fin de semana sin horario ni movimiento", fecha_actual, dia_nombre)
                     stats['saltados_descanso'] += 1
                     fecha_actual += timedelta(days=1)
                     continue
@@ -91,20 +100,21 @@ class ProcesarBitacoraUseCase:
                 # Si no tiene horario ese día o es día de descanso pero SÍ tiene movimiento
                 if (not horario_dia or horario_dia.upper() == 'DESCANSO') and tiene_movimiento:
                     horario_dia = '00:00-00:00'  # Horario ficticio para procesar el movimiento
-                    print(f"[DEBUG] Día {fecha_actual} ({dia_nombre}) es DESCANSO pero tiene movimiento")
+                    logger.debug("Día %s (%s) es DESCANSO pero tiene movimiento", fecha_actual, dia_nombre)
                 elif not horario_dia or horario_dia.upper() == 'DESCANSO':
                     # Es descanso y NO tiene movimiento, saltar
-                    print(f"[DEBUG] Día {fecha_actual} ({dia_nombre}) saltado: DESCANSO sin movimiento")
+                    logger.debug("Día %s (%s) saltado: DESCANSO sin movimiento", fecha_actual, dia_nombre)
                     stats['saltados_descanso'] += 1
                     fecha_actual += timedelta(days=1)
                     continue
                 
                 # Obtener checadas del día (con lógica inteligente)
                 checadas, error = obtener_checadas_dia_use_case.ejecutar(
-                    num_trabajador, fecha_actual, horario_dia
+                    num_trabajador, fecha_actual, horario_dia,
+                    checadas_dia=checadas_por_dia.get(fecha_actual, [])
                 )
                 if error:
-                    print(f"[WARNING] Error obteniendo checadas {fecha_actual}: {error}")
+                    logger.warning("Error obteniendo checadas %s: %s", fecha_actual, error)
                     checadas = {'tiene_checadas': False}
                 
                 # Calcular incidencias (movimiento ya se obtuvo arriba)
@@ -139,10 +149,11 @@ class ProcesarBitacoraUseCase:
                 # Validar
                 es_valido, error_validacion = registro.validar()
                 if not es_valido:
-                    print(f"[ERROR] Registro inválido {fecha_actual}: {error_validacion}")
-                    print(f"  - Código: {registro.codigo_incidencia}, Tipo Mov: {registro.tipo_movimiento}")
-                    print(f"  - Checada1: {registro.checada1}, Checada2: {registro.checada2}")
-                    print(f"  - Movimiento: {movimiento}")
+                    logger.error(
+                        "Registro inválido %s: %s (código=%s, tipo_mov=%s, checada1=%s, checada2=%s, movimiento=%s)",
+                        fecha_actual, error_validacion, registro.codigo_incidencia, registro.tipo_movimiento,
+                        registro.checada1, registro.checada2, movimiento
+                    )
                     stats['errores'] += 1
                     fecha_actual += timedelta(days=1)
                     continue
@@ -150,14 +161,17 @@ class ProcesarBitacoraUseCase:
                 # Guardar en BD
                 success, error, accion = self._guardar_registro(registro)
                 if error:
-                    print(f"[ERROR] Error guardando registro {fecha_actual}: {error}")
+                    logger.error("Error guardando registro %s: %s", fecha_actual, error)
                     stats['errores'] += 1
                 else:
                     if accion == 'bloqueado':
-                        print(f"[BLOQUEADO] {fecha_actual} ({dia_nombre}) - Registro protegido (updatable=FALSE)")
+                        logger.debug("%s (%s) - Registro protegido (updatable=FALSE)", fecha_actual, dia_nombre)
                         stats['bloqueados'] += 1
                     else:
-                        print(f"[OK] {fecha_actual} ({dia_nombre}) {accion}: {registro.codigo_incidencia} - {registro.descripcion_incidencia[:50]}")
+                        logger.debug(
+                            "%s (%s) %s: %s - %.50s", fecha_actual, dia_nombre, accion,
+                            registro.codigo_incidencia, registro.descripcion_incidencia
+                        )
                         if accion == 'actualizado':
                             stats['actualizados'] += 1
                         else:
@@ -169,15 +183,13 @@ class ProcesarBitacoraUseCase:
             # Resumen final
             total_dias = (fecha_fin - fecha_inicio).days + 1
             dias_procesados = stats['insertados'] + stats['actualizados']
-            print(f"\n[INFO] Resumen de procesamiento trabajador {num_trabajador}:")
-            print(f"  Total de días en rango: {total_dias}")
-            print(f"  Días procesados: {dias_procesados}")
-            print(f"  - Insertados: {stats['insertados']}")
-            print(f"  - Actualizados: {stats['actualizados']}")
-            print(f"  - Bloqueados (protegidos): {stats['bloqueados']}")
-            print(f"  Días saltados (descanso): {stats['saltados_descanso']}")
-            print(f"  Errores: {stats['errores']}")
-            print(f"  Días sin procesar: {total_dias - dias_procesados - stats['saltados_descanso'] - stats['bloqueados']}\n")
+            logger.info(
+                "Trabajador %s: %d días en rango, %d insertados, %d actualizados, %d bloqueados, "
+                "%d saltados (descanso), %d errores, %d sin procesar",
+                num_trabajador, total_dias, stats['insertados'], stats['actualizados'], stats['bloqueados'],
+                stats['saltados_descanso'], stats['errores'],
+                total_dias - dias_procesados - stats['saltados_descanso'] - stats['bloqueados']
+            )
             
             return (registros, stats), None
             
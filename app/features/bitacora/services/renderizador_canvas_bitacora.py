@@ -0,0 +1,239 @@
+"""
+Renderizador directo en canvas de las hojas de bitácora
+Dibuja encabezado, tabla y pie con coordenadas precalculadas en lugar de
+platypus (Paragraph + Table + TableStyle)
+
+El layout es fijo (landscape carta, márgenes de 0.5", 12 columnas), así que
+las posiciones se calculan una vez y solo se mide el ancho de cada texto
+(con caché). Reproduce la salida de SimpleDocTemplate:
+- Títulos centrados de 12 pt separados 22 pt, tabla centrada en el marco
+- Renglones de 20 pt (28 pt el encabezado, +12 pt por línea extra de un
+  horario mixto), texto alineado abajo
+- Si la tabla no cabe en la hoja continúa arriba de la siguiente sin
+  repetir el encabezado, igual que Table.split()
+- Pie alineado a la derecha 10 pt debajo de la tabla
+
+A diferencia de Paragraph, los títulos no se parten en varias líneas ni
+interpretan marcado (<b>, &amp;): se dibujan tal cual.
+"""
+from functools import lru_cache
+from itertools import accumulate
+from typing import BinaryIO, List, Sequence
+
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen.canvas import Canvas
+
+ENCABEZADOS = [
+    'Codigo', 'Depto.', 'Nombre', 'Fecha', 'Turno', 'Horario',
+    'C', 'Mov', 'Checada1', 'Checada2', 'Checada3', 'Checada4'
+]
+ANCHOS_COLUMNA = [40, 35, 200, 70, 35, 70, 30, 40, 50, 50, 50, 50]
+COLUMNAS_IZQUIERDA = {2}  # Nombre; el resto va centrado
+
+# Página y marco de SimpleDocTemplate (márgenes de 0.5" + padding de 6 pt del Frame)
+PAGINA = landscape(letter)
+MARGEN = 0.5 * inch
+PADDING_MARCO = 6
+MARCO_X = MARGEN + PADDING_MARCO
+MARCO_ANCHO = PAGINA[0] - 2 * MARCO_X
+MARCO_ARRIBA = PAGINA[1] - MARCO_X
+MARCO_ABAJO = MARCO_X
+
+# Títulos (estilo CustomTitle: Helvetica 12, leading 12, espacio de 10 antes/después)
+FUENTE_TITULO = ('Helvetica', 12)
+LEADING_TITULO = 12
+ESPACIO_TITULO = 10
+
+# Tabla
+FUENTE_ENCABEZADO = ('Helvetica-Bold', 8)
+FUENTE_DATOS = ('Helvetica', 7)
+LEADING_CELDA = 12
+PADDING_ENCABEZADO = 8
+PADDING_DATOS = 4
+PADDING_CELDA_X = 6
+GROSOR_REJILLA = 0.5
+GROSOR_CONTORNO = 1
+
+# Pie (estilo PageInfo: Helvetica 8, leading 12, alineado a la derecha)
+FUENTE_PIE = ('Helvetica', 8)
+LEADING_PIE = 12
+ESPACIO_PIE = 10
+
+TABLA_ANCHO = sum(ANCHOS_COLUMNA)
+TABLA_X = MARCO_X + (MARCO_ANCHO - TABLA_ANCHO) / 2
+BORDES_X = [TABLA_X + x for x in accumulate([0] + ANCHOS_COLUMNA)]
+# x de cada columna: inicio + padding (izquierda) o centro de la columna
+TEXTO_X = [
+    BORDES_X[i] + PADDING_CELDA_X if i in COLUMNAS_IZQUIERDA else BORDES_X[i] + ANCHOS_COLUMNA[i] / 2
+    for i in range(len(ANCHOS_COLUMNA))
+]
+
+
+@lru_cache(maxsize=4096)
+def _ancho(texto: str, fuente: str, tamano: float) -> float:
+    """Ancho del texto; los valores se repiten mucho (horas, horarios, nombres)"""
+    return stringWidth(texto, fuente, tamano)
+
+
+class RenderizadorCanvasBitacora:
+    """
+    Dibuja hojas de bitácora en un canvas de ReportLab
+
+    Uso:
+        renderizador = RenderizadorCanvasBitacora(buffer)
+        renderizador.agregar_hoja(titulos, filas, "HOJA #1")
+        paginas = renderizador.guardar()
+    """
+
+    def __init__(self, destino: BinaryIO):
+        self.canvas = Canvas(destino, pagesize=PAGINA)
+        self.hojas = 0
+        self._pagina_usada = False
+        self._y = MARCO_ARRIBA
+
+    def agregar_hoja(self, titulos: Sequence[str], filas: List[List], pie: str):
+        """
+        Agrega una hoja: títulos, tabla con encabezados y pie
+
+        Cada hoja empieza en página nueva (equivale al PageBreak entre hojas).
+
+        Args:
+            titulos: Líneas del encabezado, centradas
+            filas: Renglones de la tabla (12 valores; '\\n' separa líneas de una celda)
+            pie: Texto alineado a la derecha debajo de la tabla
+        """
+        if self._pagina_usada:
+            self._nueva_pagina()
+        self._pagina_usada = True
+        self.hojas += 1
+
+        self._dibujar_titulos(titulos)
+        self._dibujar_tabla([ENCABEZADOS] + [[self._texto(v) for v in fila] for fila in filas])
+        self._dibujar_pie(pie)
+
+    def guardar(self) -> int:
+        """Escribe el PDF en el destino y retorna el número de páginas"""
+        paginas = self.canvas.getPageNumber()
+        self.canvas.save()
+        return paginas
+
+    # ------------------------------------------
+    # Dibujo
+    # ------------------------------------------
+
+    def _nueva_pagina(self):
+        self.canvas.showPage()
+        self._y = MARCO_ARRIBA
+
+    def _dibujar_titulos(self, titulos: Sequence[str]):
+        fuente, tamano = FUENTE_TITULO
+        texto = self.canvas.beginText()
+        texto.setFont(fuente, tamano, LEADING_TITULO)
+
+        # El espacio antes del primer título se ignora arriba del marco
+        y = self._y
+        for titulo in titulos:
+            y -= LEADING_TITULO
+            texto.setTextOrigin(MARCO_X + (MARCO_ANCHO - _ancho(titulo, fuente, tamano)) / 2, y)
+            texto.textOut(titulo)
+            y -= ESPACIO_TITULO
+
+        self.canvas.drawText(texto)
+        # Spacer(1, 10) después del encabezado
+        self._y = y - ESPACIO_TITULO
+
+    def _dibujar_tabla(self, filas: List[List[str]]):
+        """Dibuja los renglones que caben en la página y continúa en la siguiente"""
+        alturas = [
+            max(celda.count('\n') + 1 for celda in fila) * LEADING_CELDA
+            + 2 * (PADDING_ENCABEZADO if i == 0 else PADDING_DATOS)
+            for i, fila in enumerate(filas)
+        ]
+
+        inicio = 0
+        while inicio < len(filas):
+            fin, y = inicio, self._y
+            while fin < len(filas) and y - alturas[fin] >= MARCO_ABAJO:
+                y -= alturas[fin]
+                fin += 1
+
+            if fin == inicio:
+                if self._y == MARCO_ARRIBA:
+                    raise ValueError(f"El renglón {inicio} no cabe en una página")
+                self._nueva_pagina()
+                continue
+
+            self._dibujar_tramo(filas, alturas, inicio, fin)
+            inicio = fin
+            if inicio < len(filas):
+                self._nueva_pagina()
+
+    def _dibujar_tramo(self, filas: List[List[str]], alturas: List[float], inicio: int, fin: int):
+        """Texto y rejilla de filas[inicio:fin] a partir de self._y"""
+        canvas = self.canvas
+        texto = canvas.beginText()
+        bordes_y = [self._y]
+        fuente_actual = None
+
+        for i in range(inicio, fin):
+            fuente, tamano = FUENTE_ENCABEZADO if i == 0 else FUENTE_DATOS
+            padding = PADDING_ENCABEZADO if i == 0 else PADDING_DATOS
+            if fuente_actual != fuente:
+                texto.setFont(fuente, tamano, LEADING_CELDA)
+                fuente_actual = fuente
+
+            abajo = bordes_y[-1] - alturas[i]
+            bordes_y.append(abajo)
+
+            for columna, celda in enumerate(filas[i]):
+                if not celda:
+                    continue
+                lineas = celda.split('\n')
+                # Alineado abajo: la última línea queda sobre el padding inferior
+                y = abajo + padding + len(lineas) * LEADING_CELDA - tamano
+                for linea in lineas:
+                    x = TEXTO_X[columna]
+                    if columna not in COLUMNAS_IZQUIERDA:
+                        x -= _ancho(linea, fuente, tamano) / 2
+                    texto.setTextOrigin(x, y)
+                    texto.textOut(linea)
+                    y -= LEADING_CELDA
+
+        canvas.drawText(texto)
+
+        canvas.saveState()
+        canvas.setLineCap(1)
+        canvas.setLineJoin(1)
+        canvas.setLineWidth(GROSOR_REJILLA)
+        canvas.grid(BORDES_X, bordes_y)
+        canvas.setLineWidth(GROSOR_CONTORNO)
+        canvas.rect(TABLA_X, bordes_y[-1], TABLA_ANCHO, bordes_y[0] - bordes_y[-1])
+        canvas.restoreState()
+
+        self._y = bordes_y[-1]
+
+    def _dibujar_pie(self, pie: str):
+        # Spacer(1, 10) + Paragraph: cada uno pasa a la página siguiente si no cabe
+        if self._y - ESPACIO_PIE < MARCO_ABAJO:
+            self._nueva_pagina()
+        self._y -= ESPACIO_PIE
+        if self._y - LEADING_PIE < MARCO_ABAJO:
+            self._nueva_pagina()
+        self._y -= LEADING_PIE
+
+        fuente, tamano = FUENTE_PIE
+        self.canvas.setFont(fuente, tamano)
+        self.canvas.drawString(
+            MARCO_X + MARCO_ANCHO - _ancho(pie, fuente, tamano),
+            self._y + LEADING_PIE - tamano,
+            pie
+        )
+
+    @staticmethod
+    def _texto(valor) -> str:
+        # Igual que Table: None es celda vacía, el resto pasa por str()
+        if valor is None:
+            return ''
+        return valor if isinstance(valor, str) else str(valor)
@@ -7,6 +7,7 @@ import json
 from app.features.checadores.services.verificar_conexion_use_case import verificar_conexion_use_case
 from app.features.checadores.services.consultar_trabajadores_use_case import consultar_trabajadores_use_case
 from app.features.checadores.services.descargar_asistencias_use_case import descargar_asistencias_use_case
+from app.features.checadores.services.indice_usuarios_checador_use_case import indice_usuarios_checador_use_case
 
 # Crear blueprint
 checadores_bp = Blueprint('checadores', __name__, url_prefix='/checadores')
@@ -43,6 +44,27 @@ def verificar_conexion():
     })
 
 
+@checadores_bp.route('/estado')
+def estado_checadores():
+    """API: Verificar la conexión de todos los checadores activos (en paralelo)"""
+    return jsonify({
+        'checadores': verificar_conexion_use_case.verificar_todos()
+    })
+
+
+@checadores_bp.route('/usuarios/actualizar', methods=['POST'])
+def actualizar_indice_usuarios():
+    """API: Volver a leer los usuarios de todos los checadores activos (en paralelo)"""
+    errores = indice_usuarios_checador_use_case.actualizar_todos()
+    
+    return jsonify({
+        'checadores': [
+            {'id': checador_id, 'actualizado': error is None, 'error': error}
+            for checador_id, error in errores.items()
+        ]
+    })
+
+
 @checadores_bp.route('/trabajadores')
 def consultar_trabajadores():
     """API: Obtener trabajadores registrados en un checador"""
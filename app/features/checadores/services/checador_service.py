@@ -1,199 +1,301 @@
 """
 Servicio de checadores ZKTeco
 Responsabilidad: Toda la comunicación con dispositivos ZKTeco
+
+Las operaciones usan la sesión persistente del checador (sesiones_checador):
+no se conecta ni desconecta en cada consulta.
+
+Las asistencias se leen como el buffer crudo del checador (read_with_buffer)
+y se decodifican en un generador de tuplas listas para el INSERT: sin objetos
+Attendance de pyzk, sin la segunda descarga de usuarios que hace
+get_attendance y sin tener todas las checadas convertidas en memoria a la vez.
 """
-from zk import ZK
-from app.config.checadores_config import CheckadoresConfig
+import time
+from datetime import date, time as hora_dia
+from struct import Struct, unpack
+from typing import Dict, Iterator, NamedTuple, Optional
+
+from zk import const
+
+from app.core.metricas import CHECADOR_DESCARGA_DURACION, CHECADOR_ERRORES, CHECADOR_REGISTROS
+from app.features.checadores.services.sesiones_checador import sesiones_checador
+
+# Formatos de registro de asistencia según el firmware (tamaño -> struct)
+# 8 bytes (ZK6): uid interno; 16 bytes: user_id numérico; 40 bytes (ZK8): user_id texto
+FORMATOS_ASISTENCIA = {
+    8: Struct('<HBIB'),
+    16: Struct('<IIBB2sI'),
+    40: Struct('<H24sBIB8s'),
+}
+
+
+class AsistenciasChecador(NamedTuple):
+    """Asistencias leídas de un checador (los registros se convierten al iterarlos)"""
+    serie: str
+    total: int
+    registros: Iterator[tuple]  # (num_trabajador, fecha, hora, checador)
+    usuarios: Optional[list] = None  # leer_usuarios() en la misma sesión, si se pidió
 
 
 class ChecadorService:
     """Maneja todas las operaciones con dispositivos ZKTeco"""
     
-    def __init__(self, timeout=None):
-        self.timeout = timeout or CheckadoresConfig.TIMEOUT
+    def __init__(self, sesiones=None):
+        self.sesiones = sesiones or sesiones_checador
     
-    def conectar(self, ip, puerto=4370):
+    def probar_conexion(self, ip, puerto=4370):
         """
-        Establece conexión con un checador
+        Prueba si se puede conectar al checador
         
         Args:
             ip (str): IP del checador
             puerto (int): Puerto del checador
-            
+        
         Returns:
-            tuple: (conexion, error)
+            tuple: (exito, error)
         """
-        try:
-            # Deshabilitar ping para evitar problemas con Gunicorn workers
-            zk = ZK(ip, port=puerto, timeout=self.timeout, ommit_ping=True)
-            conn = zk.connect()
-            return conn, None
-        except Exception as e:
-            return None, f"Error de conexión: {str(e)}"
+        _, error = self.sesiones.ejecutar(ip, puerto, lambda conn: None)
+        return error is None, error
     
-    def desconectar(self, conn):
+    def obtener_info_dispositivo(self, ip, puerto=4370):
         """
-        Cierra la conexión con el checador
+        Obtiene información detallada del dispositivo
         
         Args:
-            conn: Objeto de conexión
+            ip (str): IP del checador
+            puerto (int): Puerto del checador
+        
+        Returns:
+            tuple: (info_dict, error)
         """
-        try:
-            if conn:
-                conn.disconnect()
-        except Exception:
-            pass
+        return self.sesiones.ejecutar(ip, puerto, self.leer_info, 'Error al obtener información')
     
-    def probar_conexion(self, ip, puerto=4370):
+    def obtener_usuarios(self, ip, puerto=4370):
         """
-        Prueba si se puede conectar al checador
+        Obtiene usuarios registrados en un checador
         
         Args:
             ip (str): IP del checador
             puerto (int): Puerto del checador
-            
+        
         Returns:
-            tuple: (exito, error)
+            tuple: (lista_usuarios, error)
+        """
+        return self.sesiones.ejecutar(ip, puerto, self.leer_usuarios, 'Error al obtener usuarios')
+    
+    def obtener_numero_serie(self, ip, puerto=4370):
         """
-        conn, error = self.conectar(ip, puerto)
-        if error:
-            return False, error
+        Obtiene el número de serie del checador
         
-        self.desconectar(conn)
-        return True, None
+        Returns:
+            tuple: (numero_serie, error)
+        """
+        return self.sesiones.ejecutar(ip, puerto, lambda conn: conn.get_serialnumber(), 'Error al obtener número de serie')
     
-    def obtener_info_dispositivo(self, ip, puerto=4370):
+    def obtener_asistencias(self, ip, puerto=4370, con_usuarios=False):
         """
-        Obtiene información detallada del dispositivo
+        Obtiene asistencias (attendance) del checador
         
         Args:
             ip (str): IP del checador
             puerto (int): Puerto del checador
-            
+            con_usuarios (bool): Leer también los usuarios en la misma sesión
+                                 (para el índice checador_usuarios)
+        
         Returns:
-            tuple: (info_dict, error)
+            tuple: (AsistenciasChecador, error)
         """
-        conn, error = self.conectar(ip, puerto)
-        if error:
-            return None, error
-        
-        try:
-            info = {
-                'serial_number': conn.get_serialnumber() if hasattr(conn, 'get_serialnumber') else None,
-                'platform': conn.get_platform() if hasattr(conn, 'get_platform') else None,
-                'firmware_version': conn.get_firmware_version() if hasattr(conn, 'get_firmware_version') else None,
-                'device_name': conn.get_device_name() if hasattr(conn, 'get_device_name') else None,
-                'mac_address': conn.get_mac() if hasattr(conn, 'get_mac') else None,
-                'work_code': conn.get_workcode() if hasattr(conn, 'get_workcode') else None,
-                'vendor': conn.get_vendor() if hasattr(conn, 'get_vendor') else None,
-                'product_code': conn.get_product_code() if hasattr(conn, 'get_product_code') else None,
-                'pin_width': conn.get_pin_width() if hasattr(conn, 'get_pin_width') else None,
-                'face_version': conn.get_face_version() if hasattr(conn, 'get_face_version') else None,
-                'fp_version': conn.get_fp_version() if hasattr(conn, 'get_fp_version') else None,
-            }
-            
-            self.desconectar(conn)
-            return info, None
-            
-        except Exception as e:
-            self.desconectar(conn)
-            return None, f"Error al obtener información: {str(e)}"
+        return self.sesiones.ejecutar(
+            ip, puerto, lambda conn: self.leer_asistencias(conn, ip, con_usuarios), 'Error al obtener asistencias'
+        )
     
-    def obtener_usuarios(self, ip, puerto=4370):
+    def podar_asistencias(self, ip, puerto, registros_esperados):
         """
-        Obtiene usuarios registrados en un checador
+        Borra las asistencias del checador si sigue teniendo los registros descargados
         
         Args:
             ip (str): IP del checador
             puerto (int): Puerto del checador
-            
+            registros_esperados (int): Registros que tenía en la descarga verificada
+        
         Returns:
-            tuple: (lista_usuarios, error)
+            tuple: (registros_borrados, error); 0 si llegaron checadas nuevas
         """
-        conn, error = self.conectar(ip, puerto)
-        if error:
-            return None, error
+        return self.sesiones.ejecutar(
+            ip, puerto, lambda conn: self.borrar_asistencias(conn, registros_esperados), 'Error al podar asistencias'
+        )
+    
+    # ------------------------------------------
+    # Lecturas sobre una conexión abierta
+    # (lanzan excepciones: sesiones_checador reconecta si son de red)
+    # ------------------------------------------
+    
+    @staticmethod
+    def leer_info(conn):
+        """Información del dispositivo (número de serie, firmware, MAC...)"""
+        return {
+            'serial_number': conn.get_serialnumber() if hasattr(conn, 'get_serialnumber') else None,
+            'platform': conn.get_platform() if hasattr(conn, 'get_platform') else None,
+            'firmware_version': conn.get_firmware_version() if hasattr(conn, 'get_firmware_version') else None,
+            'device_name': conn.get_device_name() if hasattr(conn, 'get_device_name') else None,
+            'mac_address': conn.get_mac() if hasattr(conn, 'get_mac') else None,
+            'work_code': conn.get_workcode() if hasattr(conn, 'get_workcode') else None,
+            'vendor': conn.get_vendor() if hasattr(conn, 'get_vendor') else None,
+            'product_code': conn.get_product_code() if hasattr(conn, 'get_product_code') else None,
+            'pin_width': conn.get_pin_width() if hasattr(conn, 'get_pin_width') else None,
+            'face_version': conn.get_face_version() if hasattr(conn, 'get_face_version') else None,
+            'fp_version': conn.get_fp_version() if hasattr(conn, 'get_fp_version') else None,
+        }
+    
+    @staticmethod
+    def leer_usuarios(conn):
+        """Usuarios registrados en el dispositivo"""
+        usuarios = conn.get_users()
         
+        # Convertir usuarios a diccionarios
+        usuarios_lista = []
+        for usuario in usuarios:
+            usuarios_lista.append({
+                'user_id': usuario.user_id,  # num_trabajador
+                'name': usuario.name,
+                'privilege': usuario.privilege,
+                'password': usuario.password,
+                'group_id': usuario.group_id,
+                'uid': usuario.uid,
+                'card': getattr(usuario, 'card', None)
+            })
+        
+        return usuarios_lista
+    
+    @staticmethod
+    def leer_asistencias(conn, ip, con_usuarios=False):
+        """
+        Lee el buffer de asistencias del dispositivo
+        
+        La conversión a tuplas ocurre al iterar `registros`, fuera de la sesión
+        (el buffer ya está en memoria: no vuelve a usar la conexión).
+        
+        Args:
+            conn: Conexión abierta
+            ip (str): IP del checador (métricas y respaldo del número de serie)
+            con_usuarios (bool): Leer también los usuarios (AsistenciasChecador.usuarios)
+        
+        Returns:
+            AsistenciasChecador
+        """
+        inicio = time.perf_counter()
         try:
-            usuarios = conn.get_users()
+            try:
+                serie = conn.get_serialnumber()
+            except Exception:
+                serie = ip  # Si falla, usar IP como fallback
             
-            # Convertir usuarios a diccionarios
-            usuarios_lista = []
-            for usuario in usuarios:
-                usuarios_lista.append({
-                    'user_id': usuario.user_id,  # num_trabajador
-                    'name': usuario.name,
-                    'privilege': usuario.privilege,
-                    'password': usuario.password,
-                    'group_id': usuario.group_id,
-                    'uid': usuario.uid,
-                    'card': getattr(usuario, 'card', None)
-                })
+            usuarios = ChecadorService.leer_usuarios(conn) if con_usuarios else None
             
-            self.desconectar(conn)
-            return usuarios_lista, None
+            conn.read_sizes()
+            if not conn.records:
+                return AsistenciasChecador(serie, 0, iter(()), usuarios)
             
-        except Exception as e:
-            self.desconectar(conn)
-            return None, f"Error al obtener usuarios: {str(e)}"
+            datos, tamano = conn.read_with_buffer(const.CMD_ATTLOG_RRQ)
+            if tamano < 4:
+                return AsistenciasChecador(serie, 0, iter(()), usuarios)
+            
+            # Los primeros 4 bytes son el tamaño de los registros
+            tamano_registro = unpack('<I', datos[:4])[0] // conn.records
+            formato = FORMATOS_ASISTENCIA.get(tamano_registro)
+            if formato is None:
+                raise ValueError(f"Formato de asistencias no soportado ({tamano_registro} bytes por registro)")
+            
+            # El formato de 8 bytes solo trae el uid interno del checador
+            uids = None
+            if tamano_registro == 8:
+                if usuarios is None:
+                    uids = {usuario.uid: usuario.user_id for usuario in conn.get_users()}
+                else:
+                    uids = {usuario['uid']: usuario['user_id'] for usuario in usuarios}
+        
+        except Exception:
+            CHECADOR_ERRORES.inc(checador=ip, operacion='asistencias')
+            raise
+        
+        total = (len(datos) - 4) // tamano_registro
+        CHECADOR_DESCARGA_DURACION.observar(time.perf_counter() - inicio, checador=ip)
+        CHECADOR_REGISTROS.inc(total, checador=ip)
+        registros = ChecadorService.convertir_asistencias(
+            memoryview(datos)[4:4 + total * tamano_registro], formato, serie, uids
+        )
+        return AsistenciasChecador(serie, total, registros, usuarios)
     
-    def obtener_asistencias(self, ip, puerto=4370):
+    @staticmethod
+    def borrar_asistencias(conn, registros_esperados):
         """
-        Obtiene asistencias (attendance) del checador
+        clear_attendance solo si el checador tiene exactamente registros_esperados
+        
+        El dispositivo se deshabilita para que nadie cheque entre el conteo y el
+        borrado. Si se repite tras una reconexión y el borrado ya ocurrió, el
+        conteo no coincide y retorna 0 sin volver a borrar.
+        """
+        conn.disable_device()
+        try:
+            conn.read_sizes()
+            if conn.records != registros_esperados:
+                return 0
+            conn.clear_attendance()
+            return registros_esperados
+        finally:
+            conn.enable_device()
+    
+    @staticmethod
+    def convertir_asistencias(datos, formato, serie, uids=None):
+        """
+        Decodifica registros de asistencia del checador
         
         Args:
-            ip (str): IP del checador
-            puerto (int): Puerto del checador
+            datos: Registros crudos (sin los 4 bytes de tamaño)
+            formato (Struct): Uno de FORMATOS_ASISTENCIA
+            serie (str): Número de serie (columna checador)
+            uids (dict): {uid: user_id} para el formato de 8 bytes
+        
+        Yields:
+            tuple: (num_trabajador, fecha, hora, checador) en el orden del INSERT
             
-        Returns:
-            tuple: (lista_asistencias, error)
+        Los registros con user_id no numérico o fecha inválida se descartan, así
+        que puede entregar menos que AsistenciasChecador.total (la poda compara
+        los registros recibidos contra total).
         """
-        conn, error = self.conectar(ip, puerto)
-        if error:
-            return None, error
+        # Los días y horas se repiten mucho: se crea cada date/time una sola vez
+        fechas: Dict[int, Optional[date]] = {}
+        horas: Dict[int, hora_dia] = {}
         
-        try:
-            # Obtener número de serie del dispositivo
-            serial_number = None
-            try:
-                serial_number = conn.get_serialnumber()
-            except:
-                # Si falla, usar IP como fallback
-                serial_number = ip
-            
-            # Obtener usuarios para mapear user_id -> nombre
-            usuarios_dict = {}
+        for campos in formato.iter_unpack(datos):
+            if formato.size == 40:
+                user_id, marca = campos[1].split(b'\x00', 1)[0], campos[3]
+            elif formato.size == 16:
+                user_id, marca = campos[0], campos[1]
+            else:
+                user_id, marca = uids.get(campos[0], campos[0]), campos[2]
             try:
-                usuarios = conn.get_users()
-                for usuario in usuarios:
-                    usuarios_dict[int(usuario.user_id)] = usuario.name
-            except:
-                pass  # Si falla, seguir sin nombres
-            
-            asistencias = conn.get_attendance()
-            
-            # Convertir a diccionarios compatibles con modelo Asistencia
-            asistencias_lista = []
-            for asistencia in asistencias:
-                # pyzk estructura: user_id, timestamp, status, punch
-                # timestamp es datetime completo
-                timestamp = asistencia.timestamp
-                num_trabajador = int(asistencia.user_id)
-                
-                asistencias_lista.append({
-                    'num_trabajador': num_trabajador,
-                    'nombre': usuarios_dict.get(num_trabajador, None),  # Obtener nombre del usuario
-                    'fecha': timestamp.strftime('%Y-%m-%d'),
-                    'hora': timestamp.strftime('%H:%M:%S'),
-                    'checador': serial_number  # Número de serie del checador
-                })
+                num_trabajador = int(user_id)
+            except ValueError:
+                continue  # user_id no numérico: no es un trabajador
             
-            self.desconectar(conn)
-            return asistencias_lista, None
+            # Marca de tiempo del checador (DecodeTime de zkemsdk): segundos con meses de 31 días
+            dias, segundos = divmod(marca, 86400)
+            if dias not in fechas:
+                anio, resto = divmod(dias, 12 * 31)
+                mes, dia = divmod(resto, 31)
+                try:
+                    fechas[dias] = date(anio + 2000, mes + 1, dia + 1)
+                except ValueError:
+                    fechas[dias] = None  # Fecha inválida en la memoria del checador
+            fecha = fechas[dias]
+            if fecha is None:
+                continue
+            hora = horas.get(segundos)
+            if hora is None:
+                hora = horas[segundos] = hora_dia(segundos // 3600, segundos // 60 % 60, segundos % 60)
             
-        except Exception as e:
-            self.desconectar(conn)
-            return None, f"Error al obtener asistencias: {str(e)}"
+            yield (num_trabajador, fecha, hora, serie)
 
 
 # Instancia singleton
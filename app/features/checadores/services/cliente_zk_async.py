@@ -0,0 +1,147 @@
+"""
+Cliente asíncrono de checadores ZKTeco
+Responsabilidad: consultar varios checadores a la vez y encadenar operaciones
+sobre una sola conexión
+
+pyzk es síncrono: cada llamada corre en un pool de hilos compartido
+(run_in_executor) y asyncio solo coordina, así una ruta consulta N checadores
+en el tiempo del más lento y no N veces el timeout de los apagados.
+
+- Una sesión encadena lecturas (info + usuarios + asistencias) sobre la
+  conexión persistente del checador (sesiones_checador), que además serializa
+  los comandos: el protocolo ZK no admite comandos intercalados
+- Los resultados siguen el patrón (resultado, error) del resto del proyecto
+
+Uso desde una ruta Flask (síncrona):
+    async def leer(sesion):
+        info, error = await sesion.info()
+        ...
+    resultados = cliente_zk_async.ejecutar(
+        cliente_zk_async.en_checadores(CheckadoresConfig.get_checadores_activos(), leer)
+    )
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, List, NamedTuple, Optional, TypeVar
+
+from app.config.checadores_config import CheckadoresConfig
+from app.features.checadores.services.checador_service import checador_service
+
+T = TypeVar('T')
+
+
+class ResultadoChecador(NamedTuple):
+    """Resultado de una operación en un checador"""
+    config: dict
+    resultado: object
+    error: Optional[str]
+
+
+class SesionZKAsync:
+    """Operaciones con un checador; se usa con `async with`"""
+
+    def __init__(self, cliente: 'ClienteZKAsync', ip: str, puerto: int):
+        self.cliente = cliente
+        self.ip = ip
+        self.puerto = puerto
+        self.error: Optional[str] = None  # Error de conexión (las lecturas lo devuelven)
+
+    @property
+    def conectada(self) -> bool:
+        return self.error is None
+
+    async def __aenter__(self) -> 'SesionZKAsync':
+        _, self.error = await self.cliente.en_hilo(checador_service.probar_conexion, self.ip, self.puerto)
+        return self
+
+    async def __aexit__(self, *_):
+        # La conexión queda abierta en sesiones_checador para la siguiente operación
+        pass
+
+    async def info(self) -> tuple:
+        """(info_dict, error) — ver ChecadorService.obtener_info_dispositivo"""
+        return await self._leer(checador_service.obtener_info_dispositivo)
+
+    async def usuarios(self) -> tuple:
+        """(lista_usuarios, error) — ver ChecadorService.obtener_usuarios"""
+        return await self._leer(checador_service.obtener_usuarios)
+
+    async def numero_serie(self) -> tuple:
+        """(numero_serie, error) — ver ChecadorService.obtener_numero_serie"""
+        return await self._leer(checador_service.obtener_numero_serie)
+
+    async def asistencias(self) -> tuple:
+        """(AsistenciasChecador, error) — ver ChecadorService.obtener_asistencias"""
+        return await self._leer(checador_service.obtener_asistencias)
+
+    async def _leer(self, lectura: Callable) -> tuple:
+        if self.error:
+            return None, self.error
+        return await self.cliente.en_hilo(lectura, self.ip, self.puerto)
+
+
+class ClienteZKAsync:
+    """Coordina sesiones con varios checadores sobre un pool de hilos"""
+
+    def __init__(self, max_concurrentes: int):
+        """
+        Args:
+            max_concurrentes: Llamadas a pyzk en curso a la vez (hilos del pool)
+        """
+        self.max_concurrentes = max_concurrentes
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def sesion(self, ip: str, puerto: int = 4370) -> SesionZKAsync:
+        """Sesión con un checador (conecta al entrar en `async with`)"""
+        return SesionZKAsync(self, ip, puerto)
+
+    async def en_checadores(
+        self,
+        checadores: List[dict],
+        operacion: Callable[[SesionZKAsync], Awaitable[tuple]]
+    ) -> List[ResultadoChecador]:
+        """
+        Ejecuta `operacion` en una sesión con cada checador, todos a la vez
+
+        Args:
+            checadores: Configuraciones (ip, puerto...) de CheckadoresConfig
+            operacion: async (sesion) -> (resultado, error); solo se llama si conectó
+
+        Returns:
+            list: ResultadoChecador en el mismo orden que `checadores`
+        """
+        async def en_checador(config: dict) -> ResultadoChecador:
+            async with self.sesion(config['ip'], config.get('puerto', 4370)) as sesion:
+                if not sesion.conectada:
+                    return ResultadoChecador(config, None, sesion.error)
+                try:
+                    resultado, error = await operacion(sesion)
+                except Exception as e:
+                    resultado, error = None, f"Error en el checador: {str(e)}"
+                return ResultadoChecador(config, resultado, error)
+
+        return list(await asyncio.gather(*(en_checador(config) for config in checadores)))
+
+    async def en_hilo(self, funcion: Callable[..., T], *args) -> T:
+        """Corre una llamada bloqueante de pyzk en el pool de hilos"""
+        return await asyncio.get_running_loop().run_in_executor(self._obtener_executor(), funcion, *args)
+
+    def ejecutar(self, corrutina: Awaitable[T]) -> T:
+        """Puente para código síncrono (rutas Flask, scripts): corre la corrutina hasta terminar"""
+        return asyncio.run(corrutina)
+
+    def _obtener_executor(self) -> ThreadPoolExecutor:
+        # Se crea al primer uso: con gunicorn --preload el import ocurre antes del fork
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrentes, thread_name_prefix='checador'
+                    )
+        return self._executor
+
+
+# Instancia singleton
+cliente_zk_async = ClienteZKAsync(CheckadoresConfig.MAX_CONCURRENTES)
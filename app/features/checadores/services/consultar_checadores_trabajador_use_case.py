@@ -1,68 +1,58 @@
 """
 Caso de uso: Consultar checadores donde está registrado un trabajador
 Responsabilidad: Verificar en qué checadores está registrado un trabajador específico
+
+Consulta el índice checador_usuarios (una query por índice) en lugar de
+descargar los usuarios de cada checador; con actualizar=True primero se
+vuelven a leer todos los checadores activos (a la vez).
 """
 from app.config.checadores_config import CheckadoresConfig
-from app.features.checadores.services.checador_service import checador_service
+from app.features.checadores.services.indice_usuarios_checador_use_case import indice_usuarios_checador_use_case
 
 
 class ConsultarChecadoresTrabajadorUseCase:
     """Consulta en qué checadores está registrado un trabajador"""
     
-    def ejecutar(self, num_trabajador):
+    def ejecutar(self, num_trabajador, actualizar=False):
         """
-        Verifica en cada checador activo si el trabajador está registrado
+        Indica para cada checador activo si el trabajador está registrado
         
         Args:
             num_trabajador: Número del trabajador a buscar
+            actualizar: Leer los checadores antes de consultar el índice
         
         Returns:
             tuple: (lista de TODOS los checadores con estado de registro, error)
         """
         try:
-            checadores_lista = []
+            errores = indice_usuarios_checador_use_case.actualizar_todos() if actualizar else {}
+            
+            registros, error = indice_usuarios_checador_use_case.checadores_de_trabajador(num_trabajador)
+            if error:
+                return None, f"Error al consultar checadores: {error}"
+            
+            actualizados_en, error = indice_usuarios_checador_use_case.actualizados_en()
+            if error:
+                return None, f"Error al consultar checadores: {error}"
             
-            # Obtener todos los checadores activos (CheckadoresConfig.CHECADORES es una lista)
-            for config in CheckadoresConfig.CHECADORES:
-                if not config.get('activo', True):
-                    continue
-                
-                checador_info = {
+            # CheckadoresConfig.CHECADORES es una lista
+            checadores_lista = []
+            for config in CheckadoresConfig.get_checadores_activos():
+                actualizado_en = actualizados_en.get(config['id'])
+                checadores_lista.append({
                     'id': config['id'],
                     'nombre': config['nombre'],
                     'ip': config['ip'],
                     'puerto': config['puerto'],
                     'ubicacion': config.get('ubicacion', ''),
                     'activo': config.get('activo', True),
-                    'registrado': False,  # Por defecto no está registrado
-                    'error_conexion': None
-                }
-                
-                # Conectar al checador
-                conn, error = checador_service.conectar(config['ip'], config['puerto'])
-                
-                if error or not conn:
-                    checador_info['error_conexion'] = error or 'No se pudo conectar'
-                    checadores_lista.append(checador_info)
-                    continue
-                
-                try:
-                    # Obtener usuarios del checador
-                    usuarios = conn.get_users()
-                    
-                    # Verificar si el trabajador está registrado
-                    for usuario in usuarios:
-                        if int(usuario.user_id) == num_trabajador:
-                            checador_info['registrado'] = True
-                            break
-                    
-                finally:
-                    checador_service.desconectar(conn)
-                
-                checadores_lista.append(checador_info)
+                    'registrado': config['id'] in registros,
+                    'actualizado_en': str(actualizado_en) if actualizado_en else None,
+                    'error_conexion': errores.get(config['id'])
+                })
             
             return checadores_lista, None
-            
+        
         except Exception as e:
             return None, f"Error al consultar checadores: {str(e)}"
 
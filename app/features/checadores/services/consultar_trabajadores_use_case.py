@@ -5,6 +5,7 @@ Responsabilidad: Obtener usuarios del checador y enriquecerlos con datos de BD
 from app.config.checadores_config import CheckadoresConfig
 from app.features.checadores.models import Checador
 from app.features.checadores.services.checador_service import checador_service
+from app.core.database.query_builder import QueryBuilder
 from app.core.database.query_executor import query_executor
 
 
@@ -43,15 +44,15 @@ class ConsultarTrabajadoresUseCase:
         
         # Obtener datos de trabajadores de la BD
         num_trabajadores = [u['user_id'] for u in usuarios_checador]
-        placeholders = ','.join(['%s'] * len(num_trabajadores))
+        builder = QueryBuilder("SELECT * FROM trabajadores")
+        builder.add_in_filter('num_trabajador', num_trabajadores, chunk_size=QueryBuilder.TAMANO_BLOQUE_IN)
         
-        query = f"SELECT * FROM trabajadores WHERE num_trabajador IN ({placeholders})"
-        trabajadores_bd, error_bd = query_executor.ejecutar(query, num_trabajadores)
-        
-        # Crear diccionario de trabajadores por num_trabajador
+        # Crear diccionario de trabajadores por num_trabajador (un checador puede tener miles de usuarios)
         trabajadores_dict = {}
-        if trabajadores_bd:
-            trabajadores_dict = {t['num_trabajador']: t for t in trabajadores_bd}
+        for query, params in builder.build_chunks():
+            trabajadores_bd, error_bd = query_executor.ejecutar(query, params)
+            for t in trabajadores_bd or []:
+                trabajadores_dict[t['num_trabajador']] = t
         
         # Enriquecer usuarios del checador con datos de BD
         trabajadores_enriquecidos = []
@@ -1,11 +1,26 @@
 """
 Caso de uso: Descargar asistencias del checador
 Responsabilidad: Descargar asistencias e insertarlas en BD (solo nuevas)
+
+Los usuarios del checador se leen en la misma sesión y actualizan el índice
+checador_usuarios (indice_usuarios_checador_use_case).
+
+Con CheckadoresConfig.PODA_ASISTENCIAS cada lote insertado se verifica en BD y,
+si todo quedó, se vacía la memoria del checador (podar_asistencias_checador_use_case).
 """
 from app.config.checadores_config import CheckadoresConfig
 from app.features.checadores.models import Checador
 from app.features.checadores.services.checador_service import checador_service
+from app.features.checadores.services.indice_usuarios_checador_use_case import indice_usuarios_checador_use_case
+from app.features.checadores.services.podar_asistencias_checador_use_case import podar_asistencias_checador_use_case
+from app.features.asistencias.services.archivo_asistencias import archivo_asistencias
 from app.core.database.query_executor import query_executor
+from app.core.metricas import IMPORTACION_REGISTROS, IMPORTACION_SEGUNDOS
+from itertools import islice
+import logging
+import time
+
+logger = logging.getLogger(__name__)
 
 
 class DescargarAsistenciasUseCase:
@@ -48,10 +63,12 @@ class DescargarAsistenciasUseCase:
             'progreso': 10
         }
         
-        # Obtener asistencias del checador
+        # Obtener asistencias del checador (se convierten a tuplas al insertarlas)
+        # y sus usuarios, en la misma sesión
         asistencias, error = checador_service.obtener_asistencias(
             checador.ip,
-            checador.puerto
+            checador.puerto,
+            con_usuarios=True
         )
         
         if error:
@@ -61,7 +78,15 @@ class DescargarAsistenciasUseCase:
             }
             return
         
-        if not asistencias or len(asistencias) == 0:
+        # Un error del índice no detiene la descarga
+        serie = asistencias.serie if asistencias.serie != checador.ip else None
+        _, error_indice = indice_usuarios_checador_use_case.actualizar_checador(
+            config['id'], asistencias.usuarios, serie
+        )
+        if error_indice:
+            logger.warning("No se pudo actualizar el índice de usuarios de %s: %s", config['id'], error_indice)
+        
+        if asistencias.total == 0:
             yield {
                 'estado': 'No hay asistencias en el checador',
                 'total': 0,
@@ -71,7 +96,8 @@ class DescargarAsistenciasUseCase:
             }
             return
         
-        total_asistencias = len(asistencias)
+        total_asistencias = asistencias.total
+        inicio = time.perf_counter()
         
         yield {
             'estado': f'Descargadas {total_asistencias} asistencias. Insertando en BD...',
@@ -83,38 +109,41 @@ class DescargarAsistenciasUseCase:
         BATCH_SIZE = 1000
         insertadas = 0
         duplicadas = 0
+        procesadas = 0
         
         # Query INSERT - query_executor manejará duplicados automáticamente
+        # (sin nombre: se toma de trabajadores al consultar)
         query = """
             INSERT INTO asistencias 
-            (num_trabajador, nombre, fecha, hora, checador, created_at)
-            VALUES (%s, %s, %s, %s, %s, NOW())
+            (num_trabajador, fecha, hora, checador, created_at)
+            VALUES (%s, %s, %s, %s, NOW())
         """
         
-        for i in range(0, total_asistencias, BATCH_SIZE):
-            batch = asistencias[i:i + BATCH_SIZE]
+        verificacion = None
+        if podar_asistencias_checador_use_case.habilitada():
+            verificacion = podar_asistencias_checador_use_case.nueva_verificacion(asistencias.serie)
+        
+        # Las tuplas ya vienen en el orden del INSERT; solo un lote en memoria a la vez
+        while True:
+            batch = list(islice(asistencias.registros, BATCH_SIZE))
+            if not batch:
+                break
             
-            # Preparar parámetros
-            params_list = [
-                (
-                    a['num_trabajador'],
-                    a.get('nombre'),  # Puede ser None si no se obtuvo
-                    a['fecha'],
-                    a['hora'],
-                    a['checador']
-                )
-                for a in batch
-            ]
+            # El checador conserva su historial: las checadas de meses archivados
+            # ya no están en la tabla y el UNIQUE no las detiene
+            batch_nuevas, error_insert = archivo_asistencias.sin_archivadas(batch)
             
             # Ejecutar batch con ignore_duplicates=True
             # query_executor maneja duplicados según el UNIQUE constraint
             # Retorna: (cantidad_insertada, error)
             # cantidad_insertada = solo las que se insertaron (duplicados son ignorados)
-            batch_insertadas, error_insert = query_executor.ejecutar_batch(
-                query,
-                params_list,
-                ignore_duplicates=True
-            )
+            batch_insertadas = 0
+            if batch_nuevas and not error_insert:
+                batch_insertadas, error_insert = query_executor.ejecutar_batch(
+                    query,
+                    batch_nuevas,
+                    ignore_duplicates=True
+                )
             
             if error_insert:
                 yield {
@@ -125,25 +154,46 @@ class DescargarAsistenciasUseCase:
                 }
                 return
             
+            # Sin poder verificar un lote no se poda el checador
+            if verificacion and verificacion.verificar_lote(batch):
+                verificacion = None
+            
             # batch_insertadas = registros que SÍ se insertaron
             # batch - batch_insertadas = duplicados que se ignoraron
             batch_duplicadas = len(batch) - batch_insertadas
             
             insertadas += batch_insertadas
             duplicadas += batch_duplicadas
+            procesadas += len(batch)
             
             # Calcular progreso (30% a 90%)
-            progreso = 30 + int((i + len(batch)) / total_asistencias * 60)
+            progreso = 30 + int(procesadas / total_asistencias * 60)
             
             yield {
-                'estado': f'Procesando... {i + len(batch)}/{total_asistencias}',
+                'estado': f'Procesando... {procesadas}/{total_asistencias}',
                 'progreso': progreso,
                 'total': total_asistencias,
-                'procesadas': i + len(batch),
+                'procesadas': procesadas,
                 'insertadas': insertadas,
                 'duplicadas': duplicadas
             }
         
+        IMPORTACION_SEGUNDOS.inc(time.perf_counter() - inicio, tipo='checador')
+        IMPORTACION_REGISTROS.inc(insertadas, tipo='checador', resultado='insertado')
+        IMPORTACION_REGISTROS.inc(duplicadas, tipo='checador', resultado='duplicado')
+        
+        poda = {}
+        if podar_asistencias_checador_use_case.habilitada():
+            yield {
+                'estado': 'Verificando y podando la memoria del checador...',
+                'progreso': 95
+            }
+            if verificacion:
+                podadas, motivo = podar_asistencias_checador_use_case.podar(config, asistencias.total, verificacion)
+            else:
+                podadas, motivo = 0, 'No se pudo verificar la descarga en BD'
+            poda = {'podadas': podadas, 'motivo_sin_poda': motivo}
+        
         # Finalizado
         yield {
             'estado': 'Descarga completada',
@@ -151,6 +201,7 @@ class DescargarAsistenciasUseCase:
             'total': total_asistencias,
             'insertadas': insertadas,
             'duplicadas': duplicadas,
+            **poda,
             'finalizado': True
         }
 
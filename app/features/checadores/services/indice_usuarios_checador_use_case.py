@@ -0,0 +1,208 @@
+"""
+Caso de uso: Índice de usuarios de checadores
+Responsabilidad: Mantener la tabla checador_usuarios (qué trabajadores están
+registrados en cada checador) para consultarla sin conectar a los dispositivos
+
+Se actualiza:
+- En cada descarga de asistencias (los usuarios se leen en la misma sesión)
+- A pedido: actualizar_todos() lee todos los checadores activos a la vez
+- En segundo plano: los checadores cuyo índice tiene más de
+  INDICE_USUARIOS_INTERVALO segundos (un hilo por worker; el primero que
+  encuentra un índice vencido lo actualiza y los demás lo ven al día)
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app.config.checadores_config import CheckadoresConfig
+from app.core.database.query_executor import query_executor
+from app.features.checadores.services.cliente_zk_async import cliente_zk_async
+
+logger = logging.getLogger(__name__)
+
+
+class IndiceUsuariosChecadorUseCase:
+    """Índice persistente de usuarios por checador"""
+
+    def actualizar_checador(self, checador_id, usuarios, serie=None):
+        """
+        Reemplaza el índice de un checador con los usuarios leídos
+
+        Args:
+            checador_id (str): ID del checador en CheckadoresConfig
+            usuarios (list): Resultado de ChecadorService.obtener_usuarios
+            serie (str): Número de serie del checador
+
+        Returns:
+            tuple: (usuarios_indexados, error)
+        """
+        visto_en = datetime.now().replace(microsecond=0)
+        params = []
+        for usuario in usuarios:
+            try:
+                num_trabajador = int(usuario['user_id'])
+            except (TypeError, ValueError):
+                continue  # user_id no numérico: no es un trabajador
+            params.append((
+                checador_id, num_trabajador, serie, usuario.get('name'),
+                usuario.get('privilege'), usuario.get('card') or None, visto_en
+            ))
+
+        if not params:
+            # Una lectura vacía (checador recién reiniciado, lectura incompleta) no
+            # borra el índice: se conserva hasta que el checador vuelva a tener usuarios
+            filas, error = query_executor.ejecutar(
+                "SELECT COUNT(*) AS total FROM checador_usuarios WHERE checador_id = %s", (checador_id,)
+            )
+            if error:
+                return 0, f"Error al consultar índice de {checador_id}: {error}"
+            if filas and filas[0]['total']:
+                logger.warning(
+                    "%s no regresó usuarios; se conservan los %s del índice", checador_id, filas[0]['total']
+                )
+            return 0, None
+
+        query = """
+            REPLACE INTO checador_usuarios
+            (checador_id, num_trabajador, serie, nombre, privilegio, tarjeta, visto_en)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """
+        indexados, error = query_executor.ejecutar_batch(query, params, ignore_duplicates=False)
+        if error:
+            return 0, f"Error al actualizar índice de {checador_id}: {error}"
+
+        # Los que ya no aparecieron se dieron de baja en el checador
+        _, error = query_executor.ejecutar(
+            "DELETE FROM checador_usuarios WHERE checador_id = %s AND visto_en < %s",
+            (checador_id, visto_en)
+        )
+        if error:
+            return indexados, f"Error al depurar índice de {checador_id}: {error}"
+
+        logger.info("Índice de usuarios de %s actualizado: %s usuarios", checador_id, indexados)
+        return indexados, None
+
+    def actualizar_todos(self, checadores=None):
+        """
+        Lee los usuarios de los checadores (todos a la vez) y actualiza el índice
+
+        Args:
+            checadores (list): Configuraciones a actualizar (default: activos)
+
+        Returns:
+            dict: {checador_id: error o None}
+        """
+        async def leer(sesion):
+            serie, _ = await sesion.numero_serie()
+            usuarios, error = await sesion.usuarios()
+            if error:
+                return None, error
+            return (serie, usuarios), None
+
+        if checadores is None:
+            checadores = CheckadoresConfig.get_checadores_activos()
+        resultados = cliente_zk_async.ejecutar(cliente_zk_async.en_checadores(checadores, leer))
+
+        errores = {}
+        for resultado in resultados:
+            checador_id = resultado.config['id']
+            error = resultado.error
+            if not error:
+                serie, usuarios = resultado.resultado
+                _, error = self.actualizar_checador(checador_id, usuarios, serie)
+            if error:
+                logger.warning("No se pudo actualizar el índice de %s: %s", checador_id, error)
+            errores[checador_id] = error
+        return errores
+
+    def checadores_de_trabajador(self, num_trabajador):
+        """
+        Checadores donde está registrado un trabajador (según el índice)
+
+        Returns:
+            tuple: ({checador_id: fila del índice}, error)
+        """
+        resultados, error = query_executor.ejecutar(
+            "SELECT checador_id, serie, nombre, privilegio, tarjeta, visto_en "
+            "FROM checador_usuarios WHERE num_trabajador = %s",
+            (num_trabajador,)
+        )
+        if error:
+            return None, error
+        return {row['checador_id']: row for row in resultados}, None
+
+    def actualizados_en(self):
+        """
+        Última actualización del índice por checador
+
+        Returns:
+            tuple: ({checador_id: datetime}, error)
+        """
+        resultados, error = query_executor.ejecutar(
+            "SELECT checador_id, MAX(visto_en) AS actualizado_en FROM checador_usuarios GROUP BY checador_id"
+        )
+        if error:
+            return None, error
+        return {row['checador_id']: row['actualizado_en'] for row in resultados}, None
+
+    def actualizar_vencidos(self, antiguedad_maxima):
+        """
+        Actualiza los checadores activos cuyo índice es más viejo que antiguedad_maxima segundos
+
+        Returns:
+            dict: {checador_id: error o None} de los checadores actualizados
+        """
+        limite = datetime.now() - timedelta(seconds=antiguedad_maxima)
+        resultados, error = query_executor.ejecutar(
+            "SELECT checador_id FROM checador_usuarios GROUP BY checador_id HAVING MAX(visto_en) >= %s",
+            (limite,)
+        )
+        if error:
+            logger.error("Error consultando índice de usuarios: %s", error)
+            return {}
+
+        al_dia = {row['checador_id'] for row in resultados}
+        vencidos = [c for c in CheckadoresConfig.get_checadores_activos() if c['id'] not in al_dia]
+        if not vencidos:
+            return {}
+        return self.actualizar_todos(vencidos)
+
+
+class ActualizadorIndiceUsuarios:
+    """Hilo que mantiene el índice al día (uno por proceso)"""
+
+    # Segundos entre revisiones de antigüedad (la actualización es por INDICE_USUARIOS_INTERVALO)
+    REVISION = 300
+
+    def __init__(self, indice, intervalo):
+        self.indice = indice
+        self.intervalo = intervalo
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def asegurar_iniciado(self):
+        """Arranca el hilo si este proceso no lo tiene (se llama en before_request)"""
+        if not self.intervalo or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._bucle, name='indice-usuarios-checador', daemon=True).start()
+
+    def _bucle(self):
+        while True:
+            time.sleep(min(self.REVISION, self.intervalo))
+            try:
+                self.indice.actualizar_vencidos(self.intervalo)
+            except Exception as e:
+                logger.error("Error actualizando índice de usuarios de checadores: %s", e)
+
+
+# Instancias singleton
+indice_usuarios_checador_use_case = IndiceUsuariosChecadorUseCase()
+actualizador_indice_usuarios = ActualizadorIndiceUsuarios(
+    indice_usuarios_checador_use_case, CheckadoresConfig.INDICE_USUARIOS_INTERVALO
+)
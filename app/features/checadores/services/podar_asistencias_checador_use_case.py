@@ -0,0 +1,148 @@
+"""
+Caso de uso: Podar la memoria de asistencias de un checador
+Responsabilidad: Borrar las checadas del dispositivo (clear_attendance) después
+de una descarga cuyas checadas están TODAS en la tabla asistencias
+
+El checador nunca se vacía y cada descarga transfiere toda su historia; con la
+poda (CheckadoresConfig.PODA_ASISTENCIAS) la descarga solo trae lo nuevo.
+
+Salvaguardas:
+- Todos los registros del checador deben haberse decodificado e insertado: si
+  el decodificador descartó alguno (user_id no numérico, fecha inválida) no se
+  poda, porque se perdería
+- Cada lote insertado se verifica contra asistencias (consulta por checador y
+  rango de fechas del lote, y el archivo para los meses archivados); una sola
+  checada faltante cancela la poda
+- El checador debe tener al menos PODA_MIN_REGISTROS y su última checada más de
+  PODA_MARGEN_MINUTOS de antigüedad (no se poda mientras la gente está checando)
+- Con el dispositivo deshabilitado se vuelve a contar: si llegó alguna checada
+  desde la descarga no se borra nada
+- Se registra en el log qué se borró (checador, cantidad y rango de fechas)
+"""
+import logging
+from datetime import datetime, timedelta
+
+from app.config.checadores_config import CheckadoresConfig
+from app.core.database.query_executor import query_executor
+from app.features.asistencias.services.archivo_asistencias import archivo_asistencias
+from app.features.checadores.services.checador_service import checador_service
+
+logger = logging.getLogger(__name__)
+
+
+def _segundos(hora):
+    """TIME de la BD (timedelta) o del checador (time) en segundos del día"""
+    if isinstance(hora, timedelta):
+        return int(hora.total_seconds())
+    return hora.hour * 3600 + hora.minute * 60 + hora.second
+
+
+class VerificacionIngesta:
+    """Verificación acumulada de los lotes de una descarga"""
+
+    def __init__(self, serie):
+        self.serie = serie
+        self.registros = 0     # Registros decodificados del checador (lotes recibidos)
+        self.verificadas = 0   # Checadas distintas del checador encontradas en asistencias
+        self.faltantes = 0
+        self.primera = None    # datetime de la checada más antigua
+        self.ultima = None
+
+    def verificar_lote(self, lote):
+        """
+        Comprueba que las checadas de un lote ya insertado están en asistencias
+
+        Args:
+            lote (list): Tuplas (num_trabajador, fecha, hora, checador)
+
+        Returns:
+            str: Error de la consulta o None
+        """
+        self.registros += len(lote)
+        claves = {(num, fecha, _segundos(hora)) for num, fecha, hora, _ in lote}
+        desde = min(fecha for _, fecha, _ in claves)
+        hasta = max(fecha for _, fecha, _ in claves)
+
+        filas, error = query_executor.ejecutar(
+            "SELECT num_trabajador, fecha, hora FROM asistencias "
+            "WHERE checador = %s AND fecha BETWEEN %s AND %s",
+            (self.serie, desde, hasta)
+        )
+        if error:
+            return error
+
+        en_bd = {(fila['num_trabajador'], fila['fecha'], _segundos(fila['hora'])) for fila in filas}
+        # Las de meses archivados no se insertaron: basta con que estén en el archivo
+        pendientes, error = archivo_asistencias.sin_archivadas(
+            (num, fecha, timedelta(seconds=segundos), self.serie)
+            for num, fecha, segundos in claves - en_bd
+        )
+        if error:
+            return error
+        faltantes = len(pendientes)
+        self.faltantes += faltantes
+        self.verificadas += len(claves) - faltantes
+
+        momentos = [datetime.combine(fecha, hora) for _, fecha, hora, _ in lote]
+        primera, ultima = min(momentos), max(momentos)
+        self.primera = min(self.primera or primera, primera)
+        self.ultima = max(self.ultima or ultima, ultima)
+        return None
+
+
+class PodarAsistenciasChecadorUseCase:
+    """Borra del checador las asistencias ya verificadas en BD"""
+
+    def habilitada(self):
+        return CheckadoresConfig.PODA_ASISTENCIAS
+
+    def nueva_verificacion(self, serie):
+        """Verificación para los lotes de una descarga del checador con esa serie"""
+        return VerificacionIngesta(serie)
+
+    def podar(self, config, registros_checador, verificacion):
+        """
+        Borra las asistencias del checador si la descarga quedó verificada
+
+        Args:
+            config (dict): Configuración del checador (id, ip, puerto)
+            registros_checador (int): Registros que tenía el checador al descargar
+            verificacion (VerificacionIngesta): Resultado de verificar todos los lotes
+
+        Returns:
+            tuple: (borradas, motivo) — motivo explica por qué no se podó (None si se podó)
+        """
+        if verificacion.registros != registros_checador:
+            # El decodificador descarta registros con user_id no numérico o fecha inválida
+            return 0, (
+                f'{registros_checador - verificacion.registros} de {registros_checador} registros '
+                'del checador no se pudieron leer (user_id no numérico o fecha inválida)'
+            )
+        if verificacion.faltantes:
+            return 0, f'{verificacion.faltantes} checadas del checador no están en asistencias'
+        if registros_checador < CheckadoresConfig.PODA_MIN_REGISTROS:
+            return 0, f'El checador tiene menos de {CheckadoresConfig.PODA_MIN_REGISTROS} registros'
+        margen = timedelta(minutes=CheckadoresConfig.PODA_MARGEN_MINUTOS)
+        if verificacion.ultima is None or verificacion.ultima > datetime.now() - margen:
+            return 0, f'Hay checadas de los últimos {CheckadoresConfig.PODA_MARGEN_MINUTOS} minutos'
+
+        borradas, error = checador_service.podar_asistencias(
+            config['ip'], config.get('puerto', 4370), registros_checador
+        )
+        if error:
+            logger.error("Checador %s: no se pudo podar: %s", config['id'], error)
+            return 0, error
+        if not borradas:
+            return 0, 'Llegaron checadas nuevas durante la descarga'
+
+        logger.warning(
+            "Checador %s (%s): %s registros borrados del dispositivo, checadas del %s al %s "
+            "(%s checadas distintas verificadas en asistencias)",
+            config['id'], verificacion.serie, borradas, verificacion.primera, verificacion.ultima,
+            verificacion.verificadas
+        )
+        return borradas, None
+
+
+# Instancia singleton
+podar_asistencias_checador_use_case = PodarAsistenciasChecadorUseCase()
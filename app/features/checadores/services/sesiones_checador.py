@@ -0,0 +1,214 @@
+"""
+Sesiones persistentes con los checadores ZKTeco
+Responsabilidad: una conexión por checador reutilizada entre operaciones y requests
+
+- Un comando a la vez por checador (lock por dispositivo): el protocolo ZK no
+  admite comandos intercalados sobre una conexión
+- Si un comando falla por red (timeout, socket cerrado, sesión rechazada) se
+  reconecta y se repite una vez
+- Un hilo por proceso revisa las sesiones cada SESION_KEEPALIVE segundos:
+  cierra las que llevan más de SESION_MAX_INACTIVA sin uso y a las demás les
+  envía un comando barato (get_time) para que el checador no las corte
+- Cada worker de gunicorn tiene sus propias sesiones
+"""
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+from zk import ZK
+from zk.exception import ZKErrorConnection, ZKErrorResponse, ZKNetworkError
+
+from app.config.checadores_config import CheckadoresConfig
+from app.core.metricas import CHECADOR_CONEXIONES, CHECADOR_ERRORES
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Errores tras los cuales la conexión ya no sirve pero el comando puede repetirse
+ERRORES_CONEXION = (ZKNetworkError, ZKErrorConnection, ZKErrorResponse, OSError)
+
+
+class _Sesion:
+    """Conexión con un checador y su lock"""
+
+    def __init__(self, ip: str, puerto: int):
+        self.ip = ip
+        self.puerto = puerto
+        self.conn = None
+        self.ultimo_uso = 0.0      # Última operación pedida por la app
+        self.ultimo_contacto = 0.0  # Última respuesta del checador (incluye keep-alive)
+        self.lock = threading.Lock()
+
+
+class GestorSesionesChecador:
+    """Mantiene una conexión abierta por checador"""
+
+    def __init__(self, timeout: float, max_inactiva: float, keepalive: float):
+        """
+        Args:
+            timeout: Timeout de conexión y de cada comando (segundos)
+            max_inactiva: Segundos sin uso tras los que se cierra la sesión
+            keepalive: Intervalo del hilo de mantenimiento (0 = sin hilo; las
+                       sesiones se comprueban solo al usarlas)
+        """
+        self.timeout = timeout
+        self.max_inactiva = max_inactiva
+        self.keepalive = keepalive
+        self._sesiones: Dict[Tuple[str, int], _Sesion] = {}
+        self._lock = threading.Lock()
+        self._pid_mantenimiento = None
+
+    def ejecutar(
+        self,
+        ip: str,
+        puerto: int,
+        operacion: Callable[[ZK], T],
+        descripcion_error: str = 'Error en el checador'
+    ) -> Tuple[Optional[T], Optional[str]]:
+        """
+        Ejecuta una operación sobre la conexión del checador
+
+        Args:
+            ip: IP del checador
+            puerto: Puerto del checador
+            operacion: Función (conn) -> resultado; puede lanzar excepciones
+            descripcion_error: Prefijo del mensaje si la operación falla
+
+        Returns:
+            tuple: (resultado, error)
+        """
+        self._asegurar_mantenimiento()
+        sesion = self._sesion(ip, puerto)
+
+        with sesion.lock:
+            sesion.ultimo_uso = time.monotonic()
+            for intento in range(2):
+                error = self._conexion_vigente(sesion, 'nueva' if intento == 0 else 'reconexion')
+                if error:
+                    return None, error
+                try:
+                    resultado = operacion(sesion.conn)
+                except ERRORES_CONEXION as e:
+                    self._cerrar(sesion)
+                    if intento:
+                        return None, f"{descripcion_error}: {str(e)}"
+                    logger.warning("Checador %s: sesión perdida (%s); reconectando", ip, e)
+                    continue
+                except Exception as e:
+                    return None, f"{descripcion_error}: {str(e)}"
+                sesion.ultimo_contacto = time.monotonic()
+                return resultado, None
+
+    def cerrar_todas(self):
+        """Cierra todas las sesiones (las que están en uso al terminar su comando)"""
+        with self._lock:
+            sesiones = list(self._sesiones.values())
+        for sesion in sesiones:
+            with sesion.lock:
+                self._cerrar(sesion)
+
+    # ------------------------------------------
+    # Conexión
+    # ------------------------------------------
+
+    def _sesion(self, ip: str, puerto: int) -> _Sesion:
+        clave = (ip, puerto)
+        with self._lock:
+            sesion = self._sesiones.get(clave)
+            if sesion is None:
+                sesion = self._sesiones[clave] = _Sesion(ip, puerto)
+            return sesion
+
+    def _conexion_vigente(self, sesion: _Sesion, motivo: str) -> Optional[str]:
+        """Deja sesion.conn lista para usar (con el lock tomado); retorna el error de conexión"""
+        if sesion.conn is not None:
+            sin_respuesta = time.monotonic() - sesion.ultimo_contacto
+            if sin_respuesta <= self.keepalive or self._responde(sesion):
+                return None
+            self._cerrar(sesion)
+
+        try:
+            # Deshabilitar ping para evitar problemas con Gunicorn workers
+            zk = ZK(sesion.ip, port=sesion.puerto, timeout=self.timeout, ommit_ping=True)
+            sesion.conn = zk.connect()
+        except Exception as e:
+            CHECADOR_ERRORES.inc(checador=sesion.ip, operacion='conectar')
+            return f"Error de conexión: {str(e)}"
+
+        sesion.ultimo_contacto = time.monotonic()
+        CHECADOR_CONEXIONES.inc(checador=sesion.ip, motivo=motivo)
+        return None
+
+    def _responde(self, sesion: _Sesion) -> bool:
+        """Keep-alive: comando barato para comprobar (y mantener) la sesión"""
+        try:
+            sesion.conn.get_time()
+        except Exception as e:
+            logger.info("Checador %s: la sesión no responde (%s)", sesion.ip, e)
+            return False
+        sesion.ultimo_contacto = time.monotonic()
+        return True
+
+    @staticmethod
+    def _cerrar(sesion: _Sesion):
+        conn, sesion.conn = sesion.conn, None
+        if conn is None:
+            return
+        try:
+            conn.disconnect()
+        except Exception:
+            pass
+
+    # ------------------------------------------
+    # Mantenimiento (keep-alive y cierre por inactividad)
+    # ------------------------------------------
+
+    def _asegurar_mantenimiento(self):
+        # Un hilo por proceso; con gunicorn --preload no puede crearse antes del fork
+        if not self.keepalive or self._pid_mantenimiento == os.getpid():
+            return
+        with self._lock:
+            if self._pid_mantenimiento == os.getpid():
+                return
+            self._pid_mantenimiento = os.getpid()
+            # Las sesiones heredadas del proceso padre no son de este proceso
+            self._sesiones.clear()
+            threading.Thread(target=self._bucle_mantenimiento, name='checador-keepalive', daemon=True).start()
+
+    def _bucle_mantenimiento(self):
+        while True:
+            time.sleep(self.keepalive)
+            try:
+                self._mantener()
+            except Exception as e:
+                logger.error("Error en mantenimiento de sesiones de checadores: %s", e)
+
+    def _mantener(self):
+        with self._lock:
+            sesiones = list(self._sesiones.values())
+
+        for sesion in sesiones:
+            # Una sesión ocupada ya está en uso: no hace falta revisarla
+            if not sesion.lock.acquire(blocking=False):
+                continue
+            try:
+                if sesion.conn is None:
+                    continue
+                if time.monotonic() - sesion.ultimo_uso > self.max_inactiva:
+                    logger.debug("Checador %s: sesión inactiva cerrada", sesion.ip)
+                    self._cerrar(sesion)
+                elif not self._responde(sesion):
+                    self._cerrar(sesion)
+            finally:
+                sesion.lock.release()
+
+
+# Instancia singleton
+sesiones_checador = GestorSesionesChecador(
+    timeout=CheckadoresConfig.TIMEOUT,
+    max_inactiva=CheckadoresConfig.SESION_MAX_INACTIVA,
+    keepalive=CheckadoresConfig.SESION_KEEPALIVE
+)
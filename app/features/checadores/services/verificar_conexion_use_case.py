@@ -4,7 +4,7 @@ Responsabilidad: Obtener checadores y verificar su estado de conexión
 """
 from app.config.checadores_config import CheckadoresConfig
 from app.features.checadores.models import Checador
-from app.features.checadores.services.checador_service import checador_service
+from app.features.checadores.services.cliente_zk_async import cliente_zk_async
 
 
 class VerificarConexionUseCase:
@@ -39,22 +39,41 @@ class VerificarConexionUseCase:
         # Crear modelo
         checador = Checador.from_dict(config)
         
-        # Verificar conexión y obtener información
-        info_dispositivo, error_info = checador_service.obtener_info_dispositivo(
-            checador.ip, 
-            checador.puerto
-        )
+        # Una sola sesión: si conecta pero falla la información, el checador igual respondió
+        resultado = cliente_zk_async.ejecutar(
+            cliente_zk_async.en_checadores([config], self._leer_info)
+        )[0]
         
-        if error_info:
-            # Si falla obtener info, solo verificar conexión
-            exito, error = checador_service.probar_conexion(
-                checador.ip, 
-                checador.puerto
-            )
-            return checador, exito, None, error
+        if resultado.error:
+            return checador, False, None, resultado.error
         
-        return checador, True, info_dispositivo, None
-
+        return checador, True, resultado.resultado, None
+    
+    def verificar_todos(self):
+        """
+        Verifica todos los checadores activos a la vez
+        
+        Returns:
+            list: Diccionarios {checador, conectado, info_dispositivo, error_mensaje}
+        """
+        resultados = cliente_zk_async.ejecutar(
+            cliente_zk_async.en_checadores(CheckadoresConfig.get_checadores_activos(), self._leer_info)
+        )
+        
+        return [
+            {
+                'checador': Checador.from_dict(r.config).to_dict(),
+                'conectado': r.error is None,
+                'info_dispositivo': r.resultado,
+                'error_mensaje': r.error
+            }
+            for r in resultados
+        ]
+    
+    @staticmethod
+    async def _leer_info(sesion):
+        info, _ = await sesion.info()
+        return info, None
 
 # Instancia singleton
 verificar_conexion_use_case = VerificarConexionUseCase()
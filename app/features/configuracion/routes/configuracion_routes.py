@@ -17,6 +17,7 @@ from app.config.email_templates import (
     obtener_config
 )
 from app.config.smtp_config import SMTP_CONFIG
+from app.features.bitacora.services.cache_recursos_correo import cache_recursos_correo
 
 configuracion_bp = Blueprint('configuracion', __name__, url_prefix='/configuracion')
 
@@ -83,8 +84,9 @@ def guardar_config_email():
         if 'usar_plantilla_html' in data:
             config['usar_plantilla_html'] = data['usar_plantilla_html']
         
-        # Guardar
+        # Guardar (invalida la configuración y las imágenes ya codificadas)
         exito, error = guardar_configuracion(config)
+        cache_recursos_correo.vaciar()
         
         if not exito:
             return jsonify({'success': False, 'error': error}), 500
@@ -2,10 +2,13 @@
 Caso de uso: Asignar Horario a Trabajador
 Responsabilidad: Validar y crear asignación
 """
+import logging
 from app.core.database.query_executor import QueryExecutor
 from app.core.database.connection import db_connection
 from app.features.horarios.models.horario_trabajador import HorarioTrabajador
 
+logger = logging.getLogger(__name__)
+
 
 class AsignarHorarioTrabajadorUseCase:
     """Asigna un horario a un trabajador"""
@@ -33,8 +36,8 @@ class AsignarHorarioTrabajadorUseCase:
             tuple: (id_insertado, error)
         """
         try:
-            print(f"[ASIGNAR] Iniciando asignación para trabajador {horario.num_trabajador}")
-            print(f"[ASIGNAR] Plantilla: {horario.plantilla_horario_id}, Fechas: {horario.fecha_inicio_asignacion} - {horario.fecha_fin_asignacion}")
+            logger.debug("[ASIGNAR] Iniciando asignación para trabajador %s", horario.num_trabajador)
+            logger.debug("[ASIGNAR] Plantilla: %s, Fechas: %s - %s", horario.plantilla_horario_id, horario.fecha_inicio_asignacion, horario.fecha_fin_asignacion)
             
             # 0. Validar que las fechas sean obligatorias
             if not horario.fecha_inicio_asignacion:
@@ -114,7 +117,7 @@ class AsignarHorarioTrabajadorUseCase:
                     f"Asignaciones conflictivas:\n" + "\n".join(traslapes)
                 )
                 
-                print(f"[ASIGNAR] TRASLAPE DETECTADO: {mensaje_error}")
+                logger.warning("[ASIGNAR] TRASLAPE DETECTADO: %s", mensaje_error)
                 
                 return None, mensaje_error
             
@@ -146,7 +149,7 @@ class AsignarHorarioTrabajadorUseCase:
             resultado_id, _ = self.query_executor.ejecutar(query_last_id)
             id_insertado = resultado_id[0]['id'] if resultado_id else None
             
-            print(f"[ASIGNAR] Asignación EXITOSA: ID={id_insertado}")
+            logger.info("[ASIGNAR] Asignación EXITOSA: ID=%s", id_insertado)
             
             return id_insertado, None
             
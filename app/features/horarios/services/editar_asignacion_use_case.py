@@ -2,9 +2,12 @@
 Caso de uso: Editar Asignación de Horario
 Responsabilidad: Actualizar fechas y datos de una asignación existente
 """
+import logging
 from app.core.database.query_executor import QueryExecutor
 from app.core.database.connection import db_connection
 
+logger = logging.getLogger(__name__)
+
 
 class EditarAsignacionUseCase:
     """Edita una asignación de horario existente"""
@@ -33,7 +36,7 @@ class EditarAsignacionUseCase:
             tuple: (success, error)
         """
         try:
-            print(f"[EDITAR ASIGNACION] ID: {id_asignacion}, Fechas: {fecha_inicio} - {fecha_fin}")
+            logger.debug("[EDITAR ASIGNACION] ID: %s, Fechas: %s - %s", id_asignacion, fecha_inicio, fecha_fin)
             
             # 1. Validar fechas obligatorias
             if not fecha_inicio:
@@ -99,7 +102,7 @@ class EditarAsignacionUseCase:
                     + "\n".join(traslapes)
                 )
                 
-                print(f"[EDITAR ASIGNACION] TRASLAPE DETECTADO: {mensaje_error}")
+                logger.warning("[EDITAR ASIGNACION] TRASLAPE DETECTADO: %s", mensaje_error)
                 return False, mensaje_error
             
             # 4. No hay traslapes, proceder con la actualización
@@ -126,7 +129,7 @@ class EditarAsignacionUseCase:
             if error:
                 return False, error
             
-            print(f"[EDITAR ASIGNACION] Asignación {id_asignacion} actualizada exitosamente")
+            logger.info("[EDITAR ASIGNACION] Asignación %s actualizada exitosamente", id_asignacion)
             return True, None
             
         except Exception as e:
@@ -2,9 +2,12 @@
 Caso de uso: Eliminar Asignación de Horario
 Responsabilidad: Eliminar una asignación (DELETE real)
 """
+import logging
 from app.core.database.query_executor import QueryExecutor
 from app.core.database.connection import db_connection
 
+logger = logging.getLogger(__name__)
+
 
 class EliminarAsignacionUseCase:
     """Elimina una asignación de horario (DELETE de la BD)"""
@@ -23,7 +26,7 @@ class EliminarAsignacionUseCase:
             tuple: (success, error)
         """
         try:
-            print(f"[ELIMINAR ASIGNACION] ID: {id_asignacion}")
+            logger.debug("[ELIMINAR ASIGNACION] ID: %s", id_asignacion)
             
             # Verificar que la asignación existe
             query_check = "SELECT id FROM horarios_trabajadores WHERE id = %s"
@@ -43,7 +46,7 @@ class EliminarAsignacionUseCase:
             if error:
                 return False, error
             
-            print(f"[ELIMINAR ASIGNACION] Asignación {id_asignacion} eliminada de la BD")
+            logger.info("[ELIMINAR ASIGNACION] Asignación %s eliminada de la BD", id_asignacion)
             return True, None
             
         except Exception as e:
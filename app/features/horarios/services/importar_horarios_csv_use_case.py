@@ -2,6 +2,7 @@
 Caso de uso: Importar Horarios desde CSV
 Responsabilidad: Procesar CSV, crear/reutilizar plantillas, asignar a trabajadores
 """
+import logging
 import csv
 import io
 from datetime import datetime
@@ -12,6 +13,8 @@ from app.features.horarios.models.horario_trabajador import HorarioTrabajador
 from app.features.horarios.services.crear_plantilla_horario_use_case import crear_plantilla_horario_use_case
 from app.features.horarios.services.asignar_horario_trabajador_use_case import asignar_horario_trabajador_use_case
 
+logger = logging.getLogger(__name__)
+
 
 class ImportarHorariosCSVUseCase:
     """Importa horarios desde CSV"""
@@ -143,14 +146,14 @@ class ImportarHorariosCSVUseCase:
                     if asignacion_existente:
                         # Si existe con la misma plantilla, solo actualizamos
                         if asignacion_existente['plantilla_horario_id'] == id_plantilla:
-                            print(f"[IMPORTAR CSV] Trabajador {num_trabajador}: Asignación ya existe con la misma plantilla, se omite")
+                            logger.debug("[IMPORTAR CSV] Trabajador %s: Asignación ya existe con la misma plantilla, se omite", num_trabajador)
                             resultados['asignaciones_exitosas'] += 1
                             continue
                         else:
                             # Diferente plantilla, actualizar la asignación
                             success = self._actualizar_asignacion(asignacion_existente['id'], id_plantilla)
                             if success:
-                                print(f"[IMPORTAR CSV] Trabajador {num_trabajador}: Asignación actualizada a nueva plantilla")
+                                logger.debug("[IMPORTAR CSV] Trabajador %s: Asignación actualizada a nueva plantilla", num_trabajador)
                                 resultados['asignaciones_exitosas'] += 1
                             else:
                                 resultados['errores'].append(f"Trabajador {num_trabajador}: Error al actualizar asignación")
@@ -159,7 +162,7 @@ class ImportarHorariosCSVUseCase:
                     # No existe, crear nueva asignación
                     id_asignacion, error = asignar_horario_trabajador_use_case.ejecutar(horario_trabajador)
                     
-                    print(f"[IMPORTAR CSV] Trabajador {num_trabajador}: id_asignacion={id_asignacion}, error={error}")
+                    logger.error("[IMPORTAR CSV] Trabajador %s: id_asignacion=%s, error=%s", num_trabajador, id_asignacion, error)
                     
                     if error:
                         resultados['errores'].append(f"Trabajador {num_trabajador}: {error}")
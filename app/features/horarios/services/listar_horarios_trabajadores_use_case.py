@@ -2,8 +2,12 @@
 Caso de uso: Listar Horarios de Trabajadores
 Responsabilidad: Obtener asignaciones con información completa
 """
+import logging
 from app.core.database.query_executor import QueryExecutor
 from app.core.database.connection import db_connection
+from app.features.trabajadores.services.indice_nombres_trabajadores import indice_nombres_trabajadores
+
+logger = logging.getLogger(__name__)
 
 
 class ListarHorariosTrabajadoresUseCase:
@@ -26,7 +30,7 @@ class ListarHorariosTrabajadoresUseCase:
             tuple: (lista_horarios, error)
         """
         try:
-            print(f"[LISTAR ASIGNACIONES] Filtros: semestre={semestre}, num_trabajador={num_trabajador}, nombre={nombre_trabajador}, estado={estado_asignacion}")
+            logger.debug("[LISTAR ASIGNACIONES] Filtros: semestre=%s, num_trabajador=%s, nombre=%s, estado=%s", semestre, num_trabajador, nombre_trabajador, estado_asignacion)
             
             # Query base
             query = """
@@ -61,8 +65,11 @@ class ListarHorariosTrabajadoresUseCase:
                 params.append(num_trabajador)
             
             if nombre_trabajador:
-                where_clauses.append("t.nombre LIKE %s")
-                params.append(f"%{nombre_trabajador}%")
+                condicion, numeros, error = indice_nombres_trabajadores.condicion_sql('ht.num_trabajador', nombre_trabajador)
+                if error:
+                    return [], error
+                where_clauses.append(condicion)
+                params.extend(numeros)
             
             if estado_asignacion:
                 where_clauses.append("ht.estado_asignacion = %s")
@@ -73,23 +80,23 @@ class ListarHorariosTrabajadoresUseCase:
             
             query += " ORDER BY t.nombre"
             
-            print(f"[LISTAR ASIGNACIONES] Query: {query}")
-            print(f"[LISTAR ASIGNACIONES] Params: {params}")
+            logger.debug("[LISTAR ASIGNACIONES] Query: %s", query)
+            logger.debug("[LISTAR ASIGNACIONES] Params: %s", params)
             
             resultado, error = self.query_executor.ejecutar(query, tuple(params) if params else None)
             
             if error:
-                print(f"[LISTAR ASIGNACIONES] Error: {error}")
+                logger.error("[LISTAR ASIGNACIONES] Error: %s", error)
                 return [], error
             
-            print(f"[LISTAR ASIGNACIONES] Encontrados: {len(resultado) if resultado else 0} registros")
+            logger.debug("[LISTAR ASIGNACIONES] Encontrados: %s registros", len(resultado) if resultado else 0)
             if resultado:
-                print(f"[LISTAR ASIGNACIONES] Primer registro: {resultado[0]}")
+                logger.debug("[LISTAR ASIGNACIONES] Primer registro: %s", resultado[0])
             
             return resultado if resultado else [], None
             
         except Exception as e:
-            print(f"[LISTAR ASIGNACIONES] Exception: {str(e)}")
+            logger.error("[LISTAR ASIGNACIONES] Exception: %s", str(e))
             import traceback
             traceback.print_exc()
             return [], f"Error al listar horarios de trabajadores: {str(e)}"
@@ -97,7 +104,7 @@ class ListarHorariosTrabajadoresUseCase:
             return resultado if resultado else [], None
             
         except Exception as e:
-            print(f"[LISTAR ASIGNACIONES] Exception: {str(e)}")
+            logger.error("[LISTAR ASIGNACIONES] Exception: %s", str(e))
             return [], f"Error al listar horarios de trabajadores: {str(e)}"
 
 
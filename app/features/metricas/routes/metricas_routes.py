@@ -0,0 +1,52 @@
+"""
+Rutas de métricas de la aplicación
+- /metrics: exposición Prometheus (suma de todos los workers)
+- /metrics/db: estadísticas de queries por endpoint y huella (worker actual)
+- POST /metrics/db/reiniciar: reinicia esas estadísticas (worker actual)
+"""
+import os
+from flask import Blueprint, Response, jsonify, request
+
+from app.config.app_config import Config
+from app.core.database.query_metrics import metricas_queries
+from app.core.metricas import registro_metricas
+
+metricas_bp = Blueprint('metricas', __name__)
+
+
+def ip_autorizada_metricas(ip: str) -> bool:
+    """IPs que pueden leer /metrics sin sesión (METRICS_ALLOWED_IPS)"""
+    return ip in Config.METRICS_ALLOWED_IPS
+
+
+@metricas_bp.route('/metrics')
+def metrics():
+    """Métricas en formato de texto de Prometheus"""
+    return Response(registro_metricas.exponer(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
+@metricas_bp.route('/metrics/db')
+def metrics_db():
+    """
+    Estadísticas de BD por endpoint y huellas de query más costosas
+
+    Los valores son del worker que atiende la petición (campo pid).
+
+    Query params:
+        huellas: Número de huellas a incluir (default 20)
+    """
+    max_huellas = request.args.get('huellas', 20, type=int)
+    resumen = metricas_queries.resumen(max_huellas=max_huellas)
+    return jsonify({'success': True, 'pid': os.getpid(), **resumen})
+
+
+@metricas_bp.route('/metrics/db/reiniciar', methods=['POST'])
+def metrics_db_reiniciar():
+    """
+    Reinicia los acumulados de /metrics/db del worker que atiende la petición
+
+    Es POST para que un GET (prefetch del navegador, un enlace, un scraper) no
+    borre los acumulados.
+    """
+    metricas_queries.reiniciar()
+    return jsonify({'success': True, 'pid': os.getpid()})
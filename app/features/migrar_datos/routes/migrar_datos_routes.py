@@ -89,9 +89,13 @@ def verificar_conexion():
 def contar_asistencias():
     """Cuenta las asistencias a migrar según filtros"""
     checador = request.args.get('checador')
+    fecha_inicio = request.args.get('fecha_inicio')
+    fecha_fin = request.args.get('fecha_fin')
     
     total, error = migrar_asistencias_rinotime_use_case.contar_asistencias(
-        checador=checador
+        checador=checador,
+        fecha_inicio=fecha_inicio,
+        fecha_fin=fecha_fin
     )
     
     if error:
@@ -107,6 +111,8 @@ def migrar():
     
     terminal_sn = data.get('terminal_sn')
     checador = data.get('checador')
+    fecha_inicio = data.get('fecha_inicio')
+    fecha_fin = data.get('fecha_fin')
     
     if not terminal_sn:
         return jsonify({'error': 'Debe seleccionar un terminal'}), 400
@@ -115,7 +121,9 @@ def migrar():
         """Genera eventos SSE con el progreso"""
         for progreso in migrar_asistencias_rinotime_use_case.ejecutar(
             terminal_sn=terminal_sn,
-            checador=checador
+            checador=checador,
+            fecha_inicio=fecha_inicio,
+            fecha_fin=fecha_fin
         ):
             yield f"data: {json.dumps(progreso)}\n\n"
     
@@ -5,7 +5,9 @@ Responsabilidad: Consultar asistencias y migrarlas a iclock_transaction en RinoT
 from app.core.database.query_executor import QueryExecutor
 from app.core.database.query_builder import QueryBuilder
 from app.core.database.connection import db_connection, db_sync_connection
+from app.core.metricas import IMPORTACION_REGISTROS, IMPORTACION_SEGUNDOS
 from datetime import datetime
+import time
 
 
 class MigrarAsistenciasRinoTimeUseCase:
@@ -15,12 +17,14 @@ class MigrarAsistenciasRinoTimeUseCase:
         self.query_executor_local = QueryExecutor(db_connection)
         self.query_executor_sync = QueryExecutor(db_sync_connection)
     
-    def contar_asistencias(self, checador=None):
+    def contar_asistencias(self, checador=None, fecha_inicio=None, fecha_fin=None):
         """
         Cuenta cuántas asistencias se migrarán
         
         Args:
             checador: Filtrar por checador (serial number)
+            fecha_inicio: Primer día a migrar (YYYY-MM-DD, opcional)
+            fecha_fin: Último día a migrar (YYYY-MM-DD, opcional)
             
         Returns:
             tuple: (total_registros, error)
@@ -32,6 +36,8 @@ class MigrarAsistenciasRinoTimeUseCase:
             if checador:
                 builder.add_filter('checador', checador)
             
+            builder.add_date_filter('fecha', fecha_inicio, fecha_fin, tipo='date')
+            
             query, params = builder.build()
             resultado, error = self.query_executor_local.ejecutar(query, params)
             
@@ -44,23 +50,25 @@ class MigrarAsistenciasRinoTimeUseCase:
         except Exception as e:
             return 0, f"Error al contar asistencias: {str(e)}"
     
-    def ejecutar(self, terminal_sn, checador=None):
+    def ejecutar(self, terminal_sn, checador=None, fecha_inicio=None, fecha_fin=None):
         """
         Migra asistencias a RinoTime
         
         Args:
             terminal_sn: Serial del terminal (CLN5204760269 o CLN5204760200)
             checador: Filtrar por checador (serial del dispositivo de origen)
+            fecha_inicio: Primer día a migrar (YYYY-MM-DD, opcional)
+            fecha_fin: Último día a migrar (YYYY-MM-DD, opcional)
             
         Yields:
             dict: Progreso de la operación
         """
+        inicio = time.perf_counter()
         try:
             # Usar QueryBuilder para construir la query de consulta
             builder = QueryBuilder("""
                 SELECT 
                     num_trabajador,
-                    nombre,
                     fecha,
                     hora,
                     checador
@@ -70,6 +78,9 @@ class MigrarAsistenciasRinoTimeUseCase:
             if checador:
                 builder.add_filter('checador', checador)
             
+            # Rango sobre fecha (sin DATE()): usa idx_checador_fecha y poda particiones
+            builder.add_date_filter('fecha', fecha_inicio, fecha_fin, tipo='date')
+            
             builder.add_order_by('fecha, hora')
             
             query, params = builder.build()
@@ -285,6 +296,11 @@ class MigrarAsistenciasRinoTimeUseCase:
                     'errores': errores
                 }
             
+            IMPORTACION_SEGUNDOS.inc(time.perf_counter() - inicio, tipo='rinotime')
+            IMPORTACION_REGISTROS.inc(insertadas, tipo='rinotime', resultado='insertado')
+            IMPORTACION_REGISTROS.inc(duplicadas, tipo='rinotime', resultado='duplicado')
+            IMPORTACION_REGISTROS.inc(errores, tipo='rinotime', resultado='error')
+            
             # Finalizado
             yield {
                 'estado': 'Migración completada',
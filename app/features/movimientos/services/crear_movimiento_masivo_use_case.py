@@ -2,6 +2,7 @@
 Caso de uso: Crear Movimiento Masivo
 Crea el mismo movimiento para múltiples trabajadores
 """
+from app.core.database.query_builder import QueryBuilder
 from app.core.database.query_executor import QueryExecutor
 from app.core.database.connection import db_connection
 from app.features.movimientos.models.movimiento_models import Movimiento
@@ -64,19 +65,15 @@ class CrearMovimientoMasivoUseCase:
                 return None, "El tipo de movimiento no existe o está inactivo"
             
             # Validar que todos los trabajadores existen
-            placeholders = ','.join(['%s'] * len(nums_trabajadores))
-            query_trabajadores = f"""
-                SELECT num_trabajador, nombre 
-                FROM trabajadores 
-                WHERE num_trabajador IN ({placeholders})
-            """
-            trabajadores_encontrados, error = self.query_executor.ejecutar(
-                query_trabajadores, 
-                tuple(nums_trabajadores)
-            )
-            
-            if error:
-                return None, f"Error al validar trabajadores: {error}"
+            builder = QueryBuilder("SELECT num_trabajador, nombre FROM trabajadores")
+            builder.add_in_filter('num_trabajador', nums_trabajadores, chunk_size=QueryBuilder.TAMANO_BLOQUE_IN)
+            trabajadores_encontrados = []
+            for query_trabajadores, params in builder.build_chunks():
+                encontrados, error = self.query_executor.ejecutar(query_trabajadores, params)
+                
+                if error:
+                    return None, f"Error al validar trabajadores: {error}"
+                trabajadores_encontrados.extend(encontrados)
             
             if len(trabajadores_encontrados) != len(nums_trabajadores):
                 nums_encontrados = [t['num_trabajador'] for t in trabajadores_encontrados]
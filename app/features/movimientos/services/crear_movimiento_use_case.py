@@ -2,11 +2,14 @@
 Caso de uso: Crear Movimiento
 Responsabilidad: Insertar un nuevo movimiento en la BD
 """
+import logging
 from app.core.database.query_executor import QueryExecutor
 from app.core.database.connection import db_connection
 from app.features.movimientos.models.movimiento_models import Movimiento
 from typing import Tuple, Optional
 
+logger = logging.getLogger(__name__)
+
 
 class CrearMovimientoUseCase:
     """Crea un nuevo movimiento"""
@@ -80,7 +83,7 @@ class CrearMovimientoUseCase:
                 return None, "Error al obtener ID insertado"
             
             movimiento_id = resultado_id[0]['id']
-            print(f"[CREAR MOVIMIENTO] ID={movimiento_id}, Trabajador={movimiento.num_trabajador}")
+            logger.info("[CREAR MOVIMIENTO] ID=%s, Trabajador=%s", movimiento_id, movimiento.num_trabajador)
             
             return movimiento_id, None
             
@@ -2,11 +2,14 @@
 Caso de uso: Crear Tipo de Movimiento
 Responsabilidad: Insertar un nuevo tipo de movimiento en la BD
 """
+import logging
 from app.core.database.query_executor import QueryExecutor
 from app.core.database.connection import db_connection
 from app.features.movimientos.models.movimiento_models import TipoMovimiento
 from app.config.movimientos_config import get_letras_values
 
+logger = logging.getLogger(__name__)
+
 
 class CrearTipoMovimientoUseCase:
     """Crea un nuevo tipo de movimiento"""
@@ -74,7 +77,7 @@ class CrearTipoMovimientoUseCase:
                 return None, "Error al obtener ID insertado"
             
             tipo_id = resultado_id[0]['id']
-            print(f"[CREAR TIPO MOVIMIENTO] ID={tipo_id}, Nomenclatura={tipo.nomenclatura}")
+            logger.info("[CREAR TIPO MOVIMIENTO] ID=%s, Nomenclatura=%s", tipo_id, tipo.nomenclatura)
             
             return tipo_id, None
             
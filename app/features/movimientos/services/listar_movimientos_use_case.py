@@ -2,13 +2,17 @@
 Caso de uso: Listar Movimientos
 Responsabilidad: Consultar movimientos con filtros
 """
+import logging
 from app.core.database.query_executor import QueryExecutor
 from app.core.database.query_builder import QueryBuilder
 from app.core.database.connection import db_connection
 from app.features.movimientos.models.movimiento_models import Movimiento
+from app.features.trabajadores.services.indice_nombres_trabajadores import indice_nombres_trabajadores
 from typing import List, Optional
 from datetime import date
 
+logger = logging.getLogger(__name__)
+
 
 class ListarMovimientosUseCase:
     """Lista movimientos con filtros opcionales"""
@@ -67,7 +71,11 @@ class ListarMovimientosUseCase:
                 builder.add_filter("m.fecha_fin", fecha_fin, "<=")
             
             if nombre_trabajador:
-                builder.add_filter("t.nombre", f"%{nombre_trabajador}%", "LIKE")
+                numeros, error = indice_nombres_trabajadores.buscar(nombre_trabajador)
+                if error:
+                    logger.error("[LISTAR MOVIMIENTOS] %s", error)
+                    return []
+                builder.add_in_filter("m.num_trabajador", numeros)
             
             # Construir query con parámetros
             query, params = builder.build()
@@ -76,7 +84,7 @@ class ListarMovimientosUseCase:
             resultados, error = self.query_executor.ejecutar(query, params)
             
             if error:
-                print(f"[ERROR LISTAR MOVIMIENTOS] {error}")
+                logger.error("[LISTAR MOVIMIENTOS] %s", error)
                 return []
             
             # Convertir resultados a objetos Movimiento
@@ -105,7 +113,7 @@ class ListarMovimientosUseCase:
             return movimientos
             
         except Exception as e:
-            print(f"[ERROR LISTAR MOVIMIENTOS] {str(e)}")
+            logger.error("[LISTAR MOVIMIENTOS] %s", str(e))
             return []
 
 
@@ -2,12 +2,15 @@
 Caso de uso: Listar Tipos de Movimientos
 Responsabilidad: Consultar tipos de movimientos con filtros
 """
+import logging
 from app.core.database.query_executor import QueryExecutor
 from app.core.database.query_builder import QueryBuilder
 from app.core.database.connection import db_connection
 from app.features.movimientos.models.movimiento_models import TipoMovimiento
 from typing import List, Optional
 
+logger = logging.getLogger(__name__)
+
 
 class ListarTiposMovimientosUseCase:
     """Lista tipos de movimientos con filtros opcionales"""
@@ -68,7 +71,7 @@ class ListarTiposMovimientosUseCase:
             resultados, error = self.query_executor.ejecutar(query, params)
             
             if error:
-                print(f"[ERROR LISTAR TIPOS] {error}")
+                logger.error("[LISTAR TIPOS] %s", error)
                 return []
             
             # Convertir resultados a objetos TipoMovimiento
@@ -91,7 +94,7 @@ class ListarTiposMovimientosUseCase:
             return tipos
             
         except Exception as e:
-            print(f"[ERROR LISTAR TIPOS] {str(e)}")
+            logger.error("[LISTAR TIPOS] %s", str(e))
             return []
 
 
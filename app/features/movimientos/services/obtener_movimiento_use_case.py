@@ -2,11 +2,14 @@
 Caso de uso: Obtener Movimiento
 Responsabilidad: Consultar un movimiento por ID con datos relacionados
 """
+import logging
 from app.core.database.query_executor import QueryExecutor
 from app.core.database.connection import db_connection
 from app.features.movimientos.models.movimiento_models import Movimiento
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 
 class ObtenerMovimientoUseCase:
     """Obtiene un movimiento por ID con información relacionada"""
@@ -66,7 +69,7 @@ class ObtenerMovimientoUseCase:
             return movimiento
             
         except Exception as e:
-            print(f"[ERROR OBTENER MOVIMIENTO] {str(e)}")
+            logger.error("[OBTENER MOVIMIENTO] %s", str(e))
             return None
 
 
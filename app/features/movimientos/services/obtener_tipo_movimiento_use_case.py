@@ -2,11 +2,14 @@
 Caso de uso: Obtener Tipo de Movimiento
 Responsabilidad: Consultar un tipo de movimiento por ID
 """
+import logging
 from app.core.database.query_executor import QueryExecutor
 from app.core.database.connection import db_connection
 from app.features.movimientos.models.movimiento_models import TipoMovimiento
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 
 class ObtenerTipoMovimientoUseCase:
     """Obtiene un tipo de movimiento por ID"""
@@ -56,7 +59,7 @@ class ObtenerTipoMovimientoUseCase:
             return tipo
             
         except Exception as e:
-            print(f"[ERROR OBTENER TIPO] {str(e)}")
+            logger.error("[OBTENER TIPO] %s", str(e))
             return None
 
 
@@ -2,6 +2,7 @@
 Rutas para el feature de trabajadores
 Responsabilidad: CRUD de trabajadores
 """
+import logging
 from flask import Blueprint, render_template, flash, request, jsonify, redirect, url_for
 from app.features.trabajadores.services.obtener_trabajadores_use_case import obtener_trabajadores_use_case
 from app.features.trabajadores.services.importar_trabajadores_use_case import importar_trabajadores_use_case
@@ -9,10 +10,13 @@ from app.features.trabajadores.services.crear_trabajador_use_case import crear_t
 from app.features.trabajadores.services.actualizar_trabajador_use_case import actualizar_trabajador_use_case
 from app.features.trabajadores.services.eliminar_trabajador_use_case import eliminar_trabajador_use_case
 from app.features.trabajadores.services.cambiar_departamento_trabajador_use_case import cambiar_departamento_trabajador_use_case
+from app.features.trabajadores.services.indice_nombres_trabajadores import indice_nombres_trabajadores
 from app.features.checadores.services.consultar_checadores_trabajador_use_case import consultar_checadores_trabajador_use_case
 from app.core.database.query_executor import query_executor
 import math
 
+logger = logging.getLogger(__name__)
+
 # Crear blueprint
 trabajadores_bp = Blueprint('trabajadores', __name__, url_prefix='/trabajadores')
 
@@ -112,12 +116,14 @@ def checadores():
     """API: Consultar en qué checadores está registrado un trabajador"""
     
     num_trabajador = request.args.get('num_trabajador', type=int)
+    # actualizar=1: leer los checadores antes de consultar el índice
+    actualizar = request.args.get('actualizar') == '1'
     
     if not num_trabajador:
         return jsonify({'error': 'Falta el parámetro num_trabajador'}), 400
     
     # Ejecutar caso de uso
-    checadores_list, error = consultar_checadores_trabajador_use_case.ejecutar(num_trabajador)
+    checadores_list, error = consultar_checadores_trabajador_use_case.ejecutar(num_trabajador, actualizar)
     
     if error:
         return jsonify({'error': error}), 500
@@ -320,25 +326,28 @@ def listar():
             activo_valor = 0
         conditions.append("t.activo = %s")
         params.append(activo_valor)
-        print(f"[LISTAR TRABAJADORES] Filtrando por activo={activo_valor}")
+        logger.debug("[LISTAR TRABAJADORES] Filtrando por activo=%s", activo_valor)
     
     # Aplicar filtro por número de trabajador
     if num_trabajador is not None:
         conditions.append("t.num_trabajador = %s")
         params.append(num_trabajador)
-        print(f"[LISTAR TRABAJADORES] Filtrando por num_trabajador={num_trabajador}")
+        logger.debug("[LISTAR TRABAJADORES] Filtrando por num_trabajador=%s", num_trabajador)
     
-    # Aplicar filtro por nombre (búsqueda parcial)
+    # Aplicar filtro por nombre (búsqueda parcial con el índice de nombres)
     if nombre:
-        conditions.append("t.nombre LIKE %s")
-        params.append(f"%{nombre}%")
-        print(f"[LISTAR TRABAJADORES] Filtrando por nombre LIKE '%{nombre}%'")
+        condicion, numeros, error = indice_nombres_trabajadores.condicion_sql('t.num_trabajador', nombre)
+        if error:
+            return jsonify({'error': error}), 500
+        conditions.append(condicion)
+        params.extend(numeros)
+        logger.debug("[LISTAR TRABAJADORES] Filtrando por nombre '%s': %s trabajadores", nombre, len(numeros))
     
     # Aplicar filtro por departamento
     if departamento_id is not None:
         conditions.append("t.departamento_id = %s")
         params.append(departamento_id)
-        print(f"[LISTAR TRABAJADORES] Filtrando por departamento_id={departamento_id}")
+        logger.debug("[LISTAR TRABAJADORES] Filtrando por departamento_id=%s", departamento_id)
     
     # Agregar condiciones WHERE si hay filtros
     if conditions:
@@ -346,16 +355,16 @@ def listar():
     
     query += " ORDER BY t.num_trabajador ASC"
     
-    print(f"[LISTAR TRABAJADORES] Query: {query}")
-    print(f"[LISTAR TRABAJADORES] Params: {params}")
+    logger.debug("[LISTAR TRABAJADORES] Query: %s", query)
+    logger.debug("[LISTAR TRABAJADORES] Params: %s", params)
     
     resultado, error = query_executor.ejecutar(query, tuple(params) if params else None)
     
     if error:
-        print(f"[LISTAR TRABAJADORES] Error: {error}")
+        logger.error("[LISTAR TRABAJADORES] Error: %s", error)
         return jsonify({'error': error}), 500
     
-    print(f"[LISTAR TRABAJADORES] Encontrados: {len(resultado) if resultado else 0} trabajadores")
+    logger.debug("[LISTAR TRABAJADORES] Encontrados: %s trabajadores", len(resultado) if resultado else 0)
     
     return jsonify({'trabajadores': resultado if resultado else []})
 
@@ -3,6 +3,7 @@ Caso de uso: Actualizar trabajador
 Responsabilidad: Actualizar datos de trabajador existente
 """
 from app.core.database.query_executor import query_executor
+from app.features.trabajadores.services.indice_nombres_trabajadores import indice_nombres_trabajadores
 
 
 class ActualizarTrabajadorUseCase:
@@ -58,6 +59,7 @@ class ActualizarTrabajadorUseCase:
                     return False, f"Ya existe otro trabajador con el número {num_trabajador}"
                 return False, error
             
+            indice_nombres_trabajadores.invalidar()
             return True, None
             
         except Exception as e:
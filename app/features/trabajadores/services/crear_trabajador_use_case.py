@@ -3,6 +3,7 @@ Caso de uso: Crear trabajador
 Responsabilidad: Insertar nuevo trabajador en la base de datos
 """
 from app.core.database.query_executor import query_executor
+from app.features.trabajadores.services.indice_nombres_trabajadores import indice_nombres_trabajadores
 
 
 class CrearTrabajadorUseCase:
@@ -52,6 +53,8 @@ class CrearTrabajadorUseCase:
                     return None, f"Ya existe un trabajador con el número {num_trabajador}"
                 return None, error
             
+            indice_nombres_trabajadores.invalidar()
+            
             # Obtener el ID insertado
             query_id = "SELECT LAST_INSERT_ID() as id"
             id_result, error = query_executor.ejecutar(query_id)
@@ -3,6 +3,7 @@ Caso de uso: Eliminar trabajador
 Responsabilidad: Eliminar trabajador de la base de datos
 """
 from app.core.database.query_executor import query_executor
+from app.features.trabajadores.services.indice_nombres_trabajadores import indice_nombres_trabajadores
 
 
 class EliminarTrabajadorUseCase:
@@ -26,6 +27,7 @@ class EliminarTrabajadorUseCase:
             if error:
                 return False, error
             
+            indice_nombres_trabajadores.invalidar()
             return True, None
             
         except Exception as e:
@@ -3,6 +3,7 @@ Caso de uso: Importar trabajadores desde CSV
 Responsabilidad: Leer CSV y insertar trabajadores sin duplicar
 """
 from app.core.database.query_executor import query_executor
+from app.features.trabajadores.services.indice_nombres_trabajadores import indice_nombres_trabajadores
 import csv
 import io
 
@@ -75,6 +76,7 @@ class ImportarTrabajadoresUseCase:
             if error:
                 return None, error
             
+            indice_nombres_trabajadores.invalidar()
             duplicados = len(trabajadores_lista) - registros_insertados
             
             return {
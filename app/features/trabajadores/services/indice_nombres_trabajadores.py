@@ -0,0 +1,158 @@
+"""
+Índice de búsqueda por nombre de trabajador
+Responsabilidad: Resolver una búsqueda parcial de nombre a los num_trabajador
+que coinciden, para filtrar con num_trabajador IN (...) (usa índices) en lugar
+de nombre LIKE '%texto%' (recorre la tabla completa; en asistencias, millones
+de filas), y dar el nombre de cada num_trabajador al mostrar registros que
+solo guardan el número (asistencias)
+
+- Índice en memoria por proceso de trigramas del nombre normalizado (minúsculas
+  y sin acentos, como compara utf8mb4_unicode_ci): la búsqueda intersecta los
+  trigramas del texto y confirma la subcadena solo en los candidatos
+- Textos de menos de 3 caracteres se buscan recorriendo los nombres (miles, no
+  millones)
+- Se reconstruye cuando cambia la firma de trabajadores (COUNT(*), MAX(updated_at)),
+  revisada como máximo cada REVISION segundos; los casos de uso que modifican
+  trabajadores llaman invalidar() para verlo en la siguiente búsqueda
+"""
+import logging
+import threading
+import time
+import unicodedata
+
+from app.core.database.query_executor import query_executor
+
+logger = logging.getLogger(__name__)
+
+
+def normalizar(texto):
+    """Minúsculas y sin acentos (ñ -> n), como compara utf8mb4_unicode_ci"""
+    descompuesto = unicodedata.normalize('NFKD', texto.lower())
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def _trigramas(texto):
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceNombresTrabajadores:
+    """Trigramas de nombres de trabajadores -> num_trabajador"""
+
+    # Segundos entre revisiones de la firma de la tabla trabajadores
+    REVISION = 10
+
+    def __init__(self):
+        # ({num_trabajador: nombre normalizado}, {trigrama: set(num_trabajador)},
+        #  {num_trabajador: nombre})
+        self._indice = ({}, {}, {})
+        self._firma = None
+        self._revisado = 0.0
+        self._lock = threading.Lock()
+
+    def invalidar(self):
+        """Fuerza revisar la firma en la siguiente búsqueda"""
+        self._revisado = 0.0
+
+    def buscar(self, texto):
+        """
+        Trabajadores cuyo nombre contiene el texto
+
+        Args:
+            texto (str): Parte del nombre (sin distinguir mayúsculas ni acentos)
+
+        Returns:
+            tuple: (lista ordenada de num_trabajador, error)
+        """
+        error = self._asegurar_al_dia()
+        if error:
+            return None, error
+
+        buscado = normalizar(texto)
+        nombres, indice, _ = self._indice
+        trigramas = _trigramas(buscado)
+        if not trigramas:
+            return sorted(num for num, nombre in nombres.items() if buscado in nombre), None
+
+        # Menos candidatos primero: la intersección se vacía pronto si no hay coincidencias
+        listas = sorted((indice.get(trigrama, ()) for trigrama in trigramas), key=len)
+        candidatos = set(listas[0]).intersection(*listas[1:])
+        return sorted(num for num in candidatos if buscado in nombres[num]), None
+
+    def nombres_de(self, numeros):
+        """
+        Nombre de cada trabajador
+
+        Args:
+            numeros (iterable): num_trabajador a resolver
+
+        Returns:
+            tuple: ({num_trabajador: nombre} de los que existen en trabajadores, error)
+        """
+        error = self._asegurar_al_dia()
+        if error:
+            return {}, error
+
+        originales = self._indice[2]
+        return {num: originales[num] for num in numeros if num in originales}, None
+
+    def condicion_sql(self, columna, texto):
+        """
+        Condición SQL equivalente a "nombre LIKE %texto%" sobre una columna num_trabajador
+
+        Returns:
+            tuple: (condición, params, error); sin coincidencias la condición es "1 = 0"
+        """
+        numeros, error = self.buscar(texto)
+        if error:
+            return None, None, error
+        if not numeros:
+            return "1 = 0", [], None
+        return f"{columna} IN ({', '.join(['%s'] * len(numeros))})", numeros, None
+
+    def _asegurar_al_dia(self):
+        if time.monotonic() - self._revisado < self.REVISION:
+            return None
+
+        with self._lock:
+            if time.monotonic() - self._revisado < self.REVISION:
+                return None
+
+            resultado, error = query_executor.ejecutar(
+                "SELECT COUNT(*) AS total, MAX(updated_at) AS actualizado FROM trabajadores"
+            )
+            if error:
+                return f"Error al consultar trabajadores: {error}"
+            firma = (resultado[0]['total'], str(resultado[0]['actualizado'])) if resultado else None
+
+            if firma != self._firma:
+                error = self._reconstruir()
+                if error:
+                    return error
+                self._firma = firma
+            self._revisado = time.monotonic()
+        return None
+
+    def _reconstruir(self):
+        filas, error = query_executor.ejecutar("SELECT num_trabajador, nombre FROM trabajadores")
+        if error:
+            return f"Error al consultar trabajadores: {error}"
+
+        nombres = {}
+        trigramas = {}
+        originales = {}
+        for fila in filas:
+            originales[fila['num_trabajador']] = fila['nombre']
+            nombre = normalizar(fila['nombre'] or '')
+            nombres[fila['num_trabajador']] = nombre
+            for trigrama in _trigramas(nombre):
+                trigramas.setdefault(trigrama, set()).add(fila['num_trabajador'])
+
+        # Reemplazo en bloque: las búsquedas en curso siguen con el índice anterior
+        self._indice = (nombres, trigramas, originales)
+        logger.info("Índice de nombres de trabajadores: %s trabajadores, %s trigramas",
+                    len(nombres), len(trigramas))
+        return None
+
+
+# Instancia singleton
+indice_nombres_trabajadores = IndiceNombresTrabajadores()
@@ -0,0 +1 @@
+# Benchmarks: medición de rendimiento del pipeline de bitácora
@@ -0,0 +1,322 @@
+"""
+Generador de datos sintéticos para benchmarks
+
+Genera N trabajadores × M días de horarios, movimientos y checadas con
+distribuciones realistas (retardos, omisiones, faltas, checadas duplicadas).
+Es determinista para una misma semilla, así dos corridas son comparables.
+
+Todos los registros usan num_trabajador >= num_base y prefijo 'BENCH' para
+poder limpiarlos de una base MySQL compartida.
+"""
+import random
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+NOMBRES = [
+    'JUAN', 'MARIA', 'JOSE', 'GUADALUPE', 'FRANCISCO', 'ROSA', 'ANTONIO', 'ELENA',
+    'CARLOS', 'LAURA', 'MIGUEL', 'PATRICIA', 'ALEJANDRO', 'SOFIA', 'RAFAEL', 'ANA'
+]
+APELLIDOS = [
+    'HERNANDEZ', 'GARCIA', 'MARTINEZ', 'LOPEZ', 'GONZALEZ', 'PEREZ', 'RODRIGUEZ',
+    'SANCHEZ', 'RAMIREZ', 'CRUZ', 'FLORES', 'GOMEZ', 'MORALES', 'VAZQUEZ', 'REYES'
+]
+CHECADORES = ['BENCH0001', 'BENCH0002', 'BENCH0003', 'BENCH0004']
+# Dominios reservados (.test): el límite por dominio de la bandeja de correo se reparte entre ellos
+DOMINIOS_CORREO = ['bench-a.test', 'bench-b.test', 'bench-c.test']
+DIAS = ['lunes', 'martes', 'miercoles', 'jueves', 'viernes', 'sabado', 'domingo']
+
+# Plantillas: {dia_semana: (entrada_1, salida_1, entrada_2, salida_2)}
+PLANTILLAS = [
+    ('BENCH MATUTINO 08-16', {d: ('08:00:00', '16:00:00', None, None) for d in range(5)}),
+    ('BENCH VESPERTINO 14-21', {d: ('14:00:00', '21:00:00', None, None) for d in range(5)}),
+    ('BENCH MIXTO', {
+        **{d: ('08:00:00', '13:00:00', '16:00:00', '19:00:00') for d in range(5)},
+        5: ('09:00:00', '13:00:00', None, None)
+    }),
+]
+
+TIPOS_MOVIMIENTO = [
+    ('BENCH_COM', 'Comisión (benchmark)', 'Comisión', 'J'),
+    ('BENCH_LIC', 'Licencia (benchmark)', 'Licencia', 'L'),
+]
+
+
+def _minutos(hora: str) -> int:
+    h, m, _ = hora.split(':')
+    return int(h) * 60 + int(m)
+
+
+def _hora(minutos: int, segundos: int) -> str:
+    minutos = max(0, min(minutos, 23 * 60 + 59))
+    return f"{minutos // 60:02d}:{minutos % 60:02d}:{segundos:02d}"
+
+
+class GeneradorDatosSinteticos:
+    """Genera el conjunto de datos de N trabajadores × M días"""
+
+    def __init__(
+        self,
+        trabajadores: int = 50,
+        dias: int = 30,
+        fecha_inicio: date = date(2025, 1, 6),
+        semilla: int = 42,
+        num_base: int = 900000,
+        dias_importacion: int = 5
+    ):
+        self.num_trabajadores = trabajadores
+        self.dias = dias
+        self.fecha_inicio = fecha_inicio
+        self.fecha_fin = fecha_inicio + timedelta(days=dias - 1)
+        self.semilla = semilla
+        self.num_base = num_base
+        self.dias_importacion = dias_importacion
+
+    # ============================================
+    # CATÁLOGOS
+    # ============================================
+
+    @property
+    def nums(self) -> List[int]:
+        return [self.num_base + i for i in range(self.num_trabajadores)]
+
+    def departamentos(self) -> List[Tuple]:
+        """(num_departamento, nombre, nomenclatura)"""
+        return [(self.num_base + i, f'BENCH DEPARTAMENTO {i}', f'BD{i}') for i in range(5)]
+
+    def trabajadores(self) -> List[Tuple]:
+        """(num_trabajador, nombre, num_departamento, tipoPlaza, email)"""
+        rnd = random.Random(self.semilla)
+        filas = []
+        for i, num in enumerate(self.nums):
+            nombre = f"{rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)} {rnd.choice(NOMBRES)}"
+            tipo_plaza = 'DOCENTE' if rnd.random() < 0.3 else 'ADMINISTRATIVO'
+            email = f"bench{num}@{DOMINIOS_CORREO[i % len(DOMINIOS_CORREO)]}"
+            filas.append((num, nombre, self.num_base + i % 5, tipo_plaza, email))
+        return filas
+
+    def plantillas(self) -> List[Tuple]:
+        """(nombre_horario, descripcion, 28 columnas de horas lunes..domingo)"""
+        filas = []
+        for nombre, horario in PLANTILLAS:
+            horas = []
+            for dia in range(7):
+                horas.extend(horario.get(dia, (None, None, None, None)))
+            filas.append((nombre, nombre.replace('BENCH ', ''), *horas))
+        return filas
+
+    def asignaciones(self) -> List[Tuple]:
+        """(num_trabajador, indice_plantilla, fecha_inicio, semestre)"""
+        inicio = self.fecha_inicio - timedelta(days=30)
+        return [(num, i % len(PLANTILLAS), inicio, 'BENCH') for i, num in enumerate(self.nums)]
+
+    def movimientos(self) -> List[Tuple]:
+        """(num_trabajador, indice_tipo, fecha_inicio, fecha_fin)"""
+        rnd = random.Random(self.semilla + 1)
+        filas = []
+        for num in self.nums:
+            if rnd.random() < 0.15:
+                inicio = self.fecha_inicio + timedelta(days=rnd.randrange(self.dias))
+                fin = min(inicio + timedelta(days=rnd.randrange(3)), self.fecha_fin)
+                filas.append((num, rnd.randrange(len(TIPOS_MOVIMIENTO)), inicio, fin))
+        return filas
+
+    # ============================================
+    # CHECADAS
+    # ============================================
+
+    def _checadas_dia(self, rnd: random.Random, horario: Tuple) -> List[str]:
+        """Checadas de un día laboral con incidencias aleatorias"""
+        if rnd.random() < 0.03:
+            return []  # Falta
+
+        checadas = []
+        turnos = [(horario[0], horario[1])]
+        if horario[2]:
+            turnos.append((horario[2], horario[3]))
+
+        for entrada, salida in turnos:
+            if rnd.random() < 0.08:
+                retraso = rnd.randint(11, 40)  # Retardo
+            else:
+                retraso = int(rnd.gauss(-8, 6))
+            checadas.append(_hora(_minutos(entrada) + retraso, rnd.randrange(60)))
+
+            if rnd.random() < 0.04:
+                continue  # Omisión de salida
+            checadas.append(_hora(_minutos(salida) + int(abs(rnd.gauss(5, 5))), rnd.randrange(60)))
+
+        if checadas and rnd.random() < 0.05:
+            # Checada duplicada (mismo minuto)
+            checadas.append(checadas[0][:6] + f"{min(int(checadas[0][6:]) + 20, 59):02d}")
+
+        return checadas
+
+    def checadas(self, fecha_inicio: date = None, dias: int = None) -> Iterator[Tuple]:
+        """
+        Genera checadas (num_trabajador, fecha, hora, checador)
+
+        Args:
+            fecha_inicio: Primer día (default: inicio del periodo)
+            dias: Número de días (default: todo el periodo)
+        """
+        fecha_inicio = fecha_inicio or self.fecha_inicio
+        dias = dias or self.dias
+
+        for i, num in enumerate(self.nums):
+            horario = PLANTILLAS[i % len(PLANTILLAS)][1]
+            rnd = random.Random(self.semilla * 1000003 + num + fecha_inicio.toordinal())
+            checador = CHECADORES[i % len(CHECADORES)]
+
+            for d in range(dias):
+                fecha = fecha_inicio + timedelta(days=d)
+                horario_dia = horario.get(fecha.weekday())
+                if not horario_dia:
+                    continue
+                for hora in self._checadas_dia(rnd, horario_dia):
+                    yield (num, fecha, hora, checador)
+
+    def archivo_res(self) -> str:
+        """Contenido .res (formato del importador) para los días siguientes al periodo"""
+        inicio = self.fecha_fin + timedelta(days=1)
+        lineas = [
+            f'{num},"{fecha.isoformat()}","{hora[:5]}","{checador}"'
+            for num, fecha, hora, checador in self.checadas(inicio, self.dias_importacion)
+        ]
+        return '\n'.join(lineas)
+
+    def parametros(self) -> Dict:
+        return {
+            'trabajadores': self.num_trabajadores,
+            'dias': self.dias,
+            'fecha_inicio': self.fecha_inicio.isoformat(),
+            'fecha_fin': self.fecha_fin.isoformat(),
+            'semilla': self.semilla,
+            'dias_importacion': self.dias_importacion
+        }
+
+
+# ============================================
+# CARGA / LIMPIEZA EN BASE DE DATOS
+# ============================================
+
+def limpiar(database_connection, generador: GeneradorDatosSinteticos):
+    """Elimina todos los registros sintéticos (num_trabajador >= num_base / prefijo BENCH)"""
+    rango = (generador.num_base, generador.num_base + 1000000)
+    with database_connection.get_connection() as conn:
+        cursor = conn.cursor()
+        tablas = (
+            'bitacora', 'asistencias', 'movimientos', 'horarios_trabajadores', 'correos_salida',
+            'checador_usuarios', 'trabajadores'
+        )
+        for tabla in tablas:
+            cursor.execute(f"DELETE FROM {tabla} WHERE num_trabajador >= %s AND num_trabajador < %s", rango)
+        cursor.execute("DELETE FROM plantillas_horarios WHERE nombre_horario LIKE 'BENCH %%'")
+        cursor.execute("DELETE FROM tipos_movimientos WHERE nomenclatura LIKE 'BENCH%%'")
+        cursor.execute("DELETE FROM departamentos WHERE num_departamento >= %s AND num_departamento < %s", rango)
+
+
+def sembrar(database_connection, generador: GeneradorDatosSinteticos, lote: int = 5000) -> Dict[str, int]:
+    """
+    Inserta el conjunto de datos sintético
+
+    Returns:
+        dict: Filas insertadas por tabla
+    """
+    conteo = {}
+    columnas_horas = ', '.join(
+        f"{dia}_{campo}" for dia in DIAS for campo in ('entrada_1', 'salida_1', 'entrada_2', 'salida_2')
+    )
+
+    with database_connection.get_connection() as conn:
+        cursor = conn.cursor()
+
+        # Departamentos
+        cursor.executemany(
+            "INSERT INTO departamentos (num_departamento, nombre, nomenclatura) VALUES (%s, %s, %s)",
+            generador.departamentos()
+        )
+        cursor.execute(
+            "SELECT id, num_departamento FROM departamentos WHERE num_departamento >= %s",
+            (generador.num_base,)
+        )
+        ids_departamento = {row['num_departamento']: row['id'] for row in _filas(cursor)}
+
+        # Trabajadores
+        trabajadores = [
+            (num, nombre, ids_departamento[num_depto], tipo_plaza, email)
+            for num, nombre, num_depto, tipo_plaza, email in generador.trabajadores()
+        ]
+        cursor.executemany(
+            "INSERT INTO trabajadores (num_trabajador, nombre, departamento_id, tipoPlaza, email, activo) "
+            "VALUES (%s, %s, %s, %s, %s, 1)",
+            trabajadores
+        )
+        conteo['trabajadores'] = len(trabajadores)
+
+        # Plantillas de horario
+        placeholders = ', '.join(['%s'] * 30)
+        cursor.executemany(
+            f"INSERT INTO plantillas_horarios (nombre_horario, descripcion_horario, {columnas_horas}) "
+            f"VALUES ({placeholders})",
+            generador.plantillas()
+        )
+        cursor.execute("SELECT id, nombre_horario FROM plantillas_horarios WHERE nombre_horario LIKE 'BENCH %%'")
+        ids_plantilla = {row['nombre_horario']: row['id'] for row in _filas(cursor)}
+        orden_plantillas = [ids_plantilla[nombre] for nombre, _ in PLANTILLAS]
+
+        cursor.executemany(
+            "INSERT INTO horarios_trabajadores "
+            "(num_trabajador, plantilla_horario_id, fecha_inicio_asignacion, semestre) VALUES (%s, %s, %s, %s)",
+            [(num, orden_plantillas[idx], inicio, semestre) for num, idx, inicio, semestre in generador.asignaciones()]
+        )
+        conteo['horarios_trabajadores'] = generador.num_trabajadores
+
+        # Movimientos
+        cursor.executemany(
+            "INSERT INTO tipos_movimientos (nomenclatura, nombre, categoria, letra) VALUES (%s, %s, %s, %s)",
+            TIPOS_MOVIMIENTO
+        )
+        cursor.execute("SELECT id, nomenclatura FROM tipos_movimientos WHERE nomenclatura LIKE 'BENCH%%'")
+        ids_tipo = {row['nomenclatura']: row['id'] for row in _filas(cursor)}
+        orden_tipos = [ids_tipo[t[0]] for t in TIPOS_MOVIMIENTO]
+
+        movimientos = [
+            (num, orden_tipos[idx], inicio, fin, 'BENCH')
+            for num, idx, inicio, fin in generador.movimientos()
+        ]
+        if movimientos:
+            cursor.executemany(
+                "INSERT INTO movimientos (num_trabajador, tipo_movimiento_id, fecha_inicio, fecha_fin, observaciones) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                movimientos
+            )
+        conteo['movimientos'] = len(movimientos)
+
+        # Checadas
+        query_checadas = (
+            "INSERT IGNORE INTO asistencias (num_trabajador, fecha, hora, checador) "
+            "VALUES (%s, %s, %s, %s)"
+        )
+        total = 0
+        pendientes = []
+        for checada in generador.checadas():
+            pendientes.append(checada)
+            if len(pendientes) >= lote:
+                cursor.executemany(query_checadas, pendientes)
+                total += len(pendientes)
+                pendientes = []
+        if pendientes:
+            cursor.executemany(query_checadas, pendientes)
+            total += len(pendientes)
+        conteo['asistencias'] = total
+
+    return conteo
+
+
+def _filas(cursor) -> List[Dict]:
+    """fetchall como lista de dicts (cursor pymysql normal o SQLite)"""
+    filas = cursor.fetchall()
+    if filas and not isinstance(filas[0], dict):
+        columnas = [c[0] for c in cursor.description]
+        return [dict(zip(columnas, fila)) for fila in filas]
+    return list(filas)
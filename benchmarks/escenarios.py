@@ -0,0 +1,614 @@
+"""
+Escenarios de benchmark
+
+Cada escenario tiene:
+- preparar(ctx): trabajo previo que NO se mide (ej. contar filas esperadas)
+- ejecutar(ctx): trabajo medido; retorna {'filas': int, 'latencias_ms': [...], 'extra': {...}}
+
+Las latencias son por unidad de trabajo (un trabajador, un PDF). Si un escenario
+no tiene unidad natural, el runner reporta la latencia por query.
+
+Los escenarios se ejecutan en el orden de ESCENARIOS sobre la misma base:
+bitacora_individual inserta la bitácora, bitacora_masivo la reprocesa (updates)
+y los escenarios de PDF la leen.
+"""
+import logging
+import os
+import time
+import timeit
+from datetime import date, timedelta
+from typing import Dict, List
+
+from benchmarks.datos_sinteticos import GeneradorDatosSinteticos
+
+
+class Contexto:
+    """Datos compartidos por los escenarios de una corrida"""
+
+    def __init__(self, generador: GeneradorDatosSinteticos):
+        self.generador = generador
+        self.nums: List[int] = generador.nums
+        self.fecha_inicio: date = generador.fecha_inicio
+        self.fecha_fin: date = generador.fecha_fin
+
+
+class Escenario:
+    """Escenario base"""
+    nombre = ''
+    descripcion = ''
+    # Si True, el runner no configura logging (el escenario lo hace)
+    configura_logging = False
+
+    def preparar(self, ctx: Contexto) -> None:
+        pass
+
+    def ejecutar(self, ctx: Contexto) -> Dict:
+        raise NotImplementedError
+
+
+# ============================================
+# BITÁCORA
+# ============================================
+
+class BitacoraIndividual(Escenario):
+    nombre = 'bitacora_individual'
+    descripcion = 'ProcesarBitacoraUseCase por trabajador (filas = días insertados/actualizados)'
+
+    def ejecutar(self, ctx):
+        from app.features.bitacora.services.procesar_bitacora_use_case import ProcesarBitacoraUseCase
+
+        use_case = ProcesarBitacoraUseCase()
+        latencias, filas, errores = [], 0, 0
+
+        for num in ctx.nums:
+            inicio = time.perf_counter()
+            resultado, error = use_case.ejecutar(num, ctx.fecha_inicio, ctx.fecha_fin)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            if error:
+                errores += 1
+                continue
+            _, stats = resultado
+            filas += stats['insertados'] + stats['actualizados']
+
+        return {'filas': filas, 'latencias_ms': latencias, 'extra': {'trabajadores_con_error': errores}}
+
+
+class BitacoraMasivo(Escenario):
+    nombre = 'bitacora_masivo'
+    descripcion = 'ProcesarBitacoraMasivoUseCase con todos los trabajadores en una llamada'
+
+    def ejecutar(self, ctx):
+        from app.features.bitacora.services.procesar_bitacora_masivo_use_case import procesar_bitacora_masivo_use_case
+
+        inicio = time.perf_counter()
+        resultados, error = procesar_bitacora_masivo_use_case.ejecutar(ctx.nums, ctx.fecha_inicio, ctx.fecha_fin)
+        latencia = (time.perf_counter() - inicio) * 1000
+        if error:
+            raise RuntimeError(error)
+
+        filas = sum(r['stats'].get('insertados', 0) + r['stats'].get('actualizados', 0) for r in resultados)
+        fallidos = sum(1 for r in resultados if not r['success'])
+        return {'filas': filas, 'latencias_ms': [latencia], 'extra': {'trabajadores_con_error': fallidos}}
+
+
+# ============================================
+# IMPORTACIÓN
+# ============================================
+
+class ImportarChecadas(Escenario):
+    nombre = 'importar_checadas'
+    descripcion = 'ImportarChecadasUseCase: parseo + duplicados + inserción de un archivo .res'
+
+    def preparar(self, ctx):
+        self.contenido = ctx.generador.archivo_res()
+
+    def ejecutar(self, ctx):
+        from app.features.asistencias.services.importar_checadas_use_case import ImportarChecadasUseCase
+
+        use_case = ImportarChecadasUseCase()
+        for evento in use_case.ejecutar(self.contenido):
+            if evento.get('error'):
+                raise RuntimeError(evento['error'])
+
+        insertadas = 0
+        for evento in use_case.ejecutar_insercion(getattr(use_case, 'checadas_pendientes', [])):
+            insertadas = evento.get('insertadas', insertadas)
+
+        return {'filas': insertadas, 'latencias_ms': [], 'extra': {'lineas_archivo': self.contenido.count('\n') + 1}}
+
+
+# ============================================
+# CHECADORES (simulados)
+# ============================================
+
+class DescargaChecadores(Escenario):
+    nombre = 'descarga_checadores'
+    descripcion = ('Checadores simulados (zk_simulado.py): índice de usuarios secuencial vs concurrente '
+                   'y descarga de asistencias (nuevas, repetidas, con poda y después de la poda)')
+
+    CHECADORES = 4
+    # Demora por comando del checador simulado (cada bloque de 64 KB es un comando)
+    LATENCIA_MS = 2
+
+    def preparar(self, ctx):
+        from benchmarks.zk_simulado import crear_flota
+
+        # Checadas de los días posteriores a los de importar_checadas: la descarga las inserta
+        inicio = ctx.fecha_fin + timedelta(days=ctx.generador.dias_importacion + 1)
+        self.flota = crear_flota(ctx.generador, self.CHECADORES, inicio, latencia_ms=self.LATENCIA_MS, semilla=1)
+
+    def ejecutar(self, ctx):
+        from app.config.checadores_config import CheckadoresConfig
+        from app.features.checadores.services.descargar_asistencias_use_case import descargar_asistencias_use_case
+        from app.features.checadores.services.indice_usuarios_checador_use_case import (
+            indice_usuarios_checador_use_case
+        )
+        from app.features.checadores.services.sesiones_checador import sesiones_checador
+
+        for checador in self.flota:
+            checador.iniciar()
+        CheckadoresConfig.usar_simulados([c.direccion for c in self.flota])
+        checadores = CheckadoresConfig.get_checadores_activos()
+
+        def cronometrar(funcion) -> float:
+            sesiones_checador.cerrar_todas()  # Cada medición conecta desde cero
+            inicio = time.perf_counter()
+            funcion()
+            return time.perf_counter() - inicio
+
+        def descargar(checador_id) -> Dict:
+            final = {}
+            for evento in descargar_asistencias_use_case.ejecutar(checador_id):
+                if evento.get('error'):
+                    raise RuntimeError(evento['error'])
+                final = evento
+            return final
+
+        extra = {
+            'checadas_en_checadores': sum(c.total_checadas for c in self.flota),
+            'indice_secuencial_s': round(cronometrar(
+                lambda: [indice_usuarios_checador_use_case.actualizar_todos([c]) for c in checadores]
+            ), 3),
+            'indice_concurrente_s': round(cronometrar(indice_usuarios_checador_use_case.actualizar_todos), 3),
+        }
+
+        latencias = []
+        insertadas = duplicadas = 0
+        sesiones_checador.cerrar_todas()
+        inicio = time.perf_counter()
+        for checador in checadores:
+            t = time.perf_counter()
+            final = descargar(checador['id'])
+            latencias.append((time.perf_counter() - t) * 1000)
+            insertadas += final.get('insertadas', 0)
+        duracion = time.perf_counter() - inicio
+
+        # Segunda descarga: el checador conserva todo, todas son duplicadas
+        inicio = time.perf_counter()
+        for checador in checadores:
+            duplicadas += descargar(checador['id']).get('duplicadas', 0)
+        extra['descarga_s'] = round(duracion, 3)
+        extra['descarga_repetida_s'] = round(time.perf_counter() - inicio, 3)
+
+        # Con poda: verifica en BD y vacía los checadores; la siguiente descarga ya no trae la historia
+        CheckadoresConfig.PODA_ASISTENCIAS = True
+        CheckadoresConfig.PODA_MIN_REGISTROS = CheckadoresConfig.PODA_MARGEN_MINUTOS = 0
+        inicio = time.perf_counter()
+        extra['podadas'] = sum(descargar(c['id']).get('podadas', 0) for c in checadores)
+        extra['descarga_con_poda_s'] = round(time.perf_counter() - inicio, 3)
+        inicio = time.perf_counter()
+        for checador in checadores:
+            descargar(checador['id'])
+        extra['descarga_tras_poda_s'] = round(time.perf_counter() - inicio, 3)
+        CheckadoresConfig.PODA_ASISTENCIAS = False
+        extra['insertadas'] = insertadas
+        extra['duplicadas_repetida'] = duplicadas
+        extra['checadas_por_s'] = round(extra['checadas_en_checadores'] / duracion, 1) if duracion else None
+        extra['conexiones'] = sum(c.conexiones for c in self.flota)
+        extra['comandos'] = sum(c.comandos for c in self.flota)
+        extra['mb_enviados'] = round(sum(c.bytes_enviados for c in self.flota) / 1024 / 1024, 2)
+
+        sesiones_checador.cerrar_todas()
+        for checador in self.flota:
+            checador.detener()
+        return {'filas': insertadas, 'latencias_ms': latencias, 'extra': extra}
+
+
+# ============================================
+# PDF
+# ============================================
+
+class PdfIndividual(Escenario):
+    nombre = 'pdf_individual'
+    descripcion = 'ListarBitacoraUseCase + GenerarPdfBitacoraUseCase por trabajador (filas = renglones)'
+
+    def ejecutar(self, ctx):
+        from app.features.bitacora.services.listar_bitacora_use_case import ListarBitacoraUseCase
+        from app.features.bitacora.services.generar_pdf_bitacora_use_case import generar_pdf_bitacora_use_case
+
+        listar = ListarBitacoraUseCase()
+        fecha_inicio, fecha_fin = ctx.fecha_inicio.isoformat(), ctx.fecha_fin.isoformat()
+        latencias, filas, bytes_total = [], 0, 0
+
+        for num in ctx.nums:
+            inicio = time.perf_counter()
+            registros = listar.ejecutar(num_trabajador=num, fecha_inicio=ctx.fecha_inicio, fecha_fin=ctx.fecha_fin)
+            if not registros:
+                continue
+            buffer, error = generar_pdf_bitacora_use_case.ejecutar(
+                registros, registros[0].nombre_trabajador, num, fecha_inicio, fecha_fin
+            )
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            if error:
+                raise RuntimeError(error)
+            filas += len(registros)
+            bytes_total += buffer.getbuffer().nbytes
+
+        return {'filas': filas, 'latencias_ms': latencias, 'extra': {'bytes_pdf': bytes_total}}
+
+
+class PdfMasivo(Escenario):
+    nombre = 'pdf_masivo'
+    descripcion = 'GenerarPdfMasivoBitacoraUseCase con todos los trabajadores (filas = renglones)'
+
+    def preparar(self, ctx):
+        from app.core.database.query_executor import query_executor
+
+        placeholders = ', '.join(['%s'] * len(ctx.nums))
+        resultados, error = query_executor.ejecutar(
+            f"SELECT COUNT(*) as total FROM bitacora WHERE num_trabajador IN ({placeholders}) "
+            f"AND fecha >= %s AND fecha <= %s",
+            (*ctx.nums, ctx.fecha_inicio, ctx.fecha_fin)
+        )
+        self.filas = resultados[0]['total'] if not error else 0
+
+    def ejecutar(self, ctx):
+        from app.features.bitacora.services.generar_pdf_masivo_bitacora_use_case import generar_pdf_masivo_bitacora_use_case
+
+        inicio = time.perf_counter()
+        archivo, error = generar_pdf_masivo_bitacora_use_case.ejecutar(
+            ctx.nums, ctx.fecha_inicio.isoformat(), ctx.fecha_fin.isoformat()
+        )
+        latencia = (time.perf_counter() - inicio) * 1000
+        if error:
+            raise RuntimeError(error)
+
+        bytes_pdf = archivo.seek(0, os.SEEK_END)
+        archivo.close()
+        procesos = generar_pdf_masivo_bitacora_use_case._procesos_paralelo(len(ctx.nums))
+        return {'filas': self.filas, 'latencias_ms': [latencia], 'extra': {'bytes_pdf': bytes_pdf, 'procesos': procesos}}
+
+
+class PdfRenderizadores(Escenario):
+    nombre = 'pdf_renderizadores'
+    descripcion = 'GenerarPdfBitacoraUseCase con platypus vs canvas: páginas/s y paridad (filas = renglones, latencia = canvas)'
+
+    RENDERIZADORES = ('platypus', 'canvas')
+
+    def preparar(self, ctx):
+        from app.features.bitacora.services.listar_bitacora_use_case import ListarBitacoraUseCase
+
+        listar = ListarBitacoraUseCase()
+        self.registros = {}
+        for num in ctx.nums:
+            registros = listar.ejecutar(num_trabajador=num, fecha_inicio=ctx.fecha_inicio, fecha_fin=ctx.fecha_fin)
+            if registros:
+                self.registros[num] = registros
+
+    def ejecutar(self, ctx):
+        from benchmarks.paridad_pdf import huella_pdf, paginas
+        from app.features.bitacora.services.generar_pdf_bitacora_use_case import GenerarPdfBitacoraUseCase
+
+        fecha_inicio, fecha_fin = ctx.fecha_inicio.isoformat(), ctx.fecha_fin.isoformat()
+        extra, pdfs, latencias = {}, {}, {}
+
+        for renderizador in self.RENDERIZADORES:
+            use_case = GenerarPdfBitacoraUseCase()
+            use_case.renderizador = renderizador
+            pdfs[renderizador], latencias[renderizador] = [], []
+
+            inicio = time.perf_counter()
+            for num, registros in self.registros.items():
+                inicio_pdf = time.perf_counter()
+                buffer, error = use_case.ejecutar(registros, registros[0].nombre_trabajador, num, fecha_inicio, fecha_fin)
+                latencias[renderizador].append((time.perf_counter() - inicio_pdf) * 1000)
+                if error:
+                    raise RuntimeError(error)
+                pdfs[renderizador].append(buffer.getvalue())
+            segundos = time.perf_counter() - inicio
+
+            total_paginas = sum(paginas(pdf) for pdf in pdfs[renderizador])
+            extra[renderizador] = {
+                'segundos': round(segundos, 3),
+                'paginas': total_paginas,
+                'paginas_por_s': round(total_paginas / segundos, 1) if segundos else 0,
+                'bytes_pdf': sum(len(pdf) for pdf in pdfs[renderizador]),
+            }
+
+        # Paridad: mismos textos en las mismas posiciones, página por página
+        extra['pdfs_distintos'] = sum(
+            1 for a, b in zip(pdfs['platypus'], pdfs['canvas']) if huella_pdf(a) != huella_pdf(b)
+        )
+        if extra['canvas']['segundos']:
+            extra['aceleracion'] = round(extra['platypus']['segundos'] / extra['canvas']['segundos'], 2)
+
+        filas = sum(len(registros) for registros in self.registros.values())
+        return {'filas': filas, 'latencias_ms': latencias['canvas'], 'extra': extra}
+
+
+class PdfCache(Escenario):
+    nombre = 'pdf_cache'
+    descripcion = 'PDF individual y masivo con la caché vacía vs. repetidos (filas = renglones, latencia = repetidos)'
+
+    def preparar(self, ctx):
+        from app.features.bitacora.services.listar_bitacora_use_case import ListarBitacoraUseCase
+
+        listar = ListarBitacoraUseCase()
+        self.registros = {}
+        for num in ctx.nums:
+            registros = listar.ejecutar(num_trabajador=num, fecha_inicio=ctx.fecha_inicio, fecha_fin=ctx.fecha_fin)
+            if registros:
+                self.registros[num] = registros
+
+    def ejecutar(self, ctx):
+        from app.features.bitacora.services.cache_pdf_bitacora import cache_pdf_bitacora
+        from app.features.bitacora.services.generar_pdf_bitacora_use_case import generar_pdf_bitacora_use_case
+        from app.features.bitacora.services.generar_pdf_masivo_bitacora_use_case import generar_pdf_masivo_bitacora_use_case
+
+        if not cache_pdf_bitacora.habilitada:
+            raise RuntimeError('La caché de PDFs está deshabilitada (PDF_CACHE_MAX_MB=0)')
+
+        fecha_inicio, fecha_fin = ctx.fecha_inicio.isoformat(), ctx.fecha_fin.isoformat()
+        extra, latencias = {}, []
+
+        for pasada in ('frio', 'caliente'):
+            inicio = time.perf_counter()
+            for num, registros in self.registros.items():
+                inicio_pdf = time.perf_counter()
+                _, error = generar_pdf_bitacora_use_case.ejecutar(
+                    registros, registros[0].nombre_trabajador, num, fecha_inicio, fecha_fin
+                )
+                if error:
+                    raise RuntimeError(error)
+                if pasada == 'caliente':
+                    latencias.append((time.perf_counter() - inicio_pdf) * 1000)
+            extra[f'individual_{pasada}_s'] = round(time.perf_counter() - inicio, 3)
+
+            inicio = time.perf_counter()
+            archivo, error = generar_pdf_masivo_bitacora_use_case.ejecutar(ctx.nums, fecha_inicio, fecha_fin)
+            if error:
+                raise RuntimeError(error)
+            archivo.close()
+            extra[f'masivo_{pasada}_s'] = round(time.perf_counter() - inicio, 3)
+
+        for tipo in ('individual', 'masivo'):
+            if extra[f'{tipo}_caliente_s']:
+                extra[f'{tipo}_aceleracion'] = round(extra[f'{tipo}_frio_s'] / extra[f'{tipo}_caliente_s'], 1)
+
+        filas = sum(len(registros) for registros in self.registros.values())
+        return {'filas': filas, 'latencias_ms': latencias, 'extra': extra}
+
+
+# ============================================
+# CORREO
+# ============================================
+
+class CorreoMasivo(Escenario):
+    nombre = 'correo_masivo'
+    descripcion = 'Envío masivo a un SMTP local (sink) con fallos 451 simulados y vaciado de la bandeja de salida'
+
+    # Demora del sink por mensaje y cada cuántos mensajes responde 451
+    LATENCIA_MS = 5
+    FALLAR_CADA = 10
+
+    def ejecutar(self, ctx):
+        from app.config.smtp_config import SMTP_CONFIG
+        from app.core.smtp_pool import LimitadorTasa, smtp_pool
+        from app.features.bitacora.services.bandeja_correo_use_case import bandeja_correo_use_case
+        from app.features.bitacora.services.enviar_correo_masivo_bitacora_use_case import (
+            enviar_correo_masivo_bitacora_use_case
+        )
+        from benchmarks.smtp_sink import ServidorSMTPPrueba
+
+        with ServidorSMTPPrueba(latencia_ms=self.LATENCIA_MS, fallar_cada=self.FALLAR_CADA) as sink:
+            # El pool comparte el dict SMTP_CONFIG; sin límite por minuto ni backoff
+            SMTP_CONFIG.update(
+                host=sink.host, port=sink.puerto, use_tls=False, username='',
+                from_email='bench@bench-rh.test'
+            )
+            smtp_pool.limitador = LimitadorTasa(0)
+            bandeja_correo_use_case.backoff_base = 0
+            bandeja_correo_use_case.espera_dominio = 0.01
+
+            latencias = []
+            inicio = anterior = time.perf_counter()
+            final = {}
+            for evento in enviar_correo_masivo_bitacora_use_case.ejecutar(
+                ctx.nums, ctx.fecha_inicio.isoformat(), ctx.fecha_fin.isoformat()
+            ):
+                if evento.get('error'):
+                    raise RuntimeError(evento['error'])
+                if 'resultado' in evento:
+                    ahora = time.perf_counter()
+                    latencias.append((ahora - anterior) * 1000)
+                    anterior = ahora
+                if evento.get('finalizado'):
+                    final = evento
+            duracion_envio = time.perf_counter() - inicio
+
+            # Reintentos: con backoff 0 cada revisión toma todo lo pendiente
+            inicio = time.perf_counter()
+            revisiones = reenviados = 0
+            while revisiones < 20:
+                resumen = bandeja_correo_use_case.procesar_pendientes(limite=len(ctx.nums))
+                revisiones += 1
+                reenviados += resumen['enviados']
+                if not any(resumen.values()):
+                    break
+            duracion_bandeja = time.perf_counter() - inicio
+            smtp_pool.cerrar()
+
+        estados, _ = bandeja_correo_use_case.resumen()
+        extra = {
+            'enviados': final.get('enviados'),
+            'encolados': final.get('encolados'),
+            'fallidos': final.get('fallidos'),
+            'envio_s': round(duracion_envio, 3),
+            'correos_por_s': round(final.get('enviados', 0) / duracion_envio, 1) if duracion_envio else None,
+            'conexiones_smtp': sink.conexiones,
+            'rechazos_451': sink.rechazados,
+            'bandeja_reenviados': reenviados,
+            'bandeja_revisiones': revisiones,
+            'bandeja_s': round(duracion_bandeja, 3),
+            'bandeja_estados': estados,
+            'mensajes_recibidos': sink.mensajes,
+            'mb_recibidos': round(sink.bytes / 1024 / 1024, 2),
+        }
+        return {'filas': sink.mensajes, 'latencias_ms': latencias, 'extra': extra}
+
+
+# ============================================
+# LOGGING
+# ============================================
+
+class LoggingOverhead(Escenario):
+    nombre = 'logging'
+    descripcion = 'Costo de logging: llamadas DEBUG deshabilitadas vs print/f-string, y bitácora con LOG_LEVEL=DEBUG'
+    configura_logging = True
+
+    # Trabajadores usados para comparar bitácora INFO vs DEBUG
+    MAX_TRABAJADORES = 20
+
+    def ejecutar(self, ctx):
+        from app.core.logging_config import configurar_logging, FORMATO_LOG
+        from app.features.bitacora.services.procesar_bitacora_use_case import ProcesarBitacoraUseCase
+
+        # Los registros pasan por la cola real pero se escriben a /dev/null
+        devnull = open(os.devnull, 'w')
+        destino = logging.StreamHandler(devnull)
+        destino.setFormatter(logging.Formatter(FORMATO_LOG))
+        configurar_logging('INFO', destinos=[destino])
+
+        logger = logging.getLogger('benchmarks.logging')
+        root = logging.getLogger()
+        fecha = ctx.fecha_inicio
+        checadas = ['08:01:12', '08:01:40', '16:03:05']
+        repeticiones = 20000
+
+        def ns_por_llamada(funcion) -> float:
+            return round(min(timeit.repeat(funcion, number=repeticiones, repeat=3)) / repeticiones * 1e9, 1)
+
+        extra = {
+            # Lo que costaba antes: formatear el f-string e imprimirlo siempre
+            'print_fstring_ns': ns_por_llamada(
+                lambda: print(f"[DEBUG] Fecha {fecha}: {len(checadas)} checadas originales: {checadas}", file=devnull)
+            ),
+            'fstring_sin_io_ns': ns_por_llamada(
+                lambda: f"[DEBUG] Fecha {fecha}: {len(checadas)} checadas originales: {checadas}"
+            ),
+            # Ahora: con nivel INFO la llamada DEBUG no formatea nada
+            'debug_deshabilitado_ns': ns_por_llamada(
+                lambda: logger.debug("Fecha %s: %s checadas originales: %s", fecha, len(checadas), checadas)
+            ),
+        }
+
+        root.setLevel(logging.DEBUG)
+        extra['debug_habilitado_cola_ns'] = ns_por_llamada(
+            lambda: logger.debug("Fecha %s: %s checadas originales: %s", fecha, len(checadas), checadas)
+        )
+
+        # Bitácora real con INFO vs DEBUG
+        use_case = ProcesarBitacoraUseCase()
+        nums = ctx.nums[:self.MAX_TRABAJADORES]
+        tiempos = {}
+        for num in nums:  # Calentamiento (caché de página SQLite / MySQL)
+            use_case.ejecutar(num, ctx.fecha_inicio, ctx.fecha_fin)
+        for nivel in (logging.INFO, logging.DEBUG):
+            root.setLevel(nivel)
+            inicio = time.perf_counter()
+            for num in nums:
+                use_case.ejecutar(num, ctx.fecha_inicio, ctx.fecha_fin)
+            tiempos[logging.getLevelName(nivel)] = time.perf_counter() - inicio
+        root.setLevel(logging.INFO)
+
+        extra['bitacora_info_s'] = round(tiempos['INFO'], 3)
+        extra['bitacora_debug_s'] = round(tiempos['DEBUG'], 3)
+        extra['overhead_debug_pct'] = round((tiempos['DEBUG'] / tiempos['INFO'] - 1) * 100, 2) if tiempos['INFO'] else None
+
+        devnull.close()
+        return {'filas': 0, 'latencias_ms': [], 'extra': extra}
+
+
+# ============================================
+# ÍNDICES
+# ============================================
+
+class IndicesConsultas(Escenario):
+    nombre = 'indices'
+    descripcion = 'EXPLAIN de las consultas calientes de asistencias y bitácora: cada una usa el índice esperado'
+
+    # Índices aceptados por tabla: nombres de schemas/*.sql (MySQL) y de esquema_sqlite.sql
+    TRABAJADOR_FECHA = ('idx_trabajador_fecha', 'uk_asistencia_unica',
+                        'idx_asistencias_trabajador_fecha', 'sqlite_autoindex_asistencias_1')
+    FECHA_HORA = ('idx_fecha_hora', 'idx_asistencias_fecha_hora')
+    BITACORA_TRABAJADOR_FECHA = ('idx_trabajador_fecha', 'uk_trabajador_fecha', 'sqlite_autoindex_bitacora_1')
+
+    def ejecutar(self, ctx):
+        from app.core.database.query_executor import QueryExecutor, query_executor
+        from app.features.asistencias.services.obtener_asistencias_use_case import obtener_asistencias_use_case
+        from app.features.bitacora.services.listar_bitacora_use_case import ListarBitacoraUseCase
+        from app.features.bitacora.services.obtener_checadas_dia_use_case import obtener_checadas_dia_use_case
+
+        num = ctx.nums[0]
+        casos = [
+            ('checadas_rango', 'asistencias', self.TRABAJADOR_FECHA,
+             lambda: obtener_checadas_dia_use_case.checadas_rango(num, ctx.fecha_inicio, ctx.fecha_fin)),
+            ('checadas_dia', 'asistencias', self.TRABAJADOR_FECHA,
+             lambda: obtener_checadas_dia_use_case.ejecutar(num, ctx.fecha_inicio)),
+            ('listado_por_fecha', 'asistencias', self.FECHA_HORA,
+             lambda: obtener_asistencias_use_case.ejecutar(
+                 fecha_inicio=str(ctx.fecha_inicio), fecha_fin=str(ctx.fecha_inicio + timedelta(days=2)),
+                 order_by='fecha'
+             )),
+            ('bitacora_versiones', 'bitacora', self.BITACORA_TRABAJADOR_FECHA,
+             lambda: ListarBitacoraUseCase().versiones_por_trabajadores(ctx.nums[:50], ctx.fecha_inicio, ctx.fecha_fin)),
+        ]
+
+        # Se capturan los SELECT que emite cada caso de uso y se explican después
+        ejecutar_original = QueryExecutor.ejecutar
+        capturadas = []
+
+        def ejecutar_capturando(executor, query, params=None):
+            capturadas.append((query, params))
+            return ejecutar_original(executor, query, params)
+
+        resultados = {}
+        fallas = []
+        QueryExecutor.ejecutar = ejecutar_capturando
+        try:
+            for nombre, tabla, indices, operacion in casos:
+                capturadas.clear()
+                operacion()
+                consultas = [
+                    (query, params) for query, params in capturadas
+                    if query.strip().upper().startswith('SELECT') and f"FROM {tabla}" in ' '.join(query.split())
+                ]
+                resultados[nombre] = len(consultas)
+                for query, params in consultas:
+                    usa, error = query_executor.usa_indice(query, params, indices, tabla=tabla)
+                    if not usa:
+                        fallas.append(f"{nombre}: {error} ({' '.join(query.split())[:120]})")
+        finally:
+            QueryExecutor.ejecutar = ejecutar_original
+
+        if fallas:
+            raise AssertionError("Consultas sin el índice esperado:\n" + "\n".join(fallas))
+        return {'filas': 0, 'latencias_ms': [], 'extra': {'consultas_explicadas': resultados}}
+
+
+ESCENARIOS = {
+    e.nombre: e for e in (
+        BitacoraIndividual, BitacoraMasivo, ImportarChecadas, DescargaChecadores, PdfIndividual, PdfMasivo,
+        PdfRenderizadores, PdfCache, CorreoMasivo, LoggingOverhead, IndicesConsultas
+    )
+}
@@ -0,0 +1,162 @@
+-- ============================================
+-- Esquema SQLite equivalente (solo tablas usadas por los benchmarks)
+-- Fuente de verdad: schemas/*.sql (MySQL). Los tipos DATE / TIME / TIMESTAMP se
+-- conservan para que sqlite_standin.py convierta los valores igual que pymysql.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS departamentos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    num_departamento INTEGER NOT NULL UNIQUE,
+    nombre VARCHAR(255) NOT NULL,
+    nomenclatura VARCHAR(50) DEFAULT '',
+    activo BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS trabajadores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    num_trabajador INTEGER NOT NULL UNIQUE,
+    nombre VARCHAR(255) NOT NULL,
+    email VARCHAR(100) DEFAULT NULL,
+    departamento_id INTEGER DEFAULT 0,
+    tipoPlaza VARCHAR(100) DEFAULT NULL,
+    ingresoSEPfecha DATE DEFAULT NULL,
+    captura DATE DEFAULT NULL,
+    activo BOOLEAN DEFAULT 1,
+    movimiento VARCHAR(100) DEFAULT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_trabajadores_nombre ON trabajadores (nombre);
+CREATE INDEX IF NOT EXISTS idx_trabajadores_activo ON trabajadores (activo);
+
+CREATE TABLE IF NOT EXISTS plantillas_horarios (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre_horario VARCHAR(255) NOT NULL,
+    descripcion_horario TEXT,
+    lunes_entrada_1 TIME, lunes_salida_1 TIME, lunes_entrada_2 TIME, lunes_salida_2 TIME,
+    martes_entrada_1 TIME, martes_salida_1 TIME, martes_entrada_2 TIME, martes_salida_2 TIME,
+    miercoles_entrada_1 TIME, miercoles_salida_1 TIME, miercoles_entrada_2 TIME, miercoles_salida_2 TIME,
+    jueves_entrada_1 TIME, jueves_salida_1 TIME, jueves_entrada_2 TIME, jueves_salida_2 TIME,
+    viernes_entrada_1 TIME, viernes_salida_1 TIME, viernes_entrada_2 TIME, viernes_salida_2 TIME,
+    sabado_entrada_1 TIME, sabado_salida_1 TIME, sabado_entrada_2 TIME, sabado_salida_2 TIME,
+    domingo_entrada_1 TIME, domingo_salida_1 TIME, domingo_entrada_2 TIME, domingo_salida_2 TIME,
+    activo BOOLEAN DEFAULT 1,
+    horario_hash VARCHAR(32) UNIQUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS horarios_trabajadores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    num_trabajador INTEGER NOT NULL,
+    plantilla_horario_id INTEGER NOT NULL,
+    fecha_inicio_asignacion DATE NOT NULL,
+    fecha_fin_asignacion DATE,
+    semestre VARCHAR(50) NOT NULL,
+    estado_asignacion VARCHAR(20) DEFAULT 'activo',
+    activo_asignacion BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_horarios_trabajadores_num ON horarios_trabajadores (num_trabajador);
+CREATE INDEX IF NOT EXISTS idx_horarios_trabajadores_fechas ON horarios_trabajadores (fecha_inicio_asignacion, fecha_fin_asignacion);
+
+CREATE TABLE IF NOT EXISTS tipos_movimientos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nomenclatura VARCHAR(20) NOT NULL UNIQUE,
+    nombre VARCHAR(255) NOT NULL,
+    descripcion TEXT,
+    categoria VARCHAR(50) NOT NULL,
+    letra CHAR(1) NOT NULL,
+    campos_personalizados TEXT,
+    activo BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS movimientos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    num_trabajador INTEGER NOT NULL,
+    tipo_movimiento_id INTEGER NOT NULL,
+    fecha_inicio DATE NOT NULL,
+    fecha_fin DATE NOT NULL,
+    observaciones TEXT,
+    datos_personalizados TEXT,
+    usuario_registro VARCHAR(100),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_movimientos_trabajador_fechas ON movimientos (num_trabajador, fecha_inicio, fecha_fin);
+
+CREATE TABLE IF NOT EXISTS asistencias (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    num_trabajador INTEGER NOT NULL,
+    fecha DATE NOT NULL,
+    hora TIME NOT NULL,
+    checador VARCHAR(50) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (num_trabajador, fecha, hora, checador)
+);
+CREATE INDEX IF NOT EXISTS idx_asistencias_trabajador_fecha ON asistencias (num_trabajador, fecha);
+CREATE INDEX IF NOT EXISTS idx_asistencias_fecha_hora ON asistencias (fecha, hora);
+CREATE INDEX IF NOT EXISTS idx_asistencias_checador_fecha ON asistencias (checador, fecha);
+
+CREATE TABLE IF NOT EXISTS bitacora (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    num_trabajador INTEGER NOT NULL,
+    departamento VARCHAR(255),
+    nombre_trabajador VARCHAR(255) NOT NULL,
+    fecha DATE NOT NULL,
+    turno_id INTEGER,
+    horario_texto VARCHAR(50),
+    codigo_incidencia CHAR(2) NOT NULL,
+    tipo_movimiento VARCHAR(50),
+    movimiento_id INTEGER,
+    checada1 TIME,
+    checada2 TIME,
+    checada3 TIME,
+    checada4 TIME,
+    minutos_retardo INTEGER DEFAULT 0,
+    horas_trabajadas DECIMAL(5,2) DEFAULT 0.00,
+    descripcion_incidencia TEXT,
+    updatable BOOLEAN DEFAULT 1,
+    fecha_procesamiento TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    procesado_por VARCHAR(100),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (num_trabajador, fecha)
+);
+CREATE INDEX IF NOT EXISTS idx_bitacora_fecha ON bitacora (fecha);
+CREATE INDEX IF NOT EXISTS idx_bitacora_codigo_incidencia ON bitacora (codigo_incidencia);
+
+CREATE TABLE IF NOT EXISTS correos_salida (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    remitente VARCHAR(255) NOT NULL,
+    destinatario VARCHAR(255) NOT NULL,
+    dominio VARCHAR(255) NOT NULL,
+    asunto VARCHAR(255) DEFAULT NULL,
+    num_trabajador INTEGER DEFAULT NULL,
+    mensaje_ruta VARCHAR(500) NOT NULL,
+    estado VARCHAR(20) NOT NULL DEFAULT 'pendiente',
+    intentos INTEGER NOT NULL DEFAULT 0,
+    siguiente_intento TIMESTAMP NOT NULL,
+    ultimo_error TEXT,
+    creado_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    enviado_en TIMESTAMP NULL DEFAULT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_correos_salida_estado_siguiente ON correos_salida (estado, siguiente_intento);
+
+CREATE TABLE IF NOT EXISTS checador_usuarios (
+    checador_id VARCHAR(50) NOT NULL,
+    num_trabajador INTEGER NOT NULL,
+    serie VARCHAR(50) DEFAULT NULL,
+    nombre VARCHAR(100) DEFAULT NULL,
+    privilegio INTEGER DEFAULT NULL,
+    tarjeta VARCHAR(50) DEFAULT NULL,
+    visto_en TIMESTAMP NOT NULL,
+    PRIMARY KEY (checador_id, num_trabajador)
+);
+CREATE INDEX IF NOT EXISTS idx_checador_usuarios_num_trabajador ON checador_usuarios (num_trabajador);
+CREATE INDEX IF NOT EXISTS idx_checador_usuarios_checador_visto ON checador_usuarios (checador_id, visto_en);
@@ -0,0 +1,128 @@
+"""
+Utilidades de medición para benchmarks
+- Conteo y tiempo de queries (envolviendo la conexión que usa QueryExecutor)
+- Percentiles de latencia
+- Memoria residente pico del proceso
+"""
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+def percentil(valores: List[float], p: float) -> Optional[float]:
+    """Percentil por interpolación lineal (p entre 0 y 100)"""
+    if not valores:
+        return None
+    ordenados = sorted(valores)
+    k = (len(ordenados) - 1) * p / 100
+    inferior = int(k)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (k - inferior)
+
+
+def resumen_latencias(valores_ms: List[float]) -> Dict[str, Optional[float]]:
+    """Resumen p50/p95/max de una lista de latencias en milisegundos"""
+    def redondear(v):
+        return round(v, 3) if v is not None else None
+
+    return {
+        'n': len(valores_ms),
+        'p50': redondear(percentil(valores_ms, 50)),
+        'p95': redondear(percentil(valores_ms, 95)),
+        'max': redondear(max(valores_ms) if valores_ms else None)
+    }
+
+
+def rss_pico_kb() -> int:
+    """Memoria residente pico del proceso en KB"""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reporta bytes, Linux reporta KB
+    return pico // 1024 if sys.platform == 'darwin' else pico
+
+
+class Medidor:
+    """Acumula queries ejecutadas y su duración"""
+
+    def __init__(self):
+        self.queries = 0
+        self.latencias_query_ms: List[float] = []
+
+    def registrar_query(self, duracion_s: float):
+        self.queries += 1
+        self.latencias_query_ms.append(duracion_s * 1000)
+
+    def reiniciar(self):
+        self.queries = 0
+        self.latencias_query_ms = []
+
+
+class CursorMedido:
+    """Envuelve un cursor DB-API y registra cada execute en el Medidor"""
+
+    def __init__(self, cursor, medidor: Medidor):
+        self._cursor = cursor
+        self._medidor = medidor
+
+    def execute(self, query, params=None):
+        inicio = time.perf_counter()
+        try:
+            return self._cursor.execute(query, params)
+        finally:
+            self._medidor.registrar_query(time.perf_counter() - inicio)
+
+    def executemany(self, query, params_list):
+        inicio = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, params_list)
+        finally:
+            self._medidor.registrar_query(time.perf_counter() - inicio)
+
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self._cursor.close()
+
+
+class ConexionMedida:
+    """Envuelve una conexión DB-API para que sus cursores sean medidos"""
+
+    def __init__(self, conexion, medidor: Medidor):
+        self._conexion = conexion
+        self._medidor = medidor
+
+    def cursor(self, *args, **kwargs):
+        return CursorMedido(self._conexion.cursor(*args, **kwargs), self._medidor)
+
+    def __getattr__(self, nombre):
+        return getattr(self._conexion, nombre)
+
+
+def instrumentar(database_connection, medidor: Medidor, origen=None):
+    """
+    Reemplaza get_connection de una instancia DatabaseConnection
+
+    Todos los QueryExecutor que comparten la instancia (db_connection) quedan medidos.
+
+    Args:
+        database_connection: Instancia a instrumentar (ej. db_connection)
+        medidor: Medidor donde se acumulan las queries
+        origen: Conexión real a usar (default: la propia instancia, p.ej. MySQL);
+                para SQLite se pasa un DatabaseConnectionSQLite
+    """
+    get_connection_original = (origen or database_connection).get_connection
+
+    @contextmanager
+    def get_connection():
+        with get_connection_original() as conexion:
+            yield ConexionMedida(conexion, medidor)
+
+    database_connection.get_connection = get_connection
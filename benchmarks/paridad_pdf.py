@@ -0,0 +1,75 @@
+"""
+Comparación de PDFs por contenido dibujado (requiere pypdf)
+
+Dos PDFs generados por caminos distintos (platypus vs canvas) no son iguales
+byte a byte, pero deben verse iguales. La huella de cada página es la lista
+ordenada de textos con su posición absoluta y tamaño de fuente, calculada
+recorriendo los operadores del content stream (q/Q, cm, BT, Tm, Td, T*, Tf, Tj).
+"""
+from io import BytesIO
+from typing import List, Tuple
+
+from pypdf import PdfReader
+from pypdf.generic import ContentStream
+
+Texto = Tuple[float, float, float, str]
+
+IDENTIDAD = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+
+
+def _multiplicar(a: List[float], b: List[float]) -> List[float]:
+    """Producto de matrices PDF [a b c d e f] (a aplicada primero)"""
+    return [
+        a[0] * b[0] + a[1] * b[2], a[0] * b[1] + a[1] * b[3],
+        a[2] * b[0] + a[3] * b[2], a[2] * b[1] + a[3] * b[3],
+        a[4] * b[0] + a[5] * b[2] + b[4], a[4] * b[1] + a[5] * b[3] + b[5],
+    ]
+
+
+def _traslacion(x: float, y: float) -> List[float]:
+    return [1.0, 0.0, 0.0, 1.0, x, y]
+
+
+def huella_pagina(lector: PdfReader, pagina, decimales: int = 1) -> List[Texto]:
+    """Textos de la página como (x, y, tamaño, texto), ordenados"""
+    textos = []
+    ctm, pila = IDENTIDAD, []
+    linea = matriz = IDENTIDAD
+    leading, tamano = 0.0, 0.0
+
+    for operandos, operador in ContentStream(pagina.get_contents(), lector).operations:
+        if operador == b'q':
+            pila.append(ctm)
+        elif operador == b'Q':
+            ctm = pila.pop()
+        elif operador == b'cm':
+            ctm = _multiplicar([float(v) for v in operandos], ctm)
+        elif operador == b'BT':
+            linea = matriz = IDENTIDAD
+        elif operador == b'Tm':
+            linea = matriz = [float(v) for v in operandos]
+        elif operador == b'Td':
+            linea = matriz = _multiplicar(_traslacion(float(operandos[0]), float(operandos[1])), linea)
+        elif operador == b'TL':
+            leading = float(operandos[0])
+        elif operador == b'T*':
+            linea = matriz = _multiplicar(_traslacion(0, -leading), linea)
+        elif operador == b'Tf':
+            tamano = float(operandos[1])
+        elif operador == b'Tj':
+            texto = bytes(operandos[0].original_bytes).decode('cp1252', errors='replace')
+            if texto.strip():
+                posicion = _multiplicar(matriz, ctm)
+                textos.append((round(posicion[4], decimales), round(posicion[5], decimales), tamano, texto))
+
+    return sorted(textos)
+
+
+def huella_pdf(pdf: bytes) -> List[List[Texto]]:
+    """Huella de cada página del PDF"""
+    lector = PdfReader(BytesIO(pdf))
+    return [huella_pagina(lector, pagina) for pagina in lector.pages]
+
+
+def paginas(pdf: bytes) -> int:
+    return len(PdfReader(BytesIO(pdf)).pages)
@@ -0,0 +1,273 @@
+"""
+Runner de benchmarks del pipeline de bitácora
+
+Uso:
+    python -m benchmarks.run_benchmarks                               # SQLite, 50 trabajadores × 30 días
+    python -m benchmarks.run_benchmarks -n 200 -d 60 --salida actual.json
+    python -m benchmarks.run_benchmarks --comparar base.json --salida actual.json
+    python -m benchmarks.run_benchmarks --backend mysql                # usa DB_SISTEMA_* del .env
+
+Cada escenario corre en un subproceso propio para que el RSS pico sea del escenario.
+Con --backend mysql los datos sintéticos (num_trabajador >= 900000, prefijo BENCH)
+se insertan y eliminan en la base configurada: usar una base de pruebas.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from typing import Dict, Optional
+
+# Permitir importar el paquete app desde la raíz del proyecto
+RAIZ_PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_PROYECTO)
+
+# Las métricas Prometheus de los escenarios no deben mezclarse con las del servicio
+os.environ.setdefault('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'tecnotime_metricas_bench'))
+# Caché de PDFs propia de los benchmarks; se vacía antes de cada escenario
+os.environ.setdefault('PDF_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'tecnotime_pdf_cache_bench'))
+# Bandeja de salida propia y sin despachador en segundo plano (correo_masivo la vacía explícitamente)
+os.environ.setdefault('CORREO_BANDEJA_DIR', os.path.join(tempfile.gettempdir(), 'tecnotime_bandeja_bench'))
+os.environ.setdefault('CORREO_BANDEJA_INTERVALO', '0')
+
+from benchmarks.datos_sinteticos import GeneradorDatosSinteticos, limpiar, sembrar
+from benchmarks.escenarios import ESCENARIOS, Contexto
+from benchmarks.medicion import Medidor, instrumentar, resumen_latencias, rss_pico_kb
+
+# Métricas comparadas con --comparar: (ruta, mayor_es_mejor)
+METRICAS_COMPARADAS = [
+    (('filas_por_s',), True),
+    (('latencia_ms', 'p95'), False),
+    (('queries',), False),
+    (('rss_pico_kb',), False),
+]
+
+
+def parsear_argumentos():
+    parser = argparse.ArgumentParser(description='Benchmarks del pipeline de bitácora')
+    parser.add_argument('--backend', choices=['sqlite', 'mysql'], default='sqlite')
+    parser.add_argument('--sqlite-db', default=None, help='Archivo SQLite (default: temporal)')
+    parser.add_argument('-n', '--trabajadores', type=int, default=50)
+    parser.add_argument('-d', '--dias', type=int, default=30)
+    parser.add_argument('--fecha-inicio', type=date.fromisoformat, default=date(2025, 1, 6))
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--escenarios', nargs='+', choices=list(ESCENARIOS), default=list(ESCENARIOS))
+    parser.add_argument('--log-level', default='WARNING', help='LOG_LEVEL durante los escenarios')
+    parser.add_argument('--salida', default=None, help='Archivo JSON de resultados')
+    parser.add_argument('--comparar', default=None, help='JSON de una corrida anterior')
+    parser.add_argument('--umbral', type=float, default=10.0, help='%% de empeoramiento considerado regresión')
+    parser.add_argument('--mantener-datos', action='store_true', help='No borrar datos sintéticos (mysql)')
+    parser.add_argument('--escenario-interno', default=None, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def crear_generador(args) -> GeneradorDatosSinteticos:
+    return GeneradorDatosSinteticos(
+        trabajadores=args.trabajadores,
+        dias=args.dias,
+        fecha_inicio=args.fecha_inicio,
+        semilla=args.semilla
+    )
+
+
+def conectar(args, medidor: Medidor):
+    """Instrumenta db_connection (y la redirige a SQLite si aplica)"""
+    from app.core.database.connection import db_connection
+
+    origen = None
+    if args.backend == 'sqlite':
+        from benchmarks.sqlite_standin import DatabaseConnectionSQLite
+        origen = DatabaseConnectionSQLite(args.sqlite_db)
+
+    instrumentar(db_connection, medidor, origen)
+    return db_connection
+
+
+# ============================================
+# PROCESO HIJO: un escenario
+# ============================================
+
+def ejecutar_escenario(args) -> Dict:
+    """Corre un escenario en este proceso y retorna sus métricas"""
+    escenario = ESCENARIOS[args.escenario_interno]()
+
+    if not escenario.configura_logging:
+        from app.core.logging_config import configurar_logging
+        configurar_logging(args.log_level)
+
+    medidor = Medidor()
+    conectar(args, medidor)
+    ctx = Contexto(crear_generador(args))
+
+    # Cada escenario mide con la caché de PDFs vacía (pdf_cache mide el efecto de llenarla)
+    from app.features.bitacora.services.cache_pdf_bitacora import cache_pdf_bitacora
+    cache_pdf_bitacora.vaciar()
+
+    escenario.preparar(ctx)
+    medidor.reiniciar()
+    rss_inicial = rss_pico_kb()
+
+    inicio = time.perf_counter()
+    resultado = escenario.ejecutar(ctx)
+    duracion = time.perf_counter() - inicio
+
+    filas = resultado['filas']
+    latencias = resultado['latencias_ms'] or medidor.latencias_query_ms
+    return {
+        'descripcion': escenario.descripcion,
+        'duracion_s': round(duracion, 3),
+        'filas': filas,
+        'filas_por_s': round(filas / duracion, 1) if duracion and filas else 0,
+        'queries': medidor.queries,
+        'queries_por_fila': round(medidor.queries / filas, 2) if filas else None,
+        'latencia_ms': resumen_latencias(latencias),
+        'latencia_unidad': 'operacion' if resultado['latencias_ms'] else 'query',
+        'query_ms': resumen_latencias(medidor.latencias_query_ms),
+        'rss_inicial_kb': rss_inicial,
+        'rss_pico_kb': rss_pico_kb(),
+        **({'extra': resultado['extra']} if resultado.get('extra') else {})
+    }
+
+
+def lanzar_escenario(nombre: str, args) -> Dict:
+    """Corre un escenario en un subproceso (RSS aislado)"""
+    comando = [
+        sys.executable, '-m', 'benchmarks.run_benchmarks',
+        '--escenario-interno', nombre,
+        '--backend', args.backend,
+        '--sqlite-db', args.sqlite_db or '',
+        '-n', str(args.trabajadores),
+        '-d', str(args.dias),
+        '--fecha-inicio', args.fecha_inicio.isoformat(),
+        '--semilla', str(args.semilla),
+        '--log-level', args.log_level,
+    ]
+    proceso = subprocess.run(comando, cwd=RAIZ_PROYECTO, capture_output=True, text=True)
+    if proceso.returncode != 0:
+        return {'error': proceso.stderr.strip().splitlines()[-1] if proceso.stderr.strip() else 'Error desconocido'}
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+
+# ============================================
+# COMPARACIÓN
+# ============================================
+
+def _valor(resultado: Dict, ruta) -> Optional[float]:
+    for clave in ruta:
+        if not isinstance(resultado, dict):
+            return None
+        resultado = resultado.get(clave)
+    return resultado
+
+
+def comparar(actual: Dict, anterior: Dict, umbral: float) -> int:
+    """Imprime diferencias contra una corrida anterior; retorna número de regresiones"""
+    regresiones = 0
+    print(f"\nComparación contra {anterior.get('fecha')} ({anterior.get('commit') or 'sin commit'})")
+
+    for nombre, resultado in actual['escenarios'].items():
+        previo = anterior.get('escenarios', {}).get(nombre)
+        if not previo or 'error' in resultado or 'error' in previo or not resultado.get('filas'):
+            continue
+        for ruta, mayor_es_mejor in METRICAS_COMPARADAS:
+            nuevo, viejo = _valor(resultado, ruta), _valor(previo, ruta)
+            if not nuevo or not viejo:
+                continue
+            cambio = (nuevo - viejo) / viejo * 100
+            empeora = -cambio if mayor_es_mejor else cambio
+            marca = '  REGRESIÓN' if empeora > umbral else ''
+            regresiones += 1 if marca else 0
+            print(f"  {nombre:22s} {'.'.join(ruta):16s} {viejo:>12} -> {nuevo:>12} ({cambio:+.1f}%){marca}")
+
+    return regresiones
+
+
+def commit_actual() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ_PROYECTO, capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+# ============================================
+# PROCESO PRINCIPAL
+# ============================================
+
+def main() -> int:
+    args = parsear_argumentos()
+
+    if args.escenario_interno:
+        print(json.dumps(ejecutar_escenario(args), default=str))
+        return 0
+
+    db_temporal = None
+    if args.backend == 'sqlite' and not args.sqlite_db:
+        db_temporal = tempfile.NamedTemporaryFile(prefix='tecnotime_bench_', suffix='.sqlite3', delete=False)
+        args.sqlite_db = db_temporal.name
+        db_temporal.close()
+
+    generador = crear_generador(args)
+    medidor = Medidor()
+    db_connection = conectar(args, medidor)
+
+    print(f"Backend: {args.backend} | {args.trabajadores} trabajadores × {args.dias} días")
+    if args.backend == 'sqlite':
+        from benchmarks.sqlite_standin import DatabaseConnectionSQLite
+        DatabaseConnectionSQLite(args.sqlite_db).crear_esquema()
+
+    inicio = time.perf_counter()
+    limpiar(db_connection, generador)
+    conteo = sembrar(db_connection, generador)
+    print(f"Datos sintéticos: {conteo} ({time.perf_counter() - inicio:.1f}s)")
+
+    resultados = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit_actual(),
+        'backend': args.backend,
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'parametros': generador.parametros(),
+        'datos': conteo,
+        'escenarios': {}
+    }
+
+    for nombre in args.escenarios:
+        print(f"→ {nombre}...", end=' ', flush=True)
+        resultado = lanzar_escenario(nombre, args)
+        resultados['escenarios'][nombre] = resultado
+        if 'error' in resultado:
+            print(f"ERROR: {resultado['error']}")
+        else:
+            print(
+                f"{resultado['duracion_s']}s, {resultado['filas_por_s']} filas/s, "
+                f"{resultado['queries']} queries, p50={resultado['latencia_ms']['p50']}ms "
+                f"p95={resultado['latencia_ms']['p95']}ms, RSS={resultado['rss_pico_kb']} KB"
+            )
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False, default=str)
+        print(f"\nResultados guardados en {args.salida}")
+
+    regresiones = 0
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            regresiones = comparar(resultados, json.load(f), args.umbral)
+
+    if args.backend == 'mysql' and not args.mantener_datos:
+        limpiar(db_connection, generador)
+    if db_temporal:
+        os.unlink(args.sqlite_db)
+
+    hubo_errores = any('error' in r for r in resultados['escenarios'].values())
+    return 1 if regresiones or hubo_errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
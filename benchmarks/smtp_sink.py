@@ -0,0 +1,142 @@
+"""
+Servidor SMTP local que acepta y descarta correos (para benchmarks y pruebas)
+
+Habla lo mínimo de SMTP para smtplib (EHLO, AUTH, MAIL, RCPT, DATA, RSET,
+QUIT) sin TLS, y cuenta conexiones y mensajes. Puede simular un servidor
+lento (latencia por mensaje) y fallos temporales (451 cada N mensajes) para
+medir el pool SMTP y la bandeja de salida sin tocar un servidor real.
+
+Uso en código:
+    with ServidorSMTPPrueba(latencia_ms=5, fallar_cada=10) as sink:
+        SMTP_CONFIG.update(host=sink.host, port=sink.puerto, use_tls=False, username='')
+        ...
+        sink.mensajes, sink.conexiones
+
+Uso manual (la app apunta a él con SMTP_HOST=127.0.0.1 SMTP_PORT=2525 SMTP_USE_TLS=false):
+    python -m benchmarks.smtp_sink --puerto 2525
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+
+class _ManejadorSMTP(socketserver.StreamRequestHandler):
+    """Una sesión SMTP"""
+
+    def handle(self):
+        servidor: ServidorSMTPPrueba = self.server.sink
+        servidor._contar('conexiones')
+        self._responder('220 sink ESMTP listo')
+
+        while True:
+            linea = self.rfile.readline()
+            if not linea:
+                return
+            comando = linea.decode('utf-8', 'replace').strip()
+            verbo = comando[:4].upper()
+
+            if verbo in ('EHLO', 'HELO'):
+                self._responder('250-sink', '250-AUTH PLAIN LOGIN', '250 8BITMIME')
+            elif verbo == 'AUTH':
+                self._responder('235 2.7.0 Autenticado')
+            elif verbo == 'DATA':
+                self._responder('354 Terminar con <CRLF>.<CRLF>')
+                self._recibir_datos(servidor)
+            elif verbo == 'QUIT':
+                self._responder('221 2.0.0 Adiós')
+                return
+            else:  # MAIL, RCPT, RSET, NOOP
+                self._responder('250 2.0.0 OK')
+
+    def _recibir_datos(self, servidor):
+        tamano = 0
+        while True:
+            linea = self.rfile.readline()
+            if not linea or linea == b'.\r\n':
+                break
+            tamano += len(linea)
+
+        if servidor.latencia_ms:
+            time.sleep(servidor.latencia_ms / 1000)
+
+        numero = servidor._contar('recibidos')
+        if servidor.fallar_cada and numero % servidor.fallar_cada == 0:
+            servidor._contar('rechazados')
+            self._responder('451 4.3.0 Fallo temporal simulado')
+            return
+
+        servidor._contar('mensajes')
+        servidor._contar('bytes', tamano)
+        self._responder('250 2.0.0 Mensaje aceptado')
+
+    def _responder(self, *lineas: str):
+        self.wfile.write(''.join(f'{linea}\r\n' for linea in lineas).encode('utf-8'))
+
+
+class _ServidorTCP(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class ServidorSMTPPrueba:
+    """Sink SMTP en un hilo; se usa como context manager"""
+
+    def __init__(self, host: str = '127.0.0.1', puerto: int = 0, latencia_ms: float = 0, fallar_cada: int = 0):
+        """
+        Args:
+            host: Interfaz donde escuchar
+            puerto: Puerto (0 = uno libre, ver .puerto)
+            latencia_ms: Demora simulada por mensaje
+            fallar_cada: Responder 451 a cada N-ésimo mensaje (0 = nunca)
+        """
+        self.latencia_ms = latencia_ms
+        self.fallar_cada = fallar_cada
+        self.conexiones = self.recibidos = self.rechazados = self.mensajes = self.bytes = 0
+        self._lock = threading.Lock()
+        self._servidor = _ServidorTCP((host, puerto), _ManejadorSMTP)
+        self._servidor.sink = self
+        self.host, self.puerto = self._servidor.server_address[:2]
+
+    def iniciar(self) -> 'ServidorSMTPPrueba':
+        threading.Thread(target=self._servidor.serve_forever, name='smtp-sink', daemon=True).start()
+        return self
+
+    def detener(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *_):
+        self.detener()
+
+    def _contar(self, contador: str, valor: int = 1) -> int:
+        with self._lock:
+            total = getattr(self, contador) + valor
+            setattr(self, contador, total)
+            return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor SMTP local que descarta los correos')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=2525)
+    parser.add_argument('--latencia-ms', type=float, default=0, help='Demora simulada por mensaje')
+    parser.add_argument('--fallar-cada', type=int, default=0, help='Responder 451 a cada N-ésimo mensaje')
+    args = parser.parse_args()
+
+    sink = ServidorSMTPPrueba(args.host, args.puerto, args.latencia_ms, args.fallar_cada)
+    sink.iniciar()
+    print(f'Sink SMTP en {sink.host}:{sink.puerto} (Ctrl+C para terminar)')
+    try:
+        while True:
+            time.sleep(10)
+            print(f'conexiones={sink.conexiones} mensajes={sink.mensajes} rechazados={sink.rechazados}')
+    except KeyboardInterrupt:
+        sink.detener()
+
+
+if __name__ == '__main__':
+    main()
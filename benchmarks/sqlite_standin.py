@@ -0,0 +1,198 @@
+"""
+Sustituto SQLite de la conexión MySQL para benchmarks
+
+Expone la misma interfaz que DatabaseConnection (get_connection como context
+manager) y un cursor compatible con el que usa QueryExecutor:
+- Traduce placeholders %s / %(nombre)s, INSERT IGNORE y NOW()/CURDATE()
+- Devuelve filas como dict (igual que DictCursor)
+- Convierte DATE -> date, TIME -> timedelta, TIMESTAMP -> datetime como pymysql
+- Traduce sqlite3.IntegrityError a pymysql.IntegrityError para ejecutar_batch
+"""
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pymysql
+
+ESQUEMA_SQLITE = Path(__file__).parent / 'esquema_sqlite.sql'
+
+_PLACEHOLDER_NOMBRADO = re.compile(r'%\((\w+)\)s')
+_INSERT_IGNORE = re.compile(r'\bINSERT\s+IGNORE\b', re.IGNORECASE)
+_EXPLAIN = re.compile(r'^\s*EXPLAIN\s+(?!QUERY\s+PLAN\b)', re.IGNORECASE)
+_PASO_PLAN = re.compile(
+    r'^(?:SCAN|SEARCH) (\w+)(?: AS \w+)?'
+    r'(?: USING (?:COVERING )?INDEX (\w+)| USING (?:INTEGER )?(PRIMARY) KEY)?'
+)
+
+
+# ============================================
+# CONVERSIÓN DE TIPOS (equivalente a pymysql)
+# ============================================
+
+def _time_a_texto(valor: time) -> str:
+    return valor.strftime('%H:%M:%S')
+
+
+def _timedelta_a_texto(valor: timedelta) -> str:
+    total = int(valor.total_seconds())
+    return f"{total // 3600:02d}:{(total % 3600) // 60:02d}:{total % 60:02d}"
+
+
+def _texto_a_timedelta(valor: bytes) -> timedelta:
+    partes = valor.decode().split(':')
+    horas, minutos = int(partes[0]), int(partes[1])
+    segundos = int(float(partes[2])) if len(partes) > 2 else 0
+    return timedelta(hours=horas, minutes=minutos, seconds=segundos)
+
+
+def _texto_a_datetime(valor: bytes) -> datetime:
+    return datetime.fromisoformat(valor.decode())
+
+
+sqlite3.register_adapter(date, lambda v: v.isoformat())
+sqlite3.register_adapter(datetime, lambda v: v.isoformat(sep=' ', timespec='seconds'))
+sqlite3.register_adapter(time, _time_a_texto)
+sqlite3.register_adapter(timedelta, _timedelta_a_texto)
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_converter('DATE', lambda v: date.fromisoformat(v.decode()))
+sqlite3.register_converter('TIME', _texto_a_timedelta)
+sqlite3.register_converter('TIMESTAMP', _texto_a_datetime)
+sqlite3.register_converter('DATETIME', _texto_a_datetime)
+
+
+def traducir_sql(query: str) -> str:
+    """Traduce el dialecto MySQL usado por la app al de SQLite"""
+    query = _INSERT_IGNORE.sub('INSERT OR IGNORE', query)
+    query = _EXPLAIN.sub('EXPLAIN QUERY PLAN ', query)
+    query = _PLACEHOLDER_NOMBRADO.sub(r':\1', query)
+    return query.replace('%s', '?').replace('%%', '%')
+
+
+# ============================================
+# CURSOR / CONEXIÓN
+# ============================================
+
+class CursorSQLite:
+    """Cursor con la interfaz de pymysql (DictCursor)"""
+
+    def __init__(self, cursor: sqlite3.Cursor):
+        self._cursor = cursor
+        self._plan = False
+
+    def execute(self, query, params=None):
+        query = traducir_sql(query)
+        self._plan = query.upper().startswith('EXPLAIN QUERY PLAN')
+        try:
+            self._cursor.execute(query, params or ())
+        except sqlite3.IntegrityError as e:
+            raise pymysql.IntegrityError(*e.args)
+        return self._cursor.rowcount
+
+    @staticmethod
+    def _paso_plan(row) -> dict:
+        """Paso de EXPLAIN QUERY PLAN con las columnas de EXPLAIN de MySQL que usa la app"""
+        paso = _PASO_PLAN.match(row['detail'])
+        return {
+            'id': row['id'],
+            'table': paso.group(1) if paso else None,
+            'key': (paso.group(2) or paso.group(3)) if paso else None,
+            'Extra': row['detail']
+        }
+
+    def executemany(self, query, params_list):
+        try:
+            self._cursor.executemany(traducir_sql(query), params_list)
+        except sqlite3.IntegrityError as e:
+            raise pymysql.IntegrityError(*e.args)
+        return self._cursor.rowcount
+
+    def fetchall(self):
+        if self._plan:
+            return [self._paso_plan(row) for row in self._cursor.fetchall()]
+        return [dict(row) for row in self._cursor.fetchall()]
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        return dict(row) if row is not None else None
+
+    def fetchmany(self, size=None):
+        return [dict(row) for row in self._cursor.fetchmany(size or self._cursor.arraysize)]
+
+    def __iter__(self):
+        for row in self._cursor:
+            yield dict(row)
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ConexionSQLite:
+    """Conexión con la interfaz de pymysql"""
+
+    def __init__(self, ruta: str):
+        self._conn = sqlite3.connect(ruta, detect_types=sqlite3.PARSE_DECLTYPES)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.create_function('NOW', 0, lambda: datetime.now().isoformat(sep=' ', timespec='seconds'))
+        self._conn.create_function('CURDATE', 0, lambda: date.today().isoformat())
+
+    def cursor(self, cursorclass=None):
+        return CursorSQLite(self._conn.cursor())
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+
+class DatabaseConnectionSQLite:
+    """Equivalente de DatabaseConnection respaldado por un archivo SQLite"""
+
+    def __init__(self, ruta: str):
+        self.ruta = str(ruta)
+
+    @contextmanager
+    def get_connection(self):
+        """Misma semántica que DatabaseConnection: commit al salir, rollback si falla"""
+        connection = ConexionSQLite(self.ruta)
+        try:
+            yield connection
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+    def crear_esquema(self):
+        """Crea las tablas de esquema_sqlite.sql"""
+        conn = sqlite3.connect(self.ruta)
+        try:
+            conn.executescript(ESQUEMA_SQLITE.read_text(encoding='utf-8'))
+            conn.commit()
+        finally:
+            conn.close()
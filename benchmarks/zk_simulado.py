@@ -0,0 +1,458 @@
+"""
+Checador ZKTeco simulado (protocolo de pyzk) para benchmarks y pruebas sin dispositivos
+
+Atiende por TCP y UDP en el mismo puerto los comandos que usa la app a través
+de pyzk: connect/disconnect, get_time (keep-alive), get_serialnumber y demás
+opciones de get_info, read_sizes, get_users y get_attendance (lectura por
+buffer en bloques, como los equipos reales) y clear_attendance.
+
+- Usuarios y checadas salen de GeneradorDatosSinteticos (crear_flota): cada
+  checador tiene a los trabajadores i % cantidad, con número de serie BENCH0001...
+- Un comando a la vez por checador (como el dispositivo real)
+- latencia_ms: demora por comando (cada bloque de un get_attendance es un comando)
+- perdida: probabilidad de no responder un comando; pyzk espera TIMEOUT y falla
+  con ZKNetworkError, igual que con un paquete perdido en la red real
+
+Uso en código:
+    flota = crear_flota(GeneradorDatosSinteticos(500, 250), cantidad=4, latencia_ms=2)
+    for checador in flota:
+        checador.iniciar()
+    CheckadoresConfig.usar_simulados([c.direccion for c in flota])
+
+Uso manual (la app apunta a ellos con la variable CHECADORES_SIMULADOS que imprime):
+    python -m benchmarks.zk_simulado --checadores 4 --puerto 4370 -n 500 -d 250 --latencia-ms 5
+"""
+import argparse
+import random
+import socketserver
+import struct
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from zk import const
+
+from benchmarks.datos_sinteticos import GeneradorDatosSinteticos
+
+# Comandos de lectura por buffer (ZK6/ZK8); pyzk los usa como literales
+CMD_PREPARE_BUFFER = 1503
+CMD_READ_BUFFER = 1504
+
+# Tamaño de los bloques CMD_DATA por UDP (pyzk recibe de a 1024 + 8)
+BLOQUE_UDP = 1024
+
+# Formatos de registro ZK8 (los que pyzk espera por TCP): usuario de 72 bytes y checada de 40
+USUARIO = struct.Struct('<HB8s24sIx7sx24s')
+CHECADA = struct.Struct('<H24sB4sB8s')
+
+ENCABEZADO = struct.Struct('<4H')
+ENCABEZADO_TCP = struct.Struct('<HHI')
+
+
+def codificar_fecha(momento: datetime) -> int:
+    """Fecha y hora en el formato del checador (EncodeTime de zkemsdk)"""
+    return (
+        ((momento.year % 100) * 12 * 31 + (momento.month - 1) * 31 + momento.day - 1) * 86400
+        + (momento.hour * 60 + momento.minute) * 60 + momento.second
+    )
+
+
+def _checksum(paquete: bytes) -> int:
+    if len(paquete) % 2:
+        paquete += b'\x00'
+    suma = 0
+    for (palabra,) in struct.iter_unpack('<H', paquete):
+        suma += palabra
+        if suma > const.USHRT_MAX:
+            suma -= const.USHRT_MAX
+    suma = ~suma
+    while suma < 0:
+        suma += const.USHRT_MAX
+    return suma
+
+
+def _paquete(comando: int, session_id: int, reply_id: int, datos: bytes = b'') -> bytes:
+    checksum = _checksum(ENCABEZADO.pack(comando, 0, session_id, reply_id) + datos)
+    return ENCABEZADO.pack(comando, checksum, session_id, reply_id) + datos
+
+
+class _SesionZK:
+    """Estado de una conexión (el buffer de la última lectura pedida)"""
+
+    def __init__(self, session_id: int, tcp: bool):
+        self.id = session_id
+        self.tcp = tcp
+        self.buffer = b''
+
+
+class _ManejadorTCP(socketserver.BaseRequestHandler):
+    """Una conexión TCP: paquetes con encabezado de 8 bytes (MACHINE_PREPARE_DATA + longitud)"""
+
+    def handle(self):
+        checador: ChecadorSimulado = self.server.checador
+        checador._contar('conexiones')
+        sesion = None
+        while True:
+            encabezado = self._leer(ENCABEZADO_TCP.size)
+            if not encabezado:
+                return
+            _, _, longitud = ENCABEZADO_TCP.unpack(encabezado)
+            paquete = self._leer(longitud)
+            if len(paquete) < ENCABEZADO.size:
+                return
+
+            comando, _, session_id, reply_id = ENCABEZADO.unpack(paquete[:ENCABEZADO.size])
+            if comando == const.CMD_CONNECT:
+                sesion = _SesionZK(checador._nuevo_session_id(), tcp=True)
+            elif sesion is None or session_id != sesion.id:
+                self._enviar([(const.CMD_ACK_UNAUTH, b'')], session_id, reply_id)
+                continue
+
+            respuestas = checador._atender(sesion, comando, paquete[ENCABEZADO.size:])
+            self._enviar(respuestas, sesion.id, reply_id)
+            if comando == const.CMD_EXIT:
+                return
+
+    def _enviar(self, respuestas, session_id, reply_id):
+        for comando, datos in respuestas:
+            paquete = _paquete(comando, session_id, reply_id, datos)
+            self.request.sendall(
+                ENCABEZADO_TCP.pack(const.MACHINE_PREPARE_DATA_1, const.MACHINE_PREPARE_DATA_2, len(paquete)) + paquete
+            )
+            self.server.checador._contar('bytes_enviados', len(paquete))
+
+    def _leer(self, tamano: int) -> bytes:
+        partes = []
+        while tamano > 0:
+            parte = self.request.recv(tamano)
+            if not parte:
+                return b''
+            partes.append(parte)
+            tamano -= len(parte)
+        return b''.join(partes)
+
+
+class _ManejadorUDP(socketserver.BaseRequestHandler):
+    """Un datagrama UDP; la sesión se identifica por session_id"""
+
+    def handle(self):
+        checador: ChecadorSimulado = self.server.checador
+        paquete, sock = self.request
+        if len(paquete) < ENCABEZADO.size:
+            return
+
+        comando, _, session_id, reply_id = ENCABEZADO.unpack(paquete[:ENCABEZADO.size])
+        if comando == const.CMD_CONNECT:
+            checador._contar('conexiones')
+            sesion = _SesionZK(checador._nuevo_session_id(), tcp=False)
+            checador._sesiones_udp[sesion.id] = sesion
+        else:
+            sesion = checador._sesiones_udp.get(session_id)
+
+        if sesion is None:
+            respuestas = [(const.CMD_ACK_UNAUTH, b'')]
+        else:
+            respuestas = checador._atender(sesion, comando, paquete[ENCABEZADO.size:])
+            if comando == const.CMD_EXIT:
+                checador._sesiones_udp.pop(sesion.id, None)
+
+        for respuesta, datos in respuestas:
+            salida = _paquete(respuesta, session_id if sesion is None else sesion.id, reply_id, datos)
+            sock.sendto(salida, self.client_address)
+            checador._contar('bytes_enviados', len(salida))
+
+
+class _ServidorTCP(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class ChecadorSimulado:
+    """Checador ZKTeco en memoria servido en un hilo; se usa como context manager"""
+
+    def __init__(
+        self,
+        serie: str,
+        usuarios: Iterable[Tuple[int, str]],
+        checadas: Iterable[Tuple[int, date, str]] = (),
+        host: str = '127.0.0.1',
+        puerto: int = 0,
+        latencia_ms: float = 0,
+        perdida: float = 0.0,
+        semilla: Optional[int] = None
+    ):
+        """
+        Args:
+            serie: Número de serie (get_serialnumber)
+            usuarios: (num_trabajador, nombre) registrados en el checador
+            checadas: (num_trabajador, fecha, 'HH:MM:SS') en la memoria del checador
+            host: Interfaz donde escuchar
+            puerto: Puerto TCP y UDP (0 = uno libre, ver .puerto)
+            latencia_ms: Demora simulada por comando
+            perdida: Probabilidad (0-1) de no responder un comando
+            semilla: Semilla de las pérdidas (None = aleatoria)
+        """
+        self.serie = serie
+        self.latencia_ms = latencia_ms
+        self.perdida = perdida
+        self.conexiones = self.comandos = self.perdidos = self.bytes_enviados = 0
+
+        self._uids: Dict[int, int] = {}
+        registros = []
+        for uid, (num, nombre) in enumerate(usuarios, start=1):
+            self._uids[num] = uid
+            registros.append(USUARIO.pack(
+                uid, 0, b'', nombre.encode('utf-8')[:24], 0, b'1', str(num).encode()
+            ))
+        self._usuarios = b''.join(registros)
+        self._num_usuarios = len(registros)
+
+        self._checadas = bytearray()
+        self._num_checadas = 0
+        self.agregar_checadas(checadas)
+
+        self._azar = random.Random(semilla)
+        self._lock = threading.Lock()          # Un comando a la vez
+        self._lock_contadores = threading.Lock()
+        self._sesiones_udp: Dict[int, _SesionZK] = {}
+
+        self._tcp = _ServidorTCP((host, puerto), _ManejadorTCP)
+        self.host, self.puerto = self._tcp.server_address[:2]
+        self._udp = socketserver.UDPServer((host, self.puerto), _ManejadorUDP)
+        self._tcp.checador = self._udp.checador = self
+
+    @property
+    def direccion(self) -> Tuple[str, int]:
+        return self.host, self.puerto
+
+    @property
+    def total_usuarios(self) -> int:
+        return self._num_usuarios
+
+    @property
+    def total_checadas(self) -> int:
+        return self._num_checadas
+
+    def agregar_checadas(self, checadas: Iterable[Tuple[int, date, str]]):
+        """Agrega checadas a la memoria del checador (simula checadas nuevas entre descargas)"""
+        registros = []
+        for num, fecha, hora in checadas:
+            h, m, s = (int(x) for x in hora.split(':'))
+            marca = codificar_fecha(datetime(fecha.year, fecha.month, fecha.day, h, m, s))
+            registros.append(CHECADA.pack(
+                self._uids.get(num, 0), str(num).encode(), 1, struct.pack('<I', marca), 0, b''
+            ))
+        self._checadas.extend(b''.join(registros))
+        self._num_checadas += len(registros)
+
+    def iniciar(self) -> 'ChecadorSimulado':
+        for servidor, nombre in ((self._tcp, 'tcp'), (self._udp, 'udp')):
+            threading.Thread(
+                target=servidor.serve_forever, kwargs={'poll_interval': 0.05},
+                name=f'zk-simulado-{self.puerto}-{nombre}', daemon=True
+            ).start()
+        return self
+
+    def detener(self):
+        for servidor in (self._tcp, self._udp):
+            servidor.shutdown()
+            servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *_):
+        self.detener()
+
+    # ------------------------------------------
+    # Protocolo
+    # ------------------------------------------
+
+    def _atender(self, sesion: _SesionZK, comando: int, datos: bytes) -> List[Tuple[int, bytes]]:
+        """Respuestas (comando, datos) a un comando; [] = respuesta perdida"""
+        if comando == const.CMD_ACK_OK:
+            return []  # Confirmación del cliente (captura en vivo): no lleva respuesta
+
+        with self._lock:
+            self._contar('comandos')
+            if self.latencia_ms:
+                time.sleep(self.latencia_ms / 1000)
+            if self.perdida and self._azar.random() < self.perdida:
+                self._contar('perdidos')
+                return []
+            return self._responder(sesion, comando, datos)
+
+    def _responder(self, sesion: _SesionZK, comando: int, datos: bytes) -> List[Tuple[int, bytes]]:
+        ok = [(const.CMD_ACK_OK, b'')]
+
+        if comando in (const.CMD_CONNECT, const.CMD_EXIT, const.CMD_ENABLEDEVICE,
+                       const.CMD_DISABLEDEVICE, const.CMD_REFRESHDATA):
+            return ok
+
+        if comando == const.CMD_GET_TIME:
+            return [(const.CMD_ACK_OK, struct.pack('<I', codificar_fecha(datetime.now())))]
+
+        if comando == const.CMD_GET_VERSION:
+            return [(const.CMD_ACK_OK, b'Ver 6.60 Simulado\x00')]
+
+        if comando == const.CMD_GET_PINWIDTH:
+            return [(const.CMD_ACK_OK, b'\x09')]
+
+        if comando == const.CMD_OPTIONS_RRQ:
+            clave = datos.split(b'\x00')[0].decode('ascii', 'replace')
+            valor = self._opciones().get(clave)
+            if valor is None:
+                return [(const.CMD_ACK_ERROR, b'')]
+            return [(const.CMD_ACK_OK, f'{clave}={valor}\x00'.encode())]
+
+        if comando == const.CMD_GET_FREE_SIZES:
+            return [(const.CMD_ACK_OK, self._tamanos())]
+
+        if comando == CMD_PREPARE_BUFFER:
+            _, solicitado, _, _ = struct.unpack('<bhii', datos[:11])
+            if solicitado == const.CMD_USERTEMP_RRQ:
+                contenido = self._usuarios
+            elif solicitado == const.CMD_ATTLOG_RRQ:
+                contenido = bytes(self._checadas)
+            else:
+                contenido = b''  # Huellas, rostros...: el simulado no tiene
+            # Como el checador: tamaño total en los primeros 4 bytes del buffer
+            sesion.buffer = struct.pack('<I', len(contenido)) + contenido
+            return [(const.CMD_ACK_OK, b'\x00' + struct.pack('<I', len(sesion.buffer)))]
+
+        if comando == CMD_READ_BUFFER:
+            inicio, tamano = struct.unpack('<ii', datos[:8])
+            bloque = sesion.buffer[inicio:inicio + tamano]
+            if sesion.tcp:
+                return [(const.CMD_DATA, bloque)]
+            # UDP: PREPARE_DATA con el tamaño, bloques de 1024 y ACK_OK al final
+            return (
+                [(const.CMD_PREPARE_DATA, struct.pack('<I', len(bloque)))]
+                + [(const.CMD_DATA, bloque[i:i + BLOQUE_UDP]) for i in range(0, len(bloque), BLOQUE_UDP)]
+                + ok
+            )
+
+        if comando == const.CMD_FREE_DATA:
+            sesion.buffer = b''
+            return ok
+
+        if comando == const.CMD_CLEAR_ATTLOG:
+            self._checadas = bytearray()
+            self._num_checadas = 0
+            return ok
+
+        return [(const.CMD_ACK_UNKNOWN, b'')]
+
+    def _opciones(self) -> Dict[str, str]:
+        return {
+            '~SerialNumber': self.serie,
+            '~Platform': 'ZMM220_TFT',
+            '~DeviceName': f'Simulado {self.serie}',
+            'MAC': f'00:17:61:{self.puerto >> 8 & 0xff:02x}:{self.puerto & 0xff:02x}:01',
+            '~ZKFPVersion': '10',
+            'ZKFaceVersion': '0',
+            '~ExtendFmt': '1',
+            '~UserExtFmt': '1',
+            'FaceFunOn': '0',
+            'CompatOldFirmware': '0',
+            'IPAddress': self.host,
+            'NetMask': '255.255.255.0',
+            'GATEIPAddress': '0.0.0.0',
+        }
+
+    def _tamanos(self) -> bytes:
+        """Respuesta de read_sizes: 20 enteros de memoria + 3 de rostros"""
+        campos = [0] * 20
+        campos[4] = self._num_usuarios
+        campos[8] = self._num_checadas
+        campos[14] = 3000                                   # Capacidad de huellas
+        campos[15] = max(10000, self._num_usuarios)         # Capacidad de usuarios
+        campos[16] = max(100000, self._num_checadas)        # Capacidad de checadas
+        campos[17] = campos[14]
+        campos[18] = campos[15] - self._num_usuarios
+        campos[19] = campos[16] - self._num_checadas
+        return struct.pack('<20i', *campos) + struct.pack('<3i', 0, 0, 0)
+
+    def _nuevo_session_id(self) -> int:
+        return self._azar.randrange(1, const.USHRT_MAX)
+
+    def _contar(self, contador: str, valor: int = 1):
+        with self._lock_contadores:
+            setattr(self, contador, getattr(self, contador) + valor)
+
+
+def crear_flota(
+    generador: GeneradorDatosSinteticos,
+    cantidad: int = 4,
+    fecha_inicio: date = None,
+    dias: int = None,
+    puerto_inicial: int = 0,
+    **opciones
+) -> List[ChecadorSimulado]:
+    """
+    Checadores simulados con los datos del generador
+
+    El trabajador i queda registrado (y checa) en el checador i % cantidad; con
+    cantidad=4 coincide con el checador que el generador asigna a sus checadas.
+
+    Args:
+        generador: Datos sintéticos (trabajadores y checadas)
+        cantidad: Número de checadores
+        fecha_inicio, dias: Periodo de las checadas (default: el del generador)
+        puerto_inicial: Puerto del primero (los demás consecutivos); 0 = libres
+        **opciones: host, latencia_ms, perdida, semilla de ChecadorSimulado
+    """
+    indice = {num: i % cantidad for i, num in enumerate(generador.nums)}
+    usuarios = [[] for _ in range(cantidad)]
+    for num, nombre, *_ in generador.trabajadores():
+        usuarios[indice[num]].append((num, nombre))
+
+    checadas = [[] for _ in range(cantidad)]
+    for num, fecha, hora, _ in generador.checadas(fecha_inicio, dias):
+        checadas[indice[num]].append((num, fecha, hora))
+
+    return [
+        ChecadorSimulado(
+            f'BENCH{i + 1:04d}', usuarios[i], checadas[i],
+            puerto=puerto_inicial + i if puerto_inicial else 0, **opciones
+        )
+        for i in range(cantidad)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Checadores ZKTeco simulados (protocolo de pyzk)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=4370, help='Puerto del primer checador (TCP y UDP)')
+    parser.add_argument('--checadores', type=int, default=4)
+    parser.add_argument('-n', '--trabajadores', type=int, default=500)
+    parser.add_argument('-d', '--dias', type=int, default=250, help='Días de checadas en la memoria')
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--latencia-ms', type=float, default=0, help='Demora simulada por comando')
+    parser.add_argument('--perdida', type=float, default=0, help='Probabilidad de no responder un comando (0-1)')
+    args = parser.parse_args()
+
+    generador = GeneradorDatosSinteticos(args.trabajadores, args.dias, semilla=args.semilla)
+    flota = crear_flota(
+        generador, args.checadores, puerto_inicial=args.puerto, host=args.host,
+        latencia_ms=args.latencia_ms, perdida=args.perdida, semilla=args.semilla
+    )
+    for checador in flota:
+        checador.iniciar()
+        print(f'{checador.serie} en {checador.host}:{checador.puerto}: '
+              f'{checador.total_usuarios} usuarios, {checador.total_checadas} checadas')
+    print('CHECADORES_SIMULADOS=' + ','.join(f'{c.host}:{c.puerto}' for c in flota))
+    print('(Ctrl+C para terminar)')
+    try:
+        while True:
+            time.sleep(10)
+            print(' '.join(f'{c.serie}: conexiones={c.conexiones} comandos={c.comandos} perdidos={c.perdidos}'
+                           for c in flota))
+    except KeyboardInterrupt:
+        for checador in flota:
+            checador.detener()
+
+
+if __name__ == '__main__':
+    main()
@@ -6,7 +6,6 @@
 CREATE TABLE IF NOT EXISTS asistencias (
     id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
     num_trabajador INT UNSIGNED NOT NULL,
-    nombre VARCHAR(255) DEFAULT NULL COMMENT 'Nombre del trabajador obtenido del checador',
     fecha DATE NOT NULL,
     hora TIME NOT NULL,
     checador VARCHAR(50) NOT NULL,
@@ -16,7 +15,6 @@ CREATE TABLE IF NOT EXISTS asistencias (
     INDEX idx_trabajador_fecha (num_trabajador, fecha),
     INDEX idx_fecha_hora (fecha, hora),
     INDEX idx_checador_fecha (checador, fecha),
-    INDEX idx_nombre (nombre),
     
     -- Prevenir duplicados exactos (mismo trabajador, misma fecha/hora, mismo checador)
     UNIQUE KEY uk_asistencia_unica (num_trabajador, fecha, hora, checador)
@@ -27,24 +25,44 @@ CREATE TABLE IF NOT EXISTS asistencias (
   ROW_FORMAT=COMPRESSED
   KEY_BLOCK_SIZE=8;
 
+-- ============================================
+-- Migración: quitar el nombre del trabajador (tablas creadas antes)
+-- El nombre se toma de trabajadores al consultar; el código ya no escribe ni
+-- necesita la columna, así que se puede quitar en cualquier momento después de
+-- actualizar la aplicación (sin backfill). Reconstruye la tabla: ejecutar fuera
+-- del horario de checadas.
+-- ============================================
+/*
+ALTER TABLE asistencias
+    DROP INDEX idx_nombre,
+    DROP COLUMN nombre;
+*/
+
 -- ============================================
 -- Particionamiento por fecha (recomendado para millones de registros)
--- Descomenta si necesitas particionamiento por año
+-- Particiones mensuales por RANGE COLUMNS(fecha); la llave primaria debe
+-- incluir fecha. No se ejecuta a mano: el ALTER completo (desde la checada más
+-- antigua) lo genera y ejecuta scripts/particiones_asistencias.py:
+--     particionar [--ejecutar]        migra la tabla existente
+--     rolar                           crea las de los próximos meses (también
+--                                     en cada corrida nocturna)
+--     archivar --antes-de AAAA-MM-DD  mueve las antiguas a asistencias_archivo_pAAAAMM
 -- ============================================
 /*
 ALTER TABLE asistencias
-PARTITION BY RANGE (YEAR(fecha)) (
-    PARTITION p2023 VALUES LESS THAN (2024),
-    PARTITION p2024 VALUES LESS THAN (2025),
-    PARTITION p2025 VALUES LESS THAN (2026),
-    PARTITION p2026 VALUES LESS THAN (2027),
-    PARTITION p_future VALUES LESS THAN MAXVALUE
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id, fecha)
+PARTITION BY RANGE COLUMNS(fecha) (
+    PARTITION p202501 VALUES LESS THAN ('2025-02-01'),
+    PARTITION p202502 VALUES LESS THAN ('2025-03-01'),
+    -- ...
+    PARTITION p_futuro VALUES LESS THAN (MAXVALUE)
 );
 */
 
 -- ============================================
 -- Ejemplo de inserción
 -- ============================================
--- INSERT INTO asistencias (num_trabajador, nombre, fecha, hora, checador) 
--- VALUES (2, 'JUAN PEREZ', '2024-10-19', '16:45', 'CHK002')
+-- INSERT INTO asistencias (num_trabajador, fecha, hora, checador) 
+-- VALUES (2, '2024-10-19', '16:45', 'CHK002')
 -- ON DUPLICATE KEY UPDATE created_at = CURRENT_TIMESTAMP;
@@ -0,0 +1,47 @@
+-- ============================================
+-- Script: Tabla de ejecuciones de bitácora
+-- Descripción: Metadatos de cada corrida automática (nocturna) del procesamiento de bitácora
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS bitacora_ejecuciones (
+    id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    tipo VARCHAR(20) NOT NULL DEFAULT 'nocturna' COMMENT 'nocturna, manual',
+    fecha_inicio DATE NOT NULL COMMENT 'Primer día procesado',
+    fecha_fin DATE NOT NULL COMMENT 'Último día procesado',
+    estado VARCHAR(20) NOT NULL DEFAULT 'en_curso' COMMENT 'en_curso, completada, con_errores, fallida',
+
+    -- Resultados
+    trabajadores_total INT UNSIGNED DEFAULT 0,
+    trabajadores_exitosos INT UNSIGNED DEFAULT 0,
+    trabajadores_fallidos INT UNSIGNED DEFAULT 0,
+    registros_insertados INT UNSIGNED DEFAULT 0,
+    registros_actualizados INT UNSIGNED DEFAULT 0,
+    registros_errores INT UNSIGNED DEFAULT 0,
+    duracion_segundos DECIMAL(10,2) DEFAULT NULL,
+    errores TEXT COMMENT 'JSON con los primeros errores por trabajador',
+
+    -- Auditoría
+    ejecutado_por VARCHAR(100) DEFAULT NULL,
+    iniciado_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finalizado_en TIMESTAMP NULL DEFAULT NULL,
+
+    -- Índices
+    INDEX idx_tipo_estado_fecha_fin (tipo, estado, fecha_fin),
+    INDEX idx_iniciado_en (iniciado_en)
+
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COLLATE=utf8mb4_unicode_ci
+  COMMENT='Historial de procesamientos automáticos de bitácora';
+
+
+-- ============================================
+-- Consultas útiles
+-- ============================================
+
+-- Últimas corridas nocturnas
+-- SELECT id, fecha_inicio, fecha_fin, estado, trabajadores_total, registros_insertados,
+--        registros_actualizados, duracion_segundos
+-- FROM bitacora_ejecuciones
+-- WHERE tipo = 'nocturna'
+-- ORDER BY iniciado_en DESC LIMIT 20;
@@ -0,0 +1,36 @@
+-- ============================================
+-- Script: Índice de usuarios de checadores
+-- Descripción: Qué trabajadores están registrados en cada checador ZKTeco.
+--              Se actualiza en segundo plano, en cada descarga de asistencias
+--              y a pedido (indice_usuarios_checador_use_case.py)
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS checador_usuarios (
+    checador_id VARCHAR(50) NOT NULL COMMENT 'ID en CheckadoresConfig.CHECADORES',
+    num_trabajador INT NOT NULL COMMENT 'user_id en el checador',
+    serie VARCHAR(50) DEFAULT NULL COMMENT 'Número de serie del checador',
+    nombre VARCHAR(100) DEFAULT NULL COMMENT 'Nombre registrado en el checador',
+    privilegio INT DEFAULT NULL,
+    tarjeta VARCHAR(50) DEFAULT NULL,
+    visto_en DATETIME NOT NULL COMMENT 'Última actualización del checador en la que apareció',
+
+    PRIMARY KEY (checador_id, num_trabajador),
+
+    -- Índices
+    INDEX idx_num_trabajador (num_trabajador),
+    INDEX idx_checador_visto (checador_id, visto_en)
+
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COLLATE=utf8mb4_unicode_ci
+  COMMENT='Usuarios registrados en cada checador';
+
+
+-- ============================================
+-- Consultas útiles
+-- ============================================
+
+-- Última actualización y usuarios por checador
+-- SELECT checador_id, serie, MAX(visto_en), COUNT(*)
+-- FROM checador_usuarios
+-- GROUP BY checador_id, serie;
@@ -0,0 +1,56 @@
+-- ============================================
+-- Script: Bandeja de salida de correos
+-- Descripción: Correos que no se pudieron enviar al momento y se reintentan
+--              en segundo plano (bandeja_correo_use_case.py)
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS correos_salida (
+    id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    remitente VARCHAR(255) NOT NULL,
+    destinatario VARCHAR(255) NOT NULL,
+    dominio VARCHAR(255) NOT NULL COMMENT 'Dominio del destinatario (límite de envíos por dominio)',
+    asunto VARCHAR(255) DEFAULT NULL,
+    num_trabajador INT DEFAULT NULL,
+    mensaje_ruta VARCHAR(500) NOT NULL COMMENT 'Archivo .eml con el mensaje MIME ya armado (CORREO_BANDEJA_DIR); se borra en enviado/fallido',
+    estado VARCHAR(20) NOT NULL DEFAULT 'pendiente' COMMENT 'pendiente, enviado, fallido',
+
+    -- Reintentos
+    intentos INT UNSIGNED NOT NULL DEFAULT 0,
+    siguiente_intento DATETIME NOT NULL COMMENT 'No antes de esta hora (backoff exponencial; también bloquea el envío en curso)',
+    ultimo_error TEXT,
+
+    -- Auditoría
+    creado_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    enviado_en TIMESTAMP NULL DEFAULT NULL,
+
+    -- Índices
+    INDEX idx_estado_siguiente (estado, siguiente_intento),
+    INDEX idx_num_trabajador (num_trabajador)
+
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COLLATE=utf8mb4_unicode_ci
+  COMMENT='Bandeja de salida de correos con reintentos';
+
+
+-- ============================================
+-- Consultas útiles
+-- ============================================
+
+-- Pendientes y fallidos por dominio
+-- SELECT dominio, estado, COUNT(*), MIN(siguiente_intento)
+-- FROM correos_salida
+-- WHERE estado <> 'enviado'
+-- GROUP BY dominio, estado;
+
+
+-- ============================================
+-- Limpieza
+-- ============================================
+-- Archivos: el .eml de un correo se borra cuando queda 'enviado' o 'fallido';
+-- el despachador borra cada hora los .eml de CORREO_BANDEJA_DIR (y temporales)
+-- con más de una hora que no corresponden a un correo 'pendiente'.
+--
+-- Filas: las de estado final solo sirven de historial; para depurarlas:
+-- DELETE FROM correos_salida
+-- WHERE estado IN ('enviado', 'fallido') AND creado_en < NOW() - INTERVAL 90 DAY;
@@ -0,0 +1,69 @@
+"""
+Script para mover las checadas antiguas de asistencias al archivo frío
+(archivos comprimidos por mes en ASISTENCIAS_ARCHIVO_DIR)
+
+    .venv/bin/python scripts/archivar_asistencias.py                          # horizonte: ASISTENCIAS_ARCHIVO_MESES
+    .venv/bin/python scripts/archivar_asistencias.py --antes-de 2024-01-01
+    .venv/bin/python scripts/archivar_asistencias.py --listar
+
+Con ASISTENCIAS_ARCHIVO_AUTOMATICO=true también se ejecuta en cada corrida
+nocturna (procesar_bitacora_nocturna.py).
+"""
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+
+# Permitir importar el paquete app desde scripts/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.features.asistencias.services.archivar_asistencias_use_case import archivar_asistencias_use_case
+from app.features.asistencias.services.archivo_asistencias import archivo_asistencias
+
+
+def parsear_argumentos():
+    """Define los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description='Archivo frío de la tabla asistencias')
+    parser.add_argument(
+        '--antes-de',
+        type=lambda s: datetime.strptime(s, '%Y-%m-%d').date(),
+        help='Archiva los meses completos anteriores a este día (YYYY-MM-DD); '
+             'default: ASISTENCIAS_ARCHIVO_MESES meses atrás'
+    )
+    parser.add_argument(
+        '--listar',
+        action='store_true',
+        help='Solo muestra los meses archivados'
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parsear_argumentos()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+    )
+
+    if args.listar:
+        for mes in archivo_asistencias.meses():
+            ruta = archivo_asistencias.ruta(mes)
+            print(f"{mes:%Y-%m}  {ruta}  {os.path.getsize(ruta):,} bytes")
+        return 0
+
+    archivados, error = archivar_asistencias_use_case.ejecutar(args.antes_de)
+    for archivado in archivados or []:
+        print(f"{archivado['mes']}: {archivado['filas']:,} filas -> {archivado['archivo']}")
+    if not error and not archivados:
+        print("No hay meses por archivar")
+
+    if error:
+        logging.error("%s", error)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,6 +23,8 @@ echo "📦 Instalando gunicorn..."
 # Copiar archivo de servicio
 echo "📄 Copiando archivo de servicio..."
 cp /home/ccomputo/projects/rino/tecnotime.service /etc/systemd/system/
+cp /home/ccomputo/projects/rino/scripts/tecnotime-bitacora.service /etc/systemd/system/
+cp /home/ccomputo/projects/rino/scripts/tecnotime-bitacora.timer /etc/systemd/system/
 
 # Recargar systemd
 echo "🔄 Recargando systemd..."
@@ -32,6 +34,10 @@ systemctl daemon-reload
 echo "✅ Habilitando servicio..."
 systemctl enable tecnotime.service
 
+# Habilitar el procesamiento nocturno de bitácora
+echo "🌙 Habilitando procesamiento nocturno de bitácora..."
+systemctl enable --now tecnotime-bitacora.timer
+
 # Iniciar el servicio
 echo "🚀 Iniciando servicio..."
 systemctl start tecnotime.service
@@ -56,6 +62,9 @@ echo "  • Reiniciar:       sudo systemctl restart tecnotime"
 echo "  • Ver logs:        sudo journalctl -u tecnotime -f"
 echo "  • Logs de acceso:  sudo tail -f /var/log/tecnotime/access.log"
 echo "  • Logs de error:   sudo tail -f /var/log/tecnotime/error.log"
+echo "  • Bitácora nocturna: sudo systemctl list-timers tecnotime-bitacora.timer"
+echo "  • Correr ahora:    sudo systemctl start tecnotime-bitacora.service"
+echo "  • Logs nocturnos:  sudo journalctl -u tecnotime-bitacora"
 echo ""
 echo "La aplicación está corriendo en: http://localhost:5000"
 echo "=========================================="
@@ -0,0 +1,96 @@
+"""
+Script para administrar las particiones por fecha de la tabla asistencias
+
+    .venv/bin/python scripts/particiones_asistencias.py estado
+    .venv/bin/python scripts/particiones_asistencias.py particionar            # solo muestra el ALTER
+    .venv/bin/python scripts/particiones_asistencias.py particionar --ejecutar
+    .venv/bin/python scripts/particiones_asistencias.py rolar
+    .venv/bin/python scripts/particiones_asistencias.py archivar --antes-de 2024-01-01
+
+rolar también se ejecuta en cada corrida nocturna (procesar_bitacora_nocturna.py).
+archivar deja las checadas en el archivo frío (como scripts/archivar_asistencias.py)
+pero quita cada partición completa en lugar de borrar fila por fila.
+"""
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+
+# Permitir importar el paquete app desde scripts/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.features.asistencias.services.particiones_asistencias_use_case import particiones_asistencias_use_case
+
+
+def parsear_argumentos():
+    """Define los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description='Particiones por fecha de la tabla asistencias')
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    comandos.add_parser('estado', help='Muestra las particiones actuales')
+
+    particionar = comandos.add_parser('particionar', help='Particiona la tabla existente')
+    particionar.add_argument(
+        '--ejecutar',
+        action='store_true',
+        help='Ejecuta el ALTER TABLE (sin esta opción solo se muestra)'
+    )
+
+    comandos.add_parser('rolar', help='Crea las particiones de los próximos periodos')
+
+    archivar = comandos.add_parser('archivar', help='Pasa particiones antiguas al archivo frío')
+    archivar.add_argument(
+        '--antes-de',
+        type=lambda s: datetime.strptime(s, '%Y-%m-%d').date(),
+        required=True,
+        help='Archiva las particiones con fechas anteriores a este día (YYYY-MM-DD)'
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parsear_argumentos()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+    )
+
+    if args.comando == 'estado':
+        estado, error = particiones_asistencias_use_case.estado()
+        if not error and not estado['particionada']:
+            print("asistencias no está particionada (ver: particionar)")
+        elif not error:
+            for particion in estado['particiones']:
+                hasta = particion['hasta'] or 'MAXVALUE'
+                print(f"{particion['nombre']:<12} < {hasta!s:<12} ~{particion['filas']:,} filas")
+
+    elif args.comando == 'particionar':
+        if args.ejecutar:
+            creadas, error = particiones_asistencias_use_case.particionar()
+            if not error:
+                print(f"{creadas} particiones creadas")
+        else:
+            sql, error = particiones_asistencias_use_case.sentencia_particionar()
+            if not error:
+                print(sql + ';')
+
+    elif args.comando == 'rolar':
+        creadas, error = particiones_asistencias_use_case.rolar()
+        if not error:
+            print(f"Particiones creadas: {', '.join(creadas) if creadas else 'ninguna'}")
+
+    else:
+        archivadas, error = particiones_asistencias_use_case.archivar(args.antes_de)
+        for archivada in archivadas or []:
+            print(f"{archivada['particion']} -> {', '.join(archivada['meses']) or 'sin filas'} ({archivada['filas']:,} filas)")
+
+    if error:
+        logging.error("%s", error)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Script para procesar la bitácora de forma incremental (corrida nocturna)
+
+Procesa los días pendientes desde la última corrida exitosa hasta ayer para
+todos los trabajadores activos con horario asignado. Se ejecuta desde
+tecnotime-bitacora.timer, pero también puede correrse a mano:
+
+    .venv/bin/python scripts/procesar_bitacora_nocturna.py
+    .venv/bin/python scripts/procesar_bitacora_nocturna.py --fecha-fin 2025-01-31 --dias 31
+    .venv/bin/python scripts/procesar_bitacora_nocturna.py --trabajadores 123 456
+
+Una sola corrida a la vez (flock sobre BITACORA_NOCTURNA_LOCK): si ya hay otra
+en curso esta termina sin hacer nada.
+"""
+import argparse
+import fcntl
+import logging
+import os
+import sys
+from datetime import datetime
+
+# Permitir importar el paquete app desde scripts/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.features.bitacora.services.procesar_bitacora_nocturna_use_case import procesar_bitacora_nocturna_use_case
+from app.config import asistencias_config, bitacora_config
+from app.features.asistencias.services.archivar_asistencias_use_case import archivar_asistencias_use_case
+from app.features.asistencias.services.particiones_asistencias_use_case import particiones_asistencias_use_case
+
+
+def parsear_argumentos():
+    """Define los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description='Procesamiento nocturno incremental de bitácora')
+    parser.add_argument(
+        '--fecha-fin',
+        type=lambda s: datetime.strptime(s, '%Y-%m-%d').date(),
+        default=None,
+        help='Último día a procesar (YYYY-MM-DD, default: ayer)'
+    )
+    parser.add_argument(
+        '--dias',
+        type=int,
+        default=None,
+        help='Días a procesar hacia atrás desde fecha-fin (ignora el historial de corridas)'
+    )
+    parser.add_argument(
+        '--trabajadores',
+        type=int,
+        nargs='+',
+        default=None,
+        help='Números de trabajador a procesar (default: todos los activos)'
+    )
+    parser.add_argument(
+        '--tipo',
+        default='nocturna',
+        help="Tipo de corrida guardado en bitacora_ejecuciones (default: 'nocturna'; "
+             "con --dias o --trabajadores se guarda como 'manual')"
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parsear_argumentos()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+    )
+
+    # El bloqueo se libera al cerrar el archivo (también si el proceso muere)
+    with open(bitacora_config.NOCTURNA_LOCK, 'a') as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            logging.warning("Otra corrida nocturna está en curso (%s); no se hace nada", bitacora_config.NOCTURNA_LOCK)
+            return 0
+        return corrida(args)
+
+
+def corrida(args) -> int:
+    """Particiones, archivo frío y bitácora de los días pendientes"""
+    # Particiones de asistencias de los próximos periodos (sin particiones no hace nada)
+    _, error = particiones_asistencias_use_case.rolar()
+    if error:
+        logging.warning("No se pudieron crear particiones de asistencias: %s", error)
+
+    # Checadas más antiguas que el horizonte al archivo frío (ASISTENCIAS_ARCHIVO_AUTOMATICO)
+    if asistencias_config.ARCHIVO_AUTOMATICO:
+        _, error = archivar_asistencias_use_case.ejecutar()
+        if error:
+            logging.warning("No se pudieron archivar asistencias: %s", error)
+
+    resumen, error = procesar_bitacora_nocturna_use_case.ejecutar(
+        fecha_fin=args.fecha_fin,
+        dias=args.dias,
+        num_trabajadores=args.trabajadores,
+        tipo=args.tipo
+    )
+
+    if error:
+        logging.error("Procesamiento nocturno fallido: %s", error)
+        return 1
+
+    logging.info(
+        "Resultado: %s (%s a %s)",
+        resumen['estado'], resumen['fecha_inicio'], resumen['fecha_fin']
+    )
+
+    # Código 2 = terminó, pero con trabajadores o registros con error
+    return 2 if resumen['estado'] == 'con_errores' else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())